@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Serve the read-only dashboard, alerts and product lookup endpoints with
+# async views, let pages open the live event stream, and do not keep
+# per-thread connections (see settings)
+os.environ.setdefault('ASYNC_READ_VIEWS', '1')
+os.environ.setdefault('LIVE_EVENTS', '1')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,13 +45,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inventory_system.middleware.RequestMetricsMiddleware',  # first, so session/auth queries are counted
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'inventory_system.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'inventory_system.middleware.RequestDebugLogMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -85,6 +91,48 @@ DATABASES = {
     }
 }
 
+# Connection reuse, per worker process
+# DB_CONNECTION_MODE=persistent (default): each worker thread keeps its
+# connection for DB_CONN_MAX_AGE seconds and health-checks it before reuse.
+# DB_CONNECTION_MODE=pool: a psycopg 3 pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE
+# connections per process, shared by its threads (use it under ASGI, where
+# persistent connections do not help). Needs `pip install -r requirements-pool.txt`
+# (psycopg 3 and psycopg_pool); set DB_POOL_MAX_SIZE to the worker's thread count. A request waits up to
+# DB_POOL_TIMEOUT seconds for a free connection. Statistics: /api/metrics/db-pool/.
+DB_CONNECTION_MODE = os.environ.get('DB_CONNECTION_MODE', 'persistent')
+if DB_CONNECTION_MODE == 'pool':
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            'DB_CONNECTION_MODE=pool needs psycopg 3 and psycopg_pool: pip install -r requirements-pool.txt'
+        )
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '8')),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Optional read replica (streaming replica of 'default'). List/retrieve
+# requests, dashboard widgets and exports read from it; writes, and a client's
+# reads for REPLICA_STICKY_SECONDS after it writes (a cookie), stay on 'default'
+# (inventory_system.db_router). Tests run it as a mirror of 'default'.
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['inventory_system.db_router.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+REPLICA_STICKY_SECONDS = 10
+
 
 
 # Password validation
@@ -126,6 +174,71 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Human-readable ID allocation (CAT-00001, TXN-2026-00001, ...)
+# Codes are reserved from the id_sequence counters table, a block of numbers
+# per round trip. With ID_ALLOCATOR_OWN_CONNECTION (ignored on SQLite) the
+# reservations run on a separate autocommit connection, so the counter rows
+# are never locked for the length of a request's transaction.
+# A process notices a reset made by another one (reset_database, erase_sample_data)
+# at its next reservation, or at the latest ID_ALLOCATOR_RESET_CHECK_SECONDS later.
+ID_ALLOCATOR = 'inventory_system.services.sequence_service.CounterTableAllocator'
+ID_ALLOCATOR_BLOCK_SIZE = 100
+ID_ALLOCATOR_OWN_CONNECTION = True
+ID_ALLOCATOR_RESET_CHECK_SECONDS = 5
+
+# Cache used by the dashboard widgets.
+# Each process may keep its own copy: the stamps that invalidate them live in
+# the database (change_stamp), so every process sees the same ETags.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+DASHBOARD_CACHE_TIMEOUT = 300  # seconds
+
+# Logging for inventory_system (services, signals, views)
+# INVENTORY_LOG_LEVEL gates what is written (e.g. WARNING in production).
+# A session-authenticated staff user can still trace one request at DEBUG by
+# sending the `X-Debug-Log: 1` header (inventory_system.middleware).
+INVENTORY_LOG_LEVEL = os.environ.get('INVENTORY_LOG_LEVEL', 'DEBUG' if DEBUG else 'INFO')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'inventory_level': {
+            '()': 'inventory_system.logging_utils.RequestLevelFilter',
+            'level': INVENTORY_LOG_LEVEL,
+        },
+    },
+    'formatters': {
+        'key_value': {
+            '()': 'inventory_system.logging_utils.KeyValueFormatter',
+            'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+        },
+    },
+    'handlers': {
+        'inventory_console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['inventory_level'],
+            'formatter': 'key_value',
+        },
+    },
+    'loggers': {
+        'inventory_system': {
+            'handlers': ['inventory_console'],
+            'level': 'DEBUG',
+            'propagate': False,
+        },
+    },
+}
+
+# Per-request query/latency metrics (inventory_system.middleware.RequestMetricsMiddleware)
+# Reported per view at /api/metrics/requests/ (JSON or ?output=prometheus) and by
+# `manage.py request_metrics`. The ring buffer holds the last N requests per process.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', '1' if DEBUG else '0') == '1'
+REQUEST_METRICS_BUFFER_SIZE = 500
+REQUEST_METRICS_SLOW_QUERIES = 3  # slowest statements kept per request
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -149,6 +262,43 @@ CSRF_COOKIE_HTTPONLY = False
 # Gmail OTP Settings
 GMAIL_SENDER_EMAIL = 'me'  # Uses authenticated user's email, or specify: 'your-email@gmail.com'
 
+# Outbound email (OTP codes, password reset notices)
+# Views queue mail in the outbound_email table and return at once. After the
+# request commits, OUTBOUND_EMAIL_THREADS in-process threads send it; failed or
+# missed mail is retried with backoff by `manage.py send_queued_email` (run it
+# as a service). EMAIL_BACKEND is the transport: set it to
+# django.core.mail.backends.console.EmailBackend, or .filebased.EmailBackend
+# (writes to EMAIL_FILE_PATH), to test without Gmail. Bodies are blanked once a
+# row is Sent, Expired or Failed; `manage.py refresh_inventory_status` deletes
+# those rows after 30 days (MailQueueService.RETENTION).
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'inventory_system.services.gmail_service.GmailEmailBackend')
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+OUTBOUND_EMAIL_THREADS = int(os.environ.get('OUTBOUND_EMAIL_THREADS', '2'))
+OUTBOUND_EMAIL_MAX_ATTEMPTS = 5
+
+# Server-sent events (/api/events/): stock, alert, order and dashboard updates
+# pushed to open pages after each commit. The local broker reaches the clients
+# of its own process only, so serve the stream from a single ASGI process
+# (e.g. `uvicorn config.asgi:application`). Under WSGI every open stream holds
+# a worker thread until EVENT_STREAM_MAX_SECONDS, when the browser reconnects.
+# Pages only open the stream when LIVE_EVENTS is on (config/asgi.py turns it
+# on); otherwise they keep polling /api/alerts/ every 5 minutes.
+LIVE_EVENTS = os.environ.get('LIVE_EVENTS', '0') == '1'
+EVENT_BROKER = 'inventory_system.services.event_service.LocalEventBroker'
+EVENT_REPLAY_SIZE = 200  # recent events resent to clients reconnecting with Last-Event-ID
+EVENT_STREAM_QUEUE_SIZE = 100  # events a slow client may fall behind before it is told to reload
+EVENT_STREAM_HEARTBEAT = 15  # seconds
+EVENT_STREAM_MAX_SECONDS = 300
+
+# Async read path. config/asgi.py turns this on, so under an ASGI server
+# (`uvicorn config.asgi:application`) the dashboard widgets, /api/alerts/ and
+# GET /api/products/<id>/ are served by inventory_system.async_views (async
+# ORM) instead of sync DRF views; a waiting request then holds no thread of
+# its own. The ASGI entrypoint also defaults DB_CONN_MAX_AGE to 0: persistent
+# connections are not reused there (DB_CONNECTION_MODE=pool is). Compare
+# against the WSGI workers with testing/benchmark_read_path.py.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', '0') == '1'
+
 # CSRF Settings
 CSRF_TRUSTED_ORIGINS = ['http://127.0.0.1:8000', 'http://localhost:8000']
 
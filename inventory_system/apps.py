@@ -10,6 +10,7 @@ class InventorySystemConfig(AppConfig):
         
         # Clear all sessions on server start (logs out all users from previous session)
         # This runs when the server starts, ensuring no stale sessions persist
+        import logging
         import sys
         import os
         
@@ -24,7 +25,7 @@ class InventorySystemConfig(AppConfig):
                 # Delete all sessions - this logs out everyone
                 deleted_count = Session.objects.all().delete()[0]
                 if deleted_count > 0:
-                    print(f"[Auth] Cleared {deleted_count} session(s) from previous server run.")
+                    logging.getLogger(__name__).info('Cleared %s session(s) from previous server run', deleted_count)
             except Exception as e:
                 # Silently fail if sessions table doesn't exist yet (e.g., fresh install)
                 pass
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Async read views for inventory_system (served under ASGI)
+
+Async counterparts of the read-only dashboard widgets, /api/alerts/ and the
+product lookup (GET /api/products/<id>/). They answer the same JSON as the
+DRF views in views.py but query through Django's async ORM, so under an ASGI
+server a request waiting on the database holds no worker thread. urls.py
+routes to them when settings.ASYNC_READ_VIEWS is on (config/asgi.py).
+DRF has no async views, so the API's authentication classes are run here
+through sync_to_async and its error format is reproduced.
+"""
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .db_router import reads_from, replica_reads
+from .models import InventoryAlert, Product
+from .serializers import (
+    DashboardCategorySerializer,
+    DashboardSupplierSerializer,
+    DashboardStockStatusSerializer,
+    ProductSerializer,
+)
+from .services.alert_service import AlertService
+from .services.dashboard_service import DashboardService
+from .views import ProductViewSet
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _error(detail, status):
+    return JsonResponse({'detail': detail}, status=status)
+
+
+def _authenticate(request):
+    """
+    Authenticate request with DEFAULT_AUTHENTICATION_CLASSES, as the API's DRF views do
+
+    Returns:
+        tuple: (user, None), or (None, the 401/403 response DRF would send)
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+        if user.is_authenticated:
+            return user, None
+        error = exceptions.NotAuthenticated()
+    except exceptions.AuthenticationFailed as e:
+        error = e
+
+    # Like APIView.handle_exception: 401 with a challenge when the first authenticator has one
+    challenge = drf_request.authenticators[0].authenticate_header(drf_request) if drf_request.authenticators else None
+    response = _error(error.detail, 401 if challenge else 403)
+    if challenge:
+        response['WWW-Authenticate'] = challenge
+    return None, response
+
+
+def async_read_view(view):
+    """
+    Async counterpart of @api_view(['GET']) with IsAuthenticated
+
+    Only GET/HEAD are answered; errors use DRF's {'detail': ...} format.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            response = _error(f'Method "{request.method}" not allowed.', 405)
+            response['Allow'] = ', '.join(READ_METHODS)
+            return response
+
+        # From the primary, like the sync views (process_view loads request.user before routing)
+        with reads_from(None):
+            user, error = await sync_to_async(_authenticate)(request)
+        if error:
+            return error
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def dashboard_widget(widget):
+    """
+    condition() for an async dashboard view, with the widget's stamp loaded first
+
+    Django calls the ETag / Last-Modified functions synchronously, where the
+    ORM may not be used; DashboardService.modified_at() then answers from the
+    stamp loaded here.
+    """
+    def decorator(view):
+        conditional_view = condition(**DashboardService.condition_funcs(widget))(view)
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            await DashboardService.aload_stamp(widget, request)
+            return await conditional_view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# --- Dashboard aggregate endpoints ---
+# Same cache and ETag / Last-Modified handling as views.dashboard_*.
+@replica_reads
+@async_read_view
+@dashboard_widget(DashboardService.CATEGORIES)
+async def dashboard_categories(request):
+    async def build():
+        return DashboardCategorySerializer(await DashboardService.acategory_distribution(), many=True).data
+
+    return JsonResponse(await DashboardService.aget(DashboardService.CATEGORIES, build, request), safe=False)
+
+
+@replica_reads
+@async_read_view
+@dashboard_widget(DashboardService.TOP_SUPPLIERS)
+async def dashboard_top_suppliers(request):
+    try:
+        top = int(request.GET.get('top', 5))
+    except (TypeError, ValueError):
+        top = 5
+
+    async def build():
+        return DashboardSupplierSerializer(await DashboardService.atop_suppliers(top), many=True).data
+
+    return JsonResponse(await DashboardService.aget(DashboardService.TOP_SUPPLIERS, build, request), safe=False)
+
+
+@replica_reads
+@async_read_view
+@dashboard_widget(DashboardService.STOCK_STATUS)
+async def dashboard_stock_status(request):
+    async def build():
+        return DashboardStockStatusSerializer(await DashboardService.astock_status_counts(), many=True).data
+
+    return JsonResponse(await DashboardService.aget(DashboardService.STOCK_STATUS, build, request), safe=False)
+
+
+@replica_reads
+@async_read_view
+@dashboard_widget(DashboardService.STATS)
+async def dashboard_stats(request):
+    return JsonResponse(await DashboardService.aget(DashboardService.STATS, DashboardService.astats, request))
+
+
+@async_read_view
+async def inventory_alerts(request):
+    """Same response and `type` / `severity` filters as views.inventory_alerts"""
+    await AlertService.aensure_current()
+    today = timezone.now().date()
+
+    alerts = InventoryAlert.objects.order_by('priority', 'product_name', 'alert_id')
+    summary = await AlertService.asummary(alerts)
+
+    alert_type = request.GET.get('type')
+    if alert_type:
+        alerts = alerts.filter(alert_type=alert_type)
+    severity = request.GET.get('severity')
+    if severity:
+        alerts = alerts.filter(severity=severity)
+
+    return JsonResponse({
+        'summary': summary,
+        'alerts': [AlertService.to_dict(alert, today) async for alert in alerts],
+    })
+
+
+# --- Product lookup ---
+_product_detail = ProductViewSet.as_view({
+    'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+})
+
+
+@async_read_view
+async def _product_lookup(request, product_id):
+    # Same queryset as ProductViewSet.get_queryset, with the serializer's relations loaded up front
+    products = Product.objects.select_related('category', 'subcategory').prefetch_related('suppliers')
+    if request.GET.get('show_archived') == 'true':
+        products = products.filter(status='Archived')
+    else:
+        products = products.exclude(status='Archived')
+
+    try:
+        product = await products.aget(product_id=product_id)
+    except Product.DoesNotExist:
+        return _error('No Product matches the given query.', 404)
+    return JsonResponse(ProductSerializer(product).data)
+
+
+@replica_reads
+@csrf_exempt  # writes go to ProductViewSet, which checks CSRF like every DRF view
+async def product_detail(request, product_id):
+    """/api/products/<id>/: lookups served async, writes by ProductViewSet"""
+    if request.method in READ_METHODS:
+        return await _product_lookup(request, product_id)
+    return await sync_to_async(_product_detail)(request, product_id=product_id)
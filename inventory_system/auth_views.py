@@ -1,3 +1,5 @@
+import logging
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.permissions import AllowAny
@@ -7,7 +9,9 @@ from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from .models import OTP
-from .services.gmail_service import gmail_service
+from .services.mail_queue_service import MailQueueService
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
@@ -63,20 +67,8 @@ def login_api(request):
             otp=otp_code
         )
         
-        # Send OTP via Gmail
-        try:
-            gmail_service.send_otp_email(
-                user_email=user.email,
-                username=user.username,
-                otp_code=otp_code
-            )
-        except Exception as e:
-            # Delete the OTP record if email fails
-            otp_record.delete()
-            return Response(
-                {'error': f'Failed to send OTP email: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        # Queue the OTP email (sent off the request path, see MailQueueService)
+        MailQueueService.enqueue_otp(user, otp_record)
         
         return Response({
             'message': 'OTP sent to your email',
@@ -211,19 +203,8 @@ def resend_otp(request):
         otp=otp_code
     )
     
-    # Send OTP via Gmail
-    try:
-        gmail_service.send_otp_email(
-            user_email=user.email,
-            username=user.username,
-            otp_code=otp_code
-        )
-    except Exception as e:
-        otp_record.delete()
-        return Response(
-            {'error': f'Failed to send OTP email: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    # Queue the OTP email (sent off the request path, see MailQueueService)
+    MailQueueService.enqueue_otp(user, otp_record)
     
     return Response({
         'message': 'New OTP sent to your email',
@@ -385,20 +366,8 @@ def request_password_reset(request):
             otp=otp_code
         )
         
-        # Send OTP via Gmail
-        try:
-            gmail_service.send_otp_email(
-                user_email=user.email,
-                username=user.username,
-                otp_code=otp_code,
-                is_password_reset=True
-            )
-        except Exception as e:
-            otp_record.delete()
-            return Response(
-                {'error': f'Failed to send OTP email: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        # Queue the OTP email (sent off the request path, see MailQueueService)
+        MailQueueService.enqueue_otp(user, otp_record, is_password_reset=True)
         
         return Response({
             'message': 'Password reset OTP sent to your email',
@@ -546,15 +515,8 @@ def reset_password(request):
     otp_record.is_used = True
     otp_record.save()
     
-    # Send confirmation email
-    try:
-        gmail_service.send_password_reset_success_email(
-            user_email=user.email,
-            username=user.username
-        )
-    except Exception as e:
-        # Log error but don't fail the password reset
-        print(f"Failed to send password reset confirmation email: {str(e)}")
+    # Queue the confirmation email
+    MailQueueService.enqueue_password_reset_success(user)
     
     return Response({
         'message': 'Password reset successfully'
@@ -605,20 +567,8 @@ def resend_reset_otp(request):
         otp=otp_code
     )
     
-    # Send OTP via Gmail
-    try:
-        gmail_service.send_otp_email(
-            user_email=user.email,
-            username=user.username,
-            otp_code=otp_code,
-            is_password_reset=True
-        )
-    except Exception as e:
-        otp_record.delete()
-        return Response(
-            {'error': f'Failed to send OTP email: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    # Queue the OTP email (sent off the request path, see MailQueueService)
+    MailQueueService.enqueue_otp(user, otp_record, is_password_reset=True)
     
     return Response({
         'message': 'New password reset OTP sent to your email',
@@ -0,0 +1,86 @@
+"""
+Read replica routing for inventory_system
+
+Writes always go to 'default'. Reads go to the REPLICA_DATABASE alias only
+inside a request that ReplicaRoutingMiddleware marked as replica-safe: the
+list/retrieve actions of viewsets and function views decorated with
+@replica_reads (dashboard, exports), for GET/HEAD requests. A client that
+just wrote (any POST/PUT/PATCH/DELETE) gets a short-lived cookie and reads
+from 'default' for REPLICA_STICKY_SECONDS, so it always sees its own changes
+whichever worker process serves the next request. Without a replica alias in
+DATABASES everything stays on 'default'.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_read_alias = contextvars.ContextVar('inventory_read_alias', default=None)
+
+
+def replica_alias():
+    """The configured replica alias, or None when there is none"""
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def read_alias():
+    """Alias the current request reads from (None: the default database)"""
+    return _read_alias.get()
+
+
+def set_read_alias(alias):
+    """Route reads to alias (None for 'default'); returns a token for reset_read_alias"""
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token):
+    _read_alias.reset(token)
+
+
+@contextmanager
+def reads_from(alias):
+    """Route reads to alias (None for 'default') inside the block"""
+    token = set_read_alias(alias)
+    try:
+        yield
+    finally:
+        reset_read_alias(token)
+
+
+def replica_reads(view):
+    """Mark a function view as safe to serve from the replica"""
+    view.replica_reads = True
+    return view
+
+
+STICKY_COOKIE = 'replica_sticky'
+
+
+def mark_write(response):
+    """Keep the client of response on the default database for REPLICA_STICKY_SECONDS"""
+    response.set_cookie(
+        STICKY_COOKIE, '1', max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 10),
+        secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+    )
+
+
+def recently_wrote(request):
+    return STICKY_COOKIE in request.COOKIES
+
+
+class ReplicaRouter:
+    """Send reads to the alias chosen for the current request; the replica is never migrated"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != replica_alias()
@@ -0,0 +1,128 @@
+"""
+Logging helpers for inventory_system
+
+Modules log through named loggers (logging.getLogger(__name__)) with lazy
+%-style arguments. What reaches the console is gated by INVENTORY_LOG_LEVEL
+(see LOGGING in settings); a single request can be traced at DEBUG without
+changing that level by sending the `X-Debug-Log: 1` header as a staff user
+(see RequestDebugLogMiddleware).
+"""
+import contextvars
+import logging
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+_request_debug = contextvars.ContextVar('inventory_request_debug', default=False)
+
+
+class RequestLevelFilter(logging.Filter):
+    """Pass records at or above `level`, or every record while a debug request is running"""
+
+    def __init__(self, level='INFO'):
+        super().__init__()
+        self.level = level if isinstance(level, int) else logging.getLevelName(level.upper())
+
+    def filter(self, record):
+        return record.levelno >= self.level or _request_debug.get()
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Append the timing fields of timed_operation records as key=value pairs"""
+
+    FIELDS = ('operation', 'elapsed_ms', 'queries')
+
+    def format(self, record):
+        message = super().format(record)
+        pairs = [f'{field}={getattr(record, field)}' for field in self.FIELDS if hasattr(record, field)]
+        return f"{message} {' '.join(pairs)}" if pairs else message
+
+
+@contextmanager
+def debug_request():
+    """Let every inventory_system log record through for the duration of the block"""
+    token = _request_debug.set(True)
+    try:
+        yield
+    finally:
+        _request_debug.reset(token)
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _log_timing(logger, level, operation, started, counter):
+    logger.log(level, '%s finished', operation, extra={
+        'operation': operation,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'queries': counter.count,
+    })
+
+
+@contextmanager
+def timed_operation(logger, operation, level=logging.INFO):
+    """
+    Log `operation` with elapsed_ms and the number of queries issued once the block exits
+
+    Usage:
+        with timed_operation(logger, 'bulk_receive'):
+            ...
+    """
+    counter = _QueryCounter()
+    started = time.perf_counter()
+    try:
+        with execute_wrapper_all(counter):
+            yield
+    finally:
+        _log_timing(logger, level, operation, started, counter)
+
+
+@contextmanager
+def _execute_wrappers(databases, wrapper):
+    with ExitStack() as stack:
+        for database in databases:
+            stack.enter_context(database.execute_wrapper(wrapper))
+        yield
+
+
+def execute_wrapper_all(wrapper):
+    """
+    connection.execute_wrapper() on the connection of every alias, so queries
+    routed to the read replica (db_router) are seen as well
+    """
+    return _execute_wrappers(connections.all(), wrapper)
+
+
+@asynccontextmanager
+async def aexecute_wrapper(wrapper):
+    """
+    execute_wrapper_all() for async code (ASGI requests)
+
+    The ORM runs a request's queries in its sync_to_async thread, on that
+    thread's connections, so the wrapper is installed there rather than on the
+    event loop thread's connections.
+    """
+    # Connections are resolved per thread, so they must be looked up in the worker thread
+    databases = await sync_to_async(connections.all)()
+    with _execute_wrappers(databases, wrapper):
+        yield
+
+
+@asynccontextmanager
+async def atimed_operation(logger, operation, level=logging.INFO):
+    """timed_operation() for async code"""
+    counter = _QueryCounter()
+    started = time.perf_counter()
+    try:
+        async with aexecute_wrapper(counter):
+            yield
+    finally:
+        _log_timing(logger, level, operation, started, counter)
@@ -0,0 +1,68 @@
+"""
+Management command to archive old years of the transaction ledger.
+Usage: python manage.py archive_transactions [--keep-years 2 | --year 2023] [--output-dir DIR] [--drop] [--dry-run]
+
+The ledger is partitioned by year on PostgreSQL (migration 0029). Each yearly
+partition older than the kept years is exported to
+<output-dir>/transaction_y<year>.csv.gz (gzipped CSV with a header row) and
+then detached from the transaction table; if the export fails the partition
+stays attached and the command can simply be run again.
+Detached tables are kept so they can be attached again; pass --drop to remove
+them once the export is stored safely.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from inventory_system.services.partition_service import TransactionPartitionService
+
+
+class Command(BaseCommand):
+    help = 'Export and detach yearly transaction partitions older than the kept years (PostgreSQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-years', type=int, default=2,
+            help='Years to keep attached, including the current one (default: 2)',
+        )
+        parser.add_argument('--year', type=int, help='Archive only this year')
+        parser.add_argument(
+            '--output-dir',
+            default=str(Path(settings.BASE_DIR) / 'archives' / 'transactions'),
+            help='Where to write the CSV exports',
+        )
+        parser.add_argument('--drop', action='store_true', help='Drop the detached tables after exporting')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the partitions that would be archived')
+
+    def handle(self, *args, **options):
+        if not TransactionPartitionService.is_partitioned():
+            raise CommandError('The transaction table is not partitioned (PostgreSQL with migration 0029 required)')
+        if options['keep_years'] < 1:
+            raise CommandError('--keep-years must be at least 1')
+
+        partitions = TransactionPartitionService.partitions()
+        if options['year']:
+            years = [options['year']]
+        else:
+            cutoff = timezone.now().year - options['keep_years'] + 1
+            years = [year for year in partitions if year < cutoff]
+
+        if not years:
+            self.stdout.write(self.style.SUCCESS('✅ Nothing to archive'))
+            return
+
+        if options['dry_run']:
+            for year in years:
+                self.stdout.write(f'   Would archive {partitions.get(year, f"(no partition for {year})")}')
+            return
+
+        for year in years:
+            try:
+                path, rows = TransactionPartitionService.archive(year, options['output_dir'], drop=options['drop'])
+            except ValidationError as e:
+                raise CommandError(e.detail[0])
+            action = 'exported and dropped' if options['drop'] else 'exported and detached'
+            self.stdout.write(self.style.SUCCESS(f'✅ {year}: {rows:,} transaction(s) {action} to {path}'))
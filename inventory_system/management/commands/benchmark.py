@@ -0,0 +1,245 @@
+"""
+Management command to benchmark the hot API endpoints on a synthetic catalog.
+Usage: python manage.py benchmark [--size 1k|10k|100k] [--iterations 20] [--keepdb] [--compare results.json]
+
+A separate database (the test database name with a _bench_<size> suffix) is
+created, seeded with SeedService.seed_catalog and dropped afterwards, so the
+real data is never touched; --keepdb keeps the seeded database for the next run.
+Only 'default' is switched to it, so replica routing is turned off while the
+benchmarks run: every read goes to the seeded database.
+
+Every endpoint is requested in-process through the full middleware stack.
+p50/p95/max latency and query counts are printed and written to
+benchmarks/results/<timestamp>_<commit>_<size>.json; pass an earlier file with
+--compare to see the change per endpoint.
+"""
+import json
+import logging
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from inventory_system.logging_utils import execute_wrapper_all
+from inventory_system.models import OrderItem, Product, ProductBatch
+from inventory_system.services.dashboard_service import DashboardService
+from inventory_system.services.metrics_service import RequestMetricsService
+from inventory_system.services.seed_service import SeedService
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic catalog in a scratch database and benchmark the hot API endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=list(SeedService.SIZES), default='1k', help='Catalog size (default: 1k)')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint (default: 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint (default: 2)')
+        parser.add_argument('--only', help='Comma-separated benchmark names to run')
+        parser.add_argument('--keepdb', action='store_true', help='Keep (and reuse) the seeded database')
+        parser.add_argument(
+            '--output-dir',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'results'),
+            help='Where to write the results JSON',
+        )
+        parser.add_argument('--compare', help='Earlier results JSON to compare against')
+
+    def handle(self, *args, **options):
+        size = options['size']
+        benchmarks = self.benchmarks()
+        if options['only']:
+            names = options['only'].split(',')
+            unknown = [name for name in names if name not in benchmarks]
+            if unknown:
+                raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}. Choose from: {', '.join(benchmarks)}")
+            benchmarks = {name: benchmarks[name] for name in names}
+
+        # Keep log output from distorting the timings
+        app_logger = logging.getLogger('inventory_system')
+        log_level = app_logger.level
+        app_logger.setLevel(logging.WARNING)
+
+        old_name = connection.settings_dict['NAME']
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = (
+            f'{old_name}_bench_{size}' if connection.vendor == 'sqlite' else f'test_{old_name}_bench_{size}'
+        )
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'], serialize=False)
+
+        try:
+            catalog = self.seed(size)
+            # The replica alias still points at the real replica
+            with override_settings(REPLICA_DATABASE=None):
+                results = self.run(benchmarks, options['iterations'], options['warmup'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            app_logger.setLevel(log_level)
+
+        self.report(results)
+        path = self.save(results, catalog, size, options)
+        self.stdout.write(self.style.SUCCESS(f'✅ Results written to {path}'))
+
+        if options['compare']:
+            self.compare(results, options['compare'])
+
+    def seed(self, size):
+        existing = Product.objects.count()
+        if existing:
+            self.stdout.write(f'   Reusing seeded database ({existing:,} products)')
+            return {'products': existing, 'batches': ProductBatch.objects.count()}
+
+        self.stdout.write(f'   Seeding {size} catalog...')
+        started = time.perf_counter()
+        counts = SeedService.seed_catalog(
+            SeedService.SIZES[size],
+            progress=lambda done, total: self.stdout.write(f'   {done:,}/{total:,} products', ending='\r'),
+        )
+        self.stdout.write(f'\n   Seeded in {time.perf_counter() - started:.1f} s: '
+                          + ', '.join(f'{count:,} {table}' for table, count in counts.items() if count))
+        return counts
+
+    def benchmarks(self):
+        """name -> callable(client, iteration) issuing one request"""
+        def invalidate_then_get(path, widget):
+            def request(client, iteration):
+                DashboardService.invalidate(widget)
+                return client.get(path)
+            return request
+
+        return {
+            'product-stocks-list': lambda client, i: client.get('/api/product-stocks/', {'page_size': 50}),
+            'product-batches-list': lambda client, i: client.get('/api/product-batches/', {'page_size': 50}),
+            'transactions-list': lambda client, i: client.get('/api/transactions/', {'page_size': 50}),
+            'alerts': lambda client, i: client.get('/api/alerts/'),
+            'dashboard-categories': invalidate_then_get('/api/dashboard/categories/', DashboardService.CATEGORIES),
+            'dashboard-top-suppliers': invalidate_then_get('/api/dashboard/top-suppliers/', DashboardService.TOP_SUPPLIERS),
+            'dashboard-stock-status': invalidate_then_get('/api/dashboard/stock-status/', DashboardService.STOCK_STATUS),
+            'dashboard-stats': invalidate_then_get('/api/dashboard/stats/', DashboardService.STATS),
+            'bulk-receive': self.bulk_receive,
+            'batch-adjustment': self.batch_adjustment,
+        }
+
+    def bulk_receive(self, client, iteration):
+        if not hasattr(self, '_receive_items'):
+            self._receive_items = list(
+                OrderItem.objects.filter(order__status__in=['Pending', 'Partially Received'])
+                .values_list('order_id', 'order_item_id')[:10]
+            )
+        items = [
+            {'order': order_id, 'order_item': order_item_id, 'quantity_received': 1, 'received_by': 'Benchmark'}
+            for order_id, order_item_id in self._receive_items
+        ]
+        return client.post('/api/receive-orders/bulk_receive/', json.dumps({'items': items}), content_type='application/json')
+
+    def batch_adjustment(self, client, iteration):
+        if not hasattr(self, '_batches'):
+            self._batches = list(ProductBatch.objects.filter(on_hand__gt=0).values_list('batch_id', 'on_hand')[:50])
+        batch_id, on_hand = self._batches[iteration % len(self._batches)]
+        return client.patch(
+            f'/api/product-batches/{batch_id}/',
+            json.dumps({'on_hand': on_hand + iteration % 2, 'transaction_performed_by': 'Benchmark'}),
+            content_type='application/json',
+        )
+
+    def run(self, benchmarks, iterations, warmup):
+        user, _ = User.objects.get_or_create(username='benchmark', defaults={'is_staff': True, 'is_superuser': True})
+        host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost'
+        client = Client(HTTP_HOST='localhost' if host == '*' else host)
+        client.force_login(user)
+
+        results = {}
+        for name, request in benchmarks.items():
+            for i in range(warmup):
+                request(client, i)
+
+            latencies, queries, db_ms = [], [], []
+            for i in range(iterations):
+                timer = RequestMetricsService.query_timer()
+                started = time.perf_counter()
+                with execute_wrapper_all(timer):
+                    response = request(client, warmup + i)
+                latencies.append((time.perf_counter() - started) * 1000)
+                queries.append(timer.count)
+                db_ms.append(timer.db_ms)
+                if response.status_code >= 400:
+                    raise CommandError(f'{name}: HTTP {response.status_code} {response.content[:300]!r}')
+
+            results[name] = {
+                'p50_ms': round(percentile(latencies, 50), 2),
+                'p95_ms': round(percentile(latencies, 95), 2),
+                'max_ms': round(max(latencies), 2),
+                'db_p50_ms': round(percentile(db_ms, 50), 2),
+                'queries_p50': percentile(queries, 50),
+                'queries_max': max(queries),
+            }
+        return results
+
+    def report(self, results):
+        self.stdout.write(f"{'Benchmark':<26} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'DB ms':>8} {'Queries':>8}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<26} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['max_ms']:>9.1f} "
+                f"{result['db_p50_ms']:>8.1f} {result['queries_max']:>8}"
+            )
+
+    def save(self, results, catalog, size, options):
+        commit = self.git_commit()
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        created_at = datetime.now()
+        path = output_dir / f"{created_at:%Y%m%d-%H%M%S}_{commit}_{size}.json"
+        path.write_text(json.dumps({
+            'commit': commit,
+            'created_at': created_at.isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'size': size,
+            'catalog': catalog,
+            'iterations': options['iterations'],
+            'results': results,
+        }, indent=2))
+        return path
+
+    def compare(self, results, baseline_path):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {baseline_path}: {e}')
+
+        self.stdout.write(f"\nCompared with {baseline.get('commit')} ({baseline.get('size')}, {baseline.get('database')}):")
+        self.stdout.write(f"{'Benchmark':<26} {'p50':>16} {'p95':>16} {'Queries':>12}")
+        for name, result in results.items():
+            before = baseline.get('results', {}).get(name)
+            if not before:
+                continue
+            self.stdout.write(
+                f"{name:<26} {self.change(before['p50_ms'], result['p50_ms']):>16} "
+                f"{self.change(before['p95_ms'], result['p95_ms']):>16} "
+                f"{before['queries_max']:>5} -> {result['queries_max']:<4}"
+            )
+
+    @staticmethod
+    def change(before, after):
+        if not before:
+            return f'{after:.1f}'
+        return f'{after:.1f} ({(after - before) / before:+.0%})'
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return 'unknown'
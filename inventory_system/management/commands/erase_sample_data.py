@@ -4,12 +4,28 @@ from inventory_system.models import (
     Order, OrderItem, ReceiveOrder, 
     ProductStocks, ProductBatch, Transaction, ArchiveLog
 )
+from inventory_system.services.reset_service import ResetService
 from django.db import transaction as db_transaction
 import sys
 
 class Command(BaseCommand):
     help = 'Erase all sample data from the database'
 
+    # stats key per model emptied by --truncate
+    TRUNCATE_STATS = {
+        Transaction: 'transactions_deleted',
+        ReceiveOrder: 'receive_orders_deleted',
+        OrderItem: 'order_items_deleted',
+        Order: 'orders_deleted',
+        ProductBatch: 'batches_deleted',
+        ProductStocks: 'stocks_deleted',
+        Supplier: 'suppliers_deleted',
+        Product: 'products_deleted',
+        Subcategory: 'subcategories_deleted',
+        Category: 'categories_deleted',
+        ArchiveLog: 'archive_logs_deleted',
+    }
+
     def __init__(self):
         super().__init__()
         self.stats = {
@@ -43,6 +59,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Enable verbose output with detailed logging',
         )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Empty the tables with TRUNCATE (bulk DELETE on SQLite) instead of per-object deletes; '
+                 'no signals fire and sequence counters restart',
+        )
 
     def log_verbose(self, message, verbose):
         """Log message only if verbose mode is enabled"""
@@ -99,6 +121,7 @@ class Command(BaseCommand):
         force = kwargs.get('force', False)
         keep_categories = kwargs.get('keep_categories', False)
         verbose = kwargs.get('verbose', False)
+        truncate = kwargs.get('truncate', False)
         
         self.stdout.write(self.style.SUCCESS('='*80))
         self.stdout.write(self.style.SUCCESS('ERASE SAMPLE DATA'))
@@ -106,6 +129,7 @@ class Command(BaseCommand):
         self.stdout.write(f'Force Mode: {"ON" if force else "OFF"}')
         self.stdout.write(f'Keep Categories: {"YES" if keep_categories else "NO"}')
         self.stdout.write(f'Verbose Mode: {"ON" if verbose else "OFF"}')
+        self.stdout.write(f'Truncate Mode: {"ON" if truncate else "OFF"}')
         self.stdout.write(self.style.SUCCESS('='*80))
         
         # Get confirmation
@@ -115,6 +139,10 @@ class Command(BaseCommand):
         
         self.stdout.write(self.style.SUCCESS('\n✓ Confirmation received. Starting deletion...\n'))
         
+        if truncate:
+            self.handle_truncate(keep_categories)
+            return
+        
         try:
             with db_transaction.atomic():
                 # Step 1: Delete Transactions
@@ -266,3 +294,24 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS('\n🎉 ALL SAMPLE DATA ERASED SUCCESSFULLY!'))
             self.stdout.write(self.style.SUCCESS('Database is now clean and ready for fresh data.'))
+
+    def handle_truncate(self, keep_categories):
+        """Empty every sample data table in one transaction via ResetService"""
+        models = ResetService.SAMPLE_DATA_MODELS
+        if keep_categories:
+            models = [model for model in models if model not in (Category, Subcategory)]
+
+        try:
+            counts = ResetService.truncate(models)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'\n❌ Critical error during truncate: {str(e)}'))
+            self.stdout.write(self.style.ERROR('Transaction rolled back. No data was deleted.'))
+            return
+
+        for model, count in counts.items():
+            if model in self.TRUNCATE_STATS:
+                self.stats[self.TRUNCATE_STATS[model]] = count
+
+        self.print_stats()
+        self.stdout.write(self.style.SUCCESS('\n🎉 ALL SAMPLE DATA ERASED SUCCESSFULLY!'))
+        self.stdout.write(self.style.SUCCESS('Database is now clean and ready for fresh data.'))
@@ -3,9 +3,436 @@ from inventory_system.models import Category, Subcategory, Product, Supplier, Su
 from django.utils import timezone
 from django.db import transaction as db_transaction
 from datetime import timedelta, date
+from inventory_system.services.inventory_service import InventoryService
+from inventory_system.services.receive_service import ReceiveService
+from inventory_system.services.seed_service import SeedService
+from inventory_system.services.sequence_service import SequenceService
+from inventory_system.signals import inventory_signals_disabled
 import random
+import time
 import traceback
 
+PHARMACY_DATA = {
+    'Medications': {
+        'description': 'Prescription and over-the-counter medications',
+        'subcategories': [
+            ('Antibiotics', 'Antimicrobial medications for bacterial infections'),
+            ('Pain Relief', 'Analgesics and pain management medications'),
+            ('Vitamins & Supplements', 'Dietary supplements and multivitamins'),
+            ('Cardiovascular', 'Heart and blood pressure medications'),
+            ('Respiratory', 'Asthma, allergy, and respiratory medications'),
+            ('Gastrointestinal', 'Digestive system medications'),
+            ('Diabetes Care', 'Insulin and diabetes management medications'),
+            ('Antifungal', 'Medications for fungal infections'),
+        ]
+    },
+    'Medical Supplies': {
+        'description': 'Medical equipment and supplies',
+        'subcategories': [
+            ('Bandages & Dressings', 'Wound care and bandaging materials'),
+            ('Syringes & Needles', 'Injection equipment and supplies'),
+            ('Surgical Instruments', 'Medical and surgical tools'),
+            ('Diagnostic Equipment', 'Blood pressure monitors, thermometers, etc.'),
+            ('First Aid', 'First aid kits and emergency supplies'),
+            ('Gloves & Masks', 'Protective equipment and disposables'),
+        ]
+    },
+    'Personal Care': {
+        'description': 'Personal hygiene and wellness products',
+        'subcategories': [
+            ('Skin Care', 'Lotions, creams, and skin treatments'),
+            ('Oral Care', 'Toothpaste, mouthwash, and dental products'),
+            ('Hair Care', 'Shampoos, conditioners, and hair treatments'),
+            ('Hygiene Products', 'Soaps, sanitizers, and cleaning products'),
+            ('Baby Care', 'Baby formula, diapers, and infant care products'),
+        ]
+    },
+    'Laboratory Supplies': {
+        'description': 'Laboratory equipment and testing supplies',
+        'subcategories': [
+            ('Test Kits', 'Diagnostic and screening test kits'),
+            ('Lab Equipment', 'Laboratory instruments and tools'),
+            ('Reagents', 'Chemical reagents and testing solutions'),
+            ('Specimen Collection', 'Sample collection and storage supplies'),
+        ]
+    },
+    'Wellness & Nutrition': {
+        'description': 'Health and wellness products',
+        'subcategories': [
+            ('Herbal Supplements', 'Natural and herbal remedies'),
+            ('Protein & Nutrition', 'Protein powders and nutritional supplements'),
+            ('Weight Management', 'Diet and weight loss products'),
+            ('Sports Nutrition', 'Sports supplements and energy products'),
+        ]
+    },
+}
+
+PRODUCTS_DATA = [
+    # Medications - Antibiotics
+    {'brand': 'Amoxil', 'generic': 'Amoxicillin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 15.50, 'unit': 'Capsule'},
+    {'brand': 'Zithromax', 'generic': 'Azithromycin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 25.00, 'unit': 'Tablet'},
+    {'brand': 'Cipro', 'generic': 'Ciprofloxacin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 18.75, 'unit': 'Tablet'},
+
+    # Medications - Pain Relief
+    {'brand': 'Tylenol', 'generic': 'Paracetamol 500mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 8.50, 'unit': 'Tablet'},
+    {'brand': 'Advil', 'generic': 'Ibuprofen 400mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 12.00, 'unit': 'Tablet'},
+    {'brand': 'Aleve', 'generic': 'Naproxen Sodium 220mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 14.25, 'unit': 'Tablet'},
+
+    # Medications - Vitamins & Supplements
+    {'brand': 'Centrum', 'generic': 'Multivitamin', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 22.50, 'unit': 'Tablet'},
+    {'brand': 'Nature Made', 'generic': 'Vitamin C 1000mg', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 16.00, 'unit': 'Tablet'},
+    {'brand': 'Calcium Plus', 'generic': 'Calcium + Vitamin D', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 18.00, 'unit': 'Tablet'},
+
+    # Medications - Cardiovascular
+    {'brand': 'Norvasc', 'generic': 'Amlodipine 5mg', 'category': 'Medications', 'subcategory': 'Cardiovascular', 'price': 30.00, 'unit': 'Tablet'},
+    {'brand': 'Losartan', 'generic': 'Losartan Potassium 50mg', 'category': 'Medications', 'subcategory': 'Cardiovascular', 'price': 28.50, 'unit': 'Tablet'},
+
+    # Medications - Respiratory
+    {'brand': 'Ventolin', 'generic': 'Salbutamol Inhaler', 'category': 'Medications', 'subcategory': 'Respiratory', 'price': 45.00, 'unit': 'Inhaler'},
+    {'brand': 'Claritin', 'generic': 'Loratadine 10mg', 'category': 'Medications', 'subcategory': 'Respiratory', 'price': 16.50, 'unit': 'Tablet'},
+
+    # Medications - Gastrointestinal
+    {'brand': 'Omeprazole', 'generic': 'Omeprazole 20mg', 'category': 'Medications', 'subcategory': 'Gastrointestinal', 'price': 20.00, 'unit': 'Capsule'},
+    {'brand': 'Imodium', 'generic': 'Loperamide 2mg', 'category': 'Medications', 'subcategory': 'Gastrointestinal', 'price': 12.50, 'unit': 'Capsule'},
+
+    # Medications - Diabetes Care
+    {'brand': 'Glucophage', 'generic': 'Metformin 500mg', 'category': 'Medications', 'subcategory': 'Diabetes Care', 'price': 25.00, 'unit': 'Tablet'},
+    {'brand': 'Lantus', 'generic': 'Insulin Glargine', 'category': 'Medications', 'subcategory': 'Diabetes Care', 'price': 85.00, 'unit': 'Vial'},
+
+    # Medical Supplies - Bandages & Dressings
+    {'brand': 'Band-Aid', 'generic': 'Adhesive Bandages', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 5.50, 'unit': 'Box'},
+    {'brand': 'Medipore', 'generic': 'Gauze Pad 4x4', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 8.00, 'unit': 'Pack'},
+    {'brand': 'Tegaderm', 'generic': 'Transparent Dressing', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 12.00, 'unit': 'Piece'},
+
+    # Medical Supplies - Syringes & Needles
+    {'brand': 'BD', 'generic': 'Syringe 3ml with Needle', 'category': 'Medical Supplies', 'subcategory': 'Syringes & Needles', 'price': 0.85, 'unit': 'Piece'},
+    {'brand': 'Terumo', 'generic': 'Insulin Syringe 1ml', 'category': 'Medical Supplies', 'subcategory': 'Syringes & Needles', 'price': 0.95, 'unit': 'Piece'},
+
+    # Medical Supplies - Diagnostic Equipment
+    {'brand': 'Omron', 'generic': 'Blood Pressure Monitor', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 450.00, 'unit': 'Unit'},
+    {'brand': 'Accu-Chek', 'generic': 'Glucometer', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 350.00, 'unit': 'Unit'},
+    {'brand': 'Digital', 'generic': 'Thermometer', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 85.00, 'unit': 'Unit'},
+
+    # Medical Supplies - Gloves & Masks
+    {'brand': 'Nitrile Pro', 'generic': 'Nitrile Gloves Medium', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 25.00, 'unit': 'Box'},
+    {'brand': 'N95 Premium', 'generic': 'N95 Face Mask', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 3.50, 'unit': 'Piece'},
+    {'brand': 'Surgical Plus', 'generic': 'Surgical Face Mask', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 0.75, 'unit': 'Piece'},
+
+    # Personal Care - Skin Care
+    {'brand': 'Cetaphil', 'generic': 'Gentle Skin Cleanser', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 35.00, 'unit': 'Bottle'},
+    {'brand': 'Neutrogena', 'generic': 'Hydrating Lotion', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 28.50, 'unit': 'Bottle'},
+    {'brand': 'Aveeno', 'generic': 'Daily Moisturizer', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 32.00, 'unit': 'Tube'},
+
+    # Personal Care - Oral Care
+    {'brand': 'Colgate', 'generic': 'Total Toothpaste', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 6.50, 'unit': 'Tube'},
+    {'brand': 'Listerine', 'generic': 'Antiseptic Mouthwash', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 12.00, 'unit': 'Bottle'},
+    {'brand': 'Oral-B', 'generic': 'Soft Bristle Toothbrush', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 4.50, 'unit': 'Piece'},
+
+    # Personal Care - Baby Care
+    {'brand': 'Similac', 'generic': 'Infant Formula', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 65.00, 'unit': 'Can'},
+    {'brand': 'Pampers', 'generic': 'Baby Diapers Medium', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 42.00, 'unit': 'Pack'},
+    {'brand': 'Johnson\'s', 'generic': 'Baby Powder', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 8.50, 'unit': 'Bottle'},
+
+    # Laboratory Supplies - Test Kits
+    {'brand': 'QuickTest', 'generic': 'COVID-19 Rapid Test Kit', 'category': 'Laboratory Supplies', 'subcategory': 'Test Kits', 'price': 25.00, 'unit': 'Kit'},
+    {'brand': 'PregnaSure', 'generic': 'Pregnancy Test Kit', 'category': 'Laboratory Supplies', 'subcategory': 'Test Kits', 'price': 8.00, 'unit': 'Kit'},
+
+    # Wellness & Nutrition - Herbal Supplements
+    {'brand': 'Ginkgo Plus', 'generic': 'Ginkgo Biloba Extract', 'category': 'Wellness & Nutrition', 'subcategory': 'Herbal Supplements', 'price': 28.00, 'unit': 'Bottle'},
+    {'brand': 'Omega-3', 'generic': 'Fish Oil 1000mg', 'category': 'Wellness & Nutrition', 'subcategory': 'Herbal Supplements', 'price': 32.50, 'unit': 'Bottle'},
+
+    # Wellness & Nutrition - Protein & Nutrition
+    {'brand': 'Whey Pro', 'generic': 'Whey Protein Powder', 'category': 'Wellness & Nutrition', 'subcategory': 'Protein & Nutrition', 'price': 125.00, 'unit': 'Tub'},
+    {'brand': 'Ensure', 'generic': 'Nutritional Shake', 'category': 'Wellness & Nutrition', 'subcategory': 'Protein & Nutrition', 'price': 55.00, 'unit': 'Can'},
+]
+
+SUPPLIERS_DATA = [
+    {
+        'name': 'PharmaCare Distributors Inc.',
+        'contact_person': 'John Martinez',
+        'email': 'jmartinez@pharmacare.com',
+        'phone': '+1-555-0101',
+        'address': '123 Medical Plaza, Healthcare District, Metro Manila',
+    },
+    {
+        'name': 'MediSupply Solutions',
+        'contact_person': 'Sarah Chen',
+        'email': 'schen@medisupply.com',
+        'phone': '+1-555-0102',
+        'address': '456 Pharmacy Street, Business Park, Quezon City',
+    },
+    {
+        'name': 'Global Health Products Corp.',
+        'contact_person': 'Michael Rodriguez',
+        'email': 'mrodriguez@globalhealthprod.com',
+        'phone': '+1-555-0103',
+        'address': '789 Wellness Avenue, Medical Center, Makati City',
+    },
+    {
+        'name': 'Vital Med Supplies',
+        'contact_person': 'Emily Tan',
+        'email': 'etan@vitalmed.com',
+        'phone': '+1-555-0104',
+        'address': '321 Healthcare Road, Industrial Zone, Pasig City',
+    },
+    {
+        'name': 'Prime Pharma Wholesale',
+        'contact_person': 'David Wong',
+        'email': 'dwong@primepharma.com',
+        'phone': '+1-555-0105',
+        'address': '654 Drug Lane, Commerce Hub, Mandaluyong City',
+    },
+    {
+        'name': 'HealthFirst Trading Co.',
+        'contact_person': 'Lisa Garcia',
+        'email': 'lgarcia@healthfirst.com',
+        'phone': '+1-555-0106',
+        'address': '987 Medical Supply Drive, Export Processing Zone, Cavite',
+    },
+    {
+        'name': 'MedEquip International',
+        'contact_person': 'Robert Kim',
+        'email': 'rkim@medequip.com',
+        'phone': '+1-555-0107',
+        'address': '147 Equipment Boulevard, Tech Park, Taguig City',
+    },
+    {
+        'name': 'Wellness Distributors Ltd.',
+        'contact_person': 'Jennifer Santos',
+        'email': 'jsantos@wellnessdist.com',
+        'phone': '+1-555-0108',
+        'address': '258 Nutrition Street, Health District, Pasay City',
+    },
+]
+
+SUPPLIER_PRODUCT_MAPPINGS = {
+    'PharmaCare Distributors Inc.': [
+        # Antibiotics specialist + some pain relief
+        'Amoxil', 'Zithromax', 'Cipro', 'Tylenol', 'Advil', 'Aleve'
+    ],
+    'MediSupply Solutions': [
+        # Pain relief + vitamins + some antibiotics
+        'Tylenol', 'Advil', 'Centrum', 'Nature Made', 'Calcium Plus', 'Amoxil'
+    ],
+    'Global Health Products Corp.': [
+        # Vitamins, supplements, wellness
+        'Centrum', 'Nature Made', 'Calcium Plus', 'Ginkgo Plus', 'Omega-3', 
+        'Whey Pro', 'Ensure'
+    ],
+    'Vital Med Supplies': [
+        # Cardiovascular + respiratory + diabetes
+        'Norvasc', 'Losartan', 'Ventolin', 'Claritin', 'Glucophage', 'Lantus'
+    ],
+    'Prime Pharma Wholesale': [
+        # Respiratory + GI + some cardiovascular
+        'Ventolin', 'Claritin', 'Omeprazole', 'Imodium', 'Norvasc', 'Losartan'
+    ],
+    'HealthFirst Trading Co.': [
+        # Medical supplies + diagnostic equipment
+        'Band-Aid', 'Medipore', 'Tegaderm', 'BD', 'Terumo', 
+        'Omron', 'Accu-Chek', 'Digital', 'Nitrile Pro', 'N95 Premium', 'Surgical Plus'
+    ],
+    'MedEquip International': [
+        # Diagnostic equipment + syringes + test kits
+        'Omron', 'Accu-Chek', 'Digital', 'BD', 'Terumo',
+        'QuickTest', 'PregnaSure'
+    ],
+    'Wellness Distributors Ltd.': [
+        # Personal care + baby care + wellness
+        'Cetaphil', 'Neutrogena', 'Aveeno', 'Colgate', 'Listerine', 'Oral-B',
+        'Similac', 'Pampers', "Johnson's", 'Whey Pro', 'Ensure'
+    ],
+}
+
+STOCK_CONFIGS = {
+    # HIGH STOCK - Normal items (thousands in stock)
+    'Amoxil': [(2500, 365), (1800, 180), (1200, 90)],  # 5,500 total - multiple batches
+    'Tylenol': [(5000, 545), (3000, 365), (2000, 180)],  # 10,000 total - very popular
+    'Advil': [(4000, 365), (2500, 270), (1500, 120)],  # 8,000 total
+    'Centrum': [(3000, 730), (2000, 545), (1500, 365)],  # 6,500 total - long shelf life
+    'Nature Made': [(2500, 545), (1800, 365)],  # 4,300 total
+    'Calcium Plus': [(2000, 545), (1500, 365)],  # 3,500 total
+    'Band-Aid': [(8000, 1095), (5000, 730)],  # 13,000 total - very long shelf life
+    'Nitrile Pro': [(10000, 1095), (6000, 730)],  # 16,000 total - bulk PPE
+    'Surgical Plus': [(15000, 730), (8000, 545)],  # 23,000 total - high volume PPE
+    'Colgate': [(4000, 545), (2500, 365)],  # 6,500 total
+
+    # MEDIUM STOCK - Normal items
+    'Zithromax': [(800, 270), (600, 180)],  # 1,400 total
+    'Cipro': [(700, 300), (500, 180)],  # 1,200 total
+    'Aleve': [(1200, 365), (800, 180)],  # 2,000 total
+    'Norvasc': [(600, 365), (400, 270)],  # 1,000 total
+    'Losartan': [(550, 300), (450, 200)],  # 1,000 total
+    'Claritin': [(900, 365), (600, 180)],  # 1,500 total
+    'Omeprazole': [(800, 270), (500, 150)],  # 1,300 total
+    'Glucophage': [(700, 300), (500, 200)],  # 1,200 total
+    'Medipore': [(2000, 730), (1500, 545)],  # 3,500 total
+    'Tegaderm': [(1500, 730), (1000, 545)],  # 2,500 total
+    'BD': [(5000, 1095), (3000, 730)],  # 8,000 total
+    'Terumo': [(4000, 1095), (2500, 730)],  # 6,500 total
+    'N95 Premium': [(3000, 730), (2000, 545)],  # 5,000 total
+    'Cetaphil': [(800, 545), (500, 365)],  # 1,300 total
+    'Neutrogena': [(700, 545), (400, 365)],  # 1,100 total
+    'Aveeno': [(600, 545), (400, 365)],  # 1,000 total
+    'Listerine': [(1000, 730), (600, 545)],  # 1,600 total
+    'Oral-B': [(2000, 1095), (1500, 730)],  # 3,500 total
+    'Ginkgo Plus': [(500, 545), (300, 365)],  # 800 total
+    'Omega-3': [(600, 545), (400, 365)],  # 1,000 total
+    # Note: 'Whey Pro' and 'Ensure' are handled as OUT OF STOCK below
+
+    # LOW STOCK - Items that need reordering (below threshold of 10)
+    'Ventolin': [(5, 180), (3, 90)],  # 8 total - LOW STOCK! Critical respiratory med
+    'Imodium': [(4, 150), (2, 60)],  # 6 total - LOW STOCK!
+    'Lantus': [(3, 120), (2, 60)],  # 5 total - LOW STOCK! Critical diabetes med
+    'Omron': [(2, 730)],  # 2 total - LOW STOCK! Expensive equipment
+    'Accu-Chek': [(3, 730)],  # 3 total - LOW STOCK! Expensive equipment
+    'Digital': [(4, 730), (2, 545)],  # 6 total - LOW STOCK!
+    'QuickTest': [(5, 90), (3, 45)],  # 8 total - LOW STOCK! High demand test kits
+
+    # NEAR EXPIRY - Items expiring within 30 days
+    'PregnaSure': [(150, 25), (80, 15)],  # 230 total but NEAR EXPIRY
+    'Similac': [(200, 20), (100, 10)],  # 300 total but NEAR EXPIRY - baby formula
+    "Johnson's": [(180, 28), (120, 18)],  # 300 total but NEAR EXPIRY
+
+    # EXPIRED STOCK - Items that have already expired (need disposal)
+    'Pampers': [(50, -5), (30, -15)],  # 80 total - ALL EXPIRED (need urgent disposal)
+}
+
+OUT_OF_STOCK_PRODUCTS = ['Whey Pro', 'Ensure']
+
+
+def sample_orders():
+    """Sample orders (dates relative to now): items with the receipts to record as (quantity, days ago)"""
+    return [
+        # Order 1: Completed order - Medications from PharmaCare
+        {
+            'ordered_by': 'Sarah Johnson, Head Pharmacist',
+            'date_ordered': timezone.now() - timedelta(days=15),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Amoxil', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 500, 'received': [(300, 14), (200, 13)]},
+                {'product_brand': 'Tylenol', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 1000, 'received': [(1000, 14)]},
+                {'product_brand': 'Advil', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 750, 'received': [(750, 14)]},
+            ]
+        },
+        # Order 2: Partially received - Medical supplies from HealthFirst
+        {
+            'ordered_by': 'Michael Chen, Inventory Manager',
+            'date_ordered': timezone.now() - timedelta(days=10),
+            'status': 'Partially Received',
+            'items': [
+                {'product_brand': 'BD', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 2000, 'received': [(1000, 8)]},
+                {'product_brand': 'Band-Aid', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 500, 'received': [(300, 8)]},
+                {'product_brand': 'Nitrile Pro', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 200, 'received': [(100, 7)]},
+            ]
+        },
+        # Order 3: Pending order - Vitamins from Global Health
+        {
+            'ordered_by': 'Emily Rodriguez, Assistant Pharmacist',
+            'date_ordered': timezone.now() - timedelta(days=5),
+            'status': 'Pending',
+            'items': [
+                {'product_brand': 'Centrum', 'supplier_name': 'Global Health Products Corp.', 'quantity': 300, 'received': []},
+                {'product_brand': 'Nature Made', 'supplier_name': 'Global Health Products Corp.', 'quantity': 400, 'received': []},
+                {'product_brand': 'Omega-3', 'supplier_name': 'Global Health Products Corp.', 'quantity': 250, 'received': []},
+            ]
+        },
+        # Order 4: Completed - Cardiovascular meds from Vital Med
+        {
+            'ordered_by': 'Dr. Robert Kim',
+            'date_ordered': timezone.now() - timedelta(days=20),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Norvasc', 'supplier_name': 'Vital Med Supplies', 'quantity': 400, 'received': [(400, 19)]},
+                {'product_brand': 'Losartan', 'supplier_name': 'Vital Med Supplies', 'quantity': 350, 'received': [(350, 19)]},
+            ]
+        },
+        # Order 5: Partially received - Baby care from Wellness Distributors
+        {
+            'ordered_by': 'Jennifer Santos, Store Manager',
+            'date_ordered': timezone.now() - timedelta(days=7),
+            'status': 'Partially Received',
+            'items': [
+                {'product_brand': 'Similac', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 100, 'received': [(50, 6)]},
+                {'product_brand': 'Pampers', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 150, 'received': [(75, 6)]},
+                {'product_brand': 'Cetaphil', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 200, 'received': []},
+            ]
+        },
+        # Order 6: Completed - Diagnostic equipment from MedEquip
+        {
+            'ordered_by': 'Thomas Lee, Equipment Coordinator',
+            'date_ordered': timezone.now() - timedelta(days=25),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Omron', 'supplier_name': 'MedEquip International', 'quantity': 20, 'received': [(20, 24)]},
+                {'product_brand': 'Accu-Chek', 'supplier_name': 'MedEquip International', 'quantity': 15, 'received': [(15, 24)]},
+            ]
+        },
+        # Order 7: Pending - Test kits from MedEquip
+        {
+            'ordered_by': 'Dr. Maria Reyes',
+            'date_ordered': timezone.now() - timedelta(days=3),
+            'status': 'Pending',
+            'items': [
+                {'product_brand': 'QuickTest', 'supplier_name': 'MedEquip International', 'quantity': 500, 'received': []},
+                {'product_brand': 'PregnaSure', 'supplier_name': 'MedEquip International', 'quantity': 200, 'received': []},
+            ]
+        },
+        # Order 8: Completed - Respiratory meds from Prime Pharma (alternative supplier)
+        {
+            'ordered_by': 'Angela Cruz, Senior Pharmacist',
+            'date_ordered': timezone.now() - timedelta(days=18),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Ventolin', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 150, 'received': [(150, 17)]},
+                {'product_brand': 'Claritin', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 300, 'received': [(300, 17)]},
+            ]
+        },
+        # Order 9: Partially received - Mixed order from MediSupply (using alternative supplier)
+        {
+            'ordered_by': 'David Wong, Pharmacy Director',
+            'date_ordered': timezone.now() - timedelta(days=12),
+            'status': 'Partially Received',
+            'items': [
+                {'product_brand': 'Tylenol', 'supplier_name': 'MediSupply Solutions', 'quantity': 400, 'received': [(200, 11)]},
+                {'product_brand': 'Advil', 'supplier_name': 'MediSupply Solutions', 'quantity': 350, 'received': [(150, 11)]},
+                {'product_brand': 'Amoxil', 'supplier_name': 'MediSupply Solutions', 'quantity': 600, 'received': []},
+            ]
+        },
+        # Order 10: Completed - Wellness products from Global Health
+        {
+            'ordered_by': 'Christine Lim, Wellness Coordinator',
+            'date_ordered': timezone.now() - timedelta(days=22),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Whey Pro', 'supplier_name': 'Global Health Products Corp.', 'quantity': 50, 'received': [(50, 21)]},
+                {'product_brand': 'Ensure', 'supplier_name': 'Global Health Products Corp.', 'quantity': 100, 'received': [(100, 21)]},
+                {'product_brand': 'Ginkgo Plus', 'supplier_name': 'Global Health Products Corp.', 'quantity': 75, 'received': [(75, 21)]},
+            ]
+        },
+        # Order 11: Pending - Vitamins from alternative supplier (MediSupply)
+        {
+            'ordered_by': 'Kevin Ng, Procurement Officer',
+            'date_ordered': timezone.now() - timedelta(days=2),
+            'status': 'Pending',
+            'items': [
+                {'product_brand': 'Centrum', 'supplier_name': 'MediSupply Solutions', 'quantity': 200, 'received': []},
+                {'product_brand': 'Nature Made', 'supplier_name': 'MediSupply Solutions', 'quantity': 300, 'received': []},
+            ]
+        },
+        # Order 12: Completed - Cardiovascular from alternative (Prime Pharma)
+        {
+            'ordered_by': 'Dr. Lisa Garcia',
+            'date_ordered': timezone.now() - timedelta(days=30),
+            'status': 'Received',
+            'items': [
+                {'product_brand': 'Norvasc', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 200, 'received': [(200, 29)]},
+                {'product_brand': 'Losartan', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 250, 'received': [(250, 29)]},
+            ]
+        },
+    ]
+
+
 class Command(BaseCommand):
     help = 'Insert sample pharmacy data into the database'
 
@@ -43,6 +470,20 @@ class Command(BaseCommand):
             action='store_true',
             help='Enable verbose output with detailed logging',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Fast path: build all rows in memory and bulk_create them with inventory signals '
+                 'disconnected, then recompute totals/statuses/alerts once',
+        )
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=0,
+            metavar='N',
+            help='With --bulk, also add N synthetic products with stocks, batches, transactions '
+                 'and orders (e.g. 100000 for a load-test database)',
+        )
 
     def log_verbose(self, message, verbose):
         """Log message only if verbose mode is enabled"""
@@ -74,10 +515,278 @@ class Command(BaseCommand):
         self.stdout.write(self.style.ERROR(f'Errors Encountered: {self.stats["errors"]}'))
         self.stdout.write(self.style.SUCCESS('='*80))
 
+    def handle_bulk(self, skip_orders, synthetic):
+        """
+        Same data as the row-by-row path, written table by table with bulk_create:
+        codes are reserved up front (SequenceService.next_codes), inventory signals
+        are disconnected and one set-based recompute runs at the end. Rows that
+        already exist (matched by name) are skipped, as in the default path.
+        """
+        started = time.perf_counter()
+        self.stdout.write(self.style.SUCCESS('PHARMACY INVENTORY SAMPLE DATA INSERTION (BULK)'))
+        self.stdout.write('-' * 80)
+        
+        with inventory_signals_disabled(), db_transaction.atomic():
+            categories, subcategories = self.bulk_categories()
+            products = self.bulk_products(categories, subcategories)
+            suppliers = self.bulk_suppliers()
+            self.bulk_supplier_products(suppliers, products)
+            self.bulk_stocks(products)
+            if not skip_orders:
+                self.bulk_orders(suppliers, products)
+            SeedService.recompute()
+        
+        self.stdout.write(self.style.SUCCESS(f'✅ Sample data inserted in {time.perf_counter() - started:.1f} s'))
+        
+        if synthetic:
+            started = time.perf_counter()
+            with inventory_signals_disabled():
+                counts = SeedService.seed_catalog(
+                    synthetic,
+                    progress=lambda done, total: self.stdout.write(f'   {done:,}/{total:,} synthetic products', ending='\r'),
+                )
+            self.stdout.write('')
+            for table, count in counts.items():
+                if count and f'{table}_created' in self.stats:
+                    self.stats[f'{table}_created'] += count
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {counts["products"]:,} synthetic products inserted in {time.perf_counter() - started:.1f} s'
+            ))
+        
+        self.print_stats()
+
+    def reserve_codes(self, model, field_name, objects, prefix_of):
+        """Assign codes to unsaved objects, one next_codes call for all their prefixes"""
+        by_prefix = {}
+        for obj in objects:
+            by_prefix.setdefault(prefix_of(obj), []).append(obj)
+        codes = SequenceService.next_codes(model, field_name, {prefix: len(objs) for prefix, objs in by_prefix.items()})
+        for prefix, objs in by_prefix.items():
+            for obj, code in zip(objs, codes[prefix]):
+                setattr(obj, field_name, code)
+
+    def bulk_categories(self):
+        categories = {c.category_name: c for c in Category.objects.filter(category_name__in=PHARMACY_DATA)}
+        new_categories = [
+            Category(category_name=name, category_description=info['description'], status='Active')
+            for name, info in PHARMACY_DATA.items() if name not in categories
+        ]
+        self.reserve_codes(Category, 'category_id', new_categories, lambda c: 'CAT-')
+        Category.objects.bulk_create(new_categories)
+        categories.update((c.category_name, c) for c in new_categories)
+        self.stats['categories_created'] += len(new_categories)
+        self.stats['categories_skipped'] += len(PHARMACY_DATA) - len(new_categories)
+        
+        names = [name for info in PHARMACY_DATA.values() for name, _ in info['subcategories']]
+        subcategories = {s.subcategory_name: s for s in Subcategory.objects.filter(subcategory_name__in=names)}
+        new_subcategories = [
+            Subcategory(subcategory_name=name, subcategory_description=description,
+                        category=categories[category_name], status='Active')
+            for category_name, info in PHARMACY_DATA.items()
+            for name, description in info['subcategories'] if name not in subcategories
+        ]
+        self.reserve_codes(Subcategory, 'subcategory_id', new_subcategories, lambda s: 'SC-')
+        Subcategory.objects.bulk_create(new_subcategories)
+        subcategories.update((s.subcategory_name, s) for s in new_subcategories)
+        self.stats['subcategories_created'] += len(new_subcategories)
+        self.stats['subcategories_skipped'] += len(names) - len(new_subcategories)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Categories: {len(new_categories)} created, subcategories: {len(new_subcategories)} created'
+        ))
+        return categories, subcategories
+
+    def bulk_products(self, categories, subcategories):
+        """Returns brand name -> Product (existing or new)"""
+        existing = {
+            (p.brand_name, p.generic_name): p
+            for p in Product.objects.filter(brand_name__in=[data['brand'] for data in PRODUCTS_DATA])
+        }
+        products = {}
+        new_products = []
+        for data in PRODUCTS_DATA:
+            product = existing.get((data['brand'], data['generic']))
+            if not product:
+                product = Product(
+                    brand_name=data['brand'],
+                    generic_name=data['generic'],
+                    product_name=f"{data['brand']} - {data['generic']}",
+                    category=categories[data['category']],
+                    subcategory=subcategories[data['subcategory']],
+                    price_per_unit=data['price'],
+                    unit_of_measurement=data['unit'],
+                    status='Active',
+                    expiry_threshold_days=30,
+                    low_stock_threshold=10,
+                )
+                new_products.append(product)
+            products.setdefault(data['brand'], product)
+        
+        self.reserve_codes(Product, 'product_id', new_products, lambda p: 'PRD-')
+        Product.objects.bulk_create(new_products)
+        self.stats['products_created'] += len(new_products)
+        self.stats['products_skipped'] += len(PRODUCTS_DATA) - len(new_products)
+        self.stdout.write(self.style.SUCCESS(f'✓ Products: {len(new_products)} created'))
+        return products
+
+    def bulk_suppliers(self):
+        """Returns supplier name -> Supplier (existing or new)"""
+        suppliers = {
+            s.supplier_name: s
+            for s in Supplier.objects.filter(supplier_name__in=[data['name'] for data in SUPPLIERS_DATA])
+        }
+        new_suppliers = [
+            Supplier(
+                supplier_name=data['name'],
+                contact_person=data['contact_person'],
+                email=data['email'],
+                phone_number=data['phone'],
+                address=data['address'],
+                status='Active',
+            )
+            for data in SUPPLIERS_DATA if data['name'] not in suppliers
+        ]
+        self.reserve_codes(Supplier, 'supplier_id', new_suppliers, lambda s: 'SUP-')
+        Supplier.objects.bulk_create(new_suppliers)
+        suppliers.update((s.supplier_name, s) for s in new_suppliers)
+        self.stats['suppliers_created'] += len(new_suppliers)
+        self.stats['suppliers_skipped'] += len(SUPPLIERS_DATA) - len(new_suppliers)
+        self.stdout.write(self.style.SUCCESS(f'✓ Suppliers: {len(new_suppliers)} created'))
+        return suppliers
+
+    def bulk_supplier_products(self, suppliers, products):
+        existing = set(SupplierProduct.objects.filter(
+            supplier__in=list(suppliers.values())
+        ).values_list('supplier_id', 'product_id'))
+        new_links = []
+        for supplier_name, brands in SUPPLIER_PRODUCT_MAPPINGS.items():
+            supplier = suppliers.get(supplier_name)
+            for brand in brands:
+                product = products.get(brand)
+                if not supplier or not product:
+                    continue
+                if (supplier.supplier_id, product.product_id) in existing:
+                    self.stats['supplier_products_skipped'] += 1
+                    continue
+                existing.add((supplier.supplier_id, product.product_id))
+                new_links.append(SupplierProduct(supplier=supplier, product=product))
+        
+        self.reserve_codes(SupplierProduct, 'supplier_product_id', new_links,
+                           lambda link: f"{link.supplier_id}-{link.product_id}-")
+        SupplierProduct.objects.bulk_create(new_links)
+        self.stats['supplier_products_created'] += len(new_links)
+        self.stdout.write(self.style.SUCCESS(f'✓ Supplier-Product links: {len(new_links)} created'))
+
+    def bulk_stocks(self, products):
+        today = date.today()
+        stocked = set(ProductStocks.objects.filter(
+            product__in=[p.product_id for p in products.values()]
+        ).values_list('product_id', flat=True))
+        
+        stocks = []
+        for product in products.values():
+            if product.status != 'Active':
+                continue
+            if product.product_id in stocked:
+                self.stats['stocks_skipped'] += 1
+                continue
+            stocks.append(ProductStocks(product=product))
+        self.reserve_codes(ProductStocks, 'stock_id', stocks, lambda stock: f"{stock.product_id}-STK-")
+        
+        batches = []
+        for stock in stocks:
+            product = stock.product
+            config = [] if product.brand_name in OUT_OF_STOCK_PRODUCTS else STOCK_CONFIGS.get(
+                product.brand_name, [(random.randint(500, 1500), random.randint(180, 365))]
+            )
+            for batch_qty, expiry_days in config:
+                expiry_date = today + timedelta(days=expiry_days)
+                batches.append(ProductBatch(
+                    product_stock=stock,
+                    on_hand=batch_qty,
+                    expiry_date=expiry_date,
+                    status=InventoryService.compute_batch_status(batch_qty, expiry_date, product, today),
+                ))
+        self.reserve_codes(ProductBatch, 'batch_id', batches, lambda batch: f"{batch.product_stock.product_id}-BAT-")
+        
+        stock_batches = {}
+        for batch in batches:
+            stock_batches.setdefault(batch.product_stock_id, []).append(batch)
+        for stock in stocks:
+            own = stock_batches.get(stock.stock_id, [])
+            stock.total_on_hand = sum(batch.on_hand for batch in own)
+            stock.status = InventoryService.compute_stock_status(batch.status for batch in own)
+        
+        ProductStocks.objects.bulk_create(stocks)
+        ProductBatch.objects.bulk_create(batches)
+        self.stats['stocks_created'] += len(stocks)
+        self.stats['batches_created'] += len(batches)
+        self.stats['total_stock_units'] += sum(stock.total_on_hand for stock in stocks)
+        self.stdout.write(self.style.SUCCESS(f'✓ Stocks: {len(stocks)} created, batches: {len(batches)} created'))
+
+    def bulk_orders(self, suppliers, products):
+        """Orders and items with bulk_create; receipts go through ReceiveService (set-based)"""
+        links = set(SupplierProduct.objects.values_list('supplier_id', 'product_id'))
+        orders_data = sample_orders()
+        orders = [
+            Order(ordered_by=order_data['ordered_by'], date_ordered=order_data['date_ordered'], status='Pending')
+            for order_data in orders_data
+        ]
+        self.reserve_codes(Order, 'order_id', orders, lambda order: f"ORD-{timezone.now().year}-")
+        
+        items = []
+        receipts = []  # (order_item, quantity, days_ago, received_by)
+        for order, order_data in zip(orders, orders_data):
+            for item_data in order_data['items']:
+                product = products.get(item_data['product_brand'])
+                supplier = suppliers.get(item_data['supplier_name'])
+                if not product or not supplier or (supplier.supplier_id, product.product_id) not in links:
+                    self.stdout.write(self.style.WARNING(
+                        f"  ○ Skipping item {item_data['product_brand']} from {item_data['supplier_name']}"
+                    ))
+                    continue
+                item = OrderItem(order=order, product=product, supplier=supplier, quantity_ordered=item_data['quantity'])
+                order.total_ordered += item.quantity_ordered
+                items.append(item)
+                received_by = order_data['ordered_by'].split(',')[0]
+                receipts.extend((item, quantity, days_ago, received_by) for quantity, days_ago in item_data['received'])
+        self.reserve_codes(OrderItem, 'order_item_id', items, lambda item: 'ITM-')
+        
+        Order.objects.bulk_create(orders)
+        OrderItem.objects.bulk_create(items)
+        
+        lines, errors = ReceiveService.lock_and_validate([
+            (index, {
+                'order': item.order_id,
+                'order_item': item.order_item_id,
+                'quantity_received': quantity,
+                'date_received': timezone.now() - timedelta(days=days_ago),
+                'received_by': received_by,
+            })
+            for index, (item, quantity, days_ago, received_by) in enumerate(receipts)
+        ])
+        for error in errors:
+            self.stats['errors'] += 1
+            self.stdout.write(self.style.ERROR(f"  ✗ Receipt {error['order_item']}: {error['error']}"))
+        if lines:
+            ReceiveService.receive(lines)
+        
+        self.stats['orders_created'] += len(orders)
+        self.stats['order_items_created'] += len(items)
+        self.stats['receive_orders_created'] += len(lines)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Orders: {len(orders)} created, items: {len(items)}, receipts: {len(lines)}'
+        ))
+
     def handle(self, *args, **kwargs):
         verbose = kwargs.get('verbose', False)
         skip_orders = kwargs.get('skip_orders', False)
         
+        if kwargs.get('bulk'):
+            return self.handle_bulk(skip_orders, kwargs.get('synthetic', 0))
+        if kwargs.get('synthetic'):
+            self.stdout.write(self.style.WARNING('⊘ --synthetic requires --bulk, ignoring it'))
+        
         self.stdout.write(self.style.SUCCESS('='*80))
         self.stdout.write(self.style.SUCCESS('PHARMACY INVENTORY SAMPLE DATA INSERTION'))
         self.stdout.write(self.style.SUCCESS('='*80))
@@ -86,60 +795,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('='*80 + '\n'))
         
         # Define pharmacy categories and their subcategories
-        pharmacy_data = {
-            'Medications': {
-                'description': 'Prescription and over-the-counter medications',
-                'subcategories': [
-                    ('Antibiotics', 'Antimicrobial medications for bacterial infections'),
-                    ('Pain Relief', 'Analgesics and pain management medications'),
-                    ('Vitamins & Supplements', 'Dietary supplements and multivitamins'),
-                    ('Cardiovascular', 'Heart and blood pressure medications'),
-                    ('Respiratory', 'Asthma, allergy, and respiratory medications'),
-                    ('Gastrointestinal', 'Digestive system medications'),
-                    ('Diabetes Care', 'Insulin and diabetes management medications'),
-                    ('Antifungal', 'Medications for fungal infections'),
-                ]
-            },
-            'Medical Supplies': {
-                'description': 'Medical equipment and supplies',
-                'subcategories': [
-                    ('Bandages & Dressings', 'Wound care and bandaging materials'),
-                    ('Syringes & Needles', 'Injection equipment and supplies'),
-                    ('Surgical Instruments', 'Medical and surgical tools'),
-                    ('Diagnostic Equipment', 'Blood pressure monitors, thermometers, etc.'),
-                    ('First Aid', 'First aid kits and emergency supplies'),
-                    ('Gloves & Masks', 'Protective equipment and disposables'),
-                ]
-            },
-            'Personal Care': {
-                'description': 'Personal hygiene and wellness products',
-                'subcategories': [
-                    ('Skin Care', 'Lotions, creams, and skin treatments'),
-                    ('Oral Care', 'Toothpaste, mouthwash, and dental products'),
-                    ('Hair Care', 'Shampoos, conditioners, and hair treatments'),
-                    ('Hygiene Products', 'Soaps, sanitizers, and cleaning products'),
-                    ('Baby Care', 'Baby formula, diapers, and infant care products'),
-                ]
-            },
-            'Laboratory Supplies': {
-                'description': 'Laboratory equipment and testing supplies',
-                'subcategories': [
-                    ('Test Kits', 'Diagnostic and screening test kits'),
-                    ('Lab Equipment', 'Laboratory instruments and tools'),
-                    ('Reagents', 'Chemical reagents and testing solutions'),
-                    ('Specimen Collection', 'Sample collection and storage supplies'),
-                ]
-            },
-            'Wellness & Nutrition': {
-                'description': 'Health and wellness products',
-                'subcategories': [
-                    ('Herbal Supplements', 'Natural and herbal remedies'),
-                    ('Protein & Nutrition', 'Protein powders and nutritional supplements'),
-                    ('Weight Management', 'Diet and weight loss products'),
-                    ('Sports Nutrition', 'Sports supplements and energy products'),
-                ]
-            },
-        }
+        pharmacy_data = PHARMACY_DATA
 
         # Insert categories and subcategories
         self.stdout.write(self.style.SUCCESS('STEP 1: Inserting Categories and Subcategories'))
@@ -216,84 +872,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('STEP 2: Inserting Products'))
         self.stdout.write('-' * 80)
         
-        products_data = [
-            # Medications - Antibiotics
-            {'brand': 'Amoxil', 'generic': 'Amoxicillin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 15.50, 'unit': 'Capsule'},
-            {'brand': 'Zithromax', 'generic': 'Azithromycin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 25.00, 'unit': 'Tablet'},
-            {'brand': 'Cipro', 'generic': 'Ciprofloxacin 500mg', 'category': 'Medications', 'subcategory': 'Antibiotics', 'price': 18.75, 'unit': 'Tablet'},
-            
-            # Medications - Pain Relief
-            {'brand': 'Tylenol', 'generic': 'Paracetamol 500mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 8.50, 'unit': 'Tablet'},
-            {'brand': 'Advil', 'generic': 'Ibuprofen 400mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 12.00, 'unit': 'Tablet'},
-            {'brand': 'Aleve', 'generic': 'Naproxen Sodium 220mg', 'category': 'Medications', 'subcategory': 'Pain Relief', 'price': 14.25, 'unit': 'Tablet'},
-            
-            # Medications - Vitamins & Supplements
-            {'brand': 'Centrum', 'generic': 'Multivitamin', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 22.50, 'unit': 'Tablet'},
-            {'brand': 'Nature Made', 'generic': 'Vitamin C 1000mg', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 16.00, 'unit': 'Tablet'},
-            {'brand': 'Calcium Plus', 'generic': 'Calcium + Vitamin D', 'category': 'Medications', 'subcategory': 'Vitamins & Supplements', 'price': 18.00, 'unit': 'Tablet'},
-            
-            # Medications - Cardiovascular
-            {'brand': 'Norvasc', 'generic': 'Amlodipine 5mg', 'category': 'Medications', 'subcategory': 'Cardiovascular', 'price': 30.00, 'unit': 'Tablet'},
-            {'brand': 'Losartan', 'generic': 'Losartan Potassium 50mg', 'category': 'Medications', 'subcategory': 'Cardiovascular', 'price': 28.50, 'unit': 'Tablet'},
-            
-            # Medications - Respiratory
-            {'brand': 'Ventolin', 'generic': 'Salbutamol Inhaler', 'category': 'Medications', 'subcategory': 'Respiratory', 'price': 45.00, 'unit': 'Inhaler'},
-            {'brand': 'Claritin', 'generic': 'Loratadine 10mg', 'category': 'Medications', 'subcategory': 'Respiratory', 'price': 16.50, 'unit': 'Tablet'},
-            
-            # Medications - Gastrointestinal
-            {'brand': 'Omeprazole', 'generic': 'Omeprazole 20mg', 'category': 'Medications', 'subcategory': 'Gastrointestinal', 'price': 20.00, 'unit': 'Capsule'},
-            {'brand': 'Imodium', 'generic': 'Loperamide 2mg', 'category': 'Medications', 'subcategory': 'Gastrointestinal', 'price': 12.50, 'unit': 'Capsule'},
-            
-            # Medications - Diabetes Care
-            {'brand': 'Glucophage', 'generic': 'Metformin 500mg', 'category': 'Medications', 'subcategory': 'Diabetes Care', 'price': 25.00, 'unit': 'Tablet'},
-            {'brand': 'Lantus', 'generic': 'Insulin Glargine', 'category': 'Medications', 'subcategory': 'Diabetes Care', 'price': 85.00, 'unit': 'Vial'},
-            
-            # Medical Supplies - Bandages & Dressings
-            {'brand': 'Band-Aid', 'generic': 'Adhesive Bandages', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 5.50, 'unit': 'Box'},
-            {'brand': 'Medipore', 'generic': 'Gauze Pad 4x4', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 8.00, 'unit': 'Pack'},
-            {'brand': 'Tegaderm', 'generic': 'Transparent Dressing', 'category': 'Medical Supplies', 'subcategory': 'Bandages & Dressings', 'price': 12.00, 'unit': 'Piece'},
-            
-            # Medical Supplies - Syringes & Needles
-            {'brand': 'BD', 'generic': 'Syringe 3ml with Needle', 'category': 'Medical Supplies', 'subcategory': 'Syringes & Needles', 'price': 0.85, 'unit': 'Piece'},
-            {'brand': 'Terumo', 'generic': 'Insulin Syringe 1ml', 'category': 'Medical Supplies', 'subcategory': 'Syringes & Needles', 'price': 0.95, 'unit': 'Piece'},
-            
-            # Medical Supplies - Diagnostic Equipment
-            {'brand': 'Omron', 'generic': 'Blood Pressure Monitor', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 450.00, 'unit': 'Unit'},
-            {'brand': 'Accu-Chek', 'generic': 'Glucometer', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 350.00, 'unit': 'Unit'},
-            {'brand': 'Digital', 'generic': 'Thermometer', 'category': 'Medical Supplies', 'subcategory': 'Diagnostic Equipment', 'price': 85.00, 'unit': 'Unit'},
-            
-            # Medical Supplies - Gloves & Masks
-            {'brand': 'Nitrile Pro', 'generic': 'Nitrile Gloves Medium', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 25.00, 'unit': 'Box'},
-            {'brand': 'N95 Premium', 'generic': 'N95 Face Mask', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 3.50, 'unit': 'Piece'},
-            {'brand': 'Surgical Plus', 'generic': 'Surgical Face Mask', 'category': 'Medical Supplies', 'subcategory': 'Gloves & Masks', 'price': 0.75, 'unit': 'Piece'},
-            
-            # Personal Care - Skin Care
-            {'brand': 'Cetaphil', 'generic': 'Gentle Skin Cleanser', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 35.00, 'unit': 'Bottle'},
-            {'brand': 'Neutrogena', 'generic': 'Hydrating Lotion', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 28.50, 'unit': 'Bottle'},
-            {'brand': 'Aveeno', 'generic': 'Daily Moisturizer', 'category': 'Personal Care', 'subcategory': 'Skin Care', 'price': 32.00, 'unit': 'Tube'},
-            
-            # Personal Care - Oral Care
-            {'brand': 'Colgate', 'generic': 'Total Toothpaste', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 6.50, 'unit': 'Tube'},
-            {'brand': 'Listerine', 'generic': 'Antiseptic Mouthwash', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 12.00, 'unit': 'Bottle'},
-            {'brand': 'Oral-B', 'generic': 'Soft Bristle Toothbrush', 'category': 'Personal Care', 'subcategory': 'Oral Care', 'price': 4.50, 'unit': 'Piece'},
-            
-            # Personal Care - Baby Care
-            {'brand': 'Similac', 'generic': 'Infant Formula', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 65.00, 'unit': 'Can'},
-            {'brand': 'Pampers', 'generic': 'Baby Diapers Medium', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 42.00, 'unit': 'Pack'},
-            {'brand': 'Johnson\'s', 'generic': 'Baby Powder', 'category': 'Personal Care', 'subcategory': 'Baby Care', 'price': 8.50, 'unit': 'Bottle'},
-            
-            # Laboratory Supplies - Test Kits
-            {'brand': 'QuickTest', 'generic': 'COVID-19 Rapid Test Kit', 'category': 'Laboratory Supplies', 'subcategory': 'Test Kits', 'price': 25.00, 'unit': 'Kit'},
-            {'brand': 'PregnaSure', 'generic': 'Pregnancy Test Kit', 'category': 'Laboratory Supplies', 'subcategory': 'Test Kits', 'price': 8.00, 'unit': 'Kit'},
-            
-            # Wellness & Nutrition - Herbal Supplements
-            {'brand': 'Ginkgo Plus', 'generic': 'Ginkgo Biloba Extract', 'category': 'Wellness & Nutrition', 'subcategory': 'Herbal Supplements', 'price': 28.00, 'unit': 'Bottle'},
-            {'brand': 'Omega-3', 'generic': 'Fish Oil 1000mg', 'category': 'Wellness & Nutrition', 'subcategory': 'Herbal Supplements', 'price': 32.50, 'unit': 'Bottle'},
-            
-            # Wellness & Nutrition - Protein & Nutrition
-            {'brand': 'Whey Pro', 'generic': 'Whey Protein Powder', 'category': 'Wellness & Nutrition', 'subcategory': 'Protein & Nutrition', 'price': 125.00, 'unit': 'Tub'},
-            {'brand': 'Ensure', 'generic': 'Nutritional Shake', 'category': 'Wellness & Nutrition', 'subcategory': 'Protein & Nutrition', 'price': 55.00, 'unit': 'Can'},
-        ]
+        products_data = PRODUCTS_DATA
         
         for product_data in products_data:
             try:
@@ -373,64 +952,7 @@ class Command(BaseCommand):
         self.stdout.write('-' * 80)
         
         # Suppliers now supply MULTIPLE products (many-to-many relationship)
-        suppliers_data = [
-            {
-                'name': 'PharmaCare Distributors Inc.',
-                'contact_person': 'John Martinez',
-                'email': 'jmartinez@pharmacare.com',
-                'phone': '+1-555-0101',
-                'address': '123 Medical Plaza, Healthcare District, Metro Manila',
-            },
-            {
-                'name': 'MediSupply Solutions',
-                'contact_person': 'Sarah Chen',
-                'email': 'schen@medisupply.com',
-                'phone': '+1-555-0102',
-                'address': '456 Pharmacy Street, Business Park, Quezon City',
-            },
-            {
-                'name': 'Global Health Products Corp.',
-                'contact_person': 'Michael Rodriguez',
-                'email': 'mrodriguez@globalhealthprod.com',
-                'phone': '+1-555-0103',
-                'address': '789 Wellness Avenue, Medical Center, Makati City',
-            },
-            {
-                'name': 'Vital Med Supplies',
-                'contact_person': 'Emily Tan',
-                'email': 'etan@vitalmed.com',
-                'phone': '+1-555-0104',
-                'address': '321 Healthcare Road, Industrial Zone, Pasig City',
-            },
-            {
-                'name': 'Prime Pharma Wholesale',
-                'contact_person': 'David Wong',
-                'email': 'dwong@primepharma.com',
-                'phone': '+1-555-0105',
-                'address': '654 Drug Lane, Commerce Hub, Mandaluyong City',
-            },
-            {
-                'name': 'HealthFirst Trading Co.',
-                'contact_person': 'Lisa Garcia',
-                'email': 'lgarcia@healthfirst.com',
-                'phone': '+1-555-0106',
-                'address': '987 Medical Supply Drive, Export Processing Zone, Cavite',
-            },
-            {
-                'name': 'MedEquip International',
-                'contact_person': 'Robert Kim',
-                'email': 'rkim@medequip.com',
-                'phone': '+1-555-0107',
-                'address': '147 Equipment Boulevard, Tech Park, Taguig City',
-            },
-            {
-                'name': 'Wellness Distributors Ltd.',
-                'contact_person': 'Jennifer Santos',
-                'email': 'jsantos@wellnessdist.com',
-                'phone': '+1-555-0108',
-                'address': '258 Nutrition Street, Health District, Pasay City',
-            },
-        ]
+        suppliers_data = SUPPLIERS_DATA
         
         for supplier_data in suppliers_data:
             try:
@@ -476,44 +998,7 @@ class Command(BaseCommand):
         
         # Define which suppliers carry which products
         # Each supplier specializes in certain categories but may overlap
-        supplier_product_mappings = {
-            'PharmaCare Distributors Inc.': [
-                # Antibiotics specialist + some pain relief
-                'Amoxil', 'Zithromax', 'Cipro', 'Tylenol', 'Advil', 'Aleve'
-            ],
-            'MediSupply Solutions': [
-                # Pain relief + vitamins + some antibiotics
-                'Tylenol', 'Advil', 'Centrum', 'Nature Made', 'Calcium Plus', 'Amoxil'
-            ],
-            'Global Health Products Corp.': [
-                # Vitamins, supplements, wellness
-                'Centrum', 'Nature Made', 'Calcium Plus', 'Ginkgo Plus', 'Omega-3', 
-                'Whey Pro', 'Ensure'
-            ],
-            'Vital Med Supplies': [
-                # Cardiovascular + respiratory + diabetes
-                'Norvasc', 'Losartan', 'Ventolin', 'Claritin', 'Glucophage', 'Lantus'
-            ],
-            'Prime Pharma Wholesale': [
-                # Respiratory + GI + some cardiovascular
-                'Ventolin', 'Claritin', 'Omeprazole', 'Imodium', 'Norvasc', 'Losartan'
-            ],
-            'HealthFirst Trading Co.': [
-                # Medical supplies + diagnostic equipment
-                'Band-Aid', 'Medipore', 'Tegaderm', 'BD', 'Terumo', 
-                'Omron', 'Accu-Chek', 'Digital', 'Nitrile Pro', 'N95 Premium', 'Surgical Plus'
-            ],
-            'MedEquip International': [
-                # Diagnostic equipment + syringes + test kits
-                'Omron', 'Accu-Chek', 'Digital', 'BD', 'Terumo',
-                'QuickTest', 'PregnaSure'
-            ],
-            'Wellness Distributors Ltd.': [
-                # Personal care + baby care + wellness
-                'Cetaphil', 'Neutrogena', 'Aveeno', 'Colgate', 'Listerine', 'Oral-B',
-                'Similac', 'Pampers', "Johnson's", 'Whey Pro', 'Ensure'
-            ],
-        }
+        supplier_product_mappings = SUPPLIER_PRODUCT_MAPPINGS
         
         for supplier_name, product_brands in supplier_product_mappings.items():
             try:
@@ -590,63 +1075,11 @@ class Command(BaseCommand):
         # Stock configuration for products
         # Format: 'brand_name': [(quantity, expiry_days_from_today), ...]
         # Positive expiry_days = future, Negative = past (expired)
-        stock_configs = {
-            # HIGH STOCK - Normal items (thousands in stock)
-            'Amoxil': [(2500, 365), (1800, 180), (1200, 90)],  # 5,500 total - multiple batches
-            'Tylenol': [(5000, 545), (3000, 365), (2000, 180)],  # 10,000 total - very popular
-            'Advil': [(4000, 365), (2500, 270), (1500, 120)],  # 8,000 total
-            'Centrum': [(3000, 730), (2000, 545), (1500, 365)],  # 6,500 total - long shelf life
-            'Nature Made': [(2500, 545), (1800, 365)],  # 4,300 total
-            'Calcium Plus': [(2000, 545), (1500, 365)],  # 3,500 total
-            'Band-Aid': [(8000, 1095), (5000, 730)],  # 13,000 total - very long shelf life
-            'Nitrile Pro': [(10000, 1095), (6000, 730)],  # 16,000 total - bulk PPE
-            'Surgical Plus': [(15000, 730), (8000, 545)],  # 23,000 total - high volume PPE
-            'Colgate': [(4000, 545), (2500, 365)],  # 6,500 total
-            
-            # MEDIUM STOCK - Normal items
-            'Zithromax': [(800, 270), (600, 180)],  # 1,400 total
-            'Cipro': [(700, 300), (500, 180)],  # 1,200 total
-            'Aleve': [(1200, 365), (800, 180)],  # 2,000 total
-            'Norvasc': [(600, 365), (400, 270)],  # 1,000 total
-            'Losartan': [(550, 300), (450, 200)],  # 1,000 total
-            'Claritin': [(900, 365), (600, 180)],  # 1,500 total
-            'Omeprazole': [(800, 270), (500, 150)],  # 1,300 total
-            'Glucophage': [(700, 300), (500, 200)],  # 1,200 total
-            'Medipore': [(2000, 730), (1500, 545)],  # 3,500 total
-            'Tegaderm': [(1500, 730), (1000, 545)],  # 2,500 total
-            'BD': [(5000, 1095), (3000, 730)],  # 8,000 total
-            'Terumo': [(4000, 1095), (2500, 730)],  # 6,500 total
-            'N95 Premium': [(3000, 730), (2000, 545)],  # 5,000 total
-            'Cetaphil': [(800, 545), (500, 365)],  # 1,300 total
-            'Neutrogena': [(700, 545), (400, 365)],  # 1,100 total
-            'Aveeno': [(600, 545), (400, 365)],  # 1,000 total
-            'Listerine': [(1000, 730), (600, 545)],  # 1,600 total
-            'Oral-B': [(2000, 1095), (1500, 730)],  # 3,500 total
-            'Ginkgo Plus': [(500, 545), (300, 365)],  # 800 total
-            'Omega-3': [(600, 545), (400, 365)],  # 1,000 total
-            # Note: 'Whey Pro' and 'Ensure' are handled as OUT OF STOCK below
-            
-            # LOW STOCK - Items that need reordering (below threshold of 10)
-            'Ventolin': [(5, 180), (3, 90)],  # 8 total - LOW STOCK! Critical respiratory med
-            'Imodium': [(4, 150), (2, 60)],  # 6 total - LOW STOCK!
-            'Lantus': [(3, 120), (2, 60)],  # 5 total - LOW STOCK! Critical diabetes med
-            'Omron': [(2, 730)],  # 2 total - LOW STOCK! Expensive equipment
-            'Accu-Chek': [(3, 730)],  # 3 total - LOW STOCK! Expensive equipment
-            'Digital': [(4, 730), (2, 545)],  # 6 total - LOW STOCK!
-            'QuickTest': [(5, 90), (3, 45)],  # 8 total - LOW STOCK! High demand test kits
-            
-            # NEAR EXPIRY - Items expiring within 30 days
-            'PregnaSure': [(150, 25), (80, 15)],  # 230 total but NEAR EXPIRY
-            'Similac': [(200, 20), (100, 10)],  # 300 total but NEAR EXPIRY - baby formula
-            "Johnson's": [(180, 28), (120, 18)],  # 300 total but NEAR EXPIRY
-            
-            # EXPIRED STOCK - Items that have already expired (need disposal)
-            'Pampers': [(50, -5), (30, -15)],  # 80 total - ALL EXPIRED (need urgent disposal)
-        }
+        stock_configs = STOCK_CONFIGS
         
         # Products that should be OUT OF STOCK (zero inventory)
         # These products exist but have no stock at all
-        out_of_stock_products = ['Whey Pro', 'Ensure']
+        out_of_stock_products = OUT_OF_STOCK_PRODUCTS
         
         # Get all active products
         all_products = Product.objects.filter(status='Active')
@@ -708,10 +1141,10 @@ class Command(BaseCommand):
                     else:
                         stock_status = 'Normal'
                     
-                    # Create the ProductStocks entry
+                    # Create the ProductStocks entry (each batch save below adds its quantity)
                     product_stock = ProductStocks.objects.create(
                         product=product,
-                        total_on_hand=total_quantity,
+                        total_on_hand=0,
                         status=stock_status
                     )
                     self.stats['stocks_created'] += 1
@@ -823,134 +1256,7 @@ class Command(BaseCommand):
             else:
                 # Define realistic pharmacy orders with specific suppliers
                 # Orders now specify which supplier to use for each product
-                orders_data = [
-                    # Order 1: Completed order - Medications from PharmaCare
-                    {
-                        'ordered_by': 'Sarah Johnson, Head Pharmacist',
-                        'date_ordered': timezone.now() - timedelta(days=15),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Amoxil', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 500, 'received': [(300, 14), (200, 13)]},
-                            {'product_brand': 'Tylenol', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 1000, 'received': [(1000, 14)]},
-                            {'product_brand': 'Advil', 'supplier_name': 'PharmaCare Distributors Inc.', 'quantity': 750, 'received': [(750, 14)]},
-                        ]
-                    },
-                    # Order 2: Partially received - Medical supplies from HealthFirst
-                    {
-                        'ordered_by': 'Michael Chen, Inventory Manager',
-                        'date_ordered': timezone.now() - timedelta(days=10),
-                        'status': 'Partially Received',
-                        'items': [
-                            {'product_brand': 'BD', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 2000, 'received': [(1000, 8)]},
-                            {'product_brand': 'Band-Aid', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 500, 'received': [(300, 8)]},
-                            {'product_brand': 'Nitrile Pro', 'supplier_name': 'HealthFirst Trading Co.', 'quantity': 200, 'received': [(100, 7)]},
-                        ]
-                    },
-                    # Order 3: Pending order - Vitamins from Global Health
-                    {
-                        'ordered_by': 'Emily Rodriguez, Assistant Pharmacist',
-                        'date_ordered': timezone.now() - timedelta(days=5),
-                        'status': 'Pending',
-                        'items': [
-                            {'product_brand': 'Centrum', 'supplier_name': 'Global Health Products Corp.', 'quantity': 300, 'received': []},
-                            {'product_brand': 'Nature Made', 'supplier_name': 'Global Health Products Corp.', 'quantity': 400, 'received': []},
-                            {'product_brand': 'Omega-3', 'supplier_name': 'Global Health Products Corp.', 'quantity': 250, 'received': []},
-                        ]
-                    },
-                    # Order 4: Completed - Cardiovascular meds from Vital Med
-                    {
-                        'ordered_by': 'Dr. Robert Kim',
-                        'date_ordered': timezone.now() - timedelta(days=20),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Norvasc', 'supplier_name': 'Vital Med Supplies', 'quantity': 400, 'received': [(400, 19)]},
-                            {'product_brand': 'Losartan', 'supplier_name': 'Vital Med Supplies', 'quantity': 350, 'received': [(350, 19)]},
-                        ]
-                    },
-                    # Order 5: Partially received - Baby care from Wellness Distributors
-                    {
-                        'ordered_by': 'Jennifer Santos, Store Manager',
-                        'date_ordered': timezone.now() - timedelta(days=7),
-                        'status': 'Partially Received',
-                        'items': [
-                            {'product_brand': 'Similac', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 100, 'received': [(50, 6)]},
-                            {'product_brand': 'Pampers', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 150, 'received': [(75, 6)]},
-                            {'product_brand': 'Cetaphil', 'supplier_name': 'Wellness Distributors Ltd.', 'quantity': 200, 'received': []},
-                        ]
-                    },
-                    # Order 6: Completed - Diagnostic equipment from MedEquip
-                    {
-                        'ordered_by': 'Thomas Lee, Equipment Coordinator',
-                        'date_ordered': timezone.now() - timedelta(days=25),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Omron', 'supplier_name': 'MedEquip International', 'quantity': 20, 'received': [(20, 24)]},
-                            {'product_brand': 'Accu-Chek', 'supplier_name': 'MedEquip International', 'quantity': 15, 'received': [(15, 24)]},
-                        ]
-                    },
-                    # Order 7: Pending - Test kits from MedEquip
-                    {
-                        'ordered_by': 'Dr. Maria Reyes',
-                        'date_ordered': timezone.now() - timedelta(days=3),
-                        'status': 'Pending',
-                        'items': [
-                            {'product_brand': 'QuickTest', 'supplier_name': 'MedEquip International', 'quantity': 500, 'received': []},
-                            {'product_brand': 'PregnaSure', 'supplier_name': 'MedEquip International', 'quantity': 200, 'received': []},
-                        ]
-                    },
-                    # Order 8: Completed - Respiratory meds from Prime Pharma (alternative supplier)
-                    {
-                        'ordered_by': 'Angela Cruz, Senior Pharmacist',
-                        'date_ordered': timezone.now() - timedelta(days=18),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Ventolin', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 150, 'received': [(150, 17)]},
-                            {'product_brand': 'Claritin', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 300, 'received': [(300, 17)]},
-                        ]
-                    },
-                    # Order 9: Partially received - Mixed order from MediSupply (using alternative supplier)
-                    {
-                        'ordered_by': 'David Wong, Pharmacy Director',
-                        'date_ordered': timezone.now() - timedelta(days=12),
-                        'status': 'Partially Received',
-                        'items': [
-                            {'product_brand': 'Tylenol', 'supplier_name': 'MediSupply Solutions', 'quantity': 400, 'received': [(200, 11)]},
-                            {'product_brand': 'Advil', 'supplier_name': 'MediSupply Solutions', 'quantity': 350, 'received': [(150, 11)]},
-                            {'product_brand': 'Amoxil', 'supplier_name': 'MediSupply Solutions', 'quantity': 600, 'received': []},
-                        ]
-                    },
-                    # Order 10: Completed - Wellness products from Global Health
-                    {
-                        'ordered_by': 'Christine Lim, Wellness Coordinator',
-                        'date_ordered': timezone.now() - timedelta(days=22),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Whey Pro', 'supplier_name': 'Global Health Products Corp.', 'quantity': 50, 'received': [(50, 21)]},
-                            {'product_brand': 'Ensure', 'supplier_name': 'Global Health Products Corp.', 'quantity': 100, 'received': [(100, 21)]},
-                            {'product_brand': 'Ginkgo Plus', 'supplier_name': 'Global Health Products Corp.', 'quantity': 75, 'received': [(75, 21)]},
-                        ]
-                    },
-                    # Order 11: Pending - Vitamins from alternative supplier (MediSupply)
-                    {
-                        'ordered_by': 'Kevin Ng, Procurement Officer',
-                        'date_ordered': timezone.now() - timedelta(days=2),
-                        'status': 'Pending',
-                        'items': [
-                            {'product_brand': 'Centrum', 'supplier_name': 'MediSupply Solutions', 'quantity': 200, 'received': []},
-                            {'product_brand': 'Nature Made', 'supplier_name': 'MediSupply Solutions', 'quantity': 300, 'received': []},
-                        ]
-                    },
-                    # Order 12: Completed - Cardiovascular from alternative (Prime Pharma)
-                    {
-                        'ordered_by': 'Dr. Lisa Garcia',
-                        'date_ordered': timezone.now() - timedelta(days=30),
-                        'status': 'Received',
-                        'items': [
-                            {'product_brand': 'Norvasc', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 200, 'received': [(200, 29)]},
-                            {'product_brand': 'Losartan', 'supplier_name': 'Prime Pharma Wholesale', 'quantity': 250, 'received': [(250, 29)]},
-                        ]
-                    },
-                ]
+                orders_data = sample_orders()
                 
                 for order_data in orders_data:
                     try:
@@ -0,0 +1,51 @@
+"""
+Management command to verify ProductStocks.total_on_hand against the batches.
+Usage: python manage.py reconcile_stock_totals [--dry-run]
+
+Batch saves maintain stock totals by delta (InventoryService.apply_stock_delta),
+so writes that bypass the ORM signals (e.g. the POS updating product_batch
+directly) can leave a total out of step. Run after such writes or nightly.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+
+from inventory_system.services.alert_service import AlertService
+from inventory_system.services.dashboard_service import DashboardService
+from inventory_system.services.inventory_service import InventoryService
+
+
+class Command(BaseCommand):
+    help = 'Verify stock totals against the sum of their batches and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted stocks, do not repair them',
+        )
+
+    def handle(self, *args, **options):
+        with db_transaction.atomic():
+            drifted = list(
+                InventoryService.find_stock_total_drift().values_list(
+                    'stock_id', 'total_on_hand', 'batch_total'
+                ).order_by('stock_id')
+            )
+
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS('✅ All stock totals match their batches'))
+                return
+
+            for stock_id, total_on_hand, batch_total in drifted:
+                self.stdout.write(f'   {stock_id}: stored {total_on_hand}, batches {batch_total} ({batch_total - total_on_hand:+d})')
+
+            if options['dry_run']:
+                self.stdout.write(self.style.WARNING(f'⚠️  {len(drifted)} stock total(s) drifted (dry run, nothing repaired)'))
+                return
+
+            stock_ids = [stock_id for stock_id, _, _ in drifted]
+            repaired = InventoryService.reconcile_stock_totals(stock_ids)
+            AlertService.refresh_stocks(stock_ids)
+            DashboardService.invalidate(DashboardService.CATEGORIES)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Repaired {repaired} stock total(s)'))
@@ -0,0 +1,51 @@
+"""
+Management command to recompute batch and stock statuses.
+Usage: python manage.py refresh_inventory_status
+
+Meant to run nightly just after midnight (e.g. cron: 5 0 * * *) so batches
+move to Near Expiry / Expired on the day they cross their threshold. It also
+creates next year's transaction partition ahead of time (PostgreSQL),
+prunes change feed entries older than a week and finished outbound email
+older than a month.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction as db_transaction
+
+from inventory_system.services.alert_service import AlertService
+from inventory_system.services.change_feed_service import ChangeFeedService
+from inventory_system.services.dashboard_service import DashboardService
+from inventory_system.services.inventory_service import InventoryService
+from inventory_system.services.mail_queue_service import MailQueueService
+from inventory_system.services.partition_service import TransactionPartitionService
+
+
+class Command(BaseCommand):
+    help = 'Recompute all batch statuses, stock totals/statuses and inventory alerts (run nightly)'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        queries_before = len(connection.queries)
+
+        with db_transaction.atomic():
+            batches_updated = InventoryService.refresh_all_batch_statuses()
+            AlertService.rebuild_all()
+            DashboardService.invalidate(DashboardService.CATEGORIES, DashboardService.STOCK_STATUS)
+
+        for partition in TransactionPartitionService.ensure_partitions():
+            self.stdout.write(f'   Created transaction partition {partition}')
+
+        pruned = ChangeFeedService.prune()
+        if pruned:
+            self.stdout.write(f'   Pruned {pruned} change log row(s)')
+        pruned = MailQueueService.prune()
+        if pruned:
+            self.stdout.write(f'   Pruned {pruned} outbound email row(s)')
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Refreshed inventory status: {batches_updated} batch status change(s) in {elapsed_ms:.0f} ms'
+        ))
+        if connection.queries_logged:
+            self.stdout.write(f'   Statements issued: {len(connection.queries) - queries_before}')
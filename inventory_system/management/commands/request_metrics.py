@@ -0,0 +1,73 @@
+"""
+Management command to measure queries and timings of API endpoints.
+Usage: python manage.py request_metrics /api/orders/ /api/products/ [--user admin] [--repeat 3] [--output table|json|prometheus]
+
+The metrics ring buffer lives inside each server process, so this command
+issues the GET requests in-process (through the full middleware stack, as the
+given user) and reports what RequestMetricsMiddleware recorded. Handy in CI or
+staging to catch N+1 regressions in the serializers; the live numbers of a
+running server are at /api/metrics/requests/.
+"""
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from inventory_system.services.metrics_service import RequestMetricsService
+
+
+class Command(BaseCommand):
+    help = 'Request API endpoints in-process and report per-view query counts and timings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='GET paths to request, e.g. /api/orders/')
+        parser.add_argument('--user', help='Username to request as (default: first superuser)')
+        parser.add_argument('--repeat', type=int, default=3, help='Requests per path (default: 3)')
+        parser.add_argument(
+            '--output',
+            choices=['table', 'json', 'prometheus'],
+            default='table',
+            help='Report format (default: table)',
+        )
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('id').first()
+        if not user:
+            raise CommandError('No such user; pass --user <username>')
+
+        host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost'
+        if host == '*':
+            host = 'localhost'
+
+        with override_settings(REQUEST_METRICS_ENABLED=True):
+            client = Client(HTTP_HOST=host)
+            client.force_login(user)
+            RequestMetricsService.reset()
+            for path in options['paths']:
+                for _ in range(options['repeat']):
+                    response = client.get(path)
+                    if response.status_code >= 400:
+                        self.stdout.write(self.style.WARNING(f'⚠️  GET {path} returned {response.status_code}'))
+            summary = RequestMetricsService.summary()
+
+        if options['output'] == 'json':
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if options['output'] == 'prometheus':
+            self.stdout.write(RequestMetricsService.to_prometheus(summary), ending='')
+            return
+
+        self.stdout.write(f"{'View':<45} {'Reqs':>5} {'Queries':>9} {'DB ms':>9} {'Py ms':>9} {'Total ms':>9}")
+        for view in summary['views']:
+            self.stdout.write(
+                f"{view['view']:<45} {view['count']:>5} {view['queries_max']:>9} "
+                f"{view['db_ms_avg']:>9.1f} {view['python_ms_avg']:>9.1f} {view['total_ms_avg']:>9.1f}"
+            )
+            for query in view['slowest_queries']:
+                self.stdout.write(f"   {query['ms']:>8.2f} ms  {query['sql'][:100]}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Measured {summary['requests']} request(s)"))
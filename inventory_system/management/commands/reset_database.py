@@ -1,7 +1,11 @@
 """
 Management command to reset/clear the database.
-Usage: python manage.py reset_database
+Usage: python manage.py reset_database [--truncate] [--force]
 WARNING: This will delete ALL data from the database!
+
+--truncate empties every table with TRUNCATE ... RESTART IDENTITY CASCADE
+(bulk DELETEs on SQLite) in one transaction: nothing is loaded row by row, no
+post_delete receiver records ADJ transactions, and the code counters restart.
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
@@ -9,11 +13,24 @@ from inventory_system.models import (
     UserInformation, Category, Subcategory, Product, ProductStocks, 
     ProductBatch, Supplier, Order, OrderItem, ReceiveOrder, Transaction
 )
+from inventory_system.services.reset_service import ResetService
 
 
 class Command(BaseCommand):
     help = 'Reset/clear the database (DELETE ALL DATA)'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Empty the tables with TRUNCATE (bulk DELETE on SQLite) instead of per-object deletes',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Skip the confirmation prompts',
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.ERROR("WARNING: DATABASE RESET"))
@@ -27,14 +44,19 @@ class Command(BaseCommand):
         self.stdout.write("  - Transactions")
         self.stdout.write("\n" + "=" * 60)
         
-        confirm1 = input("\nType 'DELETE ALL DATA' to confirm: ").strip()
-        if confirm1 != "DELETE ALL DATA":
-            self.stdout.write(self.style.ERROR("\n❌ Reset cancelled."))
-            return
+        if not options['force']:
+            confirm1 = input("\nType 'DELETE ALL DATA' to confirm: ").strip()
+            if confirm1 != "DELETE ALL DATA":
+                self.stdout.write(self.style.ERROR("\n❌ Reset cancelled."))
+                return
+            
+            confirm2 = input("Are you absolutely sure? (yes/no): ").strip().lower()
+            if confirm2 != "yes":
+                self.stdout.write(self.style.ERROR("\n❌ Reset cancelled."))
+                return
         
-        confirm2 = input("Are you absolutely sure? (yes/no): ").strip().lower()
-        if confirm2 != "yes":
-            self.stdout.write(self.style.ERROR("\n❌ Reset cancelled."))
+        if options['truncate']:
+            self.handle_truncate()
             return
         
         try:
@@ -98,3 +120,22 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"\n❌ Error resetting database: {e}"))
             self.stdout.write(self.style.WARNING("Some data may have been partially deleted."))
+
+    def handle_truncate(self):
+        """Empty every inventory and user table in one transaction via ResetService"""
+        try:
+            self.stdout.write("\n🗑️  Truncating tables...\n")
+            counts = ResetService.truncate(ResetService.SAMPLE_DATA_MODELS + ResetService.USER_MODELS)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"\n❌ Error resetting database: {e}"))
+            self.stdout.write(self.style.WARNING("Transaction rolled back. No data was deleted."))
+            return
+
+        for model, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"  ✅ Deleted {count} {model._meta.db_table} row(s)"))
+
+        self.stdout.write("\n" + "=" * 60)
+        self.stdout.write(self.style.SUCCESS("✅ Database reset complete!"))
+        self.stdout.write("=" * 60)
+        self.stdout.write("\nYou can now create fresh data.")
+        self.stdout.write("Run 'python manage.py create_user' to create your first user account.")
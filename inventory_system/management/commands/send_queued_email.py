@@ -0,0 +1,44 @@
+"""
+Management command to send the queued outbound email.
+Usage: python manage.py send_queued_email [--once] [--threads 4] [--batch 20] [--interval 2]
+
+Run it as a long-lived service next to the web workers. It sends whatever the
+in-process sender threads did not (e.g. the web worker restarted before
+commit callbacks ran) and retries failed sends with exponential backoff until
+OUTBOUND_EMAIL_MAX_ATTEMPTS. Several instances can run at once.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory_system.services.mail_queue_service import MailQueueService
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound email, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send everything due now and exit')
+        parser.add_argument('--threads', type=int, default=4, help='Sender threads (default: 4)')
+        parser.add_argument('--batch', type=int, default=20, help='Emails claimed per round (default: 20)')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to wait when nothing is due (default: 2)')
+
+    def handle(self, *args, **options):
+        totals = {}
+        try:
+            while True:
+                emails = MailQueueService.claim(limit=options['batch'])
+                if emails:
+                    results = MailQueueService.process(emails, threads=options['threads'])
+                    for status, count in results.items():
+                        totals[status] = totals.get(status, 0) + count
+                    self.stdout.write(', '.join(f'{count} {status.lower()}' for status, count in results.items()))
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        summary = ', '.join(f'{count} {status.lower()}' for status, count in totals.items()) or 'nothing due'
+        self.stdout.write(self.style.SUCCESS(f'✅ Outbound email: {summary}'))
@@ -0,0 +1,170 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from . import db_router
+from .logging_utils import aexecute_wrapper, atimed_operation, debug_request, execute_wrapper_all, timed_operation
+from .services.metrics_service import RequestMetricsService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Base for middleware that runs natively in both modes
+
+    Under ASGI the middleware chain is async and __acall__ is used, so async
+    views (async_views) are not pushed back into a worker thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+class RequestDebugLogMiddleware(SyncAndAsyncMiddleware):
+    """
+    Trace a single request at DEBUG level: staff users send `X-Debug-Log: 1`
+    and every inventory_system log record of that request is emitted, followed
+    by the request's elapsed time and query count.
+    """
+
+    def call(self, request):
+        if not request.headers.get('X-Debug-Log') or not self._may_debug(request.user):
+            return self.get_response(request)
+
+        with debug_request(), timed_operation(logger, f'{request.method} {request.path}', logging.DEBUG):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not request.headers.get('X-Debug-Log') or not await sync_to_async(self._may_debug)(await request.auser()):
+            return await self.get_response(request)
+
+        with debug_request():
+            async with atimed_operation(logger, f'{request.method} {request.path}', logging.DEBUG):
+                return await self.get_response(request)
+
+    @staticmethod
+    def _may_debug(user):
+        if not user.is_authenticated:
+            return False
+        if user.is_superuser or user.is_staff:
+            return True
+        return hasattr(user, 'user_information') and user.user_information.role == 'Admin'
+
+
+class RequestMetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Record query count, database time and Python time of every request in
+    RequestMetricsService's ring buffer, keyed by method and URL name.
+    Queries on every alias count, including reads routed to the replica.
+
+    Queries a streaming response runs while it is being sent (exports) are
+    not counted.
+    """
+
+    def call(self, request):
+        if not RequestMetricsService.enabled():
+            return self.get_response(request)
+
+        timer = RequestMetricsService.query_timer()
+        started = time.perf_counter()
+        with execute_wrapper_all(timer):
+            response = self.get_response(request)
+        return self._record(request, response, timer, started)
+
+    async def __acall__(self, request):
+        if not RequestMetricsService.enabled():
+            return await self.get_response(request)
+
+        timer = RequestMetricsService.query_timer()
+        started = time.perf_counter()
+        async with aexecute_wrapper(timer):
+            response = await self.get_response(request)
+        return self._record(request, response, timer, started)
+
+    @staticmethod
+    def _record(request, response, timer, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        RequestMetricsService.record(f'{request.method} {view}', response.status_code, total_ms, timer)
+        return response
+
+
+class ReplicaRoutingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Serve replica-safe GET/HEAD requests from the read replica (see db_router)
+    and keep clients on the primary for a few seconds after they write.
+
+    The pin is a cookie set on the response of the write, so it holds whichever
+    process serves the next request (clients must keep cookies, as browsers
+    and session-authenticated API clients do). Only views that opt in are
+    routed: viewset actions listed in the viewset's `replica_actions`
+    (default: list and retrieve) and function views marked @replica_reads.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD')
+    DEFAULT_REPLICA_ACTIONS = ('list', 'retrieve')
+
+    def call(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_token', None)
+            if token is not None:
+                db_router.reset_read_alias(token)
+
+        if request.method not in self.SAFE_METHODS and db_router.replica_alias():
+            db_router.mark_write(response)
+        return response
+
+    async def __acall__(self, request):
+        # process_view runs in a worker thread here; asgiref copies the alias it
+        # sets back into this context, where the token it kept is not valid.
+        # Reset to the alias from before the request instead.
+        token = db_router.set_read_alias(db_router.read_alias())
+        try:
+            response = await self.get_response(request)
+        finally:
+            db_router.reset_read_alias(token)
+
+        if request.method not in self.SAFE_METHODS and db_router.replica_alias():
+            db_router.mark_write(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = db_router.replica_alias()
+        if alias is None or request.method not in self.SAFE_METHODS:
+            return None
+        if not self._replica_safe(view_func, request.method) or db_router.recently_wrote(request):
+            return None
+        # Load the session and user before routing: a session created a moment
+        # ago may not have reached the replica yet
+        request.user.is_authenticated
+        request._replica_token = db_router.set_read_alias(alias)
+        return None
+
+    def _replica_safe(self, view_func, method):
+        if getattr(view_func, 'replica_reads', False):
+            return True
+        actions = getattr(view_func, 'actions', None)  # set on viewset views by as_view()
+        if not actions:
+            return False
+        replica_actions = getattr(view_func.cls, 'replica_actions', self.DEFAULT_REPLICA_ACTIONS)
+        return actions.get(method.lower()) in replica_actions
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0023_remove_supplier_product_supplier_products'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdSequence',
+            fields=[
+                ('name', models.CharField(db_column='name', max_length=50, primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(db_column='last_value', default=0)),
+            ],
+            options={
+                'db_table': 'id_sequence',
+            },
+        ),
+    ]
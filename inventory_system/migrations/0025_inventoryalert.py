@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0024_idsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryAlert',
+            fields=[
+                ('alert_id', models.CharField(db_column='alert_id', max_length=60, primary_key=True, serialize=False)),
+                ('alert_type', models.CharField(choices=[('expired', 'Expired'), ('out_of_stock', 'Out of Stock'), ('near_expiry', 'Near Expiry'), ('low_stock', 'Low Stock')], db_column='alert_type', max_length=20)),
+                ('severity', models.CharField(choices=[('critical', 'Critical'), ('warning', 'Warning')], db_column='severity', max_length=20)),
+                ('priority', models.PositiveSmallIntegerField(db_column='priority')),
+                ('product_id', models.CharField(db_column='product_id', max_length=20)),
+                ('product_name', models.CharField(db_column='product_name', max_length=255)),
+                ('category_name', models.CharField(db_column='category_name', max_length=100)),
+                ('current_stock', models.IntegerField(blank=True, db_column='current_stock', null=True)),
+                ('threshold', models.IntegerField(blank=True, db_column='threshold', null=True)),
+                ('expiry_date', models.DateField(blank=True, db_column='expiry_date', null=True)),
+                ('on_hand', models.IntegerField(blank=True, db_column='on_hand', null=True)),
+                ('batch', models.ForeignKey(blank=True, db_column='batch_id', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='inventory_system.productbatch', to_field='batch_id')),
+                ('stock', models.ForeignKey(db_column='stock_id', on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='inventory_system.productstocks', to_field='stock_id')),
+            ],
+            options={
+                'db_table': 'inventory_alert',
+                'ordering': ['priority', 'product_name'],
+                'indexes': [models.Index(fields=['priority', 'product_name'], name='inventory_alert_priority_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:22
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Fill the new counters from the existing order items and receipts"""
+    Order = apps.get_model('inventory_system', 'Order')
+    OrderItem = apps.get_model('inventory_system', 'OrderItem')
+    ReceiveOrder = apps.get_model('inventory_system', 'ReceiveOrder')
+
+    OrderItem.objects.update(quantity_received=Coalesce(Subquery(
+        ReceiveOrder.objects.filter(order_item=OuterRef('order_item_id')).values('order_item').annotate(
+            total=Sum('quantity_received')
+        ).values('total')
+    ), 0))
+    Order.objects.update(
+        total_ordered=Coalesce(Subquery(
+            OrderItem.objects.filter(order=OuterRef('order_id')).values('order').annotate(
+                total=Sum('quantity_ordered')
+            ).values('total')
+        ), 0),
+        total_received=Coalesce(Subquery(
+            ReceiveOrder.objects.filter(order=OuterRef('order_id')).values('order').annotate(
+                total=Sum('quantity_received')
+            ).values('total')
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0025_inventoryalert'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='total_ordered',
+            field=models.PositiveIntegerField(db_column='total_ordered', default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_received',
+            field=models.PositiveIntegerField(db_column='total_received', default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='quantity_received',
+            field=models.PositiveIntegerField(db_column='quantity_received', default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
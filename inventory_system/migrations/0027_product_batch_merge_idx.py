@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0026_order_received_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productbatch',
+            index=models.Index(fields=['product_stock', 'status', 'expiry_date'], name='product_batch_merge_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0027_product_batch_merge_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['date_ordered', 'order_id'], name='order_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('status', 'Archived'), _negated=True), fields=['product_id'], name='product_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productbatch',
+            index=models.Index(condition=models.Q(('on_hand__gt', 0)), fields=['batch_id'], name='product_batch_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productbatch',
+            index=models.Index(condition=models.Q(('on_hand__gt', 0)), fields=['product_stock', 'expiry_date', 'batch_id'], name='product_batch_fefo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productstocks',
+            index=models.Index(fields=['status'], name='product_stocks_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receiveorder',
+            index=models.Index(fields=['date_received', 'receive_order_id'], name='receive_order_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(condition=models.Q(('status', 'Archived'), _negated=True), fields=['supplier_id'], name='supplier_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['date_of_transaction', 'transaction_id'], name='transaction_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['transaction_type', 'date_of_transaction', 'transaction_id'], name='transaction_type_date_idx'),
+        ),
+    ]
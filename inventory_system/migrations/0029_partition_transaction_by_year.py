@@ -0,0 +1,90 @@
+"""
+Store the transaction ledger in yearly PostgreSQL range partitions on
+date_of_transaction: transaction_y2025, transaction_y2026, ... through next
+year, plus transaction_default for rows outside them. Nothing happens on other
+backends.
+
+PostgreSQL requires the unique constraints of a partitioned table to include
+the partition key, so the primary key becomes (transaction_code,
+date_of_transaction) and the transaction_id constraint becomes (transaction_id,
+date_of_transaction). Codes stay unique: they come from the id_sequence
+counters. Constraint and index names are kept, so later migrations still find
+them.
+"""
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = 'transaction'
+PARTITION_KEY = 'date_of_transaction'
+
+
+def _rebuild(schema_editor, partitioned):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    quote = connection.ops.quote_name
+    table, old = quote(TABLE), quote(f'{TABLE}_unpartitioned')
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')",
+            [table]
+        )
+        constraints = cursor.fetchall()
+        constraint_names = {name for name, _, _ in constraints}
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+            [TABLE]
+        )
+        indexes = [definition for name, definition in cursor.fetchall() if name not in constraint_names]
+        cursor.execute(f'SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}) FROM {table}')
+        first, last = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        if partitioned:
+            cursor.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({PARTITION_KEY})')
+            this_year = timezone.now().year
+            start = min(first.year, this_year) if first else this_year
+            end = max(last.year, this_year + 1) if last else this_year + 1
+            for year in range(start, end + 1):
+                cursor.execute(
+                    f"CREATE TABLE {quote(f'{TABLE}_y{year}')} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{year}-01-01 00:00:00+00') TO ('{year + 1}-01-01 00:00:00+00')"
+                )
+            cursor.execute(f"CREATE TABLE {quote(f'{TABLE}_default')} PARTITION OF {table} DEFAULT")
+        else:
+            cursor.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        cursor.execute(f'DROP TABLE {old}')
+
+        for name, kind, definition in constraints:
+            if kind in ('p', 'u'):
+                if partitioned and PARTITION_KEY not in definition:
+                    definition = f'{definition[:-1]}, {PARTITION_KEY})'
+                elif not partitioned:
+                    definition = definition.replace(f', {PARTITION_KEY})', ')')
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition}')
+        for definition in indexes:
+            cursor.execute(definition)
+
+
+def partition_ledger(apps, schema_editor):
+    _rebuild(schema_editor, partitioned=True)
+
+
+def unpartition_ledger(apps, schema_editor):
+    _rebuild(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0028_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_ledger, unpartition_ledger),
+    ]
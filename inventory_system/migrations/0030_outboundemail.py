@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:47
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0029_partition_transaction_by_year'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('email_code', models.UUIDField(db_column='email_code', default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(db_column='kind', max_length=30)),
+                ('to_email', models.EmailField(db_column='to_email', max_length=254)),
+                ('subject', models.CharField(db_column='subject', max_length=255)),
+                ('body', models.TextField(db_column='body')),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Sending', 'Sending'), ('Sent', 'Sent'), ('Failed', 'Failed'), ('Expired', 'Expired')], db_column='status', default='Pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(db_column='attempts', default=0)),
+                ('next_attempt_at', models.DateTimeField(db_column='next_attempt_at', default=django.utils.timezone.now)),
+                ('claimed_at', models.DateTimeField(blank=True, db_column='claimed_at', null=True)),
+                ('expires_at', models.DateTimeField(blank=True, db_column='expires_at', null=True)),
+                ('last_error', models.TextField(blank=True, db_column='last_error', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='created_at')),
+                ('sent_at', models.DateTimeField(blank=True, db_column='sent_at', null=True)),
+            ],
+            options={
+                'db_table': 'outbound_email',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:51
+"""
+Create the change_log table and the triggers that fill it.
+
+Every insert and delete on product, product_stocks, product_batch and
+transaction, and every update that changes one of the columns the change feed
+exposes, writes a change_log row in the same transaction. Triggers are used
+instead of signals because the service layer changes stock with
+bulk_create/update(), which send no signals. PostgreSQL and SQLite only.
+"""
+import django.utils.timezone
+from django.db import migrations, models
+
+# table -> (entity, key column, columns whose change is recorded)
+CAPTURED_TABLES = {
+    'product': ('product', 'product_id', [
+        'brand_name', 'generic_name', 'product_name', 'price', 'unit_of_measurement', 'status',
+    ]),
+    'product_stocks': ('stock', 'stock_id', ['product_id', 'total_on_hand', 'status']),
+    'product_batch': ('batch', 'batch_id', ['stock_id', 'on_hand', 'expiry_date', 'status']),
+    'transaction': ('transaction', 'transaction_id', [
+        'transaction_type', 'product_id', 'batch_id', 'quantity_change', 'on_hand', 'date_of_transaction',
+    ]),
+}
+
+PG_FUNCTION = """
+CREATE OR REPLACE FUNCTION change_log_capture() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    row_data jsonb;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+    INSERT INTO change_log (txid, entity, object_key, operation, created_at)
+    VALUES (
+        txid_current(), TG_ARGV[0], row_data ->> TG_ARGV[1],
+        CASE WHEN TG_OP = 'DELETE' THEN 'delete' ELSE 'upsert' END, now()
+    );
+    RETURN NULL;
+END
+$$
+"""
+
+
+def _changed(columns, key, distinct):
+    return ' OR '.join(f'OLD."{column}" {distinct} NEW."{column}"' for column in [key, *columns])
+
+
+def _postgresql_sql(table, entity, key, columns):
+    arguments = f"'{entity}', '{key}'"
+    return [
+        f'CREATE TRIGGER change_log_{table}_write AFTER INSERT OR DELETE ON "{table}" '
+        f'FOR EACH ROW EXECUTE FUNCTION change_log_capture({arguments})',
+        f'CREATE TRIGGER change_log_{table}_update AFTER UPDATE ON "{table}" '
+        f'FOR EACH ROW WHEN ({_changed(columns, key, "IS DISTINCT FROM")}) '
+        f'EXECUTE FUNCTION change_log_capture({arguments})',
+    ]
+
+
+def _sqlite_sql(table, entity, key, columns):
+    insert = (
+        "INSERT INTO change_log (txid, entity, object_key, operation, created_at) "
+        "VALUES (0, '{entity}', {row}.\"{key}\", '{operation}', strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+    )
+    return [
+        f'CREATE TRIGGER change_log_{table}_insert AFTER INSERT ON "{table}" '
+        f'BEGIN {insert.format(entity=entity, row="NEW", key=key, operation="upsert")}; END',
+        f'CREATE TRIGGER change_log_{table}_update AFTER UPDATE ON "{table}" '
+        f'WHEN {_changed(columns, key, "IS NOT")} '
+        f'BEGIN {insert.format(entity=entity, row="NEW", key=key, operation="upsert")}; END',
+        f'CREATE TRIGGER change_log_{table}_delete AFTER DELETE ON "{table}" '
+        f'BEGIN {insert.format(entity=entity, row="OLD", key=key, operation="delete")}; END',
+    ]
+
+
+def create_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = [PG_FUNCTION]
+        for table, (entity, key, columns) in CAPTURED_TABLES.items():
+            statements += _postgresql_sql(table, entity, key, columns)
+    elif vendor == 'sqlite':
+        statements = []
+        for table, (entity, key, columns) in CAPTURED_TABLES.items():
+            statements += _sqlite_sql(table, entity, key, columns)
+    else:
+        return
+
+    for sql in statements:
+        schema_editor.execute(sql, params=None)
+
+
+def drop_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for table in CAPTURED_TABLES:
+            for suffix in ('write', 'update'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS change_log_{table}_{suffix} ON "{table}"', params=None)
+        schema_editor.execute('DROP FUNCTION IF EXISTS change_log_capture()', params=None)
+    elif vendor == 'sqlite':
+        for table in CAPTURED_TABLES:
+            for suffix in ('insert', 'update', 'delete'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS change_log_{table}_{suffix}', params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0030_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('change_id', models.BigAutoField(db_column='change_id', primary_key=True, serialize=False)),
+                ('txid', models.BigIntegerField(db_column='txid', default=0)),
+                ('entity', models.CharField(db_column='entity', max_length=20)),
+                ('object_key', models.CharField(db_column='object_key', max_length=40)),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete'), ('reset', 'Reset')], db_column='operation', max_length=10)),
+                ('created_at', models.DateTimeField(db_column='created_at', default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'change_log',
+                'indexes': [models.Index(fields=['txid', 'change_id'], name='change_log_cursor_idx')],
+            },
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
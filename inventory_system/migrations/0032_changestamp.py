@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory_system', '0031_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeStamp',
+            fields=[
+                ('name', models.CharField(db_column='name', max_length=50, primary_key=True, serialize=False)),
+                ('stamped_at', models.DateTimeField(db_column='stamped_at')),
+            ],
+            options={
+                'db_table': 'change_stamp',
+            },
+        ),
+    ]
@@ -1,5 +1,5 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -10,20 +10,21 @@ import string
 
 from decimal import Decimal, ROUND_HALF_UP
 
-def generate_code(model, field_name, prefix, length=5):
-    last_entry = model.objects.order_by(f"-{field_name}").first()
+def generate_code(model, field_name, prefix, length=5, block_size=None):
+    """Return the next code for prefix (e.g. PRD-00001) from the id_sequence counters table"""
+    from .services.sequence_service import SequenceService
+    return SequenceService.next_code(model, field_name, prefix, length=length, block_size=block_size)
 
-    if not last_entry:
-        new_number = 1
-    else:
-        last_id = getattr(last_entry, field_name)
-        try:
-            last_number = int(last_id.replace(prefix, ""))
-            new_number = last_number + 1
-        except ValueError:
-            new_number = 1
+class IdSequence(models.Model):
+    """Last number handed out per code prefix, used by generate_code"""
+    name = models.CharField(max_length=50, primary_key=True, db_column='name')
+    last_value = models.BigIntegerField(default=0, db_column='last_value')
 
-    return f"{prefix}{str(new_number).zfill(length)}"
+    def __str__(self):
+        return f"{self.name}{self.last_value}"
+
+    class Meta:
+        db_table = 'id_sequence'
 
 class Category(models.Model):
     category_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='category_code')
@@ -148,6 +149,10 @@ class Product(models.Model):
 
     class Meta:
         db_table = 'product'
+        indexes = [
+            # Active product list (exclude Archived, newest code first) and the dashboard count
+            models.Index(fields=['product_id'], condition=~models.Q(status='Archived'), name='product_active_idx'),
+        ]
 
 class Supplier(models.Model):
     supplier_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='supplier_code')
@@ -187,6 +192,9 @@ class Supplier(models.Model):
 
     class Meta:
         db_table = 'supplier'
+        indexes = [
+            models.Index(fields=['supplier_id'], condition=~models.Q(status='Archived'), name='supplier_active_idx'),
+        ]
 
 class ArchiveLog(models.Model):
 
@@ -232,22 +240,7 @@ class SupplierProduct(models.Model):
     def save(self, *args, **kwargs):
         if not self.supplier_product_id:
             prefix = f"{self.supplier.supplier_id}-{self.product.product_id}-"
-            last_obj = SupplierProduct.objects.filter(
-                supplier=self.supplier,
-                product=self.product,
-                supplier_product_id__startswith=prefix
-            ).order_by("-supplier_product_id").first()
-
-            if not last_obj:
-                new_number = 1
-            else:
-                last_id = last_obj.supplier_product_id.replace(prefix, "")
-                try:
-                    new_number = int(last_id) + 1
-                except ValueError:
-                    new_number = 1
-
-            self.supplier_product_id = f"{prefix}{str(new_number).zfill(5)}"
+            self.supplier_product_id = generate_code(SupplierProduct, 'supplier_product_id', prefix, block_size=1)
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -279,21 +272,7 @@ class ProductStocks(models.Model):
     def save(self, *args, **kwargs):
         if not self.stock_id:
             prefix = f"{self.product.product_id}-STK-"
-            last_obj = ProductStocks.objects.filter(
-                product=self.product,
-                stock_id__startswith=prefix
-            ).order_by("-stock_id").first()
-
-            if not last_obj:
-                new_number = 1
-            else:
-                last_id = last_obj.stock_id.replace(prefix, "")
-                try:
-                    new_number = int(last_id) + 1
-                except ValueError:
-                    new_number = 1
-
-            self.stock_id = f"{prefix}{str(new_number).zfill(5)}"
+            self.stock_id = generate_code(ProductStocks, 'stock_id', prefix, block_size=1)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -301,6 +280,10 @@ class ProductStocks(models.Model):
 
     class Meta:
         db_table = 'product_stocks'
+        indexes = [
+            # Stock status widget (GROUP BY status)
+            models.Index(fields=['status'], name='product_stocks_status_idx'),
+        ]
 
 class ProductBatch(models.Model):
     batch_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='batch_code')
@@ -327,29 +310,30 @@ class ProductBatch(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.batch_id:
-            prefix = f"{self.product_stock.product.product_id}-BAT-"
-            last_obj = ProductBatch.objects.filter(
-                product_stock__product=self.product_stock.product,
-                batch_id__startswith=prefix
-            ).order_by("-batch_id").first()
-
-            if not last_obj:
-                new_number = 1
-            else:
-                last_id = last_obj.batch_id.replace(prefix, "")
-                try:
-                    new_number = int(last_id) + 1
-                except ValueError:
-                    new_number = 1
-
-            self.batch_id = f"{prefix}{str(new_number).zfill(5)}"
-        super().save(*args, **kwargs)
+            prefix = f"{self.product_stock.product_id}-BAT-"
+            self.batch_id = generate_code(ProductBatch, 'batch_id', prefix, block_size=1)
+        # The signals re-read the old row under a lock and apply the on_hand delta
+        # to the stock total: both must share the transaction of the write
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.batch_id} - {self.product_stock.product.brand_name}"
 
     class Meta:
         db_table = 'product_batch'
+        indexes = [
+            # Merge-candidate lookup in InventoryService.create_or_update_product_batch
+            models.Index(fields=['product_stock', 'status', 'expiry_date'], name='product_batch_merge_idx'),
+            # Batch list (on_hand > 0, keyset on batch_id)
+            models.Index(fields=['batch_id'], condition=models.Q(on_hand__gt=0), name='product_batch_available_idx'),
+            # FEFO dispense candidates
+            models.Index(
+                fields=['product_stock', 'expiry_date', 'batch_id'],
+                condition=models.Q(on_hand__gt=0),
+                name='product_batch_fefo_idx',
+            ),
+        ]
 
 class Order(models.Model):
     STATUS_CHOICES = [
@@ -366,23 +350,14 @@ class Order(models.Model):
     date_received = models.DateTimeField(blank=True, null=True, db_column='date_received')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending', db_column='status')
 
+    # Maintained counters (see OrderService.apply_ordered_delta / apply_receive_delta)
+    total_ordered = models.PositiveIntegerField(default=0, editable=False, db_column='total_ordered')
+    total_received = models.PositiveIntegerField(default=0, editable=False, db_column='total_received')
+
     def save(self, *args, **kwargs):
         if not self.order_id:
             year = timezone.now().year
-            prefix = f"ORD-{year}-"
-            last_entry = Order.objects.filter(order_id__startswith=prefix).order_by("-order_id").first()
-
-            if not last_entry:
-                new_number = 1
-            else:
-                last_id = last_entry.order_id
-                try:
-                    last_number = int(last_id.replace(prefix, ""))
-                    new_number = last_number + 1
-                except ValueError:
-                    new_number = 1
-
-            self.order_id = f"{prefix}{str(new_number).zfill(5)}"
+            self.order_id = generate_code(Order, 'order_id', f"ORD-{year}-")
 
         super().save(*args, **kwargs)
 
@@ -391,6 +366,10 @@ class Order(models.Model):
 
     class Meta:
         db_table = 'order'
+        indexes = [
+            # Order list (keyset on -date_ordered, -order_id)
+            models.Index(fields=['date_ordered', 'order_id'], name='order_date_idx'),
+        ]
 
 class OrderItem(models.Model):
     order_item_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='order_item_code')
@@ -417,6 +396,8 @@ class OrderItem(models.Model):
         to_field='supplier_id')
     
     quantity_ordered = models.PositiveIntegerField(db_column='quantity_ordered')
+    # Sum of ReceiveOrder.quantity_received, maintained by OrderService.apply_receive_delta
+    quantity_received = models.PositiveIntegerField(default=0, editable=False, db_column='quantity_received')
 
     def save(self, *args, **kwargs):
         if not self.order_item_id:
@@ -465,6 +446,10 @@ class ReceiveOrder(models.Model):
     
     class Meta:
         db_table = 'receive_order'
+        indexes = [
+            # Receive list and export, newest/oldest first
+            models.Index(fields=['date_received', 'receive_order_id'], name='receive_order_date_idx'),
+        ]
 
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
@@ -473,6 +458,8 @@ class Transaction(models.Model):
         ('ADJ', 'Stock Adjustment'),
     ]
 
+    # Partitioned on PostgreSQL (migration 0029): the database enforces the codes only together with
+    # date_of_transaction, so they are unique by construction (UUID4 here, id_sequence for transaction_id)
     transaction_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='transaction_code')
     transaction_id = models.CharField(max_length=20, unique=True, editable=False, db_column='transaction_id')
     transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPES, db_column='transaction_type')
@@ -499,20 +486,7 @@ class Transaction(models.Model):
     def save(self, *args, **kwargs):
         if not self.transaction_id:
             year = timezone.now().year
-            prefix = f"TXN-{year}-"
-            last_entry = Transaction.objects.filter(transaction_id__startswith=prefix).order_by("-transaction_id").first()
-
-            if not last_entry:
-                new_number = 1
-            else:
-                last_id = last_entry.transaction_id
-                try:
-                    last_number = int(last_id.replace(prefix, ""))
-                    new_number = last_number + 1
-                except ValueError:
-                    new_number = 1
-
-            self.transaction_id = f"{prefix}{str(new_number).zfill(5)}"
+            self.transaction_id = generate_code(Transaction, 'transaction_id', f"TXN-{year}-")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -520,6 +494,87 @@ class Transaction(models.Model):
 
     class Meta:
         db_table = 'transaction'
+        indexes = [
+            # Transaction list (keyset on -date_of_transaction, -transaction_id) and date-range exports
+            models.Index(fields=['date_of_transaction', 'transaction_id'], name='transaction_date_idx'),
+            # Exports filtered by type, in date order
+            models.Index(
+                fields=['transaction_type', 'date_of_transaction', 'transaction_id'],
+                name='transaction_type_date_idx',
+            ),
+        ]
+
+class InventoryAlert(models.Model):
+    """
+    Precomputed low stock / out of stock / near expiry / expired alert.
+    One row per alerting stock or batch, maintained by AlertService and read by /api/alerts/.
+    """
+    ALERT_TYPES = [
+        ('expired', 'Expired'),
+        ('out_of_stock', 'Out of Stock'),
+        ('near_expiry', 'Near Expiry'),
+        ('low_stock', 'Low Stock'),
+    ]
+
+    SEVERITY_CHOICES = [
+        ('critical', 'Critical'),
+        ('warning', 'Warning'),
+    ]
+
+    alert_id = models.CharField(max_length=60, primary_key=True, db_column='alert_id')
+    alert_type = models.CharField(max_length=20, choices=ALERT_TYPES, db_column='alert_type')
+    severity = models.CharField(max_length=20, choices=SEVERITY_CHOICES, db_column='severity')
+    priority = models.PositiveSmallIntegerField(db_column='priority')
+
+    stock = models.ForeignKey(
+        ProductStocks,
+        on_delete=models.CASCADE,
+        db_column='stock_id',
+        to_field='stock_id',
+        related_name='alerts'
+    )
+    batch = models.ForeignKey(
+        ProductBatch,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='batch_id',
+        to_field='batch_id',
+        related_name='alerts'
+    )
+    product_id = models.CharField(max_length=20, db_column='product_id')
+    product_name = models.CharField(max_length=255, db_column='product_name')
+    category_name = models.CharField(max_length=100, db_column='category_name')
+
+    current_stock = models.IntegerField(null=True, blank=True, db_column='current_stock')
+    threshold = models.IntegerField(null=True, blank=True, db_column='threshold')
+    expiry_date = models.DateField(null=True, blank=True, db_column='expiry_date')
+    on_hand = models.IntegerField(null=True, blank=True, db_column='on_hand')
+
+    def __str__(self):
+        return f"{self.alert_type} - {self.product_name}"
+
+    class Meta:
+        db_table = 'inventory_alert'
+        ordering = ['priority', 'product_name']
+        indexes = [
+            models.Index(fields=['priority', 'product_name'], name='inventory_alert_priority_idx'),
+        ]
+
+class ChangeStamp(models.Model):
+    """
+    When a shared, derived view of the inventory last changed, e.g. the day the
+    alert table was rebuilt. Kept in the database so every worker process sees
+    the same stamps.
+    """
+    name = models.CharField(max_length=50, primary_key=True, db_column='name')
+    stamped_at = models.DateTimeField(db_column='stamped_at')
+
+    def __str__(self):
+        return f"{self.name} @ {self.stamped_at}"
+
+    class Meta:
+        db_table = 'change_stamp'
 
 class UserInformation(models.Model):
     """
@@ -629,3 +684,71 @@ class OTP(models.Model):
     
     def __str__(self):
         return f"OTP for {self.user.username} - {'Valid' if self.is_valid() else 'Invalid'}"
+
+
+class OutboundEmail(models.Model):
+    """
+    Queued outgoing email (OTP codes, password reset notices).
+    Sent by MailQueueService after the request commits, retried with backoff.
+    """
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Sending', 'Sending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+        ('Expired', 'Expired'),
+    ]
+
+    email_code = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, db_column='email_code')
+    kind = models.CharField(max_length=30, db_column='kind')
+    to_email = models.EmailField(db_column='to_email')
+    subject = models.CharField(max_length=255, db_column='subject')
+    body = models.TextField(db_column='body')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending', db_column='status')
+    attempts = models.PositiveIntegerField(default=0, db_column='attempts')
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_column='next_attempt_at')
+    claimed_at = models.DateTimeField(null=True, blank=True, db_column='claimed_at')
+    # Not worth sending after this (e.g. the OTP inside has expired)
+    expires_at = models.DateTimeField(null=True, blank=True, db_column='expires_at')
+    last_error = models.TextField(null=True, blank=True, db_column='last_error')
+    created_at = models.DateTimeField(auto_now_add=True, db_column='created_at')
+    sent_at = models.DateTimeField(null=True, blank=True, db_column='sent_at')
+
+    def __str__(self):
+        return f"{self.kind} to {self.to_email} ({self.status})"
+
+    class Meta:
+        db_table = 'outbound_email'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
+
+
+class ChangeLog(models.Model):
+    """
+    Change feed of products, stocks, batches and transactions.
+    Rows are written by database triggers (migration 0031) in the same
+    transaction as the change; read by ChangeFeedService for /api/changes/.
+    """
+    OPERATION_CHOICES = [
+        ('upsert', 'Upsert'),
+        ('delete', 'Delete'),
+        ('reset', 'Reset'),
+    ]
+
+    change_id = models.BigAutoField(primary_key=True, db_column='change_id')
+    # Writing transaction id (txid_current() on PostgreSQL, 0 elsewhere); cursors order by (txid, change_id)
+    txid = models.BigIntegerField(default=0, db_column='txid')
+    entity = models.CharField(max_length=20, db_column='entity')
+    object_key = models.CharField(max_length=40, db_column='object_key')
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES, db_column='operation')
+    created_at = models.DateTimeField(default=timezone.now, db_column='created_at')
+
+    def __str__(self):
+        return f"{self.operation} {self.entity} {self.object_key}"
+
+    class Meta:
+        db_table = 'change_log'
+        indexes = [
+            models.Index(fields=['txid', 'change_id'], name='change_log_cursor_idx'),
+        ]
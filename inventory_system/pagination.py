@@ -0,0 +1,36 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on each viewset's stable ordering.
+
+    Every list response is a page: {"next": ..., "previous": ..., "results": [...]}
+    of page_size rows (?page_size= up to max_page_size). Screens fetch the page
+    they show and follow `next`/`previous` on demand (static/utils/pagination.js:
+    createCursorPager); exports that need the whole list use fetchAllPages.
+
+    DRF keys the cursor on the first ordering field only: the next page is
+    WHERE <first field> < <its value on the last row> (> when ascending), plus
+    an offset past the rows of the previous page that share that value. No
+    OFFSET over the whole table, so page latency stays flat as it grows.
+
+    Usage: GET /api/transactions/?page_size=100, then follow `next`.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-pk'
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Use the view's cursor_ordering, e.g. ('-date_of_transaction', '-transaction_id').
+
+        The first field is the cursor key: it must never change once a row is
+        written, and rows sharing a value are walked by offset, so it should be
+        (nearly) unique. End with a unique field so the order is total.
+        """
+        ordering = getattr(view, 'cursor_ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
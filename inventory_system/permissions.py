@@ -170,3 +170,22 @@ class TransactionPermission(permissions.BasePermission):
                 return True
         
         return False
+
+
+class DispensePermission(permissions.BasePermission):
+    """
+    Dispensing stock (POS checkout)
+    Admin, Staff and Clerk can dispense
+    """
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        
+        # Superusers always have access
+        if request.user.is_superuser:
+            return True
+        
+        if hasattr(request.user, 'user_information'):
+            return request.user.user_information.role in ['Admin', 'Staff', 'Clerk']
+        
+        return False
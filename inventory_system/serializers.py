@@ -339,9 +339,21 @@ class ProductStocksSerializer(serializers.ModelSerializer):
     def get_product_name(self, obj):
         return f"{obj.product.brand_name} {obj.product.generic_name}"
     
+    @staticmethod
+    def get_active_batches(obj):
+        """
+        Batches with on_hand > 0, shared by get_batches and get_status.
+        Uses the `active_batches` prefetch from ProductStocksViewSet when present.
+        """
+        active_batches = getattr(obj, 'active_batches', None)
+        if active_batches is None:
+            active_batches = list(obj.productbatch_set.filter(on_hand__gt=0).order_by('batch_id'))
+            obj.active_batches = active_batches
+        return active_batches
+    
     def get_batches(self, obj):
         """Return only batches with on_hand > 0 (hide depleted batches from UI)"""
-        active_batches = obj.productbatch_set.filter(on_hand__gt=0)
+        active_batches = self.get_active_batches(obj)
         return ProductBatchSerializer(active_batches, many=True).data
     
     def get_status(self, obj):
@@ -362,9 +374,9 @@ class ProductStocksSerializer(serializers.ModelSerializer):
         low_stock_threshold = product.low_stock_threshold
         
         # Only consider batches with stock > 0
-        batches = obj.productbatch_set.filter(on_hand__gt=0)
+        batches = self.get_active_batches(obj)
         
-        if not batches.exists():
+        if not batches:
             return 'Out of Stock'
         
         # Calculate total on hand (only from active batches)
@@ -396,12 +408,13 @@ class OrderItemSerializer(serializers.ModelSerializer):
     # Read-only display fields
     brand_name = serializers.CharField(source='product.brand_name', read_only=True)
     generic_name = serializers.CharField(source='product.generic_name', read_only=True)
-    product_id = serializers.CharField(source='product.product_id', read_only=True)
+    # FK columns hold the human-readable IDs, so these need no join
+    product_id = serializers.CharField(read_only=True)
     product_name = serializers.SerializerMethodField()
     supplier_name = serializers.CharField(source='supplier.supplier_name', read_only=True)
-    supplier_id = serializers.CharField(source='supplier.supplier_id', read_only=True)
-    order_id = serializers.CharField(source='order.order_id', read_only=True)
-    quantity_received = serializers.SerializerMethodField()
+    supplier_id = serializers.CharField(read_only=True)
+    order_id = serializers.CharField(read_only=True)
+    quantity_received = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = OrderItem
@@ -429,17 +442,6 @@ class OrderItemSerializer(serializers.ModelSerializer):
     def get_product_name(self, obj):
         return f"{obj.product.brand_name} {obj.product.generic_name}"
     
-    def get_quantity_received(self, obj):
-        """Calculate total quantity received so far for this order item"""
-        from django.db.models import Sum
-        from .models import ReceiveOrder
-        
-        total = ReceiveOrder.objects.filter(
-            order_item=obj
-        ).aggregate(Sum('quantity_received'))['quantity_received__sum']
-        
-        return total or 0
-
     def validate_quantity_ordered(self, value):
         if value <= 0:
             raise serializers.ValidationError("Quantity ordered must be greater than 0.")
@@ -460,17 +462,23 @@ class OrderSerializer(serializers.ModelSerializer):
             'status',
             'items',
             'total_items',
+            'total_ordered',
+            'total_received',
         ]
+        read_only_fields = ['total_ordered', 'total_received']
 
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
         order = super().create(validated_data)
         for item_data in items_data:
             OrderItem.objects.create(order=order, **item_data)
+        # Counters were updated by the OrderItem signals
+        order.refresh_from_db(fields=['total_ordered', 'total_received'])
         return order
 
     def get_total_items(self, obj):
-        return obj.items.count()
+        # len() uses the prefetched items when the view prefetched them
+        return len(obj.items.all())
 
     def get_date_ordered(self, obj):
         """Format date_ordered to readable format"""
@@ -527,10 +535,8 @@ class ReceiveOrderSerializer(serializers.ModelSerializer):
                 # Lock the order_item row to prevent concurrent modifications
                 locked_order_item = OrderItem.objects.select_for_update().get(pk=order_item.pk)
                 
-                # Get total already received for this order item (with lock held)
-                total_received = ReceiveOrder.objects.filter(
-                    order_item=locked_order_item
-                ).aggregate(models.Sum('quantity_received'))['quantity_received__sum'] or 0
+                # Total already received for this order item (maintained counter, read under the lock)
+                total_received = locked_order_item.quantity_received
                 
                 # Add current quantity to total
                 if not self.instance:  # Creating new
@@ -554,6 +560,28 @@ class ReceiveOrderSerializer(serializers.ModelSerializer):
         
         return data
     
+class BulkReceiveItemSerializer(serializers.Serializer):
+    """
+    One line of a bulk receive request.
+    Order and order item are plain IDs here - ReceiveService resolves and locks them in bulk.
+    """
+    order = serializers.CharField()
+    order_item = serializers.CharField()
+    quantity_received = serializers.IntegerField(min_value=0)
+    received_by = serializers.CharField()
+    date_received = serializers.DateTimeField(required=False)
+    expiry_date = serializers.DateField(required=False, allow_null=True)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    transaction_remarks = serializers.CharField(required=False, allow_blank=True)
+    transaction_performed_by = serializers.CharField(required=False, allow_blank=True)
+
+class DispenseSerializer(serializers.Serializer):
+    """Dispense request: product and quantity; batches are chosen server-side (FEFO)"""
+    product = serializers.CharField()
+    quantity = serializers.IntegerField(min_value=1)
+    performed_by = serializers.CharField(required=False, allow_blank=True)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
 class TransactionSerializer(serializers.ModelSerializer):
     product_id = serializers.CharField(source='product.product_id', read_only=True)
     product_name = serializers.SerializerMethodField()
@@ -0,0 +1,257 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import ChangeStamp, InventoryAlert, ProductBatch, ProductStocks
+from .event_service import EventService
+
+
+class AlertService:
+    """
+    Maintains the inventory_alert table behind /api/alerts/
+
+    Alerts are rebuilt per stock whenever its batches change, and fully once a
+    day (near expiry / expired depend on the date). Both run in a transaction
+    holding the row locks of the stocks concerned, so a refresh and the daily
+    rebuild never interleave their deletes and inserts. The day of the last
+    rebuild is a ChangeStamp row, shared by every process.
+
+    Low Stock: ProductStocks where total_on_hand <= product.low_stock_threshold
+    Out of Stock: ProductStocks where total_on_hand = 0
+    Near Expiry: ProductBatch where expiry_date <= today + product.expiry_threshold_days
+    Expired: ProductBatch where expiry_date < today
+    """
+
+    # Sort order: critical first, then warning; within severity by type
+    ALERT_PRIORITY = {'expired': 0, 'out_of_stock': 1, 'near_expiry': 2, 'low_stock': 3}
+    ALERT_SEVERITY = {'expired': 'critical', 'out_of_stock': 'critical', 'near_expiry': 'warning', 'low_stock': 'warning'}
+
+    REBUILT_STAMP = 'inventory_alerts:rebuilt'
+
+    @staticmethod
+    def _alert(alert_type, alert_id, stock, product, **fields):
+        return InventoryAlert(
+            alert_id=alert_id,
+            alert_type=alert_type,
+            severity=AlertService.ALERT_SEVERITY[alert_type],
+            priority=AlertService.ALERT_PRIORITY[alert_type],
+            stock_id=stock.stock_id,
+            product_id=product.product_id,
+            product_name=product.product_name or f"{product.brand_name} - {product.generic_name}",
+            category_name=product.category.category_name if product.category else 'N/A',
+            **fields
+        )
+
+    @staticmethod
+    def build_alerts(stocks, batches, today):
+        """Return unsaved InventoryAlert rows for the given stocks and batches"""
+        alerts = []
+
+        for stock in stocks:
+            product = stock.product
+
+            if stock.total_on_hand == 0:
+                alerts.append(AlertService._alert(
+                    'out_of_stock', f'out-{stock.stock_id}', stock, product,
+                    current_stock=0,
+                    threshold=product.low_stock_threshold,
+                ))
+            elif stock.total_on_hand <= product.low_stock_threshold:
+                alerts.append(AlertService._alert(
+                    'low_stock', f'low-{stock.stock_id}', stock, product,
+                    current_stock=stock.total_on_hand,
+                    threshold=product.low_stock_threshold,
+                ))
+
+        for batch in batches:
+            stock = batch.product_stock
+            product = stock.product
+            expiry_threshold_date = today + timedelta(days=product.expiry_threshold_days)
+
+            if batch.expiry_date < today:
+                alert_type, alert_id = 'expired', f'expired-{batch.batch_id}'
+            elif batch.expiry_date <= expiry_threshold_date:
+                alert_type, alert_id = 'near_expiry', f'near-expiry-{batch.batch_id}'
+            else:
+                continue
+
+            alerts.append(AlertService._alert(
+                alert_type, alert_id, stock, product,
+                batch_id=batch.batch_id,
+                expiry_date=batch.expiry_date,
+                on_hand=batch.on_hand,
+            ))
+
+        return alerts
+
+    @staticmethod
+    def _sources(stock_ids=None):
+        stocks = ProductStocks.objects.select_related('product__category').exclude(
+            product__status='Archived'
+        )
+        batches = ProductBatch.objects.select_related('product_stock__product__category').exclude(
+            product_stock__product__status='Archived'
+        ).filter(
+            on_hand__gt=0  # Only batches with stock
+        )
+        if stock_ids is not None:
+            stocks = stocks.filter(stock_id__in=stock_ids)
+            batches = batches.filter(product_stock__in=stock_ids)
+        return stocks, batches
+
+    @staticmethod
+    def refresh_stocks(stock_ids):
+        """Recompute the alerts of the given stocks (by stock_id)"""
+        stock_ids = [stock_id for stock_id in set(stock_ids) if stock_id]
+        if not stock_ids:
+            return
+
+        stocks, batches = AlertService._sources(stock_ids)
+        with transaction.atomic():
+            stocks = list(stocks.select_for_update(of=('self',)).order_by('stock_id'))
+            InventoryAlert.objects.filter(stock__in=stock_ids).delete()
+            InventoryAlert.objects.bulk_create(
+                AlertService.build_alerts(stocks, batches, timezone.now().date())
+            )
+
+        EventService.publish('stock', {'stocks': [
+            {
+                'stock_id': stock.stock_id,
+                'product_id': stock.product_id,
+                'total_on_hand': stock.total_on_hand,
+                'status': stock.status,
+            }
+            for stock in stocks
+        ]})
+        EventService.publish('alerts', AlertService.current_summary)
+
+    @staticmethod
+    def refresh_product(product):
+        """Recompute the alerts of every stock of product (name, thresholds or status changed)"""
+        AlertService.refresh_stocks(
+            ProductStocks.objects.filter(product=product).values_list('stock_id', flat=True)
+        )
+
+    @staticmethod
+    def _rebuilt_today(stamped_at):
+        return stamped_at is not None and stamped_at.date() == timezone.now().date()
+
+    @staticmethod
+    def rebuild_all(if_stale=False):
+        """
+        Rebuild the whole alert table (day rollover)
+
+        Args:
+            if_stale: Skip the rebuild when another request already did
+                      today's while this one waited for the lock
+        """
+        today = timezone.now().date()
+        stocks, batches = AlertService._sources()
+
+        with transaction.atomic():
+            ChangeStamp.objects.bulk_create(
+                [ChangeStamp(name=AlertService.REBUILT_STAMP, stamped_at=timezone.now() - timedelta(days=1))],
+                ignore_conflicts=True
+            )
+            stamp = ChangeStamp.objects.select_for_update().get(name=AlertService.REBUILT_STAMP)
+            if if_stale and AlertService._rebuilt_today(stamp.stamped_at):
+                return
+
+            # Stock rows in stock_id order, like refresh_stocks, so the two cannot deadlock
+            list(ProductStocks.objects.select_for_update().order_by('stock_id').values_list('pk', flat=True))
+            InventoryAlert.objects.all().delete()
+            InventoryAlert.objects.bulk_create(
+                AlertService.build_alerts(stocks.iterator(), batches.iterator(), today),
+                batch_size=1000
+            )
+            stamp.stamped_at = timezone.now()
+            stamp.save(update_fields=['stamped_at'])
+        EventService.publish('alerts', AlertService.current_summary)
+
+    @staticmethod
+    def _rebuilt_at():
+        return ChangeStamp.objects.filter(name=AlertService.REBUILT_STAMP).values_list('stamped_at', flat=True)
+
+    @staticmethod
+    def ensure_current():
+        """Rebuild the alert table if it has not been rebuilt today"""
+        if not AlertService._rebuilt_today(AlertService._rebuilt_at().first()):
+            AlertService.rebuild_all(if_stale=True)
+
+    @staticmethod
+    async def aensure_current():
+        """ensure_current() for async views; the (daily) rebuild runs in a worker thread"""
+        if not AlertService._rebuilt_today(await AlertService._rebuilt_at().afirst()):
+            await sync_to_async(AlertService.rebuild_all)(if_stale=True)
+
+    @staticmethod
+    def _summary_counts():
+        return {
+            'total': Count('pk'),
+            'critical': Count('pk', filter=Q(severity='critical')),
+            'warning': Count('pk', filter=Q(severity='warning')),
+            'low_stock': Count('pk', filter=Q(alert_type='low_stock')),
+            'out_of_stock': Count('pk', filter=Q(alert_type='out_of_stock')),
+            'near_expiry': Count('pk', filter=Q(alert_type='near_expiry')),
+            'expired': Count('pk', filter=Q(alert_type='expired')),
+        }
+
+    @staticmethod
+    def summary(alerts):
+        """Aggregated alert counts for a queryset, in one query"""
+        return alerts.aggregate(**AlertService._summary_counts())
+
+    @staticmethod
+    async def asummary(alerts):
+        return await alerts.aaggregate(**AlertService._summary_counts())
+
+    @staticmethod
+    def current_summary():
+        return AlertService.summary(InventoryAlert.objects.all())
+
+    @staticmethod
+    def to_dict(alert, today):
+        """Response format of /api/alerts/ (messages depend on today's date)"""
+        data = {
+            'id': alert.alert_id,
+            'type': alert.alert_type,
+            'severity': alert.severity,
+            'stock_id': alert.stock_id,
+            'product_id': alert.product_id,
+            'product_name': alert.product_name,
+        }
+
+        if alert.alert_type == 'out_of_stock':
+            data.update({
+                'message': 'Out of stock',
+                'current_stock': 0,
+                'threshold': alert.threshold,
+            })
+        elif alert.alert_type == 'low_stock':
+            data.update({
+                'message': f'Low stock: {alert.current_stock} remaining (threshold: {alert.threshold})',
+                'current_stock': alert.current_stock,
+                'threshold': alert.threshold,
+            })
+        elif alert.alert_type == 'expired':
+            data.update({
+                'batch_id': alert.batch_id,
+                'message': f'Expired on {alert.expiry_date.strftime("%b %d, %Y")}',
+                'expiry_date': alert.expiry_date.isoformat(),
+                'on_hand': alert.on_hand,
+            })
+        else:
+            days_until_expiry = (alert.expiry_date - today).days
+            data.update({
+                'batch_id': alert.batch_id,
+                'message': f'Expires in {days_until_expiry} days ({alert.expiry_date.strftime("%b %d, %Y")})',
+                'expiry_date': alert.expiry_date.isoformat(),
+                'days_until_expiry': days_until_expiry,
+                'on_hand': alert.on_hand,
+            })
+
+        data['category'] = alert.category_name
+        return data
@@ -0,0 +1,182 @@
+import logging
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models import ChangeLog, Product, ProductStocks, ProductBatch, Transaction
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeedService:
+    """
+    Incremental sync of products, stocks, batches and transactions
+
+    Triggers (migration 0031) append a change_log row for every change in the
+    same transaction, so the log is exactly as durable as the data. A cursor
+    is '<txid>-<change_id>' and the feed is read in (txid, change_id) order.
+    On PostgreSQL only changes of transactions older than every transaction
+    still running (txid < the snapshot's xmin) are served: a transaction that
+    started earlier but commits later can then never land behind a cursor a
+    client already holds. Changes are collapsed per object and answered with
+    the object's current compact state.
+    """
+
+    ZERO_CURSOR = (0, 0)
+    DEFAULT_LIMIT = 1000
+    MAX_LIMIT = 5000
+    RETENTION = timedelta(days=7)
+
+    # response key, model, key field, compact fields
+    ENTITIES = {
+        'product': ('products', Product, 'product_id', (
+            'product_id', 'brand_name', 'generic_name', 'product_name',
+            'price_per_unit', 'unit_of_measurement', 'status',
+        )),
+        'stock': ('stocks', ProductStocks, 'stock_id', ('stock_id', 'product_id', 'total_on_hand', 'status')),
+        'batch': ('batches', ProductBatch, 'batch_id', (
+            'batch_id', 'product_stock_id', 'on_hand', 'expiry_date', 'status',
+        )),
+        'transaction': ('transactions', Transaction, 'transaction_id', (
+            'transaction_id', 'transaction_type', 'product_id', 'batch_id',
+            'quantity_change', 'on_hand', 'date_of_transaction',
+        )),
+    }
+
+    _CURSOR_PATTERN = re.compile(r'^(\d+)-(\d+)$')
+
+    @staticmethod
+    def parse_cursor(value):
+        match = ChangeFeedService._CURSOR_PATTERN.match(value or '')
+        if not match:
+            raise ValidationError({'since': "Invalid cursor; use the 'cursor' of a previous response."})
+        return int(match.group(1)), int(match.group(2))
+
+    @staticmethod
+    def format_cursor(cursor):
+        return f'{cursor[0]}-{cursor[1]}'
+
+    @staticmethod
+    def _after(cursor):
+        txid, change_id = cursor
+        return Q(txid__gt=txid) | Q(txid=txid, change_id__gt=change_id)
+
+    @staticmethod
+    def _before(cursor):
+        txid, change_id = cursor
+        return Q(txid__lt=txid) | Q(txid=txid, change_id__lt=change_id)
+
+    @staticmethod
+    def _visible():
+        """Change log rows whose writing transaction can no longer commit behind them"""
+        changes = ChangeLog.objects.all()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+                changes = changes.filter(txid__lt=cursor.fetchone()[0])
+        return changes
+
+    @staticmethod
+    def head():
+        """Cursor of the newest visible change (ZERO_CURSOR when the log is empty)"""
+        newest = ChangeFeedService._visible().order_by('-txid', '-change_id').values_list('txid', 'change_id').first()
+        return newest or ChangeFeedService.ZERO_CURSOR
+
+    @staticmethod
+    def is_expired(cursor):
+        """
+        Whether changes after cursor may have been pruned or reset away
+
+        The client must then reload the full lists and continue from head().
+        """
+        oldest = ChangeLog.objects.order_by('txid', 'change_id').values_list('txid', 'change_id').first()
+        if oldest is None:
+            return cursor != ChangeFeedService.ZERO_CURSOR
+        if cursor == ChangeFeedService.ZERO_CURSOR:
+            # Only valid while the log still starts at its first row
+            return not ChangeLog.objects.filter(change_id=1).exists()
+        return cursor < oldest
+
+    @staticmethod
+    def changes_since(cursor, limit=DEFAULT_LIMIT):
+        """
+        Changes after cursor, collapsed to the current state of each object
+
+        Returns:
+            dict: cursor, has_more, products, stocks, batches, transactions and
+                  deleted (response key -> list of ids)
+        """
+        rows = list(
+            ChangeFeedService._visible()
+            .filter(ChangeFeedService._after(cursor))
+            .order_by('txid', 'change_id')
+            .values_list('txid', 'change_id', 'entity', 'object_key', 'operation')[:limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        latest = {}  # entity -> {object_key: operation}, last change wins
+        for _, _, entity, object_key, operation in rows:
+            if entity in ChangeFeedService.ENTITIES:
+                latest.setdefault(entity, {})[object_key] = operation
+
+        result = {
+            'cursor': ChangeFeedService.format_cursor(rows[-1][:2] if rows else cursor),
+            'has_more': has_more,
+            'deleted': {},
+        }
+        for entity, (name, model, key_field, fields) in ChangeFeedService.ENTITIES.items():
+            operations = latest.get(entity, {})
+            upserted = [key for key, operation in operations.items() if operation == 'upsert']
+            objects = list(
+                model.objects.filter(**{f'{key_field}__in': upserted}).order_by(key_field).values(*fields)
+            ) if upserted else []
+            found = {obj[key_field] for obj in objects}
+            # Deleted, or deleted again by a change past this page
+            deleted = sorted(key for key, operation in operations.items() if operation == 'delete' or key not in found)
+
+            result[name] = objects
+            if deleted:
+                result['deleted'][name] = deleted
+        return result
+
+    @staticmethod
+    def reset():
+        """
+        Restart the feed after tables were emptied without row triggers (TRUNCATE)
+
+        Drops the log and writes one marker row, so every cursor handed out
+        before is expired. The change_id counter is not reset.
+        """
+        ChangeLog.objects.all().delete()
+        txid = 'txid_current()' if connection.vendor == 'postgresql' else '0'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {connection.ops.quote_name(ChangeLog._meta.db_table)} '
+                f'(txid, entity, object_key, operation, created_at) VALUES ({txid}, %s, %s, %s, %s)',
+                ['feed', '', 'reset', connection.ops.adapt_datetimefield_value(timezone.now())]
+            )
+
+    @staticmethod
+    def prune(older_than=RETENTION):
+        """
+        Delete changes older than older_than, always keeping the newest one
+
+        Returns:
+            int: Rows deleted
+        """
+        boundary = (
+            ChangeLog.objects.filter(created_at__lt=timezone.now() - older_than)
+            .order_by('-txid', '-change_id')
+            .values_list('txid', 'change_id')
+            .first()
+        )
+        if boundary is None:
+            return 0
+        deleted, _ = ChangeLog.objects.filter(ChangeFeedService._before(boundary)).delete()
+        logger.info('Pruned %d change log row(s)', deleted)
+        return deleted
@@ -0,0 +1,243 @@
+import hashlib
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum, Count, F
+from django.utils import timezone
+
+from ..db_router import reads_from
+from ..models import ChangeStamp, Product, ProductStocks, Supplier, Order
+from .event_service import EventService
+
+
+class DashboardService:
+    """
+    Cached dashboard aggregates (/api/dashboard/*)
+
+    Each widget is cached under its own key for DASHBOARD_CACHE_TIMEOUT seconds
+    and carries a "last modified" stamp, kept in the change_stamp table so every
+    process sees the same one. Inventory writes call invalidate() for the widgets
+    they affect, which moves the stamp forward: the next request rebuilds the
+    widget, and polls with a matching ETag / Last-Modified get a 304 from the
+    stamp alone (one primary-key read per request). Open dashboards are told
+    which widgets changed through a 'dashboard' event (EventService). aget(),
+    aload_stamp() and the a* aggregates serve the async views (async_views).
+    """
+
+    CATEGORIES = 'categories'
+    TOP_SUPPLIERS = 'top_suppliers'
+    STOCK_STATUS = 'stock_status'
+    STATS = 'stats'
+    WIDGETS = (CATEGORIES, TOP_SUPPLIERS, STOCK_STATUS, STATS)
+
+    @staticmethod
+    def _timeout():
+        return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def _stamp_name(widget):
+        return f'dashboard:{widget}'
+
+    @staticmethod
+    def _stamps(widget):
+        # Read inside reads_from(None): a replica's stamp may lag the invalidation (see _rebuild_reads)
+        return ChangeStamp.objects.filter(name=DashboardService._stamp_name(widget)).values_list('stamped_at', flat=True)
+
+    @staticmethod
+    def _create_stamp(widget):
+        # First request for widget: concurrent requests agree on whichever insert won
+        ChangeStamp.objects.bulk_create(
+            [ChangeStamp(name=DashboardService._stamp_name(widget), stamped_at=timezone.now())], ignore_conflicts=True
+        )
+        with reads_from(None):
+            return DashboardService._stamps(widget).get()
+
+    @staticmethod
+    def _remember(request, widget, stamped_at):
+        stamp = stamped_at.timestamp()
+        if request is not None:
+            request._dashboard_stamps = {**getattr(request, '_dashboard_stamps', {}), widget: stamp}
+        return stamp
+
+    @staticmethod
+    def modified_at(widget, request=None):
+        """Stamp (unix time) of the last invalidation of widget, read once per request"""
+        stamps = getattr(request, '_dashboard_stamps', {})
+        if widget in stamps:
+            return stamps[widget]
+        with reads_from(None):
+            stamped_at = DashboardService._stamps(widget).first()
+        if stamped_at is None:
+            stamped_at = DashboardService._create_stamp(widget)
+        return DashboardService._remember(request, widget, stamped_at)
+
+    @staticmethod
+    async def aload_stamp(widget, request):
+        """
+        Read the stamp of widget for request with the async ORM
+
+        condition() calls its etag / last_modified functions synchronously, so
+        async views load the stamp first and modified_at() answers from request.
+        """
+        with reads_from(None):
+            stamped_at = await DashboardService._stamps(widget).afirst()
+        if stamped_at is None:
+            stamped_at = await sync_to_async(DashboardService._create_stamp)(widget)
+        return DashboardService._remember(request, widget, stamped_at)
+
+    @staticmethod
+    def invalidate(*widgets):
+        """
+        Mark widgets (all when none given) as changed once the current
+        transaction commits, so a rebuild never caches uncommitted data
+        """
+        widgets = widgets or DashboardService.WIDGETS
+
+        def bump():
+            now = timezone.now()
+            ChangeStamp.objects.bulk_create(
+                [ChangeStamp(name=DashboardService._stamp_name(widget), stamped_at=now) for widget in widgets],
+                update_conflicts=True, unique_fields=['name'], update_fields=['stamped_at']
+            )
+
+        transaction.on_commit(bump)
+        EventService.publish('dashboard', {'widgets': list(widgets)})
+
+    @staticmethod
+    def _variant(request):
+        # Widgets with query params (e.g. ?top=3) are cached per parameter set
+        return request.GET.urlencode() if request is not None else ''
+
+    @staticmethod
+    def etag(widget, request=None):
+        stamp = DashboardService.modified_at(widget, request)
+        digest = hashlib.md5(f'{widget}:{stamp!r}:{DashboardService._variant(request)}'.encode()).hexdigest()
+        return f'"{digest}"'
+
+    @staticmethod
+    def last_modified(widget, request=None):
+        return datetime.fromtimestamp(DashboardService.modified_at(widget, request), tz=dt_timezone.utc)
+
+    @staticmethod
+    def condition_funcs(widget):
+        """etag_func / last_modified_func for django.views.decorators.http.condition"""
+        return {
+            'etag_func': lambda request, *args, **kwargs: DashboardService.etag(widget, request),
+            'last_modified_func': lambda request, *args, **kwargs: DashboardService.last_modified(widget, request),
+        }
+
+    @staticmethod
+    def _cached(widget, request):
+        """(stamp, cache key, cached data or None when stale)"""
+        stamp = DashboardService.modified_at(widget, request)
+        key = f'dashboard:{widget}:data:{DashboardService._variant(request)}'
+        cached = cache.get(key)
+        return stamp, key, cached[1] if cached is not None and cached[0] == stamp else None
+
+    @staticmethod
+    def _rebuild_reads(stamp):
+        # Just changed: a read replica may not have the change yet
+        if time.time() - stamp < getattr(settings, 'REPLICA_STICKY_SECONDS', 10):
+            return reads_from(None)
+        return nullcontext()
+
+    @staticmethod
+    def get(widget, build, request=None):
+        """Return the cached data of widget, rebuilding it with build() when stale"""
+        stamp, key, data = DashboardService._cached(widget, request)
+        if data is not None:
+            return data
+
+        with DashboardService._rebuild_reads(stamp):
+            data = build()
+        cache.set(key, (stamp, data), DashboardService._timeout())
+        return data
+
+    @staticmethod
+    async def aget(widget, build, request=None):
+        """get() for async views; build is a coroutine function"""
+        stamp, key, data = DashboardService._cached(widget, request)
+        if data is not None:
+            return data
+
+        with DashboardService._rebuild_reads(stamp):
+            data = await build()
+        cache.set(key, (stamp, data), DashboardService._timeout())
+        return data
+
+    # --- Aggregates ---
+    # Each has a sync and an async (async ORM) variant sharing one query.
+
+    @staticmethod
+    def _category_query():
+        return ProductStocks.objects.values(category_name=F('product__category__category_name')).annotate(count=Sum('total_on_hand')).order_by('-count')
+
+    @staticmethod
+    def _category_row(row):
+        return {'category_name': row.get('category_name') or 'Uncategorized', 'count': int(row.get('count') or 0)}
+
+    @staticmethod
+    def category_distribution():
+        """Category distribution based on total_on_hand across product stocks"""
+        return [DashboardService._category_row(row) for row in DashboardService._category_query()]
+
+    @staticmethod
+    async def acategory_distribution():
+        return [DashboardService._category_row(row) async for row in DashboardService._category_query()]
+
+    @staticmethod
+    def _supplier_query(top):
+        return Supplier.objects.annotate(products_supplied=Count('products', distinct=True)).order_by('-products_supplied')[:top]
+
+    @staticmethod
+    def _supplier_row(s):
+        return {'supplier_name': s.supplier_name or 'Unknown', 'products_supplied': int(getattr(s, 'products_supplied', 0) or 0)}
+
+    @staticmethod
+    def top_suppliers(top):
+        """Top suppliers by number of distinct products supplied"""
+        return [DashboardService._supplier_row(s) for s in DashboardService._supplier_query(top)]
+
+    @staticmethod
+    async def atop_suppliers(top):
+        return [DashboardService._supplier_row(s) async for s in DashboardService._supplier_query(top)]
+
+    @staticmethod
+    def _stock_status_query():
+        return ProductStocks.objects.values(status_label=F('status')).annotate(count=Count('pk')).order_by('-count')
+
+    @staticmethod
+    def _stock_status_row(r):
+        return {'status_label': r.get('status_label') or 'Unknown', 'count': int(r.get('count') or 0)}
+
+    @staticmethod
+    def stock_status_counts():
+        """Counts grouped by ProductStocks.status"""
+        return [DashboardService._stock_status_row(r) for r in DashboardService._stock_status_query()]
+
+    @staticmethod
+    async def astock_status_counts():
+        return [DashboardService._stock_status_row(r) async for r in DashboardService._stock_status_query()]
+
+    @staticmethod
+    def _stats_queries():
+        return {
+            # Count active products (exclude archived)
+            'total_products': Product.objects.exclude(status='Archived'),
+            # Count pending orders (status = 'Pending' or 'Partially Received')
+            'pending_orders': Order.objects.filter(status__in=['Pending', 'Partially Received']),
+        }
+
+    @staticmethod
+    def stats():
+        """Total active products and pending orders"""
+        return {name: qs.count() for name, qs in DashboardService._stats_queries().items()}
+
+    @staticmethod
+    async def astats():
+        return {name: await qs.acount() for name, qs in DashboardService._stats_queries().items()}
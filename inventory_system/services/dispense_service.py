@@ -0,0 +1,172 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models import Product, ProductBatch, ProductStocks, Transaction
+from .alert_service import AlertService
+from .dashboard_service import DashboardService
+from .inventory_service import InventoryService
+from .sequence_service import SequenceService
+from ..logging_utils import timed_operation
+
+logger = logging.getLogger(__name__)
+
+
+class DispenseService:
+    """
+    First-expiry-first-out (FEFO) dispensing used by /api/transactions/dispense/
+
+    Batches are taken in expiry order with SELECT ... FOR UPDATE SKIP LOCKED,
+    a few at a time, so concurrent checkouts of the same product take
+    different batches instead of queueing on the same rows. When the unlocked
+    batches do not cover a checkout, it is rolled back and retried once with
+    a blocking lock: the stock held by other checkouts may be left over when
+    they commit (or roll back). All touched batches and their OUT
+    transactions are written in bulk.
+    """
+
+    # Batches locked per round trip while allocating
+    LOCK_CHUNK_SIZE = 10
+
+    @staticmethod
+    def allocate(product, quantity, today, skip_locked=True):
+        """
+        Lock batches of product in FEFO order until quantity is covered
+
+        Args:
+            skip_locked: Pass over batches locked by other checkouts instead
+                of waiting for them
+
+        Returns:
+            List of (batch, quantity_taken); fewer than quantity in total when
+            (unlocked) unexpired stock runs out
+        """
+        candidates = ProductBatch.objects.select_for_update(skip_locked=skip_locked).filter(
+            product_stock__product=product,
+            on_hand__gt=0,
+            expiry_date__gt=today,  # Never dispense expired stock
+        ).order_by('expiry_date', 'batch_id')
+
+        allocations = []
+        remaining = quantity
+        last = None
+        while remaining > 0:
+            chunk = candidates
+            if last:
+                chunk = chunk.filter(
+                    Q(expiry_date__gt=last.expiry_date) | Q(expiry_date=last.expiry_date, batch_id__gt=last.batch_id)
+                )
+            batches = list(chunk[:DispenseService.LOCK_CHUNK_SIZE])
+            if not batches:
+                break
+
+            for batch in batches:
+                taken = min(batch.on_hand, remaining)
+                allocations.append((batch, taken))
+                remaining -= taken
+                if remaining == 0:
+                    break
+            last = batches[-1]
+
+        return allocations
+
+    @staticmethod
+    def _dispense(product, quantity, performed_by, remarks, today, skip_locked):
+        """
+        Allocate and write one dispense in its own transaction (a savepoint
+        inside an outer one, so a short attempt releases its locks)
+
+        Returns:
+            (allocations, transactions)
+        """
+        with transaction.atomic():
+            allocations = DispenseService.allocate(product, quantity, today, skip_locked)
+            available = sum(taken for _, taken in allocations)
+            if available < quantity:
+                raise ValidationError({
+                    'quantity': (
+                        f"Insufficient stock for {product.brand_name} {product.generic_name}. "
+                        f"Requested: {quantity}, Available: {available}"
+                    )
+                })
+
+            stock_deltas = defaultdict(int)
+            for batch, taken in allocations:
+                batch.on_hand -= taken
+                batch.status = InventoryService.compute_batch_status(batch.on_hand, batch.expiry_date, product, today)
+                stock_deltas[batch.product_stock_id] += taken
+
+            transactions = [
+                Transaction(
+                    transaction_type='OUT',
+                    product=product,
+                    batch=batch,
+                    quantity_change=-taken,
+                    on_hand=batch.on_hand,
+                    performed_by=performed_by,
+                    remarks=remarks or f"Dispensed {taken} units of {product.brand_name} - {product.generic_name} (FEFO)",
+                )
+                for batch, taken in allocations
+            ]
+            prefix = f"TXN-{timezone.now().year}-"
+            codes = SequenceService.next_codes(Transaction, 'transaction_id', {prefix: len(transactions)})[prefix]
+            for txn, code in zip(transactions, codes):
+                txn.transaction_id = code
+
+            # Bulk writes bypass the ProductBatch signals, so totals and statuses are applied here
+            ProductBatch.objects.bulk_update([batch for batch, _ in allocations], ['on_hand', 'status'])
+            Transaction.objects.bulk_create(transactions)
+            for product_stock in ProductStocks.objects.filter(stock_id__in=stock_deltas.keys()):
+                InventoryService.apply_stock_delta(product_stock, -stock_deltas[product_stock.stock_id])
+                InventoryService.update_stock_status(product_stock)
+            AlertService.refresh_stocks(stock_deltas.keys())
+            DashboardService.invalidate(DashboardService.CATEGORIES, DashboardService.STOCK_STATUS)
+
+        return allocations, transactions
+
+    @staticmethod
+    def dispense(product_id, quantity, performed_by, remarks=None):
+        """
+        Dispense quantity units of a product across batches, FEFO
+
+        Returns:
+            List of allocation dicts (batch_id, expiry_date, quantity, on_hand, transaction_id)
+        """
+        product = Product.objects.filter(product_id=product_id).first()
+        if not product:
+            raise ValidationError({'product': f'Product {product_id} not found.'})
+        if product.status == 'Archived':
+            raise ValidationError({'product': f'Product {product_id} is archived.'})
+
+        today = timezone.now().date()
+
+        with timed_operation(logger, 'dispense'):
+            try:
+                allocations, transactions = DispenseService._dispense(
+                    product, quantity, performed_by, remarks, today, skip_locked=True
+                )
+            except ValidationError:
+                # Nothing is held after the rollback, so waiting on the locks (in
+                # FEFO order) cannot deadlock with another retrying checkout
+                logger.info('Dispense of %s x %s short with locked batches skipped, retrying with a blocking lock',
+                            quantity, product.product_id)
+                allocations, transactions = DispenseService._dispense(
+                    product, quantity, performed_by, remarks, today, skip_locked=False
+                )
+
+        logger.info('Dispensed %s units of %s from %s batch(es)', quantity, product.product_id, len(allocations))
+
+        return [
+            {
+                'batch_id': batch.batch_id,
+                'expiry_date': batch.expiry_date.isoformat(),
+                'quantity': taken,
+                'on_hand': batch.on_hand,
+                'transaction_id': txn.transaction_id,
+            }
+            for (batch, taken), txn in zip(allocations, transactions)
+        ]
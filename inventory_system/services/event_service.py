@@ -0,0 +1,242 @@
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One connected client of a broker
+
+    Events are put on a bounded queue (a thread-safe one, or an asyncio queue
+    fed through the event loop for ASGI streams). A client that falls
+    EVENT_STREAM_QUEUE_SIZE events behind is marked lagged and told to reload.
+    """
+
+    def __init__(self, types=None, loop=None, maxsize=100):
+        self.types = set(types) if types else None
+        self.loop = loop
+        self.lagged = False
+        self.queue = asyncio.Queue(maxsize) if loop else queue.Queue(maxsize)
+
+    def wants(self, event_type):
+        return self.types is None or event_type in self.types
+
+    def deliver(self, event):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._put, event)
+        else:
+            self._put(event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except (queue.Full, asyncio.QueueFull):
+            self.lagged = True
+
+
+class LocalEventBroker:
+    """
+    In-process publish/subscribe for the event stream
+
+    Only reaches clients connected to the same process, so it fits a
+    single-process deployment (one ASGI worker serving every stream). The
+    last EVENT_REPLAY_SIZE events are kept for clients reconnecting with
+    Last-Event-ID. Event ids carry a per-process prefix, so an id from another
+    process (or from before a restart) is recognised and answered with reset.
+    """
+
+    def __init__(self, replay_size=200, queue_size=100):
+        self.prefix = uuid.uuid4().hex[:8]
+        self.queue_size = queue_size
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._recent = deque(maxlen=replay_size)
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def subscribe(self, types=None, loop=None):
+        subscription = Subscription(types, loop, self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event_type, data):
+        with self._lock:
+            event = (f'{self.prefix}-{next(self._ids)}', event_type, data)
+            self._recent.append(event)
+            subscriptions = [s for s in self._subscriptions if s.wants(event_type)]
+        for subscription in subscriptions:
+            subscription.deliver(event)
+        return event[0]
+
+    def replay(self, last_event_id, subscription):
+        """
+        Events after last_event_id for subscription
+
+        Returns:
+            list: The missed events, or None when they are no longer known
+        """
+        prefix, _, number = (last_event_id or '').partition('-')
+        if prefix != self.prefix or not number.isdigit():
+            return None
+        with self._lock:
+            recent = list(self._recent)
+        number = int(number)
+        if recent and int(recent[0][0].split('-')[1]) > number + 1:
+            return None
+        return [
+            event for event in recent
+            if int(event[0].split('-')[1]) > number and subscription.wants(event[1])
+        ]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by EVENT_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = import_string(getattr(
+                    settings, 'EVENT_BROKER',
+                    'inventory_system.services.event_service.LocalEventBroker'
+                ))
+                _broker = broker_class(
+                    replay_size=getattr(settings, 'EVENT_REPLAY_SIZE', 200),
+                    queue_size=getattr(settings, 'EVENT_STREAM_QUEUE_SIZE', 100),
+                )
+    return _broker
+
+
+class EventService:
+    """
+    Server-sent events for open pages (stock levels, alerts, orders, dashboard)
+
+    Services and signals call publish() while writing; the event goes out once
+    the transaction commits and is dropped if it rolls back. Payloads given as
+    a callable are only built when someone is listening. Event types:
+
+    stock: {'stocks': [{stock_id, product_id, total_on_hand, status}]}
+    alerts: the /api/alerts/ summary
+    order: {'orders': [{order_id, status}]}
+    dashboard: {'widgets': [...]} whose data changed (refetch them)
+    reset: the client missed events and should reload everything
+    """
+
+    TYPES = ('stock', 'alerts', 'order', 'dashboard')
+
+    @staticmethod
+    def publish(event_type, data):
+        """Publish an event when the current transaction commits"""
+        def send():
+            broker = get_broker()
+            if not broker.has_subscribers():
+                return
+            try:
+                payload = data() if callable(data) else data
+            except Exception:
+                logger.exception('Building the %s event failed', event_type)
+                return
+            broker.publish(event_type, payload)
+
+        transaction.on_commit(send)
+
+    @staticmethod
+    def format(event_id, event_type, data):
+        """One event in the text/event-stream format"""
+        payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+        prefix = f'id: {event_id}\n' if event_id else ''
+        return f'{prefix}event: {event_type}\ndata: {payload}\n\n'.encode()
+
+    @staticmethod
+    def _settings():
+        return (
+            getattr(settings, 'EVENT_STREAM_HEARTBEAT', 15),
+            getattr(settings, 'EVENT_STREAM_MAX_SECONDS', 300),
+        )
+
+    @staticmethod
+    def _opening(broker, subscription, last_event_id):
+        # Browsers reconnect after `retry` ms when the stream ends, sending Last-Event-ID
+        yield b'retry: 3000\n\n'
+        if not last_event_id:
+            return
+        missed = broker.replay(last_event_id, subscription)
+        if missed is None:
+            yield EventService.format(None, 'reset', {})
+        else:
+            for event in missed:
+                yield EventService.format(*event)
+
+    @staticmethod
+    def _lagged(subscription):
+        # Queue overflowed: drop what is left and let the client reload
+        subscription.lagged = False
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        return EventService.format(None, 'reset', {})
+
+    @staticmethod
+    def stream(types=None, last_event_id=None):
+        """
+        Event stream for a WSGI response (holds a worker thread while open)
+
+        Ends after EVENT_STREAM_MAX_SECONDS; the browser reconnects by itself.
+        """
+        broker = get_broker()
+        subscription = broker.subscribe(types)
+        heartbeat, max_seconds = EventService._settings()
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield from EventService._opening(broker, subscription, last_event_id)
+            while time.monotonic() < deadline:
+                try:
+                    event = subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b': keepalive\n\n'
+                    continue
+                yield EventService._lagged(subscription) if subscription.lagged else EventService.format(*event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    @staticmethod
+    async def astream(types=None, last_event_id=None):
+        """Event stream for an ASGI response (no thread per client)"""
+        broker = get_broker()
+        subscription = broker.subscribe(types, loop=asyncio.get_running_loop())
+        heartbeat, max_seconds = EventService._settings()
+        deadline = time.monotonic() + max_seconds
+        try:
+            for chunk in EventService._opening(broker, subscription, last_event_id):
+                yield chunk
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+                    continue
+                yield EventService._lagged(subscription) if subscription.lagged else EventService.format(*event)
+        finally:
+            broker.unsubscribe(subscription)
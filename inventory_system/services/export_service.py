@@ -0,0 +1,370 @@
+import csv
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models import ProductStocks, ProductBatch, Transaction, ReceiveOrder
+
+
+def _product_name(prefix):
+    return lambda row: f"{row[prefix + 'brand_name']} {row[prefix + 'generic_name']}"
+
+
+def _local_datetime(field):
+    def format_value(row):
+        value = row[field]
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S') if value else ''
+    return format_value
+
+
+def _value(field):
+    return lambda row: row[field]
+
+
+class ExportService:
+    """
+    Server-side exports for /api/exports/<dataset>/<csv|xlsx>/
+
+    Rows are read with .values().iterator(chunk_size=...) (a server-side cursor
+    on PostgreSQL) and written out as they arrive, so memory stays flat however
+    many rows are exported. XLSX is streamed too: the sheet XML is compressed
+    into the zip as rows arrive (see _XLSX_PARTS).
+    """
+
+    CHUNK_SIZE = 2000
+
+    # dataset: queryset, date field for date_from/date_to, product lookup, status lookup,
+    # fields read with .values() and the (header, value) columns built from them
+    DATASETS = {
+        'stocks': {
+            'queryset': lambda: ProductStocks.objects.order_by('stock_id'),
+            'date_field': None,
+            'product_field': 'product',
+            'status_field': 'status',
+            'fields': [
+                'stock_id',
+                'product__product_id',
+                'product__brand_name',
+                'product__generic_name',
+                'product__category__category_name',
+                'total_on_hand',
+                'status',
+            ],
+            'columns': [
+                ('Stock ID', _value('stock_id')),
+                ('Product ID', _value('product__product_id')),
+                ('Product Name', _product_name('product__')),
+                ('Category', _value('product__category__category_name')),
+                ('Total On Hand', _value('total_on_hand')),
+                ('Status', _value('status')),
+            ],
+        },
+        'batches': {
+            'queryset': lambda: ProductBatch.objects.order_by('batch_id'),
+            'date_field': 'expiry_date',
+            'product_field': 'product_stock__product',
+            'status_field': 'status',
+            'fields': [
+                'batch_id',
+                'product_stock__stock_id',
+                'product_stock__product__product_id',
+                'product_stock__product__brand_name',
+                'product_stock__product__generic_name',
+                'on_hand',
+                'expiry_date',
+                'status',
+            ],
+            'columns': [
+                ('Batch ID', _value('batch_id')),
+                ('Stock ID', _value('product_stock__stock_id')),
+                ('Product ID', _value('product_stock__product__product_id')),
+                ('Product Name', _product_name('product_stock__product__')),
+                ('On Hand', _value('on_hand')),
+                ('Expiry Date', _value('expiry_date')),
+                ('Status', _value('status')),
+            ],
+        },
+        'transactions': {
+            'queryset': lambda: Transaction.objects.order_by('date_of_transaction', 'transaction_id'),
+            'date_field': 'date_of_transaction',
+            'product_field': 'product',
+            'status_field': 'transaction_type',
+            'fields': [
+                'transaction_id',
+                'transaction_type',
+                'product__product_id',
+                'product__brand_name',
+                'product__generic_name',
+                'batch__batch_id',
+                'quantity_change',
+                'on_hand',
+                'performed_by',
+                'date_of_transaction',
+                'remarks',
+            ],
+            'columns': [
+                ('Transaction ID', _value('transaction_id')),
+                ('Type', _value('transaction_type')),
+                ('Product ID', _value('product__product_id')),
+                ('Product Name', _product_name('product__')),
+                ('Batch ID', _value('batch__batch_id')),
+                ('Quantity Change', _value('quantity_change')),
+                ('On Hand', _value('on_hand')),
+                ('Performed By', _value('performed_by')),
+                ('Date', _local_datetime('date_of_transaction')),
+                ('Remarks', _value('remarks')),
+            ],
+        },
+        'receive-history': {
+            'queryset': lambda: ReceiveOrder.objects.order_by('date_received', 'receive_order_id'),
+            'date_field': 'date_received',
+            'product_field': 'order_item__product',
+            'status_field': None,
+            'fields': [
+                'receive_order_id',
+                'order__order_id',
+                'order_item__order_item_id',
+                'order_item__product__product_id',
+                'order_item__product__brand_name',
+                'order_item__product__generic_name',
+                'order_item__supplier__supplier_name',
+                'quantity_received',
+                'date_received',
+                'received_by',
+                'expiry_date',
+                'remarks',
+            ],
+            'columns': [
+                ('Receive ID', _value('receive_order_id')),
+                ('Order ID', _value('order__order_id')),
+                ('Order Item ID', _value('order_item__order_item_id')),
+                ('Product ID', _value('order_item__product__product_id')),
+                ('Product Name', _product_name('order_item__product__')),
+                ('Supplier', _value('order_item__supplier__supplier_name')),
+                ('Quantity Received', _value('quantity_received')),
+                ('Date Received', _local_datetime('date_received')),
+                ('Received By', _value('received_by')),
+                ('Expiry Date', _value('expiry_date')),
+                ('Remarks', _value('remarks')),
+            ],
+        },
+    }
+
+    @staticmethod
+    def get_dataset(name):
+        dataset = ExportService.DATASETS.get(name)
+        if not dataset:
+            raise ValidationError({'dataset': f"Unknown dataset '{name}'. Choose from: {', '.join(ExportService.DATASETS)}"})
+        return dataset
+
+    @staticmethod
+    def _parse_date(params, key):
+        value = params.get(key)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValidationError({key: 'Use the YYYY-MM-DD format.'})
+
+    @staticmethod
+    def build_queryset(dataset, params):
+        """
+        Filtered .values() queryset for a dataset
+
+        Query params: date_from, date_to (YYYY-MM-DD, inclusive), product (product_id)
+        and status (stock/batch status, or transaction type)
+        """
+        queryset = dataset['queryset']()
+
+        date_from = ExportService._parse_date(params, 'date_from')
+        date_to = ExportService._parse_date(params, 'date_to')
+        date_field = dataset['date_field']
+        if (date_from or date_to) and not date_field:
+            raise ValidationError({'date_from': 'This dataset has no date to filter on.'})
+
+        if date_field and queryset.model._meta.get_field(date_field).get_internal_type() == 'DateTimeField':
+            # Compare datetimes against local day bounds (not __date) so the index stays usable
+            if date_from:
+                queryset = queryset.filter(**{f'{date_field}__gte': timezone.make_aware(datetime.combine(date_from, time.min))})
+            if date_to:
+                queryset = queryset.filter(**{f'{date_field}__lt': timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))})
+        else:
+            if date_from:
+                queryset = queryset.filter(**{f'{date_field}__gte': date_from})
+            if date_to:
+                queryset = queryset.filter(**{f'{date_field}__lte': date_to})
+
+        if params.get('product'):
+            queryset = queryset.filter(**{f"{dataset['product_field']}__product_id": params['product']})
+        if params.get('status') and dataset['status_field']:
+            queryset = queryset.filter(**{dataset['status_field']: params['status']})
+
+        return queryset.values(*dataset['fields'])
+
+    @staticmethod
+    def iter_rows(dataset, queryset):
+        """Header row, then one list of cell values per database row"""
+        columns = dataset['columns']
+        yield [header for header, _ in columns]
+        for row in queryset.iterator(chunk_size=ExportService.CHUNK_SIZE):
+            yield [accessor(row) for _, accessor in columns]
+
+    @staticmethod
+    def stream_csv(rows):
+        """Yield CSV text CHUNK_SIZE lines at a time (UTF-8 BOM first, for Excel)"""
+        writer = csv.writer(_Echo())
+        lines = ['\ufeff']
+        for row in rows:
+            lines.append(writer.writerow(['' if value is None else value for value in row]))
+            if len(lines) >= ExportService.CHUNK_SIZE:
+                yield ''.join(lines)
+                lines = []
+        yield ''.join(lines)
+
+    @staticmethod
+    def stream_xlsx(rows):
+        """
+        Yield an .xlsx workbook (one sheet) in chunks as rows arrive
+
+        zipfile writes to an unseekable stream with data descriptors, so no
+        part of the file has to be revisited once sent.
+        """
+        output = _ZipStream()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, content in _XLSX_PARTS.items():
+                archive.writestr(name, content)
+            with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+                sheet.write(_SHEET_HEADER)
+                for number, row in enumerate(rows, 1):
+                    sheet.write(_xlsx_row(number, row).encode())
+                    if number % ExportService.CHUNK_SIZE == 0:
+                        yield output.drain()
+                sheet.write(_SHEET_FOOTER)
+        yield output.drain()
+
+    @staticmethod
+    async def astream(chunks):
+        """
+        stream_csv() / stream_xlsx() for an ASGI response
+
+        Django consumes a sync iterator in full before sending it under ASGI.
+        Here every chunk is produced in the ORM's worker thread
+        (sync_to_async), so the export is sent while it is being read.
+        """
+        done = object()
+        produce = sync_to_async(next)
+        try:
+            while (chunk := await produce(chunks, done)) is not done:
+                yield chunk
+        finally:
+            # Client gone: release the server-side cursor in the thread that opened it
+            await sync_to_async(chunks.close)()
+
+
+class _Echo:
+    """File-like object for csv.writer that returns each line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+
+class _ZipStream:
+    """Unseekable file object for zipfile that keeps written bytes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+# Minimal SpreadsheetML package around xl/worksheets/sheet1.xml; style 1 is a date cell
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_XLSX_PARTS = {
+    '[Content_Types].xml': _XML_DECLARATION + (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': _XML_DECLARATION + (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': _XML_DECLARATION + (
+        f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': _XML_DECLARATION + (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': _XML_DECLARATION + (
+        f'<styleSheet xmlns="{_MAIN_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+_SHEET_HEADER = (_XML_DECLARATION + f'<worksheet xmlns="{_MAIN_NS}"><sheetData>').encode()
+_SHEET_FOOTER = b'</sheetData></worksheet>'
+_EXCEL_EPOCH = date(1899, 12, 30)
+# Characters XML 1.0 does not allow
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _column_letters(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_cell(reference, value):
+    if value is None or value == '':
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return f'<c r="{reference}" s="1"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    text = escape(_INVALID_XML_CHARS.sub('', str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(number, values):
+    cells = ''.join(_xlsx_cell(f'{_column_letters(index)}{number}', value) for index, value in enumerate(values))
+    return f'<row r="{number}">{cells}</row>'
@@ -7,6 +7,7 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
 import pickle
 
 
@@ -115,6 +116,25 @@ class GmailService:
         except HttpError as error:
             raise Exception(f"An error occurred while sending email: {error}")
     
+    def send_message(self, mime_message):
+        """
+        Send an already built MIME message (used by GmailEmailBackend).
+        
+        Returns:
+            Sent message object
+        """
+        try:
+            if not self.service:
+                self.authenticate()
+            
+            raw_message = base64.urlsafe_b64encode(mime_message.as_bytes()).decode('utf-8')
+            return self.service.users().messages().send(
+                userId='me', body={'raw': raw_message}
+            ).execute()
+        
+        except HttpError as error:
+            raise Exception(f"An error occurred while sending email: {error}")
+    
     def send_otp_email(self, user_email, username, otp_code, is_password_reset=False):
         """
         Send OTP verification email to user.
@@ -128,14 +148,17 @@ class GmailService:
         Returns:
             Sent message object
         """
-        if is_password_reset:
-            subject = "Password Reset Verification Code"
-            title = "🔑 Password Reset"
-            greeting_text = "You requested to reset your password for your Inventory Management System account. Please use the verification code below to proceed:"
-        else:
-            subject = "Your Login Verification Code"
-            title = "🔐 Login Verification"
-            greeting_text = "You requested to log in to your Inventory Management System account. Please use the verification code below to complete your login:"
+        subject, body = self.render_otp_email(username, otp_code, is_password_reset)
+        return self.send_email(user_email, subject, body)
+    
+    @staticmethod
+    def render_otp_email(username, otp_code, is_password_reset=False):
+        """
+        Build the OTP verification email.
+        
+        Returns:
+            Tuple of (subject, HTML body)
+        """
         if is_password_reset:
             subject = "Password Reset Verification Code"
             title = "🔑 Password Reset"
@@ -241,7 +264,7 @@ class GmailService:
         </html>
         """
         
-        return self.send_email(user_email, subject, body)
+        return subject, body
 
 
     def send_password_reset_success_email(self, user_email, username):
@@ -255,6 +278,17 @@ class GmailService:
         Returns:
             Sent message object
         """
+        subject, body = self.render_password_reset_success_email(username)
+        return self.send_email(user_email, subject, body)
+    
+    @staticmethod
+    def render_password_reset_success_email(username):
+        """
+        Build the password reset confirmation email.
+        
+        Returns:
+            Tuple of (subject, HTML body)
+        """
         subject = "Password Reset Successful"
         
         # HTML email template
@@ -363,7 +397,51 @@ class GmailService:
         </html>
         """
         
-        return self.send_email(user_email, subject, body)
+        return subject, body
+
+
+class GmailEmailBackend(BaseEmailBackend):
+    """
+    Django email backend sending through the Gmail API.
+    
+    Every backend instance authenticates its own GmailService (the underlying
+    httplib2 connection is not thread-safe), so each sender thread of the
+    outbound mail queue opens its own.
+    """
+    
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently, **kwargs)
+        self.gmail = None
+    
+    def open(self):
+        if self.gmail is not None:
+            return False
+        gmail = GmailService()
+        gmail.authenticate()
+        self.gmail = gmail
+        return True
+    
+    def close(self):
+        self.gmail = None
+    
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        
+        new_connection = self.open()
+        sent = 0
+        try:
+            for message in email_messages:
+                try:
+                    self.gmail.send_message(message.message())
+                    sent += 1
+                except Exception:
+                    if not self.fail_silently:
+                        raise
+        finally:
+            if new_connection:
+                self.close()
+        return sent
 
 
 # Global instance
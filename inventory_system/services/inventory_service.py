@@ -1,8 +1,13 @@
-from django.db import models
+import logging
+
+from django.db import models, transaction
 from django.utils import timezone
 from datetime import timedelta
 from ..models import ProductBatch, Product, ProductStocks
-from django.db.models import Case, When, IntegerField, Min
+from django.db.models import Case, When, IntegerField, Min, F, Value, Sum, Subquery, OuterRef
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
 
 
 class InventoryService:
@@ -12,6 +17,12 @@ class InventoryService:
     EXPIRY_TOLERANCE_DAYS = 10  # Days difference allowed for batch merging
     RECENT_BATCH_DAYS = 30      # Only consider batches from last 30 days for merging
     
+    # Batches in these statuses may take more stock on receiving
+    MERGEABLE_BATCH_STATUSES = ['Normal', 'Low Stock', 'Out of Stock']
+
+    # Most critical first - a stock takes the status of its worst batch
+    STOCK_STATUS_PRIORITY = ['Expired', 'Out of Stock', 'Near Expiry', 'Low Stock', 'Normal']
+    
     @staticmethod
     def create_or_update_product_batch(product, product_stock, received_quantity, expiry_date=None):
         """
@@ -32,61 +43,110 @@ class InventoryService:
         Returns:
             ProductBatch instance (either existing updated or newly created)
         """
+        new_expiry_date, tolerance_days = InventoryService.resolve_batch_expiry(product, expiry_date)
         use_provided_expiry = expiry_date is not None
         
-        # Use provided expiry_date or generate one
-        if use_provided_expiry:
-            new_expiry_date = expiry_date
-            # When user provides expiry date, only merge with EXACT same expiry date
-            tolerance_days = 0
-        else:
-            new_expiry_date = timezone.now().date() + timedelta(
-                days=product.expiry_threshold_days + InventoryService.EXPIRY_TOLERANCE_DAYS
-            )
-            # When auto-generating, allow tolerance for merging
-            tolerance_days = InventoryService.EXPIRY_TOLERANCE_DAYS
-        
         # Only consider recent batches to avoid merging with very old stock
         cutoff_date = timezone.now().date() - timedelta(days=InventoryService.RECENT_BATCH_DAYS)
 
-        # Find suitable batches for merging
-        # Exclude Near Expiry and Expired to maintain batch granularity for critical items
-        suitable_batches = ProductBatch.objects.filter(
-            product_stock=product_stock,
-            expiry_date__gte=cutoff_date,
-        ).exclude(
-            status__in=['Near Expiry', 'Expired']
-        ).order_by('expiry_date')
-
-        # Try to find existing batch to merge with
-        for existing_batch in suitable_batches:
-            expiry_diff = abs((existing_batch.expiry_date - new_expiry_date).days)
-
-            if expiry_diff <= tolerance_days:
-                # Merge with existing batch
+        with transaction.atomic():
+            # Lock the stock row so concurrent receipts for this product are serialized
+            # and cannot both decide to create a new batch
+            ProductStocks.objects.select_for_update().get(pk=product_stock.pk)
+
+            # One indexed range lookup (product_batch_merge_idx) for the earliest
+            # batch within tolerance; Near Expiry and Expired batches are never merged
+            # to maintain batch granularity for critical items
+            existing_batch = ProductBatch.objects.select_for_update().filter(
+                product_stock=product_stock,
+                status__in=InventoryService.MERGEABLE_BATCH_STATUSES,
+                expiry_date__gte=max(cutoff_date, new_expiry_date - timedelta(days=tolerance_days)),
+                expiry_date__lte=new_expiry_date + timedelta(days=tolerance_days),
+            ).order_by('expiry_date').first()
+
+            if existing_batch:
+                # Merge with existing batch (row is locked, so the increment is safe)
                 old_quantity = existing_batch.on_hand
                 existing_batch.on_hand += received_quantity
                 existing_batch.save(update_fields=['on_hand'])
                 
-                print(f"📦 Merged into batch {existing_batch.batch_id} - "
-                      f"Expiry: {existing_batch.expiry_date}, "
-                      f"Old qty: {old_quantity}, New qty: {existing_batch.on_hand}")
+                logger.debug('Merged into batch %s - expiry: %s, old qty: %s, new qty: %s',
+                             existing_batch.batch_id, existing_batch.expiry_date,
+                             old_quantity, existing_batch.on_hand)
                 return existing_batch
             
-        # No suitable batch found - create new one
-        new_batch = ProductBatch.objects.create(
-            product_stock=product_stock,
-            on_hand=received_quantity,
-            expiry_date=new_expiry_date,
-            status='Normal',
-        )
+            # No suitable batch found - create new one (still under the stock lock)
+            new_batch = ProductBatch.objects.create(
+                product_stock=product_stock,
+                on_hand=received_quantity,
+                expiry_date=new_expiry_date,
+                status='Normal',
+            )
         
         expiry_source = "Actual" if use_provided_expiry else "Auto-generated"
-        print(f"📦 Created new batch {new_batch.batch_id} - "
-              f"Expiry: {new_expiry_date} ({expiry_source}), "
-              f"Quantity: {received_quantity}")
+        logger.debug('Created new batch %s - expiry: %s (%s), quantity: %s',
+                     new_batch.batch_id, new_expiry_date, expiry_source, received_quantity)
         return new_batch
 
+    @staticmethod
+    def resolve_batch_expiry(product, expiry_date=None):
+        """
+        Return (expiry_date, tolerance_days) used when receiving into a batch
+        
+        When the expiry date comes from the packaging only an EXACT match may be
+        merged; an auto-generated date allows EXPIRY_TOLERANCE_DAYS of slack.
+        """
+        if expiry_date is not None:
+            return expiry_date, 0
+        
+        new_expiry_date = timezone.now().date() + timedelta(
+            days=product.expiry_threshold_days + InventoryService.EXPIRY_TOLERANCE_DAYS
+        )
+        return new_expiry_date, InventoryService.EXPIRY_TOLERANCE_DAYS
+
+    @staticmethod
+    def find_merge_batch(candidates, expiry_date, tolerance_days):
+        """
+        Return the first candidate batch (ordered by expiry_date) whose expiry
+        is within tolerance_days of expiry_date, or None
+        """
+        for batch in candidates:
+            if abs((batch.expiry_date - expiry_date).days) <= tolerance_days:
+                return batch
+        return None
+
+    @staticmethod
+    def compute_batch_status(on_hand, expiry_date, product, current_date=None):
+        """
+        Return the status a batch should have, without saving anything
+        
+        See update_batch_status for the priority order.
+        """
+        current_date = current_date or timezone.now().date()
+        days_until_expiry = (expiry_date - current_date).days
+
+        if on_hand == 0:
+            return 'Out of Stock'
+        elif days_until_expiry <= 0:
+            return 'Expired'
+        elif days_until_expiry <= product.expiry_threshold_days:
+            return 'Near Expiry'
+        elif on_hand <= product.low_stock_threshold:
+            return 'Low Stock'
+        return 'Normal'
+
+    @staticmethod
+    def compute_stock_status(batch_statuses):
+        """
+        Return the most critical of batch_statuses (see update_stock_status),
+        or 'Out of Stock' when there are no batches
+        """
+        statuses = set(batch_statuses)
+        for status in InventoryService.STOCK_STATUS_PRIORITY:
+            if status in statuses:
+                return status
+        return 'Out of Stock'
+
     @staticmethod
     def update_batch_status(batch, force_save=False):
         """
@@ -106,25 +166,12 @@ class InventoryService:
         Returns:
             str: The new status
         """
-        current_date = timezone.now().date()
-        product = batch.product_stock.product
-        expiry_threshold = product.expiry_threshold_days
-        low_stock_threshold = product.low_stock_threshold
-
-        days_until_expiry = (batch.expiry_date - current_date).days
         old_status = batch.status
 
         # Determine new status based on priority
-        if batch.on_hand == 0:
-            new_status = 'Out of Stock'
-        elif days_until_expiry <= 0:
-            new_status = 'Expired'
-        elif days_until_expiry <= expiry_threshold:
-            new_status = 'Near Expiry'
-        elif batch.on_hand <= low_stock_threshold:
-            new_status = 'Low Stock'
-        else:
-            new_status = 'Normal'
+        new_status = InventoryService.compute_batch_status(
+            batch.on_hand, batch.expiry_date, batch.product_stock.product
+        )
 
         # Save if status changed OR force_save is True
         if batch.status != new_status or force_save:
@@ -132,7 +179,7 @@ class InventoryService:
             batch.save(update_fields=['status'])
             
             if old_status != new_status:
-                print(f"📊 Batch {batch.batch_id} status: {old_status} → {new_status}")
+                logger.debug('Batch %s status: %s -> %s', batch.batch_id, old_status, new_status)
 
         return new_status
 
@@ -183,16 +230,65 @@ class InventoryService:
         if product_stock.status != new_status:
             product_stock.status = new_status
             product_stock.save(update_fields=['status'])
-            print(f"📊 Stock {product_stock.stock_id} status: {old_status} → {new_status}")
+            logger.debug('Stock %s status: %s -> %s', product_stock.stock_id, old_status, new_status)
         
         return new_status
         
         return new_status
 
+    @staticmethod
+    def apply_stock_delta(product_stock, delta):
+        """
+        Add delta to ProductStocks.total_on_hand with one F() UPDATE instead of
+        re-summing every batch of the stock. Drift (e.g. direct POS writes to
+        product_batch) is repaired by `python manage.py reconcile_stock_totals`.
+        
+        Returns:
+            int: The new total_on_hand
+        """
+        if delta:
+            ProductStocks.objects.filter(pk=product_stock.pk).update(
+                total_on_hand=F('total_on_hand') + delta
+            )
+            product_stock.refresh_from_db(fields=['total_on_hand'])
+        return product_stock.total_on_hand
+
+    @staticmethod
+    def find_stock_total_drift():
+        """
+        Stocks whose total_on_hand differs from the sum of their batches
+        
+        Returns:
+            QuerySet of ProductStocks annotated with batch_total
+        """
+        batch_total = Subquery(
+            ProductBatch.objects.filter(product_stock=OuterRef('stock_id')).values('product_stock').annotate(
+                total=Sum('on_hand')
+            ).values('total')[:1]
+        )
+        return ProductStocks.objects.annotate(
+            batch_total=Coalesce(batch_total, 0)
+        ).exclude(total_on_hand=F('batch_total'))
+
+    @staticmethod
+    def reconcile_stock_totals(stock_ids):
+        """
+        Reset total_on_hand of the given stocks to the sum of their batches (one UPDATE)
+        """
+        batch_total = Subquery(
+            ProductBatch.objects.filter(product_stock=OuterRef('stock_id')).values('product_stock').annotate(
+                total=Sum('on_hand')
+            ).values('total')[:1]
+        )
+        return ProductStocks.objects.filter(stock_id__in=stock_ids).update(
+            total_on_hand=Coalesce(batch_total, 0)
+        )
+
     @staticmethod
     def update_stock_total(product_stock):
         """
-        Update ProductStocks total_on_hand from all its batches
+        Update ProductStocks total_on_hand from all its batches (full re-sum;
+        batch saves use apply_stock_delta)
         """
         total_on_hand = ProductBatch.objects.filter(
             product_stock=product_stock
@@ -206,22 +302,83 @@ class InventoryService:
         
         return total_on_hand
 
+    @staticmethod
+    def batch_status_expression(expiry_threshold_days, current_date=None):
+        """
+        SQL CASE equivalent of compute_batch_status for batches whose product
+        has the given expiry_threshold_days (low_stock_threshold is read per row)
+        """
+        current_date = current_date or timezone.now().date()
+        low_stock_threshold = Subquery(
+            ProductStocks.objects.filter(
+                stock_id=OuterRef('product_stock_id')
+            ).values('product__low_stock_threshold')[:1]
+        )
+        return Case(
+            When(on_hand=0, then=Value('Out of Stock')),
+            When(expiry_date__lte=current_date, then=Value('Expired')),
+            When(expiry_date__lte=current_date + timedelta(days=expiry_threshold_days), then=Value('Near Expiry')),
+            When(on_hand__lte=low_stock_threshold, then=Value('Low Stock')),
+            default=Value('Normal'),
+            output_field=models.CharField()
+        )
+
     @staticmethod
     def refresh_all_batch_statuses():
         """
-        Refresh status for all batches and product stocks
+        Refresh status for all batches and product stocks, set-based
+        
+        Batch statuses are recomputed with one UPDATE per distinct product
+        expiry_threshold_days (usually one or two), then every stock's total
+        and worst batch status are rolled up with one aggregate UPDATE.
+        Runs nightly via `python manage.py refresh_inventory_status`.
+        
+        Returns:
+            int: Number of batches whose status changed
         """
+        current_date = timezone.now().date()
         batches_updated = 0
 
-        for batch in ProductBatch.objects.all():
-            old_status = batch.status
-            new_status = InventoryService.update_batch_status(batch)
-            if old_status != new_status:
-                batches_updated += 1
-        
-        # Update all product stocks
-        for product_stock in ProductStocks.objects.all():
-            InventoryService.update_stock_total(product_stock)
-            InventoryService.update_stock_status(product_stock)
-            
-        return batches_updated
\ No newline at end of file
+        thresholds = Product.objects.filter(
+            productstocks__isnull=False
+        ).values_list('expiry_threshold_days', flat=True).distinct()
+
+        for expiry_threshold_days in thresholds:
+            batches_updated += ProductBatch.objects.filter(
+                product_stock__product__expiry_threshold_days=expiry_threshold_days
+            ).alias(
+                new_status=InventoryService.batch_status_expression(expiry_threshold_days, current_date)
+            ).exclude(
+                status=F('new_status')
+            ).update(status=F('new_status'))
+
+        InventoryService.refresh_all_stock_totals()
+
+        return batches_updated
+
+    @staticmethod
+    def refresh_all_stock_totals():
+        """
+        Recompute total_on_hand and status of every ProductStocks in one UPDATE
+        (same rules as update_stock_total and update_stock_status)
+        """
+        stock_batches = ProductBatch.objects.filter(product_stock=OuterRef('stock_id'))
+
+        total_on_hand = Subquery(
+            stock_batches.values('product_stock').annotate(total=Sum('on_hand')).values('total')[:1]
+        )
+        worst_status = Subquery(
+            stock_batches.annotate(
+                priority=Case(
+                    *[When(status=status, then=priority)
+                      for priority, status in enumerate(InventoryService.STOCK_STATUS_PRIORITY, start=1)],
+                    default=999,
+                    output_field=IntegerField()
+                )
+            ).order_by('priority').values('status')[:1]
+        )
+
+        return ProductStocks.objects.update(
+            total_on_hand=Coalesce(total_on_hand, 0),
+            status=Coalesce(worst_status, Value('Out of Stock'))
+        )
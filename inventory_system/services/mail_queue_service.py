@@ -0,0 +1,208 @@
+import logging
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import OutboundEmail
+from .gmail_service import GmailService
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueueService:
+    """
+    Outbound email queue backed by the outbound_email table
+
+    Views enqueue and return immediately. Once the request's transaction
+    commits, a small in-process thread pool (OUTBOUND_EMAIL_THREADS) claims and
+    sends the new rows; the send_queued_email worker picks up whatever that
+    pool missed and retries failures with exponential backoff. Rows are
+    claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of senders
+    can run side by side without sending twice. Mail is delivered through
+    Django's EMAIL_BACKEND (GmailEmailBackend in production). The body (e.g.
+    an OTP code) is blanked once a row is Sent, Expired or Failed, and
+    finished rows are pruned after RETENTION (refresh_inventory_status).
+    """
+
+    CLAIM_TIMEOUT = timedelta(minutes=5)  # a Sending row older than this was abandoned by a dead sender
+    RETENTION = timedelta(days=30)
+    FINAL_STATUSES = ['Sent', 'Expired', 'Failed']
+    BACKOFF_BASE_SECONDS = 10
+    BACKOFF_MAX_SECONDS = 3600
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @staticmethod
+    def enqueue(kind, to_email, subject, body, expires_at=None):
+        """Queue one HTML email; it is handed to the sender threads when the current transaction commits"""
+        email = OutboundEmail.objects.create(
+            kind=kind, to_email=to_email, subject=subject, body=body, expires_at=expires_at
+        )
+        transaction.on_commit(lambda: MailQueueService.dispatch([email.pk]))
+        logger.debug('Queued %s email %s', kind, email.pk)
+        return email
+
+    @staticmethod
+    def enqueue_otp(user, otp_record, is_password_reset=False):
+        """Queue the OTP email of otp_record; it is dropped if still unsent when the OTP expires"""
+        subject, body = GmailService.render_otp_email(user.username, otp_record.otp, is_password_reset)
+        return MailQueueService.enqueue(
+            'reset_otp' if is_password_reset else 'login_otp',
+            user.email, subject, body, expires_at=otp_record.expires_at
+        )
+
+    @staticmethod
+    def enqueue_password_reset_success(user):
+        subject, body = GmailService.render_password_reset_success_email(user.username)
+        return MailQueueService.enqueue('reset_success', user.email, subject, body)
+
+    @staticmethod
+    def dispatch(email_ids):
+        """Send freshly queued emails on the in-process threads (left to the worker when OUTBOUND_EMAIL_THREADS is 0)"""
+        threads = getattr(settings, 'OUTBOUND_EMAIL_THREADS', 0)
+        if threads <= 0:
+            return
+        with MailQueueService._executor_lock:
+            if MailQueueService._executor is None:
+                MailQueueService._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='outbound-email')
+        MailQueueService._executor.submit(MailQueueService._send_claimed, list(email_ids))
+
+    @staticmethod
+    def _send_claimed(email_ids):
+        try:
+            MailQueueService.process(MailQueueService.claim(ids=email_ids))
+        except Exception:
+            logger.exception('Sending queued email failed')
+        finally:
+            connection.close()  # Connections are per thread
+
+    @staticmethod
+    def claim(limit=20, ids=None):
+        """
+        Mark up to limit due emails as Sending and return them
+
+        Due means Pending with next_attempt_at reached, or Sending for longer
+        than CLAIM_TIMEOUT (the sender died mid-way).
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            due = OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+                Q(status='Pending', next_attempt_at__lte=now)
+                | Q(status='Sending', claimed_at__lt=now - MailQueueService.CLAIM_TIMEOUT)
+            )
+            if ids is not None:
+                due = due.filter(pk__in=ids)
+            emails = list(due.order_by('next_attempt_at')[:limit])
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                status='Sending', claimed_at=now
+            )
+        return emails
+
+    @staticmethod
+    def backoff(attempts):
+        """Delay before retry number attempts: exponential with +-20% jitter, capped"""
+        delay = min(MailQueueService.BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), MailQueueService.BACKOFF_MAX_SECONDS)
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    @staticmethod
+    def send(email, backend=None):
+        """
+        Send one claimed email and record the outcome
+
+        Returns:
+            str: The new status (Sent, Pending for a retry, Failed or Expired)
+        """
+        now = timezone.now()
+        if email.expires_at and email.expires_at <= now:
+            OutboundEmail.objects.filter(pk=email.pk).update(status='Expired', body='')
+            logger.info('Dropped expired %s email %s', email.kind, email.pk)
+            return 'Expired'
+
+        attempts = email.attempts + 1
+        message = EmailMessage(
+            email.subject, email.body,
+            from_email=getattr(settings, 'GMAIL_SENDER_EMAIL', None),
+            to=[email.to_email], connection=backend,
+        )
+        message.content_subtype = 'html'
+        try:
+            message.send()
+        except Exception as e:
+            # A Failed row is never retried, so its body is not kept
+            if attempts >= getattr(settings, 'OUTBOUND_EMAIL_MAX_ATTEMPTS', 5):
+                status, body = 'Failed', ''
+                next_attempt_at = email.next_attempt_at
+            else:
+                status, body = 'Pending', email.body
+                next_attempt_at = now + MailQueueService.backoff(attempts)
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(e)[:1000], body=body
+            )
+            logger.warning('Sending %s email %s failed (attempt %d, now %s): %s', email.kind, email.pk, attempts, status, e)
+            return status
+
+        OutboundEmail.objects.filter(pk=email.pk).update(status='Sent', attempts=attempts, sent_at=timezone.now(), body='')
+        logger.info('Sent %s email %s', email.kind, email.pk)
+        return 'Sent'
+
+    @staticmethod
+    def prune(older_than=RETENTION):
+        """
+        Delete Sent, Expired and Failed emails created more than older_than ago
+
+        Returns:
+            int: Rows deleted
+        """
+        deleted, _ = OutboundEmail.objects.filter(
+            status__in=MailQueueService.FINAL_STATUSES,
+            created_at__lt=timezone.now() - older_than,
+        ).delete()
+        if deleted:
+            logger.info('Pruned %d outbound email row(s)', deleted)
+        return deleted
+
+    @staticmethod
+    def process(emails, threads=1):
+        """
+        Send claimed emails, spread over threads sender threads
+
+        Returns:
+            Counter: status -> number of emails
+        """
+        if threads <= 1 or len(emails) <= 1:
+            return Counter(MailQueueService._send_all(emails))
+
+        chunks = [emails[i::threads] for i in range(threads)]
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='outbound-email') as pool:
+            return Counter(status for statuses in pool.map(MailQueueService._send_chunk, chunks) for status in statuses)
+
+    @staticmethod
+    def _send_all(emails):
+        if not emails:
+            return []
+        backend = get_connection()
+        try:
+            backend.open()
+        except Exception as e:
+            # Every send below retries opening and is rescheduled if it fails
+            logger.warning('Opening the email backend failed: %s', e)
+        try:
+            return [MailQueueService.send(email, backend) for email in emails]
+        finally:
+            backend.close()
+
+    @staticmethod
+    def _send_chunk(emails):
+        try:
+            return MailQueueService._send_all(emails)
+        finally:
+            connection.close()
@@ -0,0 +1,240 @@
+import heapq
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connections
+
+
+class _QueryTimer:
+    """execute_wrapper that times every statement of a request"""
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.db_ms = 0.0
+        self.slowest = []  # min-heap of (ms, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.db_ms += elapsed_ms
+            entry = (elapsed_ms, sql[:RequestMetricsService.SQL_MAX_LENGTH])
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            elif elapsed_ms > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+
+class RequestMetricsService:
+    """
+    Per-request query counts and timings, kept in an in-process ring buffer
+
+    RequestMetricsMiddleware records one entry per request; /api/metrics/requests/
+    and the request_metrics command report them per view, as JSON or in the
+    Prometheus text format. The buffer is per process: with several workers each
+    one reports its own recent requests.
+    """
+
+    SQL_MAX_LENGTH = 500
+
+    _lock = threading.Lock()
+    _buffer = deque(maxlen=getattr(settings, 'REQUEST_METRICS_BUFFER_SIZE', 500))
+
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'REQUEST_METRICS_ENABLED', False)
+
+    @staticmethod
+    def query_timer():
+        return _QueryTimer(getattr(settings, 'REQUEST_METRICS_SLOW_QUERIES', 3))
+
+    @staticmethod
+    def record(view, status_code, total_ms, timer):
+        """Add one request to the ring buffer (the oldest entry drops out when full)"""
+        entry = {
+            'view': view,
+            'status': status_code,
+            'queries': timer.count,
+            'db_ms': round(timer.db_ms, 2),
+            'python_ms': round(max(total_ms - timer.db_ms, 0), 2),
+            'total_ms': round(total_ms, 2),
+            'slowest_queries': [
+                {'sql': sql, 'ms': round(ms, 2)} for ms, sql in sorted(timer.slowest, reverse=True)
+            ],
+            'recorded_at': time.time(),
+        }
+        with RequestMetricsService._lock:
+            RequestMetricsService._buffer.append(entry)
+
+    @staticmethod
+    def entries():
+        with RequestMetricsService._lock:
+            return list(RequestMetricsService._buffer)
+
+    @staticmethod
+    def reset():
+        with RequestMetricsService._lock:
+            RequestMetricsService._buffer.clear()
+
+    @staticmethod
+    def summary():
+        """
+        Aggregate the buffer per view, most queries first
+
+        Returns:
+            {'requests': n, 'views': [{'view', 'count', 'queries_avg', 'queries_max',
+            'db_ms_avg', 'python_ms_avg', 'total_ms_avg', 'total_ms_max', 'slowest_queries'}]}
+        """
+        entries = RequestMetricsService.entries()
+        by_view = defaultdict(list)
+        for entry in entries:
+            by_view[entry['view']].append(entry)
+
+        keep = getattr(settings, 'REQUEST_METRICS_SLOW_QUERIES', 3)
+        views = []
+        for view, view_entries in by_view.items():
+            count = len(view_entries)
+            slowest = heapq.nlargest(
+                keep,
+                (query for entry in view_entries for query in entry['slowest_queries']),
+                key=lambda query: query['ms'],
+            )
+            views.append({
+                'view': view,
+                'count': count,
+                'queries_avg': round(sum(e['queries'] for e in view_entries) / count, 1),
+                'queries_max': max(e['queries'] for e in view_entries),
+                'db_ms_avg': round(sum(e['db_ms'] for e in view_entries) / count, 2),
+                'python_ms_avg': round(sum(e['python_ms'] for e in view_entries) / count, 2),
+                'total_ms_avg': round(sum(e['total_ms'] for e in view_entries) / count, 2),
+                'total_ms_max': max(e['total_ms'] for e in view_entries),
+                'slowest_queries': slowest,
+            })
+
+        views.sort(key=lambda view: (-view['queries_max'], view['view']))
+        return {'requests': len(entries), 'views': views}
+
+    # name, help text, summary key
+    PROMETHEUS_METRICS = [
+        ('inventory_request_count', 'Requests in the metrics window', 'count'),
+        ('inventory_request_queries_avg', 'Average SQL statements per request', 'queries_avg'),
+        ('inventory_request_queries_max', 'Most SQL statements issued by one request', 'queries_max'),
+        ('inventory_request_db_ms_avg', 'Average database time per request (ms)', 'db_ms_avg'),
+        ('inventory_request_python_ms_avg', 'Average non-database time per request (ms)', 'python_ms_avg'),
+        ('inventory_request_total_ms_avg', 'Average request time (ms)', 'total_ms_avg'),
+        ('inventory_request_total_ms_max', 'Slowest request time (ms)', 'total_ms_max'),
+    ]
+
+    @staticmethod
+    def to_prometheus(summary=None):
+        """Render the per-view summary as Prometheus text exposition (gauges over the window)"""
+        summary = summary or RequestMetricsService.summary()
+        lines = []
+        for name, help_text, key in RequestMetricsService.PROMETHEUS_METRICS:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            for view in summary['views']:
+                label = view['view'].replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                lines.append(f'{name}{{view="{label}"}} {view[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+class DatabasePoolMetricsService:
+    """
+    Database connection reuse per alias, for this process
+
+    In pool mode (DB_CONNECTION_MODE=pool, psycopg 3) the statistics come from
+    the psycopg_pool of each alias: size, connections in use, requests waiting
+    for a connection and the time spent waiting. In every mode `connects`
+    counts the connections Django set up (new connections, or pool checkouts),
+    recorded from the connection_created signal; with persistent connections
+    it should grow far slower than the request count.
+    """
+
+    # Pool counters that psycopg_pool only reports once they are non-zero
+    POOL_STATS = (
+        'pool_min', 'pool_max', 'pool_size', 'pool_available',
+        'requests_num', 'requests_queued', 'requests_waiting', 'requests_wait_ms', 'requests_errors',
+        'connections_num', 'connections_ms', 'connections_errors', 'connections_lost', 'returns_bad', 'usage_ms',
+    )
+
+    _lock = threading.Lock()
+    _connects = defaultdict(int)
+
+    @staticmethod
+    def record_connect(alias):
+        with DatabasePoolMetricsService._lock:
+            DatabasePoolMetricsService._connects[alias] += 1
+
+    @staticmethod
+    def reset():
+        with DatabasePoolMetricsService._lock:
+            DatabasePoolMetricsService._connects.clear()
+
+    @staticmethod
+    def mode(settings_dict):
+        if settings_dict.get('OPTIONS', {}).get('pool'):
+            return 'pool'
+        return 'persistent' if settings_dict.get('CONN_MAX_AGE') else 'per-request'
+
+    @staticmethod
+    def summary():
+        """
+        Returns:
+            {'pid': n, 'databases': {alias: {'mode', 'conn_max_age', 'connects', and
+            in pool mode the POOL_STATS plus 'in_use'}}}
+        """
+        with DatabasePoolMetricsService._lock:
+            connects = dict(DatabasePoolMetricsService._connects)
+
+        databases = {}
+        for alias in connections:
+            settings_dict = connections.settings[alias]
+            mode = DatabasePoolMetricsService.mode(settings_dict)
+            entry = {
+                'mode': mode,
+                'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+                'connects': connects.get(alias, 0),
+            }
+            pool = getattr(connections[alias], 'pool', None) if mode == 'pool' else None
+            if pool is not None:
+                stats = pool.get_stats()
+                entry.update({key: stats.get(key, 0) for key in DatabasePoolMetricsService.POOL_STATS})
+                entry['in_use'] = entry['pool_size'] - entry['pool_available']
+            databases[alias] = entry
+        return {'pid': os.getpid(), 'databases': databases}
+
+    # name, help text, summary key
+    PROMETHEUS_METRICS = [
+        ('inventory_db_connects_total', 'Connections set up by Django (new or checked out of the pool)', 'connects'),
+        ('inventory_db_pool_size', 'Connections currently in the pool', 'pool_size'),
+        ('inventory_db_pool_max', 'Maximum pool size', 'pool_max'),
+        ('inventory_db_pool_in_use', 'Pooled connections checked out', 'in_use'),
+        ('inventory_db_pool_requests_waiting', 'Requests waiting for a connection now', 'requests_waiting'),
+        ('inventory_db_pool_requests_total', 'Connection requests to the pool', 'requests_num'),
+        ('inventory_db_pool_requests_queued_total', 'Connection requests that had to wait', 'requests_queued'),
+        ('inventory_db_pool_wait_ms_total', 'Time spent waiting for a connection (ms)', 'requests_wait_ms'),
+        ('inventory_db_pool_errors_total', 'Connection requests that failed (e.g. timed out)', 'requests_errors'),
+    ]
+
+    @staticmethod
+    def to_prometheus(summary=None):
+        summary = summary or DatabasePoolMetricsService.summary()
+        lines = []
+        for name, help_text, key in DatabasePoolMetricsService.PROMETHEUS_METRICS:
+            samples = [
+                f'{name}{{database="{alias}"}} {entry[key]}'
+                for alias, entry in summary['databases'].items() if key in entry
+            ]
+            if samples:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {"counter" if name.endswith("_total") else "gauge"}')
+                lines.extend(samples)
+        return '\n'.join(lines) + '\n'
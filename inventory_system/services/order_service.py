@@ -1,7 +1,12 @@
+import logging
+
 from django.utils import timezone
-from django.db.models import Sum
+from django.db.models import Case, When, Value, F
 from rest_framework.exceptions import ValidationError
-from ..models import Order, OrderItem, ReceiveOrder
+from ..models import Order, OrderItem
+from .event_service import EventService
+
+logger = logging.getLogger(__name__)
 
 class OrderService:
     """Business logic for order management"""
@@ -9,21 +14,72 @@ class OrderService:
     @staticmethod
     def update_order_status(order):
         """
-        Update order status based on ReceiveOrder records
+        Update order status from the order's ordered/received counters
         """
-        order_items = order.items.all()
-        if not order_items.exists():
+        order.refresh_from_db(fields=['total_ordered', 'total_received'])
+        if not order.total_ordered:
             return
         
-        # Calculate totals from order items and their receipts
-        total_ordered = sum(item.quantity_ordered for item in order_items)
-        
-        # Sum all quantities received from ReceiveOrder records for this order
-        from ..models import ReceiveOrder
-        total_received = ReceiveOrder.objects.filter(
-            order=order
-        ).aggregate(total=Sum('quantity_received'))['total'] or 0
+        OrderService.apply_order_status(order, order.total_ordered, order.total_received)
         
+        order.save(update_fields=['status', 'date_received'])
+        OrderService.publish_status([order])
+
+    @staticmethod
+    def publish_status(orders):
+        """Push the status of orders to open pages once the transaction commits"""
+        EventService.publish('order', {'orders': [
+            {'order_id': order.order_id, 'status': order.status} for order in orders
+        ]})
+
+    @staticmethod
+    def apply_ordered_delta(order_id, delta):
+        """Add delta to Order.total_ordered (order item created, changed or deleted)"""
+        if delta:
+            Order.objects.filter(order_id=order_id).update(total_ordered=F('total_ordered') + delta)
+
+    @staticmethod
+    def apply_receive_delta(order_item_id, order_id, delta):
+        """Add delta to the received counters of an order item and its order"""
+        if delta:
+            OrderItem.objects.filter(order_item_id=order_item_id).update(quantity_received=F('quantity_received') + delta)
+            Order.objects.filter(order_id=order_id).update(total_received=F('total_received') + delta)
+
+    @staticmethod
+    def apply_receive_deltas(item_deltas, order_deltas):
+        """
+        apply_receive_delta for many rows: one UPDATE for the order items and
+        one for the orders
+
+        Args:
+            item_deltas: {order_item_id: quantity}
+            order_deltas: {order_id: quantity}
+        """
+        def delta_case(key_field, deltas):
+            return Case(
+                *[When(**{key_field: key}, then=Value(delta)) for key, delta in deltas.items()],
+                default=Value(0)
+            )
+
+        if item_deltas:
+            OrderItem.objects.filter(order_item_id__in=item_deltas.keys()).update(
+                quantity_received=F('quantity_received') + delta_case('order_item_id', item_deltas)
+            )
+        if order_deltas:
+            Order.objects.filter(order_id__in=order_deltas.keys()).update(
+                total_received=F('total_received') + delta_case('order_id', order_deltas)
+            )
+
+    @staticmethod
+    def lock_order_item(order_item):
+        """Re-read order_item with its row locked (call inside transaction.atomic())"""
+        return OrderItem.objects.select_for_update().get(pk=order_item.pk)
+
+    @staticmethod
+    def apply_order_status(order, total_ordered, total_received):
+        """
+        Set order.status (and date_received when fully received) from totals, without saving
+        """
         # Determine new status based on business rules
         if total_received == 0:
             order.status = 'Pending'
@@ -34,7 +90,7 @@ class OrderService:
         else:
             order.status = 'Partially Received'
         
-        order.save(update_fields=['status', 'date_received'])
+        return order.status
 
     @staticmethod
     def update_product_count(category):
@@ -42,7 +98,7 @@ class OrderService:
         Update product count for a category
         """
         count = category.products.count()
-        print(f"Updating category {category.category_name}: {category.product_count} -> {count}")
+        logger.debug('Updating category %s product count: %s -> %s', category.category_name, category.product_count, count)
         category.product_count = count
         category.save(update_fields=['product_count'])
 
@@ -59,9 +115,7 @@ class OrderService:
         
     @staticmethod
     def validate_receive_quantity_create(order_item, quantity_received):
-        total_received = ReceiveOrder.objects.filter(
-            order_item = order_item
-        ).aggregate(total = Sum('quantity_received'))['total'] or 0
+        total_received = order_item.quantity_received
 
         if total_received + quantity_received > order_item.quantity_ordered:
             raise ValidationError(
@@ -73,9 +127,7 @@ class OrderService:
     
     @staticmethod
     def validate_order_quantity_update(order_item_instance, new_quantity):
-        total_received = ReceiveOrder.objects.filter(
-            order_item = order_item_instance
-        ).aggregate(total = Sum('quantity_received'))['total'] or 0
+        total_received = order_item_instance.quantity_received
 
         if total_received > 0 and new_quantity < total_received:
             raise ValidationError(
@@ -0,0 +1,201 @@
+import csv
+import gzip
+import logging
+import re
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models import Transaction
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionPartitionService:
+    """
+    Yearly range partitions of the transaction ledger (PostgreSQL only)
+
+    Migration 0029 partitions the transaction table by date_of_transaction,
+    one partition per year (transaction_y2026, ...) plus a default partition
+    for rows outside them. ensure_partitions() runs nightly from
+    refresh_inventory_status and creates the coming year's partition before it
+    is needed. archive() exports an old year to a gzipped CSV and detaches it,
+    so recent-history queries only touch the current partitions. On other
+    backends the table is not partitioned and every method is a no-op.
+
+    PostgreSQL only enforces unique constraints that include the partition
+    key, so the database guarantees (transaction_code, date_of_transaction)
+    and (transaction_id, date_of_transaction), not the codes alone. The codes
+    stay unique by construction: transaction_code is a random UUID4 and
+    transaction_id comes from the id_sequence counter (SequenceService);
+    rows must not be inserted with codes taken from elsewhere.
+    """
+
+    TABLE = Transaction._meta.db_table
+    PARTITION_KEY = 'date_of_transaction'
+    DEFAULT_PARTITION = f'{TABLE}_default'
+    # Rows fetched per round trip when exporting an archived partition
+    EXPORT_CHUNK_SIZE = 2000
+
+    @staticmethod
+    def is_partitioned():
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+                [connection.ops.quote_name(TransactionPartitionService.TABLE)]
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def partition_name(year):
+        return f'{TransactionPartitionService.TABLE}_y{year}'
+
+    @staticmethod
+    def partitions():
+        """
+        Attached yearly partitions
+
+        Returns:
+            dict: year -> partition table name, oldest first
+        """
+        if not TransactionPartitionService.is_partitioned():
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s)",
+                [connection.ops.quote_name(TransactionPartitionService.TABLE)]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        pattern = re.compile(rf'^{re.escape(TransactionPartitionService.TABLE)}_y(\d{{4}})$')
+        years = {int(match.group(1)): name for name in names if (match := pattern.match(name))}
+        return dict(sorted(years.items()))
+
+    @staticmethod
+    def ensure_partitions(years_ahead=1):
+        """
+        Create the partitions of this year and the next years_ahead years if missing
+
+        Returns:
+            list: Names of the partitions created
+        """
+        if not TransactionPartitionService.is_partitioned():
+            return []
+
+        existing = TransactionPartitionService.partitions()
+        this_year = timezone.now().year
+        created = []
+        for year in range(this_year, this_year + years_ahead + 1):
+            if year not in existing:
+                TransactionPartitionService._create_partition(year)
+                created.append(TransactionPartitionService.partition_name(year))
+        return created
+
+    @staticmethod
+    def _bounds(year):
+        return f'{year}-01-01 00:00:00+00', f'{year + 1}-01-01 00:00:00+00'
+
+    @staticmethod
+    def _create_partition(year):
+        """
+        Create the partition of year
+
+        Rows of that year already in the default partition would make the
+        CREATE fail, so the default partition is detached, the rows are moved
+        into the new partition and it is attached again, all in one transaction.
+        """
+        quote = connection.ops.quote_name
+        table = quote(TransactionPartitionService.TABLE)
+        default = quote(TransactionPartitionService.DEFAULT_PARTITION)
+        name = TransactionPartitionService.partition_name(year)
+        start, end = TransactionPartitionService._bounds(year)
+        in_range = f'{TransactionPartitionService.PARTITION_KEY} >= %s AND {TransactionPartitionService.PARTITION_KEY} < %s'
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})', [start, end])
+            move_rows = cursor.fetchone()[0]
+            if move_rows:
+                cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {default}')
+
+            cursor.execute(
+                f'CREATE TABLE {quote(name)} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)',
+                [start, end]
+            )
+
+            if move_rows:
+                cursor.execute(f'INSERT INTO {table} SELECT * FROM {default} WHERE {in_range}', [start, end])
+                cursor.execute(f'DELETE FROM {default} WHERE {in_range}', [start, end])
+                cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+
+        logger.info('Created transaction partition %s', name)
+
+    @staticmethod
+    def archive(year, output_dir, drop=False):
+        """
+        Export the partition of year to output_dir/<partition>.csv.gz, then detach it
+
+        The export is written to a .part file and renamed once complete, and
+        the partition is only detached after that: a failed export leaves it
+        attached, so running the archive again starts over. Past years receive
+        no new rows, so the export matches what is detached. The detached
+        table is kept (it can be attached again) unless drop is set.
+
+        Returns:
+            tuple: (path of the export, rows exported)
+        """
+        partitions = TransactionPartitionService.partitions()
+        if year not in partitions:
+            raise ValidationError(f'No attached transaction partition for {year}')
+        if year >= timezone.now().year:
+            raise ValidationError('Only partitions of past years can be archived')
+
+        quote = connection.ops.quote_name
+        name = partitions[year]
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f'{name}.csv.gz'
+        partial = path.with_name(f'{path.name}.part')
+        try:
+            rows = TransactionPartitionService._export(name, partial)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        partial.replace(path)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {quote(TransactionPartitionService.TABLE)} DETACH PARTITION {quote(name)}')
+        logger.info('Exported and detached transaction partition %s', name)
+
+        if drop:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {quote(name)}')
+            logger.info('Dropped transaction partition %s', name)
+
+        return path, rows
+
+    @staticmethod
+    def _export(name, path):
+        """Write table name to path as gzipped CSV with a header; returns the row count"""
+        rows = 0
+        # Read through a server-side cursor (chunked_cursor) and written with csv,
+        # so the export does not depend on the driver's COPY API
+        with transaction.atomic(), connection.chunked_cursor() as cursor, \
+                gzip.open(path, 'wt', encoding='utf-8', newline='') as output:
+            cursor.execute(
+                f'SELECT * FROM {connection.ops.quote_name(name)} '
+                f'ORDER BY {TransactionPartitionService.PARTITION_KEY}, transaction_id'
+            )
+            # A named cursor only has a description once rows were fetched
+            chunk = cursor.fetchmany(TransactionPartitionService.EXPORT_CHUNK_SIZE)
+            writer = csv.writer(output)
+            writer.writerow([column[0] for column in cursor.description])
+            while chunk:
+                writer.writerows(['' if value is None else value for value in row] for row in chunk)
+                rows += len(chunk)
+                chunk = cursor.fetchmany(TransactionPartitionService.EXPORT_CHUNK_SIZE)
+        return rows
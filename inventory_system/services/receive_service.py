@@ -0,0 +1,259 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import Order, OrderItem, ProductBatch, ProductStocks, ReceiveOrder, Transaction
+from .alert_service import AlertService
+from .dashboard_service import DashboardService
+from .inventory_service import InventoryService
+from .order_service import OrderService
+from .sequence_service import SequenceService
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiveService:
+    """
+    Set-based receiving used by ReceiveOrderViewSet.bulk_receive
+
+    The whole delivery is validated and written in a constant number of queries:
+    batch merges, stock totals/statuses and order statuses are computed in memory
+    and written with bulk_create / bulk_update. The ReceiveOrder post_save signal
+    does not fire for these rows, so this service does all of its work.
+    """
+
+    @staticmethod
+    def lock_and_validate(items):
+        """
+        Lock the order items of a delivery and validate the received quantities
+
+        Args:
+            items: List of (index, data) pairs, data validated by BulkReceiveItemSerializer
+
+        Returns:
+            (lines, errors): lines is a list of (index, data, order_item) ready for
+            receive(); errors is a list of per-item error dicts
+        """
+        order_item_ids = {data['order_item'] for _, data in items}
+        locked_order_items = {
+            oi.order_item_id: oi
+            for oi in OrderItem.objects.select_for_update(of=('self', 'order')).select_related(
+                'order', 'product', 'supplier'
+            ).filter(order_item_id__in=order_item_ids)
+        }
+
+        # Received counters, read under the row locks
+        already_received = {
+            order_item_id: oi.quantity_received for order_item_id, oi in locked_order_items.items()
+        }
+
+        lines = []
+        errors = []
+        for index, data in items:
+            order_item_id = data['order_item']
+            order_item = locked_order_items.get(order_item_id)
+
+            if not order_item:
+                errors.append({
+                    'index': index,
+                    'order_item': order_item_id,
+                    'error': f'Order item {order_item_id} not found.'
+                })
+                continue
+
+            if data['order'] != order_item.order_id:
+                errors.append({
+                    'index': index,
+                    'order_item': order_item_id,
+                    'error': {'order': f'Order item {order_item_id} does not belong to order {data["order"]}.'}
+                })
+                continue
+
+            received = already_received.get(order_item_id, 0)
+            quantity_received = data['quantity_received']
+
+            if received + quantity_received > order_item.quantity_ordered:
+                errors.append({
+                    'index': index,
+                    'order_item': order_item_id,
+                    'error': {
+                        'quantity_received': (
+                            f"Cannot receive {quantity_received} units. "
+                            f"Ordered: {order_item.quantity_ordered}, "
+                            f"Already received: {received}, "
+                            f"Remaining: {order_item.quantity_ordered - received}"
+                        )
+                    }
+                })
+                continue
+
+            # Later lines for the same item see this line as already received
+            already_received[order_item_id] = received + quantity_received
+            lines.append((index, data, order_item))
+
+        return lines, errors
+
+    @staticmethod
+    def receive(lines):
+        """
+        Write ReceiveOrder, ProductBatch, Transaction, ProductStocks and Order
+        changes for validated lines. Must run inside transaction.atomic().
+
+        Batch merging follows InventoryService.create_or_update_product_batch,
+        applied line by line in memory.
+
+        Returns:
+            List of (index, ReceiveOrder) in input order
+        """
+        today = timezone.now().date()
+        cutoff_date = today - timedelta(days=InventoryService.RECENT_BATCH_DAYS)
+
+        products = {
+            order_item.product_id: order_item.product
+            for _, data, order_item in lines if data['quantity_received'] > 0
+        }
+
+        # Stocks and all of their batches, locked for the rest of the transaction
+        stocks = {}
+        for stock in ProductStocks.objects.select_for_update().filter(
+            product_id__in=products.keys()
+        ).order_by('stock_id'):
+            stocks.setdefault(stock.product_id, stock)
+
+        new_stocks = [
+            ProductStocks(product=product, total_on_hand=0, status='Normal')
+            for product_id, product in products.items() if product_id not in stocks
+        ]
+        if new_stocks:
+            codes = SequenceService.next_codes(ProductStocks, 'stock_id', {
+                f"{stock.product_id}-STK-": 1 for stock in new_stocks
+            })
+            for stock in new_stocks:
+                stock.stock_id = codes[f"{stock.product_id}-STK-"][0]
+                stocks[stock.product_id] = stock
+
+        batches_by_stock = defaultdict(list)
+        for batch in ProductBatch.objects.select_for_update().filter(
+            product_stock__in=[stock.stock_id for stock in stocks.values()]
+        ).order_by('expiry_date'):
+            batches_by_stock[batch.product_stock_id].append(batch)
+
+        # Apply every line in memory
+        new_batches = []
+        merged_batches = {}
+        receipts = []
+        stock_ins = []
+
+        for index, data, order_item in lines:
+            quantity = data['quantity_received']
+            receipt = ReceiveOrder(
+                order_id=order_item.order_id,
+                order_item=order_item,
+                quantity_received=quantity,
+                received_by=data['received_by'],
+                expiry_date=data.get('expiry_date'),
+                remarks=data.get('remarks'),
+            )
+            if data.get('date_received'):
+                receipt.date_received = data['date_received']
+            receipts.append((index, receipt))
+
+            if quantity <= 0:
+                continue
+
+            product = order_item.product
+            stock = stocks[product.product_id]
+            stock_batches = batches_by_stock[stock.stock_id]
+
+            expiry_date, tolerance_days = InventoryService.resolve_batch_expiry(product, data.get('expiry_date'))
+            candidates = [
+                batch for batch in stock_batches
+                if batch.expiry_date >= cutoff_date and batch.status in InventoryService.MERGEABLE_BATCH_STATUSES
+            ]
+            batch = InventoryService.find_merge_batch(candidates, expiry_date, tolerance_days)
+
+            if batch:
+                batch.on_hand += quantity
+                if not batch._state.adding:
+                    merged_batches[batch.pk] = batch
+            else:
+                batch = ProductBatch(product_stock=stock, on_hand=quantity, expiry_date=expiry_date)
+                new_batches.append(batch)
+                stock_batches.append(batch)
+                stock_batches.sort(key=lambda b: b.expiry_date)
+
+            batch.status = InventoryService.compute_batch_status(batch.on_hand, batch.expiry_date, product, today)
+            stock_ins.append((data, order_item, batch, quantity, batch.on_hand))
+
+        if new_batches:
+            counts = defaultdict(int)
+            for batch in new_batches:
+                counts[f"{batch.product_stock.product_id}-BAT-"] += 1
+            codes = SequenceService.next_codes(ProductBatch, 'batch_id', counts)
+            for batch in new_batches:
+                batch.batch_id = codes[f"{batch.product_stock.product_id}-BAT-"].pop(0)
+
+        for stock in stocks.values():
+            stock_batches = batches_by_stock[stock.stock_id]
+            stock.total_on_hand = sum(batch.on_hand for batch in stock_batches)
+            stock.status = InventoryService.compute_stock_status(batch.status for batch in stock_batches)
+
+        receipt_codes = SequenceService.next_codes(ReceiveOrder, 'receive_order_id', {'RCV-': len(receipts)})['RCV-']
+        for (_, receipt), code in zip(receipts, receipt_codes):
+            receipt.receive_order_id = code
+
+        transactions = []
+        for data, order_item, batch, quantity, on_hand in stock_ins:
+            # Priority order: custom remarks > ReceiveOrder.remarks > default message
+            remarks = (
+                data.get('transaction_remarks')
+                or data.get('remarks')
+                or f"Received {quantity} units from {order_item.supplier.supplier_name} via Order {order_item.order_id}"
+            )
+            transactions.append(Transaction(
+                transaction_type='IN',
+                product=order_item.product,
+                batch=batch,
+                quantity_change=quantity,
+                on_hand=on_hand,
+                performed_by=data.get('transaction_performed_by') or data['received_by'],
+                remarks=remarks,
+            ))
+        if transactions:
+            prefix = f"TXN-{timezone.now().year}-"
+            transaction_codes = SequenceService.next_codes(Transaction, 'transaction_id', {prefix: len(transactions)})[prefix]
+            for transaction, code in zip(transactions, transaction_codes):
+                transaction.transaction_id = code
+
+        # Order statuses from the locked order counters plus this delivery
+        orders = {order_item.order_id: order_item.order for _, _, order_item in lines}
+        item_deltas = defaultdict(int)
+        order_deltas = defaultdict(int)
+        for _, receipt in receipts:
+            item_deltas[receipt.order_item_id] += receipt.quantity_received
+            order_deltas[receipt.order_id] += receipt.quantity_received
+        for order_id, order in orders.items():
+            OrderService.apply_order_status(order, order.total_ordered, order.total_received + order_deltas[order_id])
+
+        # Writes, in dependency order
+        ProductStocks.objects.bulk_create(new_stocks)
+        ProductBatch.objects.bulk_create(new_batches)
+        ProductBatch.objects.bulk_update(merged_batches.values(), ['on_hand', 'status'])
+        ReceiveOrder.objects.bulk_create([receipt for _, receipt in receipts])
+        Transaction.objects.bulk_create(transactions)
+        ProductStocks.objects.bulk_update(
+            [stock for stock in stocks.values() if not stock._state.adding],
+            ['total_on_hand', 'status']
+        )
+        Order.objects.bulk_update(orders.values(), ['status', 'date_received'])
+        OrderService.apply_receive_deltas(item_deltas, order_deltas)
+        OrderService.publish_status(orders.values())
+        AlertService.refresh_stocks(stock.stock_id for stock in stocks.values())
+        DashboardService.invalidate(DashboardService.CATEGORIES, DashboardService.STOCK_STATUS, DashboardService.STATS)
+
+        logger.info('Bulk received %s line(s): %s new batch(es), %s merged batch(es), %s order(s) updated',
+                    len(receipts), len(new_batches), len(merged_batches), len(orders))
+
+        return receipts
@@ -0,0 +1,100 @@
+import logging
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from ..logging_utils import timed_operation
+from ..models import (
+    IdSequence, Category, Subcategory, Product, Supplier, SupplierProduct,
+    ProductStocks, ProductBatch, Order, OrderItem, ReceiveOrder, Transaction,
+    InventoryAlert, ArchiveLog, UserInformation, OTP,
+)
+from ..signals import inventory_signals_disabled
+from .change_feed_service import ChangeFeedService
+from .dashboard_service import DashboardService
+from .sequence_service import RESET_MARKER, get_allocator
+
+logger = logging.getLogger(__name__)
+
+
+class ResetService:
+    """
+    Wipe inventory data in one statement per backend instead of row by row
+
+    The ORM delete() loads every row, cascades per object and runs the
+    post_delete receivers, so each ProductBatch records an ADJ transaction and
+    recomputes its stock. truncate() uses the backend's flush SQL instead:
+    TRUNCATE ... RESTART IDENTITY CASCADE on PostgreSQL, bulk DELETEs (and a
+    sqlite_sequence reset) on SQLite, all in one transaction.
+    The change feed is restarted with it (see ChangeFeedService.reset).
+    """
+
+    SAMPLE_DATA_MODELS = [
+        InventoryAlert, Transaction, ReceiveOrder, OrderItem, Order,
+        ProductBatch, ProductStocks, SupplierProduct, Supplier, Product,
+        Subcategory, Category, ArchiveLog, IdSequence,
+    ]
+    USER_MODELS = [OTP, UserInformation, User]
+    # TRUNCATE fires no row triggers, so emptying these restarts the change feed
+    CHANGE_FEED_TABLES = {model._meta.db_table for model in (Product, ProductStocks, ProductBatch, Transaction)}
+
+    @staticmethod
+    def tables_for(models):
+        """
+        Tables of models plus every table that references them (what CASCADE would empty)
+
+        Returns:
+            list: Table names, in the order they were found
+        """
+        tables, pending, seen = [], list(models), set()
+        while pending:
+            model = pending.pop(0)
+            if model in seen:
+                continue
+            seen.add(model)
+            tables.append(model._meta.db_table)
+            for relation in model._meta.related_objects:
+                pending.append(relation.through if relation.many_to_many else relation.related_model)
+            for field in model._meta.local_many_to_many:
+                pending.append(field.remote_field.through)
+        return tables
+
+    @staticmethod
+    def truncate(models):
+        """
+        Empty models (and every table referencing them) in one transaction
+
+        Sequence counters (IdSequence) and the allocator's cached blocks are
+        reset with them: a new reset marker is written, so other processes
+        drop the blocks they reserved before. Category product counts are
+        zeroed when the categories themselves are kept.
+
+        Returns:
+            dict: model -> rows removed (tables emptied by the cascade are not counted)
+        """
+        tables = ResetService.tables_for(models)
+        statements = connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True)
+
+        with inventory_signals_disabled(), timed_operation(logger, 'truncate'), transaction.atomic():
+            counts = {model: model._base_manager.count() for model in models}
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+            if Product._meta.db_table in tables and Category._meta.db_table not in tables:
+                Category.objects.update(product_count=0)
+                Subcategory.objects.update(product_count=0)
+
+            if IdSequence._meta.db_table in tables:
+                IdSequence.objects.create(name=RESET_MARKER, last_value=time.time_ns())
+
+            if set(tables) & ResetService.CHANGE_FEED_TABLES:
+                ChangeFeedService.reset()
+
+        if IdSequence._meta.db_table in tables:
+            get_allocator().reset()
+        DashboardService.invalidate()
+        logger.info('Truncated %d table(s): %s', len(tables), ', '.join(tables))
+        return counts
@@ -0,0 +1,281 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (
+    Category, Subcategory, Product, Supplier, SupplierProduct,
+    ProductStocks, ProductBatch, Order, OrderItem, Transaction,
+)
+from .alert_service import AlertService
+from .dashboard_service import DashboardService
+from .inventory_service import InventoryService
+from .sequence_service import SequenceService
+
+
+class SeedService:
+    """
+    Synthetic catalogs for load tests and benchmarks
+
+    Rows follow the shapes of insert_sample_data (pharmacy categories, stock
+    profiles, supplier links, pending orders) but are generated in any quantity
+    and written with bulk_create, chunk by chunk, so 100k products seed in
+    minutes instead of hours. bulk_create sends no signals: stock totals,
+    statuses, category counts and alerts are computed here.
+    """
+
+    SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+    CHUNK_SIZE = 2000
+
+    CATEGORIES = {
+        'Medications': ['Antibiotics', 'Pain Relief', 'Vitamins & Supplements', 'Cardiovascular', 'Respiratory'],
+        'Medical Supplies': ['Bandages & Dressings', 'Syringes & Needles', 'Diagnostic Equipment', 'Gloves & Masks'],
+        'Personal Care': ['Skin Care', 'Oral Care', 'Hygiene Products', 'Baby Care'],
+        'Laboratory Supplies': ['Test Kits', 'Reagents', 'Specimen Collection'],
+        'Wellness & Nutrition': ['Herbal Supplements', 'Protein & Nutrition', 'Sports Nutrition'],
+    }
+    GENERICS = [
+        'Amoxicillin 500mg', 'Paracetamol 500mg', 'Ibuprofen 400mg', 'Multivitamin', 'Amlodipine 5mg',
+        'Loratadine 10mg', 'Omeprazole 20mg', 'Metformin 500mg', 'Adhesive Bandages', 'Syringe 3ml',
+        'Nitrile Gloves', 'Moisturizing Lotion', 'Toothpaste', 'Rapid Test Kit', 'Whey Protein',
+    ]
+    UNITS = ['Tablet', 'Capsule', 'Bottle', 'Piece', 'Box', 'Pack', 'Tube', 'Vial', 'Kit']
+
+    # (weight, [(quantity range, days to expiry range) per batch]), like insert_sample_data's stock_configs
+    STOCK_PROFILES = [
+        (70, [((500, 1500), (180, 365))]),   # Normal
+        (10, [((2, 8), (120, 365))]),        # Low Stock
+        (10, [((100, 300), (5, 28))]),       # Near Expiry
+        (5, [((20, 80), (-30, -1))]),        # Expired
+        (5, [((0, 0), (90, 365))]),          # Out of Stock
+    ]
+
+    @staticmethod
+    def seed_catalog(products, batches_per_product=3, transactions_per_product=5,
+                     suppliers=None, orders=None, items_per_order=5, seed=42, progress=None):
+        """
+        Write a synthetic catalog of `products` products with stocks, batches,
+        supplier links, stock-in/out transactions and pending orders
+
+        Args:
+            products: Number of products to create
+            batches_per_product: Batches per product stock
+            transactions_per_product: Transactions per product (first per batch is the stock-in)
+            suppliers: Number of suppliers (default products // 200, at least 8)
+            orders: Number of pending orders (default products // 20, at least 1)
+            items_per_order: Order items per order
+            seed: Random seed, so a size always produces the same catalog
+            progress: Optional callable(created_products, total)
+
+        Returns:
+            dict of created row counts per table
+        """
+        rng = random.Random(seed)
+        today = timezone.now().date()
+        counts = dict.fromkeys(
+            ['categories', 'subcategories', 'suppliers', 'products', 'supplier_products',
+             'stocks', 'batches', 'transactions', 'orders', 'order_items'], 0
+        )
+
+        subcategories = SeedService._seed_categories(counts)
+        supplier_list = SeedService._seed_suppliers(suppliers or max(8, products // 200), counts)
+
+        for start in range(0, products, SeedService.CHUNK_SIZE):
+            size = min(SeedService.CHUNK_SIZE, products - start)
+            with transaction.atomic():
+                SeedService._seed_products(size, subcategories, supplier_list, batches_per_product,
+                                           transactions_per_product, rng, today, counts)
+            if progress:
+                progress(start + size, products)
+
+        with transaction.atomic():
+            SeedService._seed_orders(orders or max(1, products // 20), items_per_order, supplier_list, rng, counts)
+            SeedService.recompute()
+
+        return counts
+
+    @staticmethod
+    def recompute():
+        """Set-based refresh of everything the per-row signals would have maintained"""
+        for category in Category.objects.all():
+            category.product_count = category.products.count()
+            category.save(update_fields=['product_count'])
+        InventoryService.refresh_all_batch_statuses()
+        stock_ids = list(InventoryService.find_stock_total_drift().values_list('stock_id', flat=True))
+        InventoryService.reconcile_stock_totals(stock_ids)
+        AlertService.rebuild_all()
+        DashboardService.invalidate()
+
+    @staticmethod
+    def _seed_categories(counts):
+        existing = {c.category_name: c for c in Category.objects.filter(category_name__in=SeedService.CATEGORIES)}
+        new = [
+            Category(category_name=name, category_description=f'{name} (synthetic)')
+            for name in SeedService.CATEGORIES if name not in existing
+        ]
+        SeedService._assign_codes(Category, 'category_id', 'CAT-', new)
+        Category.objects.bulk_create(new)
+        counts['categories'] += len(new)
+        categories = {**existing, **{c.category_name: c for c in new}}
+
+        names = [name for subs in SeedService.CATEGORIES.values() for name in subs]
+        existing = {s.subcategory_name: s for s in Subcategory.objects.filter(subcategory_name__in=names)}
+        new = [
+            Subcategory(subcategory_name=name, category=categories[category_name])
+            for category_name, subs in SeedService.CATEGORIES.items()
+            for name in subs if name not in existing
+        ]
+        SeedService._assign_codes(Subcategory, 'subcategory_id', 'SC-', new)
+        Subcategory.objects.bulk_create(new)
+        counts['subcategories'] += len(new)
+        return list(existing.values()) + new
+
+    @staticmethod
+    def _seed_suppliers(count, counts):
+        names = [f'Synthetic Supplier {n:04d}' for n in range(1, count + 1)]
+        existing = {s.supplier_name: s for s in Supplier.objects.filter(supplier_name__in=names)}
+        new = [
+            Supplier(supplier_name=name, contact_person='Load Test', email=f'supplier{n}@example.com')
+            for n, name in enumerate(names, start=1) if name not in existing
+        ]
+        SeedService._assign_codes(Supplier, 'supplier_id', 'SUP-', new)
+        Supplier.objects.bulk_create(new)
+        counts['suppliers'] += len(new)
+        return list(existing.values()) + new
+
+    @staticmethod
+    def _seed_products(count, subcategories, suppliers, batches_per_product,
+                       transactions_per_product, rng, today, counts):
+        products = []
+        for _ in range(count):
+            subcategory = rng.choice(subcategories)
+            product = Product(
+                brand_name=f'Brand {rng.randrange(10 ** 6):06d}',
+                generic_name=rng.choice(SeedService.GENERICS),
+                category_id=subcategory.category_id,
+                subcategory=subcategory,
+                price_per_unit=Decimal(rng.randrange(85, 8500)) / 100,
+                unit_of_measurement=rng.choice(SeedService.UNITS),
+            )
+            product.product_name = f'{product.brand_name} - {product.generic_name}'
+            products.append(product)
+        SeedService._assign_codes(Product, 'product_id', 'PRD-', products)
+
+        # Prefixes below are new per product, so the codes are numbered directly;
+        # the counters table seeds itself from these rows on first use
+        links, stocks, batches = [], [], []
+        weights = [weight for weight, _ in SeedService.STOCK_PROFILES]
+        for product in products:
+            for n, supplier in enumerate(rng.sample(suppliers, min(2, len(suppliers))), start=1):
+                links.append(SupplierProduct(
+                    supplier_product_id=f'{supplier.supplier_id}-{product.product_id}-{n:05d}',
+                    product=product,
+                    supplier=supplier,
+                ))
+            stock = ProductStocks(stock_id=f'{product.product_id}-STK-00001', product=product)
+            stocks.append(stock)
+
+            profile = rng.choices(SeedService.STOCK_PROFILES, weights=weights)[0][1]
+            for n in range(1, batches_per_product + 1):
+                (low, high), (soonest, latest) = profile[(n - 1) % len(profile)]
+                batch = ProductBatch(
+                    batch_id=f'{product.product_id}-BAT-{n:05d}',
+                    product_stock=stock,
+                    on_hand=rng.randint(low, high),
+                    expiry_date=today + timedelta(days=rng.randint(soonest, latest)),
+                )
+                batch.status = InventoryService.compute_batch_status(batch.on_hand, batch.expiry_date, product, today)
+                batches.append(batch)
+
+        stock_batches = {}
+        for batch in batches:
+            stock_batches.setdefault(batch.product_stock_id, []).append(batch)
+        for stock in stocks:
+            own = stock_batches.get(stock.stock_id, [])
+            stock.total_on_hand = sum(batch.on_hand for batch in own)
+            stock.status = InventoryService.compute_stock_status(batch.status for batch in own)
+
+        transactions = SeedService._build_transactions(batches, transactions_per_product, rng)
+
+        Product.objects.bulk_create(products, batch_size=SeedService.CHUNK_SIZE)
+        SupplierProduct.objects.bulk_create(links, batch_size=SeedService.CHUNK_SIZE)
+        ProductStocks.objects.bulk_create(stocks, batch_size=SeedService.CHUNK_SIZE)
+        ProductBatch.objects.bulk_create(batches, batch_size=SeedService.CHUNK_SIZE)
+        Transaction.objects.bulk_create(transactions, batch_size=SeedService.CHUNK_SIZE)
+
+        counts['products'] += len(products)
+        counts['supplier_products'] += len(links)
+        counts['stocks'] += len(stocks)
+        counts['batches'] += len(batches)
+        counts['transactions'] += len(transactions)
+
+    @staticmethod
+    def _build_transactions(batches, per_product, rng):
+        """A stock-in per batch, then stock-outs spread over the past year"""
+        now = timezone.now()
+        by_product = {}
+        for batch in batches:
+            by_product.setdefault(batch.product_stock.product, []).append(batch)
+
+        transactions = []
+        for product, product_batches in by_product.items():
+            for n in range(per_product):
+                batch = product_batches[n % len(product_batches)]
+                stock_in = n < len(product_batches)
+                quantity = batch.on_hand if stock_in else -rng.randint(1, 20)
+                transactions.append(Transaction(
+                    transaction_type='IN' if stock_in else 'OUT',
+                    product=product,
+                    batch=batch,
+                    quantity_change=quantity,
+                    on_hand=batch.on_hand,
+                    performed_by='Load Test',
+                    remarks='Synthetic stock-in' if stock_in else 'Synthetic dispense',
+                    date_of_transaction=now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                ))
+
+        codes_by_prefix = {}
+        for txn in transactions:
+            codes_by_prefix.setdefault(f'TXN-{txn.date_of_transaction.year}-', []).append(txn)
+        codes = SequenceService.next_codes(Transaction, 'transaction_id', {
+            prefix: len(rows) for prefix, rows in codes_by_prefix.items()
+        })
+        for prefix, rows in codes_by_prefix.items():
+            for txn, code in zip(rows, codes[prefix]):
+                txn.transaction_id = code
+        return transactions
+
+    @staticmethod
+    def _seed_orders(count, items_per_order, suppliers, rng, counts):
+        """Pending orders with large quantities, so benchmarks can receive against them repeatedly"""
+        links = list(SupplierProduct.objects.filter(supplier__in=suppliers).values_list('product_id', 'supplier_id'))
+        if not links:
+            return
+
+        prefix = f'ORD-{timezone.now().year}-'
+        orders = [Order(ordered_by='Load Test', status='Pending') for _ in range(count)]
+        SeedService._assign_codes(Order, 'order_id', prefix, orders)
+
+        items = []
+        for order in orders:
+            for product_id, supplier_id in rng.sample(links, min(items_per_order, len(links))):
+                items.append(OrderItem(
+                    order=order, product_id=product_id, supplier_id=supplier_id, quantity_ordered=100_000,
+                ))
+            order.total_ordered = 100_000 * min(items_per_order, len(links))
+        SeedService._assign_codes(OrderItem, 'order_item_id', 'ITM-', items)
+
+        Order.objects.bulk_create(orders, batch_size=SeedService.CHUNK_SIZE)
+        OrderItem.objects.bulk_create(items, batch_size=SeedService.CHUNK_SIZE)
+        counts['orders'] += len(orders)
+        counts['order_items'] += len(items)
+
+    @staticmethod
+    def _assign_codes(model, field_name, prefix, objects):
+        if not objects:
+            return
+        codes = SequenceService.next_codes(model, field_name, {prefix: len(objects)})[prefix]
+        for obj, code in zip(objects, codes):
+            setattr(obj, field_name, code)
@@ -0,0 +1,285 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models
+from django.db.models.constants import OnConflict
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# id_sequence row rewritten by ResetService whenever it empties the table
+RESET_MARKER = '#reset'
+
+
+class CounterTableAllocator:
+    """
+    Allocate sequence numbers from the id_sequence counters table.
+
+    Each key (e.g. 'PRD-', 'TXN-2026-', 'PRD-00001-BAT-') has one row holding
+    the last number handed out. Numbers are reserved with a single
+    UPDATE ... RETURNING, so two writers can never receive the same number.
+
+    Reservations go through a connection of their own (ID_ALLOCATOR_OWN_CONNECTION,
+    on every backend but SQLite) that commits each one immediately: the
+    counter row stays locked for one statement instead of until the request's
+    transaction ends, and a whole block (block_size numbers) is reserved per
+    round trip and served from memory afterwards. Numbers reserved by a
+    transaction that rolls back are skipped, like with a database sequence.
+    On the request's own connection (SQLite, whose writers are serialized
+    anyway) only one number is reserved inside a transaction, so a rollback
+    can never leave a cached block pointing at released numbers.
+
+    Every block remembers the reset marker it was reserved under, read by the
+    same UPDATE that reserves it. Serving from a block costs no query: the
+    marker is only read again once reset_check_seconds have passed since the
+    block's last check. When ResetService empties the table (in any process)
+    the marker changes and cached blocks are dropped instead of served; other
+    processes notice at their next reservation or check.
+    """
+
+    def __init__(self, block_size=100, reset_check_seconds=5):
+        self.block_size = block_size
+        self.reset_check_seconds = reset_check_seconds
+        self._blocks = {}  # key -> [next_number, last_number, reset marker, checked at]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self):
+        """The connection reservations run on (see the class docstring)"""
+        if connection.vendor == 'sqlite' or not getattr(settings, 'ID_ALLOCATOR_OWN_CONNECTION', True):
+            return connection
+        own = getattr(self._local, 'connection', None)
+        if own is None:
+            own = self._local.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        return own
+
+    def close_if_obsolete(self):
+        """Close this thread's own connection when CONN_MAX_AGE says so (end of request)"""
+        own = getattr(self._local, 'connection', None)
+        if own is not None:
+            own.close_if_unusable_or_obsolete()
+
+    @staticmethod
+    def _table(conn):
+        from ..models import IdSequence
+        return conn.ops.quote_name(IdSequence._meta.db_table)
+
+    def _reset_marker(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT last_value FROM {self._table(conn)} WHERE name = %s", [RESET_MARKER])
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def next_number(self, key, seed, block_size=None):
+        """
+        Return the next number for key.
+
+        Args:
+            key: Counter name (usually the code prefix)
+            seed: Callable returning the highest number already in use, only
+                  called the first time a key is seen
+            block_size: Optional override of the configured block size
+        """
+        conn = self._connection()
+
+        with self._lock:
+            block = self._blocks.get(key)
+        if block and block[0] <= block[1]:
+            if time.monotonic() - block[3] >= self.reset_check_seconds:
+                self._check_reset(self._reset_marker(conn))
+            with self._lock:
+                if block[0] <= block[1] and self._blocks.get(key) is block:
+                    number = block[0]
+                    block[0] += 1
+                    return number
+
+        size = block_size or self.block_size
+        if conn is connection and connection.in_atomic_block:
+            size = 1
+
+        last, marker = self._reserve(conn, key, size, seed)
+        first = last - size + 1
+        self._check_reset(marker)
+
+        if size > 1:
+            with self._lock:
+                self._blocks[key] = [first + 1, last, marker, time.monotonic()]
+        return first
+
+    def _check_reset(self, marker):
+        """Drop the blocks reserved before the reset that marker reveals, mark the rest as checked"""
+        now = time.monotonic()
+        with self._lock:
+            for key, block in list(self._blocks.items()):
+                if block[2] != marker:
+                    del self._blocks[key]
+                else:
+                    block[3] = now
+
+    def _insert_missing(self, conn, seeds):
+        """Create the counter rows of seeds (key -> starting value) that do not exist yet"""
+        from ..models import IdSequence
+
+        fields = [IdSequence._meta.get_field('name'), IdSequence._meta.get_field('last_value')]
+        values = ", ".join("(%s, %s)" for _ in seeds)
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"{conn.ops.insert_statement(on_conflict=OnConflict.IGNORE)} {self._table(conn)} "
+                f"({', '.join(conn.ops.quote_name(field.column) for field in fields)}) VALUES {values} "
+                f"{conn.ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None)}",
+                [value for item in seeds.items() for value in item]
+            )
+
+    def _reserve(self, conn, key, count, seed):
+        """Reserve count numbers for key; returns (last reserved number, reset marker)"""
+        table = self._table(conn)
+        sql = (
+            f"UPDATE {table} SET last_value = last_value + %s WHERE name = %s "
+            f"RETURNING last_value, (SELECT last_value FROM {table} WHERE name = %s)"
+        )
+
+        with conn.cursor() as cursor:
+            cursor.execute(sql, [count, key, RESET_MARKER])
+            row = cursor.fetchone()
+        if row is None:
+            # First use of this key: start after the highest existing code
+            self._insert_missing(conn, {key: seed()})
+            with conn.cursor() as cursor:
+                cursor.execute(sql, [count, key, RESET_MARKER])
+                row = cursor.fetchone()
+        return row[0], row[1] or 0
+
+    def reserve_many(self, counts, seed):
+        """
+        Reserve counts[key] consecutive numbers for every key in one statement.
+
+        Used by bulk writers that assign codes before bulk_create. Nothing is
+        cached, so this is safe inside a transaction.
+
+        Args:
+            counts: Dict of key -> how many numbers to reserve
+            seed: Callable taking a list of unseen keys and returning a dict of
+                  key -> highest number already in use
+
+        Returns:
+            dict: key -> first reserved number
+        """
+        counts = {key: count for key, count in counts.items() if count > 0}
+        if not counts:
+            return {}
+
+        conn = self._connection()
+        reserved = self._reserve_rows(conn, counts)
+        missing = [key for key in counts if key not in reserved]
+        if missing:
+            seeds = seed(missing)
+            self._insert_missing(conn, {key: seeds.get(key, 0) for key in missing})
+            reserved.update(self._reserve_rows(conn, {key: counts[key] for key in missing}))
+
+        return {key: reserved[key] - counts[key] + 1 for key in counts}
+
+    def _reserve_rows(self, conn, counts):
+        whens = " ".join("WHEN %s THEN %s" for _ in counts)
+        placeholders = ", ".join("%s" for _ in counts)
+        params = [value for key, count in counts.items() for value in (key, count)]
+        params += list(counts)
+
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._table(conn)} SET last_value = last_value + CASE name {whens} END "
+                f"WHERE name IN ({placeholders}) RETURNING name, last_value",
+                params
+            )
+            return dict(cursor.fetchall())
+
+    def reset(self):
+        """Drop all cached blocks (e.g. after the counters table is cleared)"""
+        with self._lock:
+            self._blocks.clear()
+
+
+_allocator = None
+
+
+def get_allocator():
+    """Return the process-wide allocator configured by ID_ALLOCATOR"""
+    global _allocator
+    if _allocator is None:
+        allocator_class = import_string(getattr(
+            settings, 'ID_ALLOCATOR',
+            'inventory_system.services.sequence_service.CounterTableAllocator'
+        ))
+        _allocator = allocator_class(
+            block_size=getattr(settings, 'ID_ALLOCATOR_BLOCK_SIZE', 100),
+            reset_check_seconds=getattr(settings, 'ID_ALLOCATOR_RESET_CHECK_SECONDS', 5),
+        )
+    return _allocator
+
+
+@receiver(request_finished)
+def close_allocator_connection(**kwargs):
+    """Give the allocator's own connection the same end-of-request treatment as Django's"""
+    if _allocator is not None and hasattr(_allocator, 'close_if_obsolete'):
+        _allocator.close_if_obsolete()
+
+
+class SequenceService:
+    """Human-readable code generation (CAT-00001, TXN-2026-00001, ...)"""
+
+    @staticmethod
+    def next_code(model, field_name, prefix, length=5, block_size=None):
+        """
+        Return the next code for prefix, e.g. next_code(Product, 'product_id', 'PRD-') -> 'PRD-00042'
+
+        The existing rows of model are only scanned the first time a prefix is
+        used, to continue numbering after data created before the counters table.
+        """
+        def seed():
+            last_entry = model.objects.filter(
+                **{f"{field_name}__startswith": prefix}
+            ).order_by(f"-{field_name}").values_list(field_name, flat=True).first()
+
+            if not last_entry:
+                return 0
+            try:
+                return int(last_entry.replace(prefix, ""))
+            except ValueError:
+                return 0
+
+        number = get_allocator().next_number(prefix, seed, block_size=block_size)
+        return f"{prefix}{str(number).zfill(length)}"
+
+    @staticmethod
+    def next_codes(model, field_name, counts, length=5):
+        """
+        Reserve codes for several prefixes at once, for rows written with bulk_create.
+
+        Args:
+            model: Model owning the codes (used to seed unseen prefixes)
+            field_name: Code field on model
+            counts: Dict of prefix -> number of codes needed
+
+        Returns:
+            dict: prefix -> list of codes, e.g. {'RCV-': ['RCV-00007', 'RCV-00008']}
+        """
+        def seed(prefixes):
+            query = models.Q()
+            for prefix in prefixes:
+                query |= models.Q(**{f"{field_name}__startswith": prefix})
+
+            highest = {prefix: 0 for prefix in prefixes}
+            for code in model.objects.filter(query).values_list(field_name, flat=True).iterator():
+                for prefix in prefixes:
+                    if code.startswith(prefix):
+                        try:
+                            highest[prefix] = max(highest[prefix], int(code.replace(prefix, "")))
+                        except ValueError:
+                            pass
+            return highest
+
+        firsts = get_allocator().reserve_many(counts, seed)
+        return {
+            prefix: [f"{prefix}{str(first + offset).zfill(length)}" for offset in range(counts[prefix])]
+            for prefix, first in firsts.items()
+        }
@@ -1,11 +1,21 @@
-from django.db.models.signals import post_save, pre_save, post_delete
+import logging
+from contextlib import contextmanager
+
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.db import transaction
+from django.db.backends.signals import connection_created
 from django.contrib.auth.models import User
-from .models import Product, Category, ReceiveOrder, ProductBatch, ProductStocks, UserInformation
+from .models import Product, Category, ReceiveOrder, ProductBatch, ProductStocks, UserInformation, Order, OrderItem, Supplier, SupplierProduct
 from .services.inventory_service import InventoryService
 from .services.order_service import OrderService
 from .services.transaction_service import TransactionService
+from .services.alert_service import AlertService
+from .services.dashboard_service import DashboardService
+from .services.metrics_service import DatabasePoolMetricsService
+from .logging_utils import timed_operation
+
+logger = logging.getLogger(__name__)
 
 # User Profile Auto-creation Signal
 @receiver(post_save, sender=User)
@@ -13,7 +23,7 @@ def create_user_profile(sender, instance, created, **kwargs):
     """Automatically create UserInformation profile when a User is created"""
     if created:
         UserInformation.objects.create(user=instance, role='Staff')
-        print(f"UserInformation profile created for user: {instance.username}")
+        logger.info('UserInformation profile created for user: %s', instance.username)
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
@@ -25,13 +35,14 @@ def save_user_profile(sender, instance, **kwargs):
 @receiver(post_save, sender=Product)
 def update_count_on_save(sender, instance, **kwargs):
     """Update category product count when product is saved"""
-    print(f"Signal triggered: Product {instance.brand_name} saved")
+    logger.debug('Product %s saved', instance.brand_name)
     OrderService.update_product_count(instance.category)
+    AlertService.refresh_product(instance)
 
 @receiver(post_delete, sender=Product)
 def update_count_on_delete(sender, instance, **kwargs):
     """Update category product count when product is deleted"""
-    print(f"Signal triggered: Product {instance.brand_name} deleted")
+    logger.debug('Product %s deleted', instance.brand_name)
     OrderService.update_product_count(instance.category)
 
 @receiver(pre_save, sender = ReceiveOrder)
@@ -45,7 +56,36 @@ def capture_old_receive_quantity(sender, instance, **kwargs):
     else: 
         instance._old_quantity_received = 0
 
-# ReceiveOrder Signals - Handle inventory updates when items are received
+# Order Counter Signals - Keep OrderItem.quantity_received and Order totals in step
+# (bulk_receive updates them itself; see ReceiveService.receive)
+@receiver(post_save, sender=ReceiveOrder)
+def update_received_counters_on_save(sender, instance, created, **kwargs):
+    delta = instance.quantity_received - getattr(instance, '_old_quantity_received', 0)
+    OrderService.apply_receive_delta(instance.order_item_id, instance.order_id, delta)
+
+@receiver(post_delete, sender=ReceiveOrder)
+def update_received_counters_on_delete(sender, instance, **kwargs):
+    OrderService.apply_receive_delta(instance.order_item_id, instance.order_id, -instance.quantity_received)
+
+@receiver(pre_save, sender=OrderItem)
+def capture_old_quantity_ordered(sender, instance, **kwargs):
+    instance._old_quantity_ordered = 0
+    if not instance._state.adding:
+        instance._old_quantity_ordered = OrderItem.objects.filter(
+            pk=instance.pk
+        ).values_list('quantity_ordered', flat=True).first() or 0
+
+@receiver(post_save, sender=OrderItem)
+def update_ordered_total_on_save(sender, instance, **kwargs):
+    OrderService.apply_ordered_delta(
+        instance.order_id, instance.quantity_ordered - getattr(instance, '_old_quantity_ordered', 0)
+    )
+
+@receiver(post_delete, sender=OrderItem)
+def update_ordered_total_on_delete(sender, instance, **kwargs):
+    # Receipts of the item are deleted by the cascade and subtract their own quantities
+    OrderService.apply_ordered_delta(instance.order_id, -instance.quantity_ordered)
+
 # ReceiveOrder Signals - Handle inventory updates when items are received
 @receiver(post_save, sender=ReceiveOrder)
 def handle_received_items(sender, instance, created, **kwargs):
@@ -62,19 +102,20 @@ def handle_received_items(sender, instance, created, **kwargs):
         instance._processing = True
         
         try:
-            with transaction.atomic():
+            with timed_operation(logger, 'process_receive', logging.DEBUG), transaction.atomic():
                 # Get the product and find or create its ProductStocks
 
                 if created:
                     quantity_to_add = instance.quantity_received
-                    print(f"New Receipt - Adding quantity:  {quantity_to_add}")
+                    logger.debug('New receipt %s - adding quantity: %s', instance.receive_order_id, quantity_to_add)
                 else:
                     old_quantity = getattr(instance, '_old_quantity_received', 0)
                     quantity_to_add = instance.quantity_received - old_quantity
-                    print(f"Update - Old: {old_quantity}, New {instance.quantity_received}, Difference: {quantity_to_add}")
+                    logger.debug('Receipt %s updated - old: %s, new: %s, difference: %s',
+                                 instance.receive_order_id, old_quantity, instance.quantity_received, quantity_to_add)
 
                 if quantity_to_add <= 0:
-                    print(f"No quantity to add, skipping inventory update")
+                    logger.debug('No quantity to add for %s, skipping inventory update', instance.receive_order_id)
                     # Still update order status even if no quantity change
                     OrderService.update_order_status(instance.order)
                     return
@@ -94,8 +135,7 @@ def handle_received_items(sender, instance, created, **kwargs):
                     expiry_date=instance.expiry_date  # Pass actual expiry date if available
                 )
                 
-                # Update stock totals and status
-                InventoryService.update_stock_total(product_stock)
+                # Stock totals were updated by the batch save (delta); refresh statuses
                 InventoryService.update_batch_status(batch)
                 InventoryService.update_stock_status(product_stock)
                 
@@ -124,14 +164,15 @@ def handle_received_items(sender, instance, created, **kwargs):
                     remarks=remarks
                 )
                 
-                print(f"✅ Processed ReceiveOrder {instance.receive_order_id}: {quantity_to_add} units added to batch {batch.batch_id}")
+                logger.info('Processed ReceiveOrder %s: %s units added to batch %s',
+                            instance.receive_order_id, quantity_to_add, batch.batch_id)
                 
                 # Update order status after processing inventory
                 OrderService.update_order_status(instance.order)
-                print(f"✅ Updated Order {instance.order.order_id} status to: {instance.order.status}")
+                logger.debug('Order %s status: %s', instance.order.order_id, instance.order.status)
                     
-        except Exception as e:
-            print(f"❌ Error in handle_received_items: {e}")
+        except Exception:
+            logger.exception('Error processing ReceiveOrder %s', instance.receive_order_id)
             # Transaction will automatically rollback due to atomic block
             raise
         
@@ -147,10 +188,14 @@ def handle_received_items(sender, instance, created, **kwargs):
 @receiver(pre_save, sender=ProductBatch)
 def track_batch_changes(sender, instance, **kwargs):
     """Track on_hand changes before save for transaction recording"""
+    instance._old_product_stock_id = None
     if instance.pk:
         try:
-            old_batch = ProductBatch.objects.get(pk=instance.pk)
+            # Locked until the save commits (ProductBatch.save is atomic), so a
+            # concurrent adjustment waits instead of computing its delta from the same old value
+            old_batch = ProductBatch.objects.select_for_update().get(pk=instance.pk)
             instance._old_on_hand = old_batch.on_hand
+            instance._old_product_stock_id = old_batch.product_stock_id
         except ProductBatch.DoesNotExist:
             instance._old_on_hand = 0
     else:
@@ -173,12 +218,19 @@ def update_stock_on_batch_save(sender, instance, created, **kwargs):
         old_on_hand = getattr(instance, '_old_on_hand', 0)
         quantity_change = instance.on_hand - old_on_hand
         
+        # Update totals FIRST, by delta (the batch may have moved to another stock)
+        old_stock_id = getattr(instance, '_old_product_stock_id', None)
+        if old_stock_id and old_stock_id != product_stock.stock_id:
+            old_stock = ProductStocks.objects.get(stock_id=old_stock_id)
+            InventoryService.apply_stock_delta(old_stock, -old_on_hand)
+            InventoryService.update_stock_status(old_stock)
+            AlertService.refresh_stocks([old_stock_id])
+            InventoryService.apply_stock_delta(product_stock, instance.on_hand)
+        else:
+            InventoryService.apply_stock_delta(product_stock, quantity_change)
+        
         # Record adjustment transaction if on_hand changed (and not created)
         if not created and quantity_change != 0:
-            # Update totals FIRST
-            InventoryService.update_stock_total(product_stock)
-            product_stock.refresh_from_db()
-            
             # Get custom transaction fields if provided
             custom_remarks = getattr(instance, '_custom_transaction_remarks', None)
             custom_performed_by = getattr(instance, '_custom_transaction_performed_by', None)
@@ -198,10 +250,7 @@ def update_stock_on_batch_save(sender, instance, created, **kwargs):
                 remarks=remarks,
                 skip_validation=True  # Skip negative stock validation for direct updates
             )
-            print(f"📝 Recorded adjustment transaction: {quantity_change:+d} units for batch {instance.batch_id}")
-        
-        # Update stock totals
-        InventoryService.update_stock_total(product_stock)
+            logger.debug('Recorded adjustment transaction: %+d units for batch %s', quantity_change, instance.batch_id)
         
         # Update batch status
         InventoryService.update_batch_status(instance)
@@ -209,13 +258,23 @@ def update_stock_on_batch_save(sender, instance, created, **kwargs):
         # Update stock status
         InventoryService.update_stock_status(product_stock)
         
-        print(f"✅ Updated stock {product_stock.stock_id}: {product_stock.total_on_hand} units - {product_stock.status}")
+        logger.debug('Updated stock %s: %s units - %s', product_stock.stock_id, product_stock.total_on_hand, product_stock.status)
+        
+        # Keep the alert index in step with the new totals
+        AlertService.refresh_stocks([product_stock.stock_id])
         
     finally:
         if hasattr(instance, '_updating_stock'):
             delattr(instance, '_updating_stock')
         if hasattr(instance, '_old_on_hand'):
             delattr(instance, '_old_on_hand')
+        if hasattr(instance, '_old_product_stock_id'):
+            delattr(instance, '_old_product_stock_id')
+
+@receiver(pre_delete, sender=ProductBatch)
+def lock_batch_before_delete(sender, instance, **kwargs):
+    """Re-read on_hand under a row lock (deletes run in a transaction), so the stock total loses what is actually deleted"""
+    instance.on_hand = ProductBatch.objects.select_for_update().filter(pk=instance.pk).values_list('on_hand', flat=True).first() or 0
 
 @receiver(post_delete, sender=ProductBatch)
 def update_stock_on_batch_delete(sender, instance, **kwargs):
@@ -227,12 +286,8 @@ def update_stock_on_batch_delete(sender, instance, **kwargs):
     deleted_quantity = instance.on_hand
     old_total = product_stock.total_on_hand
     
-    # Update stock totals FIRST
-    InventoryService.update_stock_total(product_stock)
-    
-    # Refresh to get updated total
-    product_stock.refresh_from_db()
-    new_total = product_stock.total_on_hand
+    # Update stock totals FIRST (returns the refreshed total)
+    new_total = InventoryService.apply_stock_delta(product_stock, -deleted_quantity)
     
     if deleted_quantity > 0:
         # Record adjustment transaction with CORRECT on_hand value
@@ -244,8 +299,94 @@ def update_stock_on_batch_delete(sender, instance, **kwargs):
             performed_by="System",
             remarks=f"Batch {instance.batch_id} deleted with {deleted_quantity} units remaining"
         )
-        print(f"✅ Transaction recorded: Batch {instance.batch_id} deleted "
-              f"(-{deleted_quantity} units, old total: {old_total}, new total: {new_total})")
+        logger.info('Batch %s deleted (-%s units, old total: %s, new total: %s)',
+                    instance.batch_id, deleted_quantity, old_total, new_total)
     
     # Update stock status after deletion
-    InventoryService.update_stock_status(product_stock)
\ No newline at end of file
+    InventoryService.update_stock_status(product_stock)
+    
+    AlertService.refresh_stocks([product_stock.stock_id])
+
+# ProductStocks Signals - Full saves (API/admin edits) refresh the alert index.
+# Saves with update_fields come from the batch signals above, which refresh it themselves.
+@receiver(post_save, sender=ProductStocks)
+def refresh_alerts_on_stock_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None:
+        AlertService.refresh_stocks([instance.stock_id])
+
+# Dashboard Cache Signals - Writes invalidate the dashboard widgets they affect
+@receiver([post_save, post_delete], sender=ProductBatch)
+@receiver([post_save, post_delete], sender=ProductStocks)
+def invalidate_dashboard_on_stock_change(sender, instance, **kwargs):
+    DashboardService.invalidate(DashboardService.CATEGORIES, DashboardService.STOCK_STATUS)
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_dashboard_on_product_change(sender, instance, **kwargs):
+    DashboardService.invalidate(DashboardService.CATEGORIES, DashboardService.STATS)
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_dashboard_on_category_change(sender, instance, **kwargs):
+    DashboardService.invalidate(DashboardService.CATEGORIES)
+
+@receiver([post_save, post_delete], sender=Order)
+def invalidate_dashboard_on_order_change(sender, instance, **kwargs):
+    DashboardService.invalidate(DashboardService.STATS)
+
+@receiver([post_save, post_delete], sender=Supplier)
+@receiver([post_save, post_delete], sender=SupplierProduct)
+def invalidate_dashboard_on_supplier_change(sender, instance, **kwargs):
+    DashboardService.invalidate(DashboardService.TOP_SUPPLIERS)
+
+
+# Database connection metrics - Counts connections set up (or checked out of the pool)
+@receiver(connection_created)
+def count_database_connect(sender, connection, **kwargs):
+    DatabasePoolMetricsService.record_connect(connection.alias)
+
+
+# Every inventory receiver above, in connection order (user profile receivers excluded)
+INVENTORY_RECEIVERS = [
+    (post_save, update_count_on_save, Product),
+    (post_delete, update_count_on_delete, Product),
+    (pre_save, capture_old_receive_quantity, ReceiveOrder),
+    (post_save, update_received_counters_on_save, ReceiveOrder),
+    (post_delete, update_received_counters_on_delete, ReceiveOrder),
+    (pre_save, capture_old_quantity_ordered, OrderItem),
+    (post_save, update_ordered_total_on_save, OrderItem),
+    (post_delete, update_ordered_total_on_delete, OrderItem),
+    (post_save, handle_received_items, ReceiveOrder),
+    (pre_save, track_batch_changes, ProductBatch),
+    (post_save, update_stock_on_batch_save, ProductBatch),
+    (post_delete, update_stock_on_batch_delete, ProductBatch),
+    (post_save, refresh_alerts_on_stock_save, ProductStocks),
+    (post_save, invalidate_dashboard_on_stock_change, ProductStocks),
+    (post_delete, invalidate_dashboard_on_stock_change, ProductStocks),
+    (post_save, invalidate_dashboard_on_stock_change, ProductBatch),
+    (post_delete, invalidate_dashboard_on_stock_change, ProductBatch),
+    (post_save, invalidate_dashboard_on_product_change, Product),
+    (post_delete, invalidate_dashboard_on_product_change, Product),
+    (post_save, invalidate_dashboard_on_category_change, Category),
+    (post_delete, invalidate_dashboard_on_category_change, Category),
+    (post_save, invalidate_dashboard_on_order_change, Order),
+    (post_delete, invalidate_dashboard_on_order_change, Order),
+    (post_save, invalidate_dashboard_on_supplier_change, SupplierProduct),
+    (post_delete, invalidate_dashboard_on_supplier_change, SupplierProduct),
+    (post_save, invalidate_dashboard_on_supplier_change, Supplier),
+    (post_delete, invalidate_dashboard_on_supplier_change, Supplier),
+]
+
+
+@contextmanager
+def inventory_signals_disabled():
+    """
+    Disconnect the inventory receivers for bulk maintenance work (seeding,
+    resets) that recomputes totals, statuses and alerts set-based afterwards.
+    Process-wide: only use from management commands.
+    """
+    for signal, handler, sender in INVENTORY_RECEIVERS:
+        signal.disconnect(handler, sender=sender)
+    try:
+        yield
+    finally:
+        for signal, handler, sender in INVENTORY_RECEIVERS:
+            signal.connect(handler, sender=sender)
@@ -1,3 +1,1578 @@
-from django.test import TestCase
+import base64
+import csv
+import gzip
+import importlib
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F, Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import async_views, db_router
+from .pagination import KeysetCursorPagination
+from .services.alert_service import AlertService
+from .services.change_feed_service import ChangeFeedService
+from .services.dashboard_service import DashboardService
+from .services.dispense_service import DispenseService
+from .services.event_service import EventService, get_broker
+from .services.export_service import ExportService
+from .services.inventory_service import InventoryService
+from .services.mail_queue_service import MailQueueService
+from .services.order_service import OrderService
+from .services.metrics_service import RequestMetricsService, DatabasePoolMetricsService
+from .services.partition_service import TransactionPartitionService
+from .services.reset_service import ResetService
+from .services.seed_service import SeedService
+from .services.sequence_service import RESET_MARKER, CounterTableAllocator, SequenceService
+from .models import (
+    Category, Subcategory, Product, ProductStocks, ProductBatch, Supplier, Order, OrderItem, ReceiveOrder,
+    Transaction, IdSequence, OTP, OutboundEmail, ChangeLog, ChangeStamp,
+)
+
+
+class SequenceAllocatorTests(TransactionTestCase):
+    """Codes come from id_sequence blocks; resets invalidate blocks cached anywhere"""
+
+    def setUp(self):
+        # A fresh process-wide allocator: the flush between these tests writes no reset marker
+        patcher = mock.patch('inventory_system.services.sequence_service._allocator', CounterTableAllocator())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        category = Category.objects.create(category_name='Medications')
+        self.product_fields = {
+            'generic_name': 'Paracetamol', 'category': category,
+            'subcategory': Subcategory.objects.create(subcategory_name='Pain Relief', category=category),
+            'price_per_unit': 10, 'unit_of_measurement': 'tablet',
+        }
+
+    def reservations(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith('UPDATE') and 'id_sequence' in q['sql']]
+
+    def test_block_is_reserved_in_one_round_trip(self):
+        allocator = CounterTableAllocator(block_size=5)
+        self.assertEqual(allocator.next_number('TST-', lambda: 0), 1)
+        self.assertEqual(IdSequence.objects.get(name='TST-').last_value, 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            numbers = [allocator.next_number('TST-', lambda: 0) for _ in range(9)]
+        self.assertEqual(numbers, list(range(2, 11)))
+        self.assertEqual(len(self.reservations(queries.captured_queries)), 1)
+
+        # A second allocator (another process) continues after the reserved blocks
+        self.assertEqual(CounterTableAllocator(block_size=5).next_number('TST-', lambda: 0), 11)
+        self.assertEqual(allocator.next_number('TST-', lambda: 0), 16)
+
+    def test_cached_numbers_cost_no_queries(self):
+        allocator = CounterTableAllocator(block_size=100)
+        with CaptureQueriesContext(connection) as queries:
+            numbers = [allocator.next_number('TST-', lambda: 0) for _ in range(100)]
+        self.assertEqual(numbers, list(range(1, 101)))
+        # The reservation of the first use (UPDATE, INSERT of the counter, UPDATE) and nothing per number
+        self.assertEqual(len(queries), 3, [q['sql'] for q in queries.captured_queries])
+
+    def test_request_transaction_reserves_single_numbers(self):
+        allocator = CounterTableAllocator(block_size=5)
+        with transaction.atomic():
+            self.assertEqual([allocator.next_number('TST-', lambda: 0) for _ in range(2)], [1, 2])
+            self.assertEqual(IdSequence.objects.get(name='TST-').last_value, 2)
+        self.assertEqual(allocator._blocks, {})
+
+    def test_new_prefix_continues_after_existing_codes(self):
+        Product.objects.create(product_id='PRD-00041', brand_name='Existing', **self.product_fields)
+
+        self.assertEqual(SequenceService.next_code(Product, 'product_id', 'PRD-'), 'PRD-00042')
+        self.assertEqual(Product.objects.create(brand_name='New', **self.product_fields).product_id, 'PRD-00043')
+
+    def test_year_rollover_starts_a_new_counter(self):
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 12, 31, 12, tzinfo=dt_timezone.utc)):
+            last_of_year = [Order.objects.create(ordered_by='admin').order_id for _ in range(2)]
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2027, 1, 1, 12, tzinfo=dt_timezone.utc)):
+            first_of_year = Order.objects.create(ordered_by='admin').order_id
+
+        self.assertEqual(last_of_year, ['ORD-2026-00001', 'ORD-2026-00002'])
+        self.assertEqual(first_of_year, 'ORD-2027-00001')
+
+    def test_reset_drops_blocks_cached_by_other_processes(self):
+        other_process = CounterTableAllocator(block_size=5, reset_check_seconds=60)
+        with mock.patch('time.monotonic', return_value=1000):
+            self.assertEqual(other_process.next_number('PRD-', lambda: 0), 1)
+            self.assertEqual(other_process.next_number('TST-', lambda: 0), 1)
+
+        ResetService.truncate([IdSequence])
+
+        # Within reset_check_seconds the cached block is still trusted
+        with mock.patch('time.monotonic', return_value=1030):
+            self.assertEqual(other_process.next_number('PRD-', lambda: 0), 2)
+
+        # Afterwards the marker is read again: the blocks reserved before the reset are not served any more
+        with mock.patch('time.monotonic', return_value=1061):
+            self.assertEqual(other_process.next_number('PRD-', lambda: 0), 1)
+        self.assertEqual(IdSequence.objects.get(name='PRD-').last_value, 5)
+        self.assertNotIn('TST-', other_process._blocks)
+
+    def test_reservation_notices_a_reset(self):
+        other_process = CounterTableAllocator(block_size=5)
+        self.assertEqual(other_process.next_number('PRD-', lambda: 0), 1)
+
+        ResetService.truncate([IdSequence])
+
+        # Reserving any other key reads the new marker and drops the stale PRD- block
+        self.assertEqual(other_process.next_number('CAT-', lambda: 0), 1)
+        self.assertEqual(other_process.next_number('PRD-', lambda: 0), 1)
+
+
+class ReceiveServiceTests(TestCase):
+    """bulk_receive (ReceiveService) writes a delivery in a constant number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        category = Category.objects.create(category_name='Medications')
+        subcategory = Subcategory.objects.create(subcategory_name='Pain Relief', category=category)
+        cls.products = [
+            Product.objects.create(
+                brand_name=f'Brand {i}', generic_name='Paracetamol', category=category, subcategory=subcategory,
+                price_per_unit=10, unit_of_measurement='tablet',
+            )
+            for i in range(9)
+        ]
+        cls.supplier = Supplier.objects.create(supplier_name='Unilab')
+        cls.expiry_date = timezone.now().date() + timedelta(days=365)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_order(self, products, quantity=100):
+        order = Order.objects.create(ordered_by='admin')
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, supplier=self.supplier, quantity_ordered=quantity)
+        return order
+
+    def line(self, item, quantity, expiry_date=None):
+        line = {'order': item.order_id, 'order_item': item.order_item_id, 'quantity_received': quantity, 'received_by': 'admin'}
+        if expiry_date:
+            line['expiry_date'] = expiry_date.isoformat()
+        return line
+
+    def bulk_receive(self, lines):
+        return self.client.post('/api/receive-orders/bulk_receive/', {'items': lines}, format='json')
+
+    def test_query_count_is_constant(self):
+        # First use of the RCV-/TXN- counters
+        warm_up = self.create_order(self.products[:1])
+        self.bulk_receive([self.line(item, 10) for item in warm_up.items.all()])
+
+        small = self.create_order(self.products[1:3])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk_receive([self.line(item, 10, self.expiry_date) for item in small.items.all()])
+        self.assertEqual(response.status_code, 201)
+
+        large = self.create_order(self.products[3:9])
+        with self.assertNumQueries(len(queries)):
+            response = self.bulk_receive([self.line(item, 10, self.expiry_date) for item in large.items.all()])
+        self.assertEqual(response.data['successful'], 6)
+
+    def test_merge_records_stock_in_without_manual_adjustment(self):
+        product = self.products[0]
+        stock = ProductStocks.objects.create(product=product)
+        batch = ProductBatch.objects.create(product_stock=stock, on_hand=20, expiry_date=self.expiry_date)
+        order = self.create_order([product])
+
+        with mock.patch.object(OrderService, 'publish_status') as publish_status:
+            response = self.bulk_receive([self.line(order.items.get(), 30, self.expiry_date)])
+        self.assertEqual(response.status_code, 201)
+
+        batch.refresh_from_db()
+        stock.refresh_from_db()
+        self.assertEqual(ProductBatch.objects.filter(product_stock=stock).count(), 1)
+        self.assertEqual((batch.on_hand, stock.total_on_hand), (50, 50))
+        transactions = Transaction.objects.filter(product=product)
+        self.assertEqual(list(transactions.values_list('transaction_type', 'quantity_change', 'on_hand')), [('IN', 30, 50)])
+        self.assertEqual([o.order_id for o in publish_status.call_args.args[0]], [order.order_id])
+
+    def test_over_receive_rolls_back_the_whole_delivery(self):
+        order = self.create_order(self.products[:2])
+        first, second = order.items.order_by('order_item_id')
+
+        response = self.bulk_receive([
+            self.line(first, 60), self.line(second, 10), self.line(first, 60),
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([int(error['index']) for error in response.data['errors']], [2])
+        self.assertIn('Remaining: 40', str(response.data['errors'][0]['error']))
+        self.assertFalse(ReceiveOrder.objects.exists())
+        self.assertFalse(ProductStocks.objects.filter(product__in=self.products[:2]).exists())
+        order.refresh_from_db()
+        self.assertEqual(order.total_received, 0)
+
+    def snapshot(self, order):
+        products = [item.product_id for item in order.items.all()]
+        return {
+            'batches': sorted(ProductBatch.objects.filter(product_stock__product__in=products).values_list(
+                'product_stock__product_id', 'expiry_date', 'on_hand', 'status')),
+            'stocks': sorted(ProductStocks.objects.filter(product__in=products).values_list(
+                'product_id', 'total_on_hand', 'status')),
+            'items': sorted(order.items.values_list('order_item_id', 'quantity_received')),
+            'order': Order.objects.values_list('status', 'total_ordered', 'total_received').get(pk=order.pk),
+            'stock_ins': sorted(Transaction.objects.filter(product__in=products, transaction_type='IN').values_list(
+                'product_id', 'quantity_change', 'on_hand')),
+        }
+
+    def test_matches_per_item_receiving(self):
+        existing = ProductBatch.objects.create(
+            product_stock=ProductStocks.objects.create(product=self.products[2]), on_hand=5, expiry_date=self.expiry_date
+        )
+        order = self.create_order(self.products[:3], quantity=80)
+        first, second, third = order.items.order_by('order_item_id')
+        later = self.expiry_date + timedelta(days=90)
+        deliveries = [
+            (first, 20, self.expiry_date), (first, 15, self.expiry_date), (first, 10, later),
+            (second, 80, None), (third, 40, self.expiry_date),
+        ]
+
+        savepoint = transaction.savepoint()
+        self.bulk_receive([self.line(item, quantity, expiry_date) for item, quantity, expiry_date in deliveries])
+        bulk = self.snapshot(order)
+        transaction.savepoint_rollback(savepoint)
+
+        for item, quantity, expiry_date in deliveries:
+            with self.captureOnCommitCallbacks(execute=True):
+                ReceiveOrder.objects.create(
+                    order=order, order_item=item, quantity_received=quantity, received_by='admin', expiry_date=expiry_date
+                )
+        self.assertEqual(bulk, self.snapshot(order))
+        self.assertEqual(bulk['order'], ('Partially Received', 240, 165))
+        self.assertIn((self.products[2].product_id, self.expiry_date, 45, 'Normal'), bulk['batches'])
+        self.assertEqual(ProductBatch.objects.filter(pk=existing.pk).values_list('on_hand', flat=True).get(), 45)
+
+
+class KeysetPaginationTests(TestCase):
+    """List endpoints are paginated by default and cursors walk every row exactly once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(12, transactions_per_product=5)
+        # Ties on the cursor's first field (date_of_transaction) are walked by offset
+        tied = Transaction.objects.order_by('transaction_id').values_list('pk', flat=True)[:25]
+        Transaction.objects.filter(pk__in=list(tied)).update(date_of_transaction=timezone.now() - timedelta(days=3))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_paginated_by_default(self):
+        response = self.client.get('/api/transactions/')
+
+        self.assertEqual(len(response.data['results']), KeysetCursorPagination.page_size)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_following_next_returns_every_row_once(self):
+        expected = list(Transaction.objects.order_by('-date_of_transaction', '-transaction_id').values_list(
+            'transaction_id', flat=True))
+
+        seen, url = [], '/api/transactions/?page_size=7'
+        while url:
+            page = self.client.get(url).data
+            self.assertLessEqual(len(page['results']), 7)
+            seen += [row['transaction_id'] for row in page['results']]
+            url = page['next']
+
+        self.assertEqual(len(expected), 60)
+        self.assertEqual(seen, expected)
+
+    def test_screens_filter_on_the_server(self):
+        transaction = Transaction.objects.filter(transaction_type='IN').order_by('transaction_id').first()
+        product_id = transaction.product.product_id
+
+        page = self.client.get(f'/api/transactions/?search={product_id}&transaction_type=IN&page_size=8').data
+        self.assertTrue(page['results'])
+        self.assertEqual({(row['product_id'], row['transaction_type']) for row in page['results']}, {(product_id, 'IN')})
+        self.assertEqual(
+            len(page['results']),
+            min(8, Transaction.objects.filter(product__product_id=product_id, transaction_type='IN').count())
+        )
+
+        stock = ProductStocks.objects.select_related('product').first()
+        page = self.client.get(f'/api/product-stocks/?search={stock.product.brand_name}&status={stock.status}').data
+        self.assertIn(stock.stock_id, [row['stock_id'] for row in page['results']])
+        other_status = 'Expired' if stock.status != 'Expired' else 'Normal'
+        page = self.client.get(f'/api/product-stocks/?search={stock.stock_id}&status={other_status}').data
+        self.assertEqual(page['results'], [])
+
+
+class StockListingQueryCountTests(TestCase):
+    """Listing stocks and batches must not issue queries per row (N+1)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.category = Category.objects.create(category_name='Medications')
+        cls.subcategory = Subcategory.objects.create(subcategory_name='Pain Relief', category=cls.category)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_stocks(self, count):
+        expiry_date = timezone.now().date() + timedelta(days=365)
+        for i in range(count):
+            product = Product.objects.create(
+                brand_name=f'Brand {ProductStocks.objects.count()}',
+                generic_name='Paracetamol',
+                category=self.category,
+                subcategory=self.subcategory,
+                price_per_unit=10,
+                unit_of_measurement='tablet',
+            )
+            stock = ProductStocks.objects.create(product=product)
+            ProductBatch.objects.create(product_stock=stock, on_hand=50, expiry_date=expiry_date)
+            ProductBatch.objects.create(product_stock=stock, on_hand=20, expiry_date=expiry_date + timedelta(days=30))
+            ProductBatch.objects.create(product_stock=stock, on_hand=0, expiry_date=expiry_date)
+
+    def test_product_stocks_list_query_count_is_constant(self):
+        self.create_stocks(2)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/product-stocks/')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.create_stocks(10)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/product-stocks/')
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertEqual(len(response.data['results'][0]['batches']), 2)
+
+    def test_product_batches_list_query_count_is_constant(self):
+        self.create_stocks(2)
+        with self.assertNumQueries(1):
+            self.client.get('/api/product-batches/')
+
+        self.create_stocks(10)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/product-batches/')
+        self.assertEqual(len(response.data['results']), 24)
+
+
+class BatchStatusRefreshTests(TestCase):
+    """The set-based nightly refresh gives the same statuses as update_batch_status row by row"""
+
+    @classmethod
+    def setUpTestData(cls):
+        SeedService.seed_catalog(30, batches_per_product=4)
+        Product.objects.filter(pk__in=list(Product.objects.values_list('pk', flat=True)[:10])).update(expiry_threshold_days=90)
+        today = timezone.now().date()
+        stock = ProductStocks.objects.select_related('product').first()
+        product = stock.product
+        # One batch on each side of every threshold of compute_batch_status
+        for on_hand, days in [
+            (0, 200), (10, 0), (10, -5), (10, product.expiry_threshold_days),
+            (10, product.expiry_threshold_days + 1), (product.low_stock_threshold, 400),
+            (product.low_stock_threshold + 1, 400),
+        ]:
+            ProductBatch.objects.create(product_stock=stock, on_hand=on_hand, expiry_date=today + timedelta(days=days))
+
+    def statuses(self):
+        return (
+            dict(ProductBatch.objects.values_list('batch_id', 'status')),
+            dict(ProductStocks.objects.values_list('stock_id', 'status')),
+        )
+
+    def test_matches_per_batch_refresh(self):
+        # Stale statuses, e.g. from yesterday
+        ProductBatch.objects.update(status='Normal')
+        ProductStocks.objects.update(status='Normal')
+
+        savepoint = transaction.savepoint()
+        for batch in ProductBatch.objects.select_related('product_stock__product'):
+            InventoryService.update_batch_status(batch)
+        for stock in ProductStocks.objects.all():
+            InventoryService.update_stock_status(stock)
+        expected = self.statuses()
+        transaction.savepoint_rollback(savepoint)
+
+        call_command('refresh_inventory_status', stdout=StringIO())
+
+        self.assertEqual(self.statuses(), expected)
+        self.assertEqual(len(set(expected[0].values())), 5)
+
+
+class AlertServiceTests(TestCase):
+    """The maintained inventory_alert table matches alerts computed on the fly"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(20, batches_per_product=3)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def legacy_alerts(self):
+        """What /api/alerts/ computed from stocks and batches on every request before the table"""
+        today = timezone.now().date()
+        alerts = {}
+        for stock in ProductStocks.objects.select_related('product').exclude(product__status='Archived'):
+            if stock.total_on_hand == 0:
+                alerts[f'out-{stock.stock_id}'] = ('out_of_stock', 'critical', stock.stock_id, 0)
+            elif stock.total_on_hand <= stock.product.low_stock_threshold:
+                alerts[f'low-{stock.stock_id}'] = ('low_stock', 'warning', stock.stock_id, stock.total_on_hand)
+        for batch in ProductBatch.objects.select_related('product_stock__product').exclude(
+            product_stock__product__status='Archived'
+        ).filter(on_hand__gt=0):
+            if batch.expiry_date < today:
+                alerts[f'expired-{batch.batch_id}'] = ('expired', 'critical', batch.product_stock_id, batch.on_hand)
+            elif batch.expiry_date <= today + timedelta(days=batch.product_stock.product.expiry_threshold_days):
+                alerts[f'near-expiry-{batch.batch_id}'] = ('near_expiry', 'warning', batch.product_stock_id, batch.on_hand)
+        return alerts
+
+    def served_alerts(self):
+        alerts = self.client.get('/api/alerts/').data['alerts']
+        return {
+            alert['id']: (alert['type'], alert['severity'], alert['stock_id'], alert.get('current_stock', alert.get('on_hand')))
+            for alert in alerts
+        }
+
+    def test_table_follows_inventory_writes(self):
+        self.assertEqual(self.served_alerts(), self.legacy_alerts())
+
+        today = timezone.now().date()
+        stocks = list(ProductStocks.objects.select_related('product').order_by('stock_id')[:5])
+        low, emptied, deleted, dated, archived = stocks
+
+        batch = ProductBatch.objects.filter(product_stock=low, on_hand__gt=0).first()
+        batch.on_hand = 1
+        batch.save()
+        for batch in ProductBatch.objects.filter(product_stock=emptied):
+            batch.on_hand = 0
+            batch.save()
+        ProductBatch.objects.filter(product_stock=deleted).first().delete()
+        ProductBatch.objects.create(product_stock=dated, on_hand=30, expiry_date=today - timedelta(days=2))
+        ProductBatch.objects.create(product_stock=dated, on_hand=30, expiry_date=today + timedelta(days=3))
+        archived.product.status = 'Archived'
+        archived.product.save()
+        low.product.low_stock_threshold = 10_000
+        low.product.save()
+
+        alerts = self.legacy_alerts()
+        self.assertEqual(self.served_alerts(), alerts)
+        self.assertEqual({alert[0] for alert in alerts.values()}, {'out_of_stock', 'low_stock', 'expired', 'near_expiry'})
+
+    def test_rebuild_date_is_shared_through_the_database(self):
+        self.client.get('/api/alerts/')
+        stamp = ChangeStamp.objects.get(name=AlertService.REBUILT_STAMP)
+        self.assertEqual(stamp.stamped_at.date(), timezone.now().date())
+
+        # Another process (empty cache) sees today's rebuild
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/alerts/')
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('DELETE')])
+
+        # Day rollover: the next request rebuilds
+        ChangeStamp.objects.filter(pk=stamp.pk).update(stamped_at=stamp.stamped_at - timedelta(days=1))
+        with mock.patch.object(AlertService, 'build_alerts', wraps=AlertService.build_alerts) as build_alerts:
+            self.client.get('/api/alerts/')
+            self.client.get('/api/alerts/')
+        self.assertEqual(build_alerts.call_count, 1)
+
+    def test_stale_only_rebuild_skips_a_rebuild_done_meanwhile(self):
+        AlertService.rebuild_all()
+        with mock.patch.object(AlertService, 'build_alerts') as build_alerts:
+            AlertService.rebuild_all(if_stale=True)
+        build_alerts.assert_not_called()
+
+
+class DashboardCacheTests(TestCase):
+    """Widget ETags come from stamps in the database, so every process answers a poll the same way"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(5)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_matching_poll_gets_304_until_a_write(self):
+        response = self.client.get('/api/dashboard/stats/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/dashboard/stats/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        product = Product.objects.exclude(status='Archived').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            product.status = 'Archived'
+            product.save()
+
+        response = self.client.get('/api/dashboard/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['total_products'], Product.objects.exclude(status='Archived').count())
+
+    def test_etag_does_not_depend_on_the_process_cache(self):
+        etag = self.client.get('/api/dashboard/categories/')['ETag']
+        # Another process: its own (empty) widget cache, the same stamp
+        cache.clear()
+        self.assertEqual(self.client.get('/api/dashboard/categories/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/api/dashboard/categories/')['ETag'], etag)
+
+    def test_stamp_is_read_once_per_request(self):
+        self.client.get('/api/dashboard/stock-status/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/dashboard/stock-status/')
+        self.assertEqual(sum('change_stamp' in query['sql'] for query in queries.captured_queries), 1)
+
+
+class OrderReceivedCounterTests(TestCase):
+    """Received quantities are maintained counters, so order listings need no per-item SUM"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        category = Category.objects.create(category_name='Medications')
+        subcategory = Subcategory.objects.create(subcategory_name='Pain Relief', category=category)
+        cls.product = Product.objects.create(
+            brand_name='Biogesic',
+            generic_name='Paracetamol',
+            category=category,
+            subcategory=subcategory,
+            price_per_unit=10,
+            unit_of_measurement='tablet',
+        )
+        cls.supplier = Supplier.objects.create(supplier_name='Unilab')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_order(self, items=2, quantity=100):
+        order = Order.objects.create(ordered_by='admin')
+        for i in range(items):
+            OrderItem.objects.create(order=order, product=self.product, supplier=self.supplier, quantity_ordered=quantity)
+        return order
+
+    def test_counters_follow_receipts(self):
+        order = self.create_order()
+        item = order.items.first()
+
+        receipt = ReceiveOrder.objects.create(order=order, order_item=item, quantity_received=30, received_by='admin')
+        receipt.quantity_received = 45
+        receipt.save()
+        ReceiveOrder.objects.create(order=order, order_item=item, quantity_received=5, received_by='admin')
+
+        item.refresh_from_db()
+        order.refresh_from_db()
+        self.assertEqual(item.quantity_received, 50)
+        self.assertEqual((order.total_ordered, order.total_received), (200, 50))
+
+        receipt.delete()
+        item.refresh_from_db()
+        order.refresh_from_db()
+        self.assertEqual(item.quantity_received, 5)
+        self.assertEqual(order.total_received, 5)
+
+    def test_order_list_query_count_is_constant(self):
+        self.create_order()
+        with self.assertNumQueries(2):
+            self.client.get('/api/orders/')
+
+        for _ in range(5):
+            self.create_order(items=3)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/orders/')
+        self.assertEqual(len(response.data['results']), 6)
+
+
+class StockTotalDeltaTests(TestCase):
+    """Batch writes move ProductStocks.total_on_hand by their on_hand change; reconcile_stock_totals repairs drift"""
+
+    @classmethod
+    def setUpTestData(cls):
+        SeedService.seed_catalog(3)
+
+    def setUp(self):
+        self.batch = ProductBatch.objects.filter(on_hand__gt=10).select_related('product_stock').first()
+        self.stock = self.batch.product_stock
+
+    def batch_total(self):
+        return ProductBatch.objects.filter(product_stock=self.stock).aggregate(total=Sum('on_hand'))['total'] or 0
+
+    def test_stale_copies_adjust_by_the_stored_value(self):
+        # Two requests that loaded the batch before either saved
+        first, second = ProductBatch.objects.get(pk=self.batch.pk), ProductBatch.objects.get(pk=self.batch.pk)
+        first.on_hand += 5
+        first.save()
+        second.on_hand -= 3
+        second.save()
+
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.total_on_hand, self.batch_total())
+        adjustments = Transaction.objects.filter(batch=self.batch, transaction_type='ADJ').order_by('date_of_transaction')
+        self.assertEqual([t.quantity_change for t in adjustments], [5, -8])
+
+    def test_delete_subtracts_the_stored_quantity(self):
+        stale = ProductBatch.objects.get(pk=self.batch.pk)
+        fresh = ProductBatch.objects.get(pk=self.batch.pk)
+        fresh.on_hand += 7
+        fresh.save()
+
+        stale.delete()
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.total_on_hand, self.batch_total())
+
+    def test_reconcile_command_reports_then_repairs_drift(self):
+        ProductStocks.objects.filter(pk=self.stock.pk).update(total_on_hand=F('total_on_hand') + 7)
+
+        out = StringIO()
+        call_command('reconcile_stock_totals', '--dry-run', stdout=out)
+        self.assertIn(f'{self.stock.stock_id}: stored {self.batch_total() + 7}, batches {self.batch_total()} (-7)', out.getvalue())
+        self.assertEqual(list(InventoryService.find_stock_total_drift().values_list('stock_id', flat=True)), [self.stock.stock_id])
+
+        call_command('reconcile_stock_totals', stdout=StringIO())
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.total_on_hand, self.batch_total())
+
+        out = StringIO()
+        call_command('reconcile_stock_totals', stdout=out)
+        self.assertIn('All stock totals match their batches', out.getvalue())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Needs row locks (select_for_update)')
+class ConcurrentBatchAdjustmentTests(TransactionTestCase):
+    """Concurrent adjustments of one batch wait for each other's row lock and leave no drift"""
+
+    def test_concurrent_adjustments_keep_the_total(self):
+        SeedService.seed_catalog(1)
+        batch = ProductBatch.objects.filter(on_hand__gt=0).first()
+        barrier = threading.Barrier(4)
+
+        def adjust(change):
+            try:
+                copy = ProductBatch.objects.get(pk=batch.pk)
+                barrier.wait()
+                copy.on_hand += change
+                copy.save()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=adjust, args=(change,)) for change in (5, 3, -2, 7)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertFalse(InventoryService.find_stock_total_drift().exists())
+
+
+class ExportTests(TestCase):
+    """/api/exports/ streams every matching row as CSV or XLSX"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(5)
+        cls.day = timezone.now() - timedelta(days=10)
+        dated = Transaction.objects.order_by('transaction_id').values_list('pk', flat=True)[:7]
+        Transaction.objects.filter(pk__in=list(dated)).update(date_of_transaction=cls.day)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_csv_export_filters_by_date(self):
+        day = timezone.localdate(self.day).isoformat()
+        response = self.client.get(f'/api/exports/transactions/csv/?date_from={day}&date_to={day}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="transactions_\d{4}-\d{2}-\d{2}\.csv"$')
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(rows[0], [header for header, _ in ExportService.DATASETS['transactions']['columns']])
+        self.assertEqual(len(rows) - 1, 7)
+        self.assertEqual({row[8][:10] for row in rows[1:]}, {day})
+
+        response = self.client.get('/api/exports/transactions/csv/?date_from=01-02-2025')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_asgi_export_is_streamed_asynchronously(self):
+        await self.async_client.aforce_login(self.user)
+        with mock.patch.object(ExportService, 'CHUNK_SIZE', 5):
+            response = await self.async_client.get('/api/exports/transactions/csv/')
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertGreater(len(chunks), 2)
+        rows = list(csv.reader(StringIO(b''.join(chunks).decode('utf-8-sig'))))
+        self.assertEqual(len(rows) - 1, await Transaction.objects.acount())
+
+    def test_xlsx_export_is_a_workbook_of_every_row(self):
+        response = self.client.get('/api/exports/batches/xlsx/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="batches_\d{4}-\d{2}-\d{2}\.xlsx"$')
+
+        with zipfile.ZipFile(BytesIO(b''.join(response.streaming_content))) as workbook:
+            self.assertIsNone(workbook.testzip())
+            sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+        namespace = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        rows = sheet.findall('x:sheetData/x:row', namespace)
+        self.assertEqual(len(rows), ProductBatch.objects.count() + 1)
+        self.assertEqual(
+            [cell.findtext('x:is/x:t', namespaces=namespace) for cell in rows[0]],
+            [header for header, _ in ExportService.DATASETS['batches']['columns']],
+        )
+        # Expiry dates are date cells (style 1), not text
+        self.assertEqual(rows[1].find("x:c[@r='F2']", namespace).get('s'), '1')
+
+
+class BatchMergeTests(TestCase):
+    """create_or_update_product_batch merges a receipt into the batch the per-batch scan used to pick"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(category_name='Medications')
+        cls.product = Product.objects.create(
+            brand_name='Biogesic', generic_name='Paracetamol', category=category,
+            subcategory=Subcategory.objects.create(subcategory_name='Pain Relief', category=category),
+            price_per_unit=10, unit_of_measurement='tablet',
+        )
+        cls.stock = ProductStocks.objects.create(product=cls.product)
+        cls.today = timezone.now().date()
+
+    def add_batch(self, days, on_hand, status):
+        batch = ProductBatch.objects.create(product_stock=self.stock, on_hand=on_hand, expiry_date=self.today + timedelta(days=days))
+        # Force the status: the signals recompute it from on_hand and expiry
+        ProductBatch.objects.filter(pk=batch.pk).update(status=status)
+        return batch
+
+    def receive(self, quantity, expiry_date=None):
+        return InventoryService.create_or_update_product_batch(self.product, self.stock, quantity, expiry_date)
+
+    def legacy_merge_target(self, expiry_date):
+        """The batch the scan over every recent batch picked before the indexed lookup"""
+        new_expiry_date, tolerance_days = InventoryService.resolve_batch_expiry(self.product, expiry_date)
+        candidates = ProductBatch.objects.filter(
+            product_stock=self.stock,
+            expiry_date__gte=self.today - timedelta(days=InventoryService.RECENT_BATCH_DAYS),
+        ).exclude(status__in=['Near Expiry', 'Expired']).order_by('expiry_date')
+        return InventoryService.find_merge_batch(candidates, new_expiry_date, tolerance_days)
+
+    def test_same_expiry_merges_other_expiry_creates(self):
+        expiry_date = self.today + timedelta(days=200)
+        first = self.receive(10, expiry_date)
+        self.assertEqual(self.receive(5, expiry_date).pk, first.pk)
+        other = self.receive(7, expiry_date + timedelta(days=1))
+
+        self.assertNotEqual(other.pk, first.pk)
+        self.assertEqual(
+            dict(ProductBatch.objects.filter(product_stock=self.stock).values_list('pk', 'on_hand')),
+            {first.pk: 15, other.pk: 7},
+        )
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.total_on_hand, 22)
+
+    def test_near_expiry_and_expired_batches_are_left_alone(self):
+        near_expiry = self.add_batch(200, 20, 'Near Expiry')
+        expired = self.add_batch(210, 5, 'Expired')
+
+        for days in (200, 210):
+            self.assertNotIn(self.receive(3, self.today + timedelta(days=days)).pk, {near_expiry.pk, expired.pk})
+        self.assertEqual(ProductBatch.objects.get(pk=near_expiry.pk).on_hand, 20)
+        self.assertEqual(ProductBatch.objects.get(pk=expired.pk).on_hand, 5)
+
+    def test_matches_the_scan_over_recent_batches(self):
+        auto_days = self.product.expiry_threshold_days + InventoryService.EXPIRY_TOLERANCE_DAYS
+        existing = [
+            self.add_batch(200, 50, 'Normal'),
+            self.add_batch(203, 0, 'Out of Stock'),
+            self.add_batch(205, 20, 'Near Expiry'),
+            self.add_batch(220, 5, 'Expired'),
+            # Expired before the recent-batch cutoff, status not refreshed yet
+            self.add_batch(-40, 10, 'Normal'),
+            self.add_batch(auto_days + 4, 3, 'Low Stock'),
+            self.add_batch(auto_days - 12, 8, 'Normal'),
+        ]
+        existing_pks = {batch.pk for batch in existing}
+
+        for days in (200, 201, 203, 205, 220, -40, auto_days + 4, auto_days - 12, None):
+            expiry_date = None if days is None else self.today + timedelta(days=days)
+            with self.subTest(days=days):
+                expected = self.legacy_merge_target(expiry_date)
+                sid = transaction.savepoint()
+                chosen = self.receive(1, expiry_date).pk
+                transaction.savepoint_rollback(sid)
+                self.assertEqual(chosen if chosen in existing_pks else None, expected.pk if expected else None)
+
+
+class DispenseServiceTests(TestCase):
+    """Dispensing takes unexpired batches first-expiry-first-out and falls back to waiting on locked ones"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        category = Category.objects.create(category_name='Medications')
+        cls.product = Product.objects.create(
+            brand_name='Biogesic', generic_name='Paracetamol', category=category,
+            subcategory=Subcategory.objects.create(subcategory_name='Pain Relief', category=category),
+            price_per_unit=10, unit_of_measurement='tablet',
+        )
+        cls.stock = ProductStocks.objects.create(product=cls.product)
+        today = timezone.now().date()
+        cls.expired = ProductBatch.objects.create(product_stock=cls.stock, on_hand=50, expiry_date=today - timedelta(days=1))
+        cls.later = ProductBatch.objects.create(product_stock=cls.stock, on_hand=30, expiry_date=today + timedelta(days=300))
+        cls.first = ProductBatch.objects.create(product_stock=cls.stock, on_hand=10, expiry_date=today + timedelta(days=100))
+        cls.second = ProductBatch.objects.create(product_stock=cls.stock, on_hand=10, expiry_date=today + timedelta(days=100))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def dispense(self, quantity):
+        return self.client.post(
+            '/api/transactions/dispense/', {'product': self.product.product_id, 'quantity': quantity}, format='json'
+        )
+
+    def on_hand(self):
+        return dict(ProductBatch.objects.filter(product_stock=self.stock).values_list('batch_id', 'on_hand'))
+
+    def test_fefo_split_across_batches(self):
+        response = self.dispense(25)
+
+        self.assertEqual(response.status_code, 201)
+        # Earliest expiry first, batch_id breaking the tie; expired stock is never taken
+        self.assertEqual(
+            [(a['batch_id'], a['quantity'], a['on_hand']) for a in response.data['allocations']],
+            [(self.first.batch_id, 10, 0), (self.second.batch_id, 10, 0), (self.later.batch_id, 5, 25)],
+        )
+        self.assertEqual(self.on_hand()[self.expired.batch_id], 50)
+        self.assertEqual(Transaction.objects.filter(transaction_type='OUT', product=self.product).count(), 3)
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.total_on_hand, 75)
+
+    def test_insufficient_unexpired_stock_changes_nothing(self):
+        before = self.on_hand()
+        response = self.dispense(51)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Available: 50', str(response.data['quantity']))
+        self.assertEqual(self.on_hand(), before)
+        self.assertFalse(Transaction.objects.filter(transaction_type='OUT').exists())
+
+    def test_short_with_locked_batches_skipped_retries_with_a_blocking_lock(self):
+        allocate = DispenseService.allocate
+        calls = []
+
+        def locked_elsewhere(product, quantity, today, skip_locked=True):
+            # Every batch is held by another checkout while locked rows are skipped
+            calls.append(skip_locked)
+            return [] if skip_locked else allocate(product, quantity, today, skip_locked)
+
+        with mock.patch.object(DispenseService, 'allocate', side_effect=locked_elsewhere):
+            response = self.dispense(15)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(calls, [True, False])
+        self.assertEqual([a['batch_id'] for a in response.data['allocations']], [self.first.batch_id, self.second.batch_id])
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True)
+class RequestMetricsTests(TestCase):
+    """RequestMetricsMiddleware records per-view query counts for the report endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        RequestMetricsService.reset()
+
+    def test_requests_are_recorded_per_view(self):
+        self.client.get('/api/orders/')
+        self.client.get('/api/orders/')
+
+        response = self.client.get('/api/metrics/requests/')
+        views = {view['view']: view for view in response.data['views']}
+        self.assertEqual(views['GET order-list']['count'], 2)
+        self.assertEqual(views['GET order-list']['queries_max'], 1)
+
+        response = self.client.get('/api/metrics/requests/', {'output': 'prometheus'})
+        self.assertIn('inventory_request_queries_max{view="GET order-list"} 1', response.content.decode())
+
+
+class DatabasePoolMetricsTests(TestCase):
+    """/api/metrics/db-pool/ reports connection setups and, in pool mode, the pool statistics"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        DatabasePoolMetricsService.reset()
+
+    def test_connects_are_counted(self):
+        connection_created.send(sender=type(connection), connection=connection)
+        default = self.client.get('/api/metrics/db-pool/').data['databases']['default']
+        self.assertEqual(default['connects'], 1)
+        self.assertNotIn('in_use', default)
+
+    def test_pool_statistics(self):
+        pool = mock.Mock(**{'get_stats.return_value': {
+            'pool_min': 2, 'pool_max': 8, 'pool_size': 5, 'pool_available': 2,
+            'requests_num': 40, 'requests_queued': 3, 'requests_wait_ms': 120,
+        }})
+        pool_settings = {**connections.settings['default'], 'OPTIONS': {'pool': {'max_size': 8}}}
+        with mock.patch.object(connections['default'], 'pool', pool, create=True), \
+                mock.patch.dict(connections.settings, {'default': pool_settings}):
+            default = self.client.get('/api/metrics/db-pool/').data['databases']['default']
+            text = self.client.get('/api/metrics/db-pool/', {'output': 'prometheus'}).content.decode()
+
+        self.assertEqual(default['mode'], 'pool')
+        self.assertEqual(default['in_use'], 3)
+        self.assertEqual(default['requests_errors'], 0)
+        self.assertIn('inventory_db_pool_wait_ms_total{database="default"} 120', text)
+
+    def test_pool_mode_without_psycopg_pool_fails_at_startup(self):
+        import config.settings
+        try:
+            with mock.patch.dict(os.environ, {'DB_CONNECTION_MODE': 'pool'}), \
+                    mock.patch.dict(sys.modules, {'psycopg_pool': None}), \
+                    self.assertRaisesMessage(ImproperlyConfigured, 'pip install -r requirements-pool.txt'):
+                importlib.reload(config.settings)
+        finally:
+            importlib.reload(config.settings)
+
+
+class SeedServiceTests(TestCase):
+    """Synthetic catalogs are written with bulk_create but must be as consistent as signal-built data"""
+
+    def test_seeded_catalog_is_consistent(self):
+        counts = SeedService.seed_catalog(40, batches_per_product=2, transactions_per_product=3, orders=2)
+
+        self.assertEqual(counts['products'], 40)
+        self.assertEqual(ProductBatch.objects.count(), 80)
+        self.assertFalse(InventoryService.find_stock_total_drift().exists())
+        self.assertEqual(sum(Category.objects.values_list('product_count', flat=True)), 40)
+        for order in Order.objects.prefetch_related('items'):
+            self.assertEqual(order.total_ordered, sum(item.quantity_ordered for item in order.items.all()))
+
+
+class QueryPlanIndexTests(TestCase):
+    """The hot list/export/dispense queries are planned as index scans on a seeded database"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Enough rows (9000 batches, 15000 transactions) that the planner prefers
+        # the indexes on its own statistics, without disabling sequential scans
+        SeedService.seed_catalog(3000, orders=150)
+        now = timezone.now()
+        ReceiveOrder.objects.bulk_create([
+            ReceiveOrder(
+                receive_order_id=f'RCV-{n:05d}', order_id=item.order_id, order_item=item,
+                quantity_received=item.quantity_ordered, received_by='admin',
+                date_received=now - timedelta(hours=n),
+            )
+            for n, item in enumerate(OrderItem.objects.order_by('order_item_id'), start=1)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        names = [index_name]
+        if connection.vendor == 'postgresql':
+            # Indexes of a partitioned table show up under their per-partition names
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(%s)",
+                    [index_name]
+                )
+                names += [row[0] for row in cursor.fetchall()]
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in names), plan)
+
+    def test_list_queries_use_indexes(self):
+        self.assertUsesIndex(Product.objects.exclude(status='Archived').order_by('-product_id')[:51], 'product_active_idx')
+        self.assertUsesIndex(Supplier.objects.exclude(status='Archived').order_by('-supplier_id')[:51], 'supplier_active_idx')
+        self.assertUsesIndex(ProductBatch.objects.filter(on_hand__gt=0).order_by('batch_id')[:51], 'product_batch_available_idx')
+        self.assertUsesIndex(Order.objects.order_by('-date_ordered', '-order_id')[:51], 'order_date_idx')
+        self.assertUsesIndex(
+            Transaction.objects.order_by('-date_of_transaction', '-transaction_id')[:51], 'transaction_date_idx'
+        )
+        self.assertUsesIndex(ReceiveOrder.objects.order_by('-date_received')[:51], 'receive_order_date_idx')
+
+    def test_dispense_export_and_dashboard_queries_use_indexes(self):
+        today = timezone.now().date()
+        product_id = ProductStocks.objects.values_list('product_id', flat=True).first()
+        self.assertUsesIndex(
+            ProductBatch.objects.filter(
+                product_stock__product=product_id, on_hand__gt=0, expiry_date__gt=today
+            ).order_by('expiry_date', 'batch_id'),
+            'product_batch_fefo_idx',
+        )
+        self.assertUsesIndex(
+            Transaction.objects.filter(
+                transaction_type='OUT', date_of_transaction__gte=timezone.now() - timedelta(days=2)
+            ).order_by('date_of_transaction', 'transaction_id'),
+            'transaction_type_date_idx',
+        )
+        # The stocks screen and the stock export filter on one status
+        self.assertUsesIndex(ProductStocks.objects.filter(status='Expired'), 'product_stocks_status_idx')
+
+
+class InsertSampleDataBulkTests(TestCase):
+    """insert_sample_data --bulk must leave the same derived state the signals maintain"""
+
+    def test_bulk_insert_is_consistent(self):
+        call_command('insert_sample_data', bulk=True, stdout=StringIO())
+
+        self.assertTrue(ProductBatch.objects.exists())
+        self.assertFalse(InventoryService.find_stock_total_drift().exists())
+        for order in Order.objects.prefetch_related('items'):
+            items = order.items.all()
+            self.assertEqual(order.total_ordered, sum(item.quantity_ordered for item in items))
+            self.assertEqual(order.total_received, sum(item.quantity_received for item in items))
+        self.assertEqual(
+            Order.objects.get(total_ordered=2250).status, 'Received'
+        )
+
+        # Signals are connected again: a new batch updates its stock total
+        stock = ProductStocks.objects.first()
+        total = stock.total_on_hand
+        ProductBatch.objects.create(product_stock=stock, on_hand=7, expiry_date=timezone.now().date() + timedelta(days=200))
+        stock.refresh_from_db()
+        self.assertEqual(stock.total_on_hand, total + 7)
+
+
+# The allocator's own connection would wait on the truncate's lock, held by the test transaction
+@override_settings(ID_ALLOCATOR_OWN_CONNECTION=False)
+class ResetServiceTests(TestCase):
+    """ResetService.truncate empties the tables without running the delete receivers"""
+
+    def test_truncate_keeps_categories_and_restarts_codes(self):
+        SeedService.seed_catalog(20, orders=2)
+        models = [m for m in ResetService.SAMPLE_DATA_MODELS if m not in (Category, Subcategory)]
+
+        counts = ResetService.truncate(models)
+
+        self.assertEqual(counts[Product], 20)
+        for model in (Product, ProductBatch, ProductStocks, Transaction, Order):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertFalse(IdSequence.objects.exclude(name=RESET_MARKER).exists())
+        self.assertTrue(Category.objects.exists())
+        self.assertFalse(Category.objects.exclude(product_count=0).exists())
+
+        category = Category.objects.first()
+        product = Product.objects.create(
+            brand_name='After reset', generic_name='Paracetamol', category=category,
+            subcategory=category.subcategories.first(), price_per_unit=1, unit_of_measurement='pcs',
+        )
+        self.assertEqual(product.product_id, 'PRD-00001')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Transaction partitioning is PostgreSQL only')
+class TransactionPartitionTests(TestCase):
+    """Yearly ledger partitions: creation ahead of time, default-partition spill-over and archival"""
+
+    def test_ensure_partitions_moves_rows_out_of_the_default_partition(self):
+        SeedService.seed_catalog(5, orders=0)
+        far_year = timezone.now().year + 5
+        ledger_row = Transaction.objects.first()
+        Transaction.objects.filter(pk=ledger_row.pk).update(
+            date_of_transaction=datetime(far_year, 6, 1, tzinfo=dt_timezone.utc)
+        )
+
+        TransactionPartitionService.ensure_partitions(years_ahead=5)
+
+        self.assertIn(far_year, TransactionPartitionService.partitions())
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{TransactionPartitionService.partition_name(far_year)}"')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_archive_exports_and_detaches_a_past_year(self):
+        SeedService.seed_catalog(5, orders=0)
+        past_year = timezone.now().year - 3
+        Transaction.objects.filter(pk__in=Transaction.objects.values('pk')[:4]).update(
+            date_of_transaction=datetime(past_year, 3, 1, tzinfo=dt_timezone.utc)
+        )
+        TransactionPartitionService._create_partition(past_year)
+        total = Transaction.objects.count()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            path, rows = TransactionPartitionService.archive(past_year, output_dir, drop=True)
+            with gzip.open(path, 'rt', newline='') as export:
+                exported = list(csv.reader(export))
+
+        self.assertCountEqual(exported[0], [field.column for field in Transaction._meta.concrete_fields])
+        self.assertEqual(len(exported), rows + 1)
+        self.assertEqual({row[exported[0].index('date_of_transaction')][:4] for row in exported[1:]}, {str(past_year)})
+
+        self.assertEqual(rows, 4)
+        self.assertEqual(Transaction.objects.count(), total - 4)
+        self.assertNotIn(past_year, TransactionPartitionService.partitions())
+
+    def test_failed_export_leaves_the_partition_attached(self):
+        SeedService.seed_catalog(5, orders=0)
+        past_year = timezone.now().year - 3
+        Transaction.objects.filter(pk__in=Transaction.objects.values('pk')[:4]).update(
+            date_of_transaction=datetime(past_year, 3, 1, tzinfo=dt_timezone.utc)
+        )
+        TransactionPartitionService._create_partition(past_year)
+        total = Transaction.objects.count()
+
+        def disk_full(name, path):
+            path.write_bytes(b'partial')
+            raise OSError('No space left on device')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            with mock.patch.object(TransactionPartitionService, '_export', side_effect=disk_full):
+                with self.assertRaises(OSError):
+                    TransactionPartitionService.archive(past_year, output_dir)
+            self.assertEqual(os.listdir(output_dir), [])
+            self.assertIn(past_year, TransactionPartitionService.partitions())
+            self.assertEqual(Transaction.objects.count(), total)
+
+            # Running it again starts over
+            path, rows = TransactionPartitionService.archive(past_year, output_dir)
+            self.assertEqual(os.listdir(output_dir), [path.name])
+        self.assertEqual(rows, 4)
+        self.assertNotIn(past_year, TransactionPartitionService.partitions())
+
+
+class MailQueueTests(TestCase):
+    """OTP email is queued by the login view and sent (or retried) by the mail queue"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('otp_user', 'otp_user@example.com', 'secret-password')
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post('/api/auth/login/', {'username': 'otp_user', 'password': 'secret-password'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return OTP.objects.get(otp_code=response.data['otp_session'])
+
+    def test_login_queues_otp_and_worker_sends_it(self):
+        otp = self.login()
+
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.kind, email.status, email.expires_at), ('login_otp', 'Pending', otp.expires_at))
+
+        call_command('send_queued_email', once=True, threads=1, stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['otp_user@example.com'])
+        self.assertIn(otp.otp, mail.outbox[0].body)
+        # The OTP is not kept once sent
+        self.assertEqual(OutboundEmail.objects.values_list('status', 'body').get(), ('Sent', ''))
+
+    @override_settings(OUTBOUND_EMAIL_MAX_ATTEMPTS=2)
+    def test_failed_send_is_retried_with_backoff_then_failed(self):
+        self.login()
+        failing = mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down'))
+
+        with failing:
+            self.assertEqual(MailQueueService.process(MailQueueService.claim()), {'Pending': 1})
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertTrue(email.body)  # kept for the retry
+        self.assertEqual(MailQueueService.claim(), [])  # not due yet
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        with failing:
+            self.assertEqual(MailQueueService.process(MailQueueService.claim()), {'Failed': 1})
+        self.assertEqual(OutboundEmail.objects.values_list('last_error', 'body').get(), ('down', ''))
+
+    def test_otp_email_is_dropped_once_the_otp_expired(self):
+        self.login()
+        OutboundEmail.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(MailQueueService.process(MailQueueService.claim()), {'Expired': 1})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().body, '')
+
+    def test_finished_emails_are_pruned_after_the_retention(self):
+        old = timezone.now() - MailQueueService.RETENTION - timedelta(days=1)
+        for status in ('Sent', 'Expired', 'Failed', 'Pending'):
+            OutboundEmail.objects.create(kind='login_otp', to_email='otp_user@example.com', subject=status, body='', status=status)
+        OutboundEmail.objects.update(created_at=old)
+        recent = OutboundEmail.objects.create(kind='login_otp', to_email='otp_user@example.com', subject='Recent', body='', status='Sent')
+
+        out = StringIO()
+        call_command('refresh_inventory_status', stdout=out)
+
+        self.assertIn('Pruned 3 outbound email row(s)', out.getvalue())
+        self.assertEqual(set(OutboundEmail.objects.values_list('subject', flat=True)), {'Pending', recent.subject})
+
+
+class ChangeFeedTests(TestCase):
+    """/api/changes/ returns the current state of everything changed after a cursor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.category = Category.objects.create(category_name='Medications')
+        cls.subcategory = Subcategory.objects.create(subcategory_name='Pain Relief', category=cls.category)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def changes(self, cursor):
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_feed_follows_service_writes(self):
+        product = Product.objects.create(
+            brand_name='Biogesic', generic_name='Paracetamol', category=self.category,
+            subcategory=self.subcategory, price_per_unit=5, unit_of_measurement='tablet',
+        )
+        stock = ProductStocks.objects.create(product=product)
+        batch = ProductBatch.objects.create(
+            product_stock=stock, on_hand=30, expiry_date=timezone.now().date() + timedelta(days=365)
+        )
+        cursor = self.client.get('/api/changes/').data['cursor']
+        self.assertEqual(self.changes(cursor)['stocks'], [])
+
+        # Dispensing updates batches and stock with bulk update(), no signals
+        DispenseService.dispense(product.product_id, 12, performed_by='admin')
+        data = self.changes(cursor)
+        self.assertEqual([b['on_hand'] for b in data['batches']], [18])
+        self.assertEqual([s['total_on_hand'] for s in data['stocks']], [18])
+        self.assertEqual(data['transactions'][0]['quantity_change'], -12)
+        self.assertEqual(data['products'], [])
+        self.assertFalse(data['has_more'])
+
+        # Saving without changing an exposed column records nothing
+        cursor = data['cursor']
+        product.save()
+        self.assertEqual(self.changes(cursor)['products'], [])
+
+        Product.objects.filter(pk=product.pk).update(price_per_unit=6)
+        batch.refresh_from_db()
+        batch.delete()
+        data = self.changes(cursor)
+        self.assertEqual(data['products'][0]['price_per_unit'], 6)
+        self.assertEqual(data['deleted'], {'batches': [batch.batch_id]})
+
+        page = self.client.get('/api/changes/', {'since': cursor, 'limit': 1}).data
+        self.assertTrue(page['has_more'])
+        self.assertEqual(self.changes(data['cursor'])['cursor'], data['cursor'])
+
+    def test_old_cursors_expire(self):
+        self.assertEqual(self.client.get('/api/changes/', {'since': 'abc'}).status_code, 400)
+        SeedService.seed_catalog(3)
+        cursor = self.client.get('/api/changes/').data['cursor']
+
+        ChangeLog.objects.update(created_at=timezone.now() - timedelta(days=8))
+        ChangeFeedService.prune()
+        self.assertEqual(ChangeLog.objects.count(), 1)
+        self.assertEqual(self.changes(cursor)['cursor'], cursor)
+        self.assertEqual(self.client.get('/api/changes/', {'since': '0-0'}).status_code, 410)
+
+        ResetService.truncate([Product])
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(self.changes(response.data['cursor'])['products'], [])
+
+
+@override_settings(EVENT_STREAM_HEARTBEAT=0.01, EVENT_STREAM_MAX_SECONDS=0.05)
+class EventStreamTests(TestCase):
+    """Committed stock, alert and order changes are pushed to subscribed streams"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(2)
+
+    def setUp(self):
+        self.broker = get_broker()
+        self.subscription = self.broker.subscribe()
+        self.addCleanup(self.broker.unsubscribe, self.subscription)
+
+    def received(self):
+        events = []
+        while not self.subscription.queue.empty():
+            events.append(self.subscription.queue.get_nowait())
+        return {event_type: data for _, event_type, data in events}
+
+    def test_events_are_published_on_commit_only(self):
+        stock = ProductStocks.objects.filter(total_on_hand__gt=5).select_related('product').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            DispenseService.dispense(stock.product.product_id, 5, performed_by='admin')
+        events = self.received()
+        self.assertEqual(
+            events['stock']['stocks'][0]['total_on_hand'],
+            ProductStocks.objects.get(pk=stock.pk).total_on_hand
+        )
+        self.assertIn('total', events['alerts'])
+        self.assertIn('widgets', events['dashboard'])
+
+        with self.captureOnCommitCallbacks(execute=False):
+            DispenseService.dispense(stock.product.product_id, 1, performed_by='admin')
+        self.assertEqual(self.received(), {})
+
+    def test_stream_replays_missed_events(self):
+        first = self.broker.publish('order', {'orders': []})
+        self.broker.publish('alerts', {'total': 3})
+
+        chunks = b''.join(EventService.stream(['alerts'], last_event_id=first))
+        self.assertIn(b'event: alerts\ndata: {"total":3}', chunks)
+        self.assertNotIn(b'event: order', chunks)
+
+        chunks = b''.join(EventService.stream(last_event_id='unknown-1'))
+        self.assertIn(b'event: reset', chunks)
+
+    def test_events_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/events/', {'types': 'bogus'}).status_code, 400)
+
+        response = client.get('/api/events/', {'types': 'stock'}, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn(b': keepalive', b''.join(response.streaming_content))
+
+    def test_pages_advertise_the_stream_only_when_served(self):
+        self.client.force_login(self.user)
+        marker = b'<meta name="live-events" content="on">'
+        with override_settings(LIVE_EVENTS=False):
+            self.assertNotIn(marker, self.client.get('/inventory/').content)
+        with override_settings(LIVE_EVENTS=True):
+            self.assertIn(marker, self.client.get('/inventory/').content)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Replica-safe GETs read from the replica alias; a client's writes pin it to the primary"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(3)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def read_aliases(self, method, path, **kwargs):
+        """Aliases chosen for the reads of one request, with 'default' standing in for the replica"""
+        aliases = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                aliases.append(db_router.read_alias())
+            return execute(sql, params, many, context)
+
+        with mock.patch.object(db_router, 'replica_alias', return_value='default'), \
+                connection.execute_wrapper(record):
+            response = getattr(self.client, method)(path, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return set(aliases)
+
+    def stamp_stats(self, stamped_at):
+        ChangeStamp.objects.update_or_create(
+            name=DashboardService._stamp_name(DashboardService.STATS), defaults={'stamped_at': stamped_at}
+        )
+
+    def test_safe_reads_are_routed_until_the_user_writes(self):
+        self.assertEqual(self.read_aliases('get', '/api/product-stocks/') - {None}, {'default'})
+        # Dashboard widgets rebuild from the primary right after a change
+        self.stamp_stats(timezone.now())
+        self.assertEqual(self.read_aliases('get', '/api/dashboard/stats/'), {None})
+        self.stamp_stats(timezone.now() - timedelta(seconds=60))
+        self.assertEqual(self.read_aliases('get', '/api/dashboard/stats/') - {None}, {'default'})
+        # Alerts may rebuild (write) their table: never routed
+        self.assertEqual(self.read_aliases('get', '/api/alerts/'), {None})
+
+        category = Category.objects.first()
+        self.read_aliases('patch', f'/api/categories/{category.category_id}/', data={'category_name': 'Renamed'}, content_type='application/json')
+        sticky = self.client.cookies[db_router.STICKY_COOKIE]
+        self.assertEqual(sticky['max-age'], settings.REPLICA_STICKY_SECONDS)
+        # The pin travels with the client, not in this process's cache
+        cache.clear()
+        self.assertEqual(self.read_aliases('get', '/api/product-stocks/'), {None})
+
+        # Once the cookie has expired, reads go to the replica again
+        del self.client.cookies[db_router.STICKY_COOKIE]
+        self.assertEqual(self.read_aliases('get', '/api/product-stocks/') - {None}, {'default'})
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_without_replica_nothing_is_routed(self):
+        aliases = []
+        with connection.execute_wrapper(lambda execute, *args: aliases.append(db_router.read_alias()) or execute(*args)):
+            self.client.get('/api/product-stocks/')
+        self.assertEqual(set(aliases), {None})
+
+
+@skipUnless(
+    'replica' in settings.DATABASES and connection.vendor == 'postgresql',
+    'Needs a PostgreSQL replica alias (DB_REPLICA_HOST)'
+)
+class ReplicaDatabaseTests(TestCase):
+    """With a real replica alias (a mirror of default in tests) list reads use its connection"""
+
+    databases = {'default', 'replica'} if 'replica' in settings.DATABASES else {'default'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def test_list_reads_use_replica_connection(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            client.get('/api/products/')
+        self.assertTrue(replica_queries.captured_queries)
+
+    def test_request_metrics_count_replica_queries(self):
+        RequestMetricsService.reset()
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as primary_queries, \
+                CaptureQueriesContext(connections['replica']) as replica_queries:
+            client.get('/api/products/')
+
+        views = {view['view']: view for view in RequestMetricsService.summary()['views']}
+        self.assertTrue(replica_queries.captured_queries)
+        self.assertEqual(views['GET product-list']['queries_max'], len(primary_queries) + len(replica_queries))
+
+
+class AsyncReadViewTests(TestCase):
+    """With ASYNC_READ_VIEWS (the ASGI entrypoint) the read endpoints are async views answering like the DRF ones"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        SeedService.seed_catalog(5)
+        cls.product_id = Product.objects.order_by('product_id').values_list('product_id', flat=True).first()
+
+    def setUp(self):
+        cache.clear()
+
+    @staticmethod
+    def reload_urls():
+        import config.urls
+        from . import urls
+        importlib.reload(urls)
+        importlib.reload(config.urls)
+        clear_url_caches()
+
+    @contextmanager
+    def async_read_urls(self):
+        try:
+            with self.settings(ASYNC_READ_VIEWS=True):
+                self.reload_urls()
+                yield
+        finally:
+            self.reload_urls()
+
+    def fetch(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.json()
+
+    def test_responses_match_the_sync_views(self):
+        paths = [
+            '/api/dashboard/categories/', '/api/dashboard/top-suppliers/?top=3', '/api/dashboard/stock-status/',
+            '/api/dashboard/stats/', '/api/alerts/', '/api/alerts/?severity=critical',
+            f'/api/products/{self.product_id}/', '/api/products/PRD-99999/',
+        ]
+        self.client.force_login(self.user)
+        expected = {path: self.fetch(path) for path in paths}
+
+        # Rebuild widgets and alerts through the async ORM
+        cache.clear()
+        ChangeStamp.objects.all().delete()
+        with self.async_read_urls():
+            self.assertIs(resolve('/api/dashboard/stats/').func, async_views.dashboard_stats)
+            self.assertIs(resolve(f'/api/products/{self.product_id}/').func, async_views.product_detail)
+            self.assertEqual({path: self.fetch(path) for path in paths}, expected)
+        self.assertIsNot(resolve('/api/dashboard/stats/').func, async_views.dashboard_stats)
+
+    def test_authentication_matches_the_sync_views(self):
+        path = f'/api/products/{self.product_id}/'
+        headers = [
+            {},
+            {'Authorization': 'Basic ' + base64.b64encode(b'admin:password').decode()},
+            {'Authorization': 'Basic ' + base64.b64encode(b'admin:wrong').decode()},
+            {'Authorization': 'Basic not-base64'},
+        ]
+
+        def answers():
+            return [
+                (response.status_code, response.json(), response.get('WWW-Authenticate'))
+                for response in (self.client.get(path, headers=header) for header in headers)
+            ]
+
+        expected = answers()
+        self.assertEqual([status for status, _, _ in expected], [403, 200, 403, 403])
+        with self.async_read_urls():
+            self.assertIs(resolve(path).func, async_views.product_detail)
+            self.assertEqual(answers(), expected)
+
+            # The configured classes are used: Basic first answers 401 with a challenge
+            basic_only = {**settings.REST_FRAMEWORK, 'DEFAULT_AUTHENTICATION_CLASSES': [
+                'rest_framework.authentication.BasicAuthentication',
+            ]}
+            with self.settings(REST_FRAMEWORK=basic_only):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response['WWW-Authenticate'], 'Basic realm="api"')
+
+    async def test_async_request_path(self):
+        path = f'/api/products/{self.product_id}/'
+        with self.async_read_urls():
+            response = await self.async_client.get(path)
+            self.assertEqual(response.status_code, 403)
+
+            await self.async_client.aforce_login(self.user)
+            RequestMetricsService.reset()
+            with self.settings(REQUEST_METRICS_ENABLED=True):
+                response = await self.async_client.get(path)
+            self.assertEqual(response.json()['product_id'], self.product_id)
+            entry = RequestMetricsService.entries()[-1]
+            self.assertEqual(entry['view'], 'GET api_product_detail')
+            self.assertGreater(entry['queries'], 0)
+
+            # Writes to the same URL still go to ProductViewSet
+            response = await self.async_client.patch(path, {'price_per_unit': '9.99'}, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            product = await Product.objects.aget(product_id=self.product_id)
+            self.assertEqual(str(product.price_per_unit), '9.99')
+
+            # Widget stamps are loaded through the async ORM before the ETag check
+            etag = (await self.async_client.get('/api/dashboard/stats/'))['ETag']
+            response = await self.async_client.get('/api/dashboard/stats/', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
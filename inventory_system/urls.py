@@ -1,9 +1,18 @@
 from rest_framework.routers import DefaultRouter
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from . import views
+from . import async_views
 from . import auth_views
 
+# Under ASGI (config/asgi.py) the read-only dashboard, alerts and product
+# lookup endpoints are served by async views
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
+product_lookup_urls = [
+    re_path(r'^api/products/(?P<product_id>PRD-\d+)/$', async_views.product_detail, name='api_product_detail'),
+] if settings.ASYNC_READ_VIEWS else []
+
 
 router = DefaultRouter()
 
@@ -46,13 +55,28 @@ urlpatterns = [
     path('api/auth/resend-reset-otp/', auth_views.resend_reset_otp, name='resend_reset_otp'),
     
     # Dashboard aggregates
-    path('api/dashboard/categories/', views.dashboard_categories, name='api_dashboard_categories'),
-    path('api/dashboard/top-suppliers/', views.dashboard_top_suppliers, name='api_dashboard_top_suppliers'),
-    path('api/dashboard/stock-status/', views.dashboard_stock_status, name='api_dashboard_stock_status'),
-    path('api/dashboard/stats/', views.dashboard_stats, name='api_dashboard_stats'),
+    path('api/dashboard/categories/', read_views.dashboard_categories, name='api_dashboard_categories'),
+    path('api/dashboard/top-suppliers/', read_views.dashboard_top_suppliers, name='api_dashboard_top_suppliers'),
+    path('api/dashboard/stock-status/', read_views.dashboard_stock_status, name='api_dashboard_stock_status'),
+    path('api/dashboard/stats/', read_views.dashboard_stats, name='api_dashboard_stats'),
     
     # Inventory alerts
-    path('api/alerts/', views.inventory_alerts, name='api_inventory_alerts'),
+    path('api/alerts/', read_views.inventory_alerts, name='api_inventory_alerts'),
+    
+    # Server-side exports (streamed)
+    path('api/exports/<str:dataset>/<str:file_format>/', views.export_data, name='api_export_data'),
+    
+    # Incremental sync (change feed)
+    path('api/changes/', views.changes, name='api_changes'),
+    
+    # Server-sent events (live stock/alert/order/dashboard updates)
+    path('api/events/', views.events, name='api_events'),
+    
+    # Per-request query/latency metrics
+    path('api/metrics/requests/', views.request_metrics, name='api_request_metrics'),
+    path('api/metrics/db-pool/', views.db_pool_metrics, name='api_db_pool_metrics'),
 
+    # Ahead of the router's products/<product_id>/ route
+    *product_lookup_urls,
     path('api/', include(router.urls)),
 ]
\ No newline at end of file
@@ -2,7 +2,8 @@ from rest_framework.exceptions import ValidationError
 from rest_framework import viewsets
 from django.shortcuts import render, redirect
 from django.conf import settings
-from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.decorators import login_required
@@ -10,7 +11,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from django.views.decorators.csrf import ensure_csrf_cookie
-from rest_framework.decorators import api_view, permission_classes
+from django.views.decorators.http import condition
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 from .serializers import (
     ArchiveLogSerializer,
@@ -29,10 +32,11 @@ from .serializers import (
     DashboardSupplierSerializer,
     DashboardStockStatusSerializer,
 )
-from django.db.models import Sum, Count, F
+from django.db.models import Sum, Count, F, Prefetch, Q
+import logging
 import os
 
-from .models import ArchiveLog, Supplier, Category, Subcategory, Product, ProductStocks, ProductBatch, OrderItem, Order, ReceiveOrder, Transaction, UserInformation
+from .models import InventoryAlert, ArchiveLog, Supplier, Category, Subcategory, Product, ProductStocks, ProductBatch, OrderItem, Order, ReceiveOrder, Transaction, UserInformation
 from .serializers import (
     ArchiveLogSerializer,
     CategorySerializer, 
@@ -45,10 +49,25 @@ from .serializers import (
     OrderSerializer, 
     ReceiveOrderSerializer,
     TransactionSerializer,
-    UserInformationSerializer
+    UserInformationSerializer,
+    BulkReceiveItemSerializer,
+    DispenseSerializer,
 )
-from .permissions import IsAdmin, IsStaffOrReadOnly, InventoryPermission, TransactionPermission
+from .pagination import KeysetCursorPagination
+from .permissions import IsAdmin, IsStaffOrReadOnly, InventoryPermission, TransactionPermission, DispensePermission
 from .services.order_service import OrderService
+from .services.receive_service import ReceiveService
+from .services.alert_service import AlertService
+from .services.dashboard_service import DashboardService
+from .services.export_service import ExportService
+from .services.dispense_service import DispenseService
+from .services.metrics_service import RequestMetricsService, DatabasePoolMetricsService
+from .services.change_feed_service import ChangeFeedService
+from .services.event_service import EventService
+from .db_router import read_alias, replica_reads
+from .logging_utils import timed_operation
+
+logger = logging.getLogger(__name__)
 
 def serve_static_html(request, file_path):
     full_path = os.path.join(settings.BASE_DIR, 'static', file_path)
@@ -56,6 +75,9 @@ def serve_static_html(request, file_path):
     if os.path.exists(full_path):
         with open(full_path, 'r', encoding = 'utf-8') as f:
             content = f.read()
+            if settings.LIVE_EVENTS:
+                # Tells static/utils/liveEvents.js the event stream is served here
+                content = content.replace('</head>', '<meta name="live-events" content="on">\n</head>', 1)
             return HttpResponse(content, content_type = 'text/html')
     else:
         return HttpResponse("File not found", status = 404)
@@ -69,58 +91,59 @@ def dashboard_view(request):
 
 
 # --- Dashboard aggregate endpoints ---
+# Served from DashboardService's cache; unchanged polls get 304 via ETag / Last-Modified.
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(**DashboardService.condition_funcs(DashboardService.CATEGORIES))
 def dashboard_categories(request):
     """Return category distribution based on total_on_hand across product stocks."""
-    qs = ProductStocks.objects.values(category_name=F('product__category__category_name')).annotate(count=Sum('total_on_hand')).order_by('-count')
-    data = []
-    for row in qs:
-        name = row.get('category_name') or 'Uncategorized'
-        data.append({'category_name': name, 'count': int(row.get('count') or 0)})
-    serializer = DashboardCategorySerializer(data, many=True)
-    return Response(serializer.data)
+    data = DashboardService.get(
+        DashboardService.CATEGORIES,
+        lambda: DashboardCategorySerializer(DashboardService.category_distribution(), many=True).data,
+        request
+    )
+    return Response(data)
 
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(**DashboardService.condition_funcs(DashboardService.TOP_SUPPLIERS))
 def dashboard_top_suppliers(request):
     """Return top suppliers by number of products supplied. Query param `top` optional."""
     try:
         top = int(request.query_params.get('top', 5))
     except (TypeError, ValueError):
         top = 5
-    # Annotate suppliers with the number of distinct products they supply (via many-to-many).
-    qs = Supplier.objects.annotate(products_supplied=Count('products', distinct=True)).order_by('-products_supplied')[:top]
-    # Use values() to build simple dicts for serialization
-    data = [{'supplier_name': s.supplier_name or 'Unknown', 'products_supplied': int(getattr(s, 'products_supplied', 0) or 0)} for s in qs]
-    serializer = DashboardSupplierSerializer(data, many=True)
-    return Response(serializer.data)
+    data = DashboardService.get(
+        DashboardService.TOP_SUPPLIERS,
+        lambda: DashboardSupplierSerializer(DashboardService.top_suppliers(top), many=True).data,
+        request
+    )
+    return Response(data)
 
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(**DashboardService.condition_funcs(DashboardService.STOCK_STATUS))
 def dashboard_stock_status(request):
     """Return counts grouped by ProductStocks.status for the stock status donut chart."""
-    qs = ProductStocks.objects.values(status_label=F('status')).annotate(count=Count('pk')).order_by('-count')
-    data = [{'status_label': r.get('status_label') or 'Unknown', 'count': int(r.get('count') or 0)} for r in qs]
-    serializer = DashboardStockStatusSerializer(data, many=True)
-    return Response(serializer.data)
+    data = DashboardService.get(
+        DashboardService.STOCK_STATUS,
+        lambda: DashboardStockStatusSerializer(DashboardService.stock_status_counts(), many=True).data,
+        request
+    )
+    return Response(data)
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(**DashboardService.condition_funcs(DashboardService.STATS))
 def dashboard_stats(request):
     """Return dashboard statistics: total products count and pending orders count."""
-    # Count active products (exclude archived)
-    total_products = Product.objects.exclude(status='Archived').count()
-    
-    # Count pending orders (status = 'Pending' or 'Partially Received')
-    pending_orders = Order.objects.filter(status__in=['Pending', 'Partially Received']).count()
-    
-    return Response({
-        'total_products': total_products,
-        'pending_orders': pending_orders
-    })
+    return Response(DashboardService.get(DashboardService.STATS, DashboardService.stats, request))
 
 
 @api_view(['GET'])
@@ -129,119 +152,187 @@ def inventory_alerts(request):
     """
     Return low stock and near expiry alerts based on product thresholds.
     
+    Answered from the precomputed inventory_alert table (see AlertService).
+    Optional query params: `type` (low_stock, out_of_stock, near_expiry, expired)
+    and `severity` (critical, warning) filter the alert list; the summary
+    always covers every alert.
+    
     Low Stock: ProductStocks where total_on_hand <= product.low_stock_threshold
     Near Expiry: ProductBatch where expiry_date <= today + product.expiry_threshold_days
     Expired: ProductBatch where expiry_date < today
     Out of Stock: ProductStocks where total_on_hand = 0
     """
-    from datetime import timedelta
-    
+    AlertService.ensure_current()
     today = timezone.now().date()
-    alerts = []
     
-    # Get all active product stocks with their products
-    product_stocks = ProductStocks.objects.select_related('product').exclude(
-        product__status='Archived'
-    )
+    # Sorted critical first, then warning; within severity by type
+    alerts = InventoryAlert.objects.order_by('priority', 'product_name', 'alert_id')
+    summary = AlertService.summary(alerts)
     
-    for stock in product_stocks:
-        product = stock.product
-        
-        # Out of Stock Alert
-        if stock.total_on_hand == 0:
-            alerts.append({
-                'id': f'out-{stock.stock_id}',
-                'type': 'out_of_stock',
-                'severity': 'critical',
-                'stock_id': stock.stock_id,
-                'product_id': product.product_id,
-                'product_name': product.product_name or f"{product.brand_name} - {product.generic_name}",
-                'message': f'Out of stock',
-                'current_stock': 0,
-                'threshold': product.low_stock_threshold,
-                'category': product.category.category_name if product.category else 'N/A',
-            })
-        # Low Stock Alert (but not out of stock)
-        elif stock.total_on_hand <= product.low_stock_threshold:
-            alerts.append({
-                'id': f'low-{stock.stock_id}',
-                'type': 'low_stock',
-                'severity': 'warning',
-                'stock_id': stock.stock_id,
-                'product_id': product.product_id,
-                'product_name': product.product_name or f"{product.brand_name} - {product.generic_name}",
-                'message': f'Low stock: {stock.total_on_hand} remaining (threshold: {product.low_stock_threshold})',
-                'current_stock': stock.total_on_hand,
-                'threshold': product.low_stock_threshold,
-                'category': product.category.category_name if product.category else 'N/A',
-            })
+    alert_type = request.query_params.get('type')
+    if alert_type:
+        alerts = alerts.filter(alert_type=alert_type)
+    severity = request.query_params.get('severity')
+    if severity:
+        alerts = alerts.filter(severity=severity)
     
-    # Get batches that are near expiry or expired
-    batches = ProductBatch.objects.select_related(
-        'product_stock', 'product_stock__product'
-    ).exclude(
-        product_stock__product__status='Archived'
-    ).filter(
-        on_hand__gt=0  # Only batches with stock
-    )
+    return Response({
+        'summary': summary,
+        'alerts': [AlertService.to_dict(alert, today) for alert in alerts]
+    })
+
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_data(request, dataset, file_format):
+    """
+    Stream a dataset (stocks, batches, transactions, receive-history) as CSV or XLSX.
     
-    for batch in batches:
-        product = batch.product_stock.product
-        expiry_threshold_date = today + timedelta(days=product.expiry_threshold_days)
-        
-        # Expired Alert
-        if batch.expiry_date < today:
-            alerts.append({
-                'id': f'expired-{batch.batch_id}',
-                'type': 'expired',
-                'severity': 'critical',
-                'stock_id': batch.product_stock.stock_id,
-                'product_id': product.product_id,
-                'product_name': product.product_name or f"{product.brand_name} - {product.generic_name}",
-                'batch_id': batch.batch_id,
-                'message': f'Expired on {batch.expiry_date.strftime("%b %d, %Y")}',
-                'expiry_date': batch.expiry_date.isoformat(),
-                'on_hand': batch.on_hand,
-                'category': product.category.category_name if product.category else 'N/A',
-            })
-        # Near Expiry Alert
-        elif batch.expiry_date <= expiry_threshold_date:
-            days_until_expiry = (batch.expiry_date - today).days
-            alerts.append({
-                'id': f'near-expiry-{batch.batch_id}',
-                'type': 'near_expiry',
-                'severity': 'warning',
-                'stock_id': batch.product_stock.stock_id,
-                'product_id': product.product_id,
-                'product_name': product.product_name or f"{product.brand_name} - {product.generic_name}",
-                'batch_id': batch.batch_id,
-                'message': f'Expires in {days_until_expiry} days ({batch.expiry_date.strftime("%b %d, %Y")})',
-                'expiry_date': batch.expiry_date.isoformat(),
-                'days_until_expiry': days_until_expiry,
-                'on_hand': batch.on_hand,
-                'category': product.category.category_name if product.category else 'N/A',
-            })
+    Optional query params: date_from / date_to (YYYY-MM-DD), product (product_id),
+    status (stock/batch status or transaction type).
+    Example: GET /api/exports/transactions/csv/?date_from=2025-01-01&date_to=2025-01-31
+    Under ASGI the file is streamed through an async iterator (ExportService.astream).
+    """
+    if file_format not in ('csv', 'xlsx'):
+        raise ValidationError({'format': "Use 'csv' or 'xlsx'."})
     
-    # Sort alerts: critical first, then warning; within severity by type
-    severity_order = {'critical': 0, 'warning': 1}
-    type_order = {'expired': 0, 'out_of_stock': 1, 'near_expiry': 2, 'low_stock': 3}
-    alerts.sort(key=lambda x: (severity_order.get(x['severity'], 2), type_order.get(x['type'], 4)))
+    export = ExportService.get_dataset(dataset)
+    # Bound now: the CSV is streamed after the request's replica routing has ended
+    queryset = ExportService.build_queryset(export, request.query_params).using(read_alias())
+    filename = f"{dataset}_{timezone.localdate().isoformat()}.{file_format}"
     
-    # Summary counts
-    summary = {
-        'total': len(alerts),
-        'critical': len([a for a in alerts if a['severity'] == 'critical']),
-        'warning': len([a for a in alerts if a['severity'] == 'warning']),
-        'low_stock': len([a for a in alerts if a['type'] == 'low_stock']),
-        'out_of_stock': len([a for a in alerts if a['type'] == 'out_of_stock']),
-        'near_expiry': len([a for a in alerts if a['type'] == 'near_expiry']),
-        'expired': len([a for a in alerts if a['type'] == 'expired']),
-    }
+    if file_format == 'csv':
+        content = ExportService.stream_csv(ExportService.iter_rows(export, queryset))
+        content_type = 'text/csv; charset=utf-8'
+    else:
+        content = ExportService.stream_xlsx(ExportService.iter_rows(export, queryset))
+        content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    if isinstance(request._request, ASGIRequest):
+        content = ExportService.astream(content)
     
-    return Response({
-        'summary': summary,
-        'alerts': alerts
-    })
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([InventoryPermission])
+def changes(request):
+    """
+    Changes to products, stocks, batches and transactions after a cursor.
+    
+    GET /api/changes/ returns the current cursor only: load the full lists once,
+    then poll GET /api/changes/?since=<cursor> and continue from the returned
+    cursor (immediately again while has_more is true). Each object appears once
+    with its current state; removed ones are listed under `deleted`. 410 means
+    the cursor is too old: reload the full lists and continue from the returned
+    cursor. Optional `limit` (default 1000, max 5000) caps the changes read.
+    """
+    since = request.query_params.get('since')
+    if not since:
+        return Response({'cursor': ChangeFeedService.format_cursor(ChangeFeedService.head())})
+    
+    cursor = ChangeFeedService.parse_cursor(since)
+    if ChangeFeedService.is_expired(cursor):
+        return Response(
+            {'detail': 'Cursor expired; reload the full lists.',
+             'cursor': ChangeFeedService.format_cursor(ChangeFeedService.head())},
+            status=status.HTTP_410_GONE
+        )
+    
+    try:
+        limit = min(int(request.query_params.get('limit', ChangeFeedService.DEFAULT_LIMIT)), ChangeFeedService.MAX_LIMIT)
+    except ValueError:
+        raise ValidationError({'limit': 'Must be an integer.'})
+    if limit < 1:
+        raise ValidationError({'limit': 'Must be at least 1.'})
+    return Response(ChangeFeedService.changes_since(cursor, limit))
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Accepts EventSource requests (Accept: text/event-stream); errors become an `error` event"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return EventService.format(None, 'error', data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def events(request):
+    """
+    Server-sent event stream of stock, alert, order and dashboard updates.
+    
+    Optional `types` query param (comma-separated: stock, alerts, order,
+    dashboard) limits the events sent. Browsers reconnect on their own and
+    resume from the Last-Event-ID header; a `reset` event means updates were
+    missed and the page should reload its data.
+    Example: new EventSource('/api/events/?types=alerts,dashboard')
+    """
+    types = [name for name in request.query_params.get('types', '').split(',') if name]
+    unknown = set(types) - set(EventService.TYPES)
+    if unknown:
+        raise ValidationError({'types': f"Unknown event type(s): {', '.join(sorted(unknown))}."})
+    
+    last_event_id = request.headers.get('Last-Event-ID')
+    if isinstance(request._request, ASGIRequest):
+        content = EventService.astream(types, last_event_id)
+    else:
+        content = EventService.stream(types, last_event_id)
+    
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: pass events through unbuffered
+    return response
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdmin])
+def request_metrics(request):
+    """
+    Per-view query counts and timings of recent requests (this process only).
+    
+    GET returns JSON; `?output=prometheus` returns the Prometheus text format.
+    DELETE clears the buffer, e.g. before exercising a page in staging.
+    """
+    if request.method == 'DELETE':
+        RequestMetricsService.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    summary = RequestMetricsService.summary()
+    if request.query_params.get('output') == 'prometheus':
+        return HttpResponse(
+            RequestMetricsService.to_prometheus(summary),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+    return Response({'enabled': RequestMetricsService.enabled(), **summary})
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdmin])
+def db_pool_metrics(request):
+    """
+    Database connection reuse of this worker process, per database alias.
+    
+    Pool mode adds pool size, connections in use, waiting requests and wait time.
+    GET returns JSON; `?output=prometheus` returns the Prometheus text format.
+    DELETE clears the connect counter.
+    """
+    if request.method == 'DELETE':
+        DatabasePoolMetricsService.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    summary = DatabasePoolMetricsService.summary()
+    if request.query_params.get('output') == 'prometheus':
+        return HttpResponse(
+            DatabasePoolMetricsService.to_prometheus(summary),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+    return Response(summary)
 
 
 @ensure_csrf_cookie
@@ -265,15 +356,17 @@ def settings_view(request):
     return serve_static_html(request, 'SettingsPage/System_Settings.html')
 
 class ArchiveLogViewSet(viewsets.ModelViewSet):
-    queryset = ArchiveLog.objects.all().order_by('-archived_at')
+    queryset = ArchiveLog.objects.all().order_by('-archived_at', '-archive_id')
     serializer_class = ArchiveLogSerializer
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-archived_at', '-archive_id')
     lookup_field = 'archive_id'
     permission_classes = [IsAdmin]  # Only Admin can view archive logs
 
 class ArchiveLoggingMixin:
     def _create_archive_log(self, instance, reason=None, user=None, snapshot=None, action='Archived'):
         try:
-            print(f"Creating ArchiveLog for:{action}: {instance}")
+            logger.debug('Creating ArchiveLog for %s: %s', action, instance)
             ArchiveLog.objects.create(
                 content_type = ContentType.objects.get_for_model(type(instance)),
                 object_id = str(instance.pk),
@@ -281,9 +374,8 @@ class ArchiveLoggingMixin:
                 reason = reason or f'Record {action}',
                 snapshot = snapshot or {}
             )
-            print("ArchiveLog created successfully.")
-        except Exception as e:
-            print("Error creating ArchiveLog:", e)
+        except Exception:
+            logger.exception('Error creating ArchiveLog for %s: %s', action, instance)
 class CategoryViewSet(ArchiveLoggingMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -422,6 +514,8 @@ class ProductViewSet(ArchiveLoggingMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     lookup_field = 'product_id'
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-product_id',)
     permission_classes = [IsStaffOrReadOnly]  # Admin/Staff can edit, Clerk can view
 
     def get_queryset(self):
@@ -498,17 +592,46 @@ class ProductStocksViewSet(viewsets.ModelViewSet):
     queryset = ProductStocks.objects.all().order_by('-stock_id')
     serializer_class = ProductStocksSerializer
     lookup_field = 'stock_id'
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-stock_id',)
     permission_classes = [InventoryPermission]  # Admin/Staff full access, Clerk read-only
 
+    def get_queryset(self):
+        # Product and active batches are loaded up front so listing stocks
+        # takes a fixed number of queries (see ProductStocksSerializer.get_active_batches)
+        queryset = ProductStocks.objects.select_related('product').prefetch_related(
+            Prefetch(
+                'productbatch_set',
+                queryset=ProductBatch.objects.filter(on_hand__gt=0).order_by('batch_id'),
+                to_attr='active_batches'
+            )
+        ).order_by('-stock_id')
+
+        # Filtered here so the stocks screen can fetch one page at a time
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(
+                Q(stock_id__icontains=search) | Q(product__product_id__icontains=search) |
+                Q(product__brand_name__icontains=search) | Q(product__generic_name__icontains=search)
+            )
+        stock_status = self.request.query_params.get('status')
+        if stock_status:
+            queryset = queryset.filter(status=stock_status)
+        return queryset
+
 class ProductBatchViewSet(viewsets.ModelViewSet):
-    queryset = ProductBatch.objects.all().order_by('-batch_id')
+    queryset = ProductBatch.objects.all().order_by('batch_id')
     serializer_class = ProductBatchSerializer
     lookup_field = 'batch_id'
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('batch_id',)
     permission_classes = [InventoryPermission]  # Admin/Staff full access, Clerk read-only
 
     def get_queryset(self):
         # Filter out batches with 0 on_hand (hide depleted batches from UI)
-        queryset = ProductBatch.objects.filter(on_hand__gt=0).order_by('batch_id')
+        queryset = ProductBatch.objects.filter(on_hand__gt=0).select_related(
+            'product_stock__product'
+        ).order_by('batch_id')
         stock_id = self.request.query_params.get('stock_id', None)
         
         if stock_id:
@@ -556,13 +679,17 @@ class ProductBatchViewSet(viewsets.ModelViewSet):
             instance._custom_transaction_performed_by = transaction_performed_by
 
 class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.all().order_by('-date_ordered')
+    queryset = Order.objects.prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.select_related('product', 'supplier').order_by('order_item_id'))
+    ).order_by('-date_ordered', '-order_id')
     serializer_class = OrderSerializer
     lookup_field = 'order_id'
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-date_ordered', '-order_id')
     permission_classes = [InventoryPermission]  # Admin/Staff full access, Clerk read-only
 
 class OrderItemViewSet(viewsets.ModelViewSet):
-    queryset = OrderItem.objects.all().order_by('order_item_id')
+    queryset = OrderItem.objects.select_related('product', 'supplier').order_by('order_item_id')
     serializer_class = OrderItemSerializer
     lookup_field = 'order_item_id'
     permission_classes = [InventoryPermission]  # Admin/Staff full access, Clerk read-only
@@ -608,14 +735,15 @@ class ReceiveOrderViewSet(viewsets.ModelViewSet):
         if not order_item:
             raise ValidationError("Order Item is Required")
         
-        OrderService.validate_receive_quantity_create(order_item, quantity_received)
-
         # Extract custom transaction fields if provided
         transaction_remarks = serializer.validated_data.pop('transaction_remarks', None)
         transaction_performed_by = serializer.validated_data.pop('transaction_performed_by', None)
         
-        # Save the instance
-        instance = serializer.save()
+        from django.db import transaction as db_transaction
+        with db_transaction.atomic():
+            # Validate against the locked received counter, then save while the lock is held
+            OrderService.validate_receive_quantity_create(OrderService.lock_order_item(order_item), quantity_received)
+            instance = serializer.save()
         
         # Attach custom fields to instance for signal to use
         if transaction_remarks:
@@ -628,6 +756,9 @@ class ReceiveOrderViewSet(viewsets.ModelViewSet):
         """
         Receive multiple order items in one atomic transaction.
         
+        The whole delivery is validated and written set-based by ReceiveService,
+        so the number of queries does not grow with the number of items.
+        
         Request body example:
         {
             "items": [
@@ -667,69 +798,51 @@ class ReceiveOrderViewSet(viewsets.ModelViewSet):
         results = []
         errors = []
         
+        # Validate the shape of every line first (no queries)
+        valid_items = []
+        for index, item_data in enumerate(items):
+            serializer = BulkReceiveItemSerializer(data=item_data)
+            if serializer.is_valid():
+                valid_items.append((index, serializer.validated_data))
+            else:
+                errors.append({
+                    'index': index,
+                    'order_item': item_data.get('order_item') if isinstance(item_data, dict) else None,
+                    'error': serializer.errors
+                })
+        
         try:
-            with db_transaction.atomic():
-                # Lock all order items upfront to prevent race conditions
-                order_item_ids = [item.get('order_item') for item in items if item.get('order_item')]
-                locked_order_items = {
-                    oi.order_item_id: oi 
-                    for oi in OrderItem.objects.select_for_update().filter(
-                        order_item_id__in=order_item_ids
-                    )
-                }
-                
-                for index, item_data in enumerate(items):
-                    try:
-                        # Validate that order_item was locked
-                        order_item_id = item_data.get('order_item')
-                        if order_item_id and order_item_id not in locked_order_items:
-                            errors.append({
-                                'index': index,
-                                'order_item': order_item_id,
-                                'error': f'Order item {order_item_id} not found.'
-                            })
-                            continue
-                        
-                        # Validate and create receive order
-                        serializer = self.get_serializer(data=item_data)
-                        serializer.is_valid(raise_exception=True)
-                        receive_order = serializer.save()
-                        
-                        results.append({
-                            'index': index,
-                            'receive_order_id': receive_order.receive_order_id,
-                            'order_item_id': receive_order.order_item.order_item_id,
-                            'product_name': f"{receive_order.order_item.product.brand_name} {receive_order.order_item.product.generic_name}",
-                            'quantity_received': receive_order.quantity_received,
-                            'status': 'success'
-                        })
-                        
-                    except ValidationError as e:
-                        # Collect validation errors but continue processing
-                        errors.append({
-                            'index': index,
-                            'order_item': item_data.get('order_item'),
-                            'error': e.detail if hasattr(e, 'detail') else str(e)
-                        })
-                    except Exception as e:
-                        errors.append({
-                            'index': index,
-                            'order_item': item_data.get('order_item'),
-                            'error': str(e)
-                        })
+            with timed_operation(logger, 'bulk_receive'), db_transaction.atomic():
+                # Lock all order items upfront to prevent race conditions,
+                # then validate quantities against what was already received
+                lines, quantity_errors = ReceiveService.lock_and_validate(valid_items)
+                errors.extend(quantity_errors)
                 
-                # If any errors occurred, rollback the entire transaction
+                # If any errors occurred, nothing is written
                 if errors:
+                    errors.sort(key=lambda error: error['index'])
                     raise ValidationError({
                         'message': 'Bulk receive failed. All items rolled back.',
                         'errors': errors,
                         'successful_items': results
                     })
+                
+                for index, receive_order in ReceiveService.receive(lines):
+                    product = receive_order.order_item.product
+                    results.append({
+                        'index': index,
+                        'receive_order_id': receive_order.receive_order_id,
+                        'order_item_id': receive_order.order_item.order_item_id,
+                        'product_name': f"{product.brand_name} {product.generic_name}",
+                        'quantity_received': receive_order.quantity_received,
+                        'status': 'success'
+                    })
         
         except ValidationError:
             # Re-raise validation errors
             raise
         except Exception as e:
+            logger.exception('Unexpected error during bulk receive')
             return Response(
                 {'error': f'Unexpected error during bulk receive: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -744,11 +857,60 @@ class ReceiveOrderViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
 
 class TransactionViewSet(viewsets.ModelViewSet):
-    queryset = Transaction.objects.all().order_by('-date_of_transaction')
+    queryset = Transaction.objects.all().order_by('-date_of_transaction', '-transaction_id')
     serializer_class = TransactionSerializer
     lookup_field = 'transaction_id'
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-date_of_transaction', '-transaction_id')
     permission_classes = [TransactionPermission]  # Admin full, Staff inventory, Clerk read-only
 
+    def get_queryset(self):
+        # Filtered here so the transactions screen can fetch one page at a time
+        queryset = Transaction.objects.select_related('product', 'batch').order_by('-date_of_transaction', '-transaction_id')
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(
+                Q(transaction_id__icontains=search) | Q(product__product_id__icontains=search) |
+                Q(product__brand_name__icontains=search) | Q(product__generic_name__icontains=search) |
+                Q(batch__batch_id__icontains=search)
+            )
+        transaction_type = self.request.query_params.get('transaction_type')
+        if transaction_type:
+            queryset = queryset.filter(transaction_type=transaction_type)
+        return queryset
+
+    @action(detail=False, methods=['post'], permission_classes=[DispensePermission])
+    def dispense(self, request):
+        """
+        Dispense a product across batches, first-expiry-first-out, in one call.
+        
+        Request body example:
+        {
+            "product": "PRD-00001",
+            "quantity": 25,
+            "performed_by": "Jane Doe",  // optional, defaults to the current user
+            "remarks": "POS sale"        // optional
+        }
+        
+        Returns the allocation: one entry (and one OUT transaction) per batch used.
+        """
+        serializer = DispenseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        allocations = DispenseService.dispense(
+            product_id=data['product'],
+            quantity=data['quantity'],
+            performed_by=data.get('performed_by') or request.user.get_full_name() or request.user.username,
+            remarks=data.get('remarks'),
+        )
+        
+        return Response({
+            'product': data['product'],
+            'quantity': data['quantity'],
+            'allocations': allocations,
+        }, status=status.HTTP_201_CREATED)
+
 class UserInformationViewSet(viewsets.ModelViewSet):
     """API endpoint for user management"""
     queryset = UserInformation.objects.all().select_related('user', 'created_by')
@@ -6,6 +6,7 @@ document.addEventListener('DOMContentLoaded', function() {
 	// Wait until chart update functions / instances are available
 	waitForChartsReady(5000).then(() => {
 		fetchAndUpdateAllCharts();
+		subscribeToDashboardChanges();
 	}).catch(() => {
 		console.warn('Charts did not initialize in time; skipping initial fetch.');
 	});
@@ -35,6 +36,33 @@ function waitForChartsReady(timeoutMs = 5000) {
 	});
 }
 
+// Widget name (DashboardService) -> fetch function
+const WIDGET_FETCHERS = {
+	stats: () => fetchDashboardStats(),
+	categories: () => fetchCategoryDistribution(),
+	top_suppliers: () => fetchTopSuppliers(),
+	stock_status: () => fetchStockStatus()
+};
+
+// Refetch only the widgets the server reports as changed (answered from the ETag cache)
+function subscribeToDashboardChanges() {
+	if (!window.LiveEvents) return;
+
+	const pending = new Set();
+	let timer = null;
+	window.LiveEvents.on('dashboard', (data) => {
+		(data.widgets || []).forEach(widget => pending.add(widget));
+		// Coalesce bursts (e.g. a delivery of many lines) into one refetch
+		clearTimeout(timer);
+		timer = setTimeout(() => {
+			const widgets = Array.from(pending);
+			pending.clear();
+			widgets.forEach(widget => WIDGET_FETCHERS[widget] && WIDGET_FETCHERS[widget]());
+		}, 500);
+	});
+	window.LiveEvents.on('reset', fetchAndUpdateAllCharts);
+}
+
 async function fetchAndUpdateAllCharts() {
 	try {
 		await Promise.all([
@@ -326,11 +326,7 @@ function initializeOrders() {
 
 async function loadProducts() {
     try {
-        const res = await fetch('/api/products/');
-        if (!res.ok) return console.error('Failed to load products', res.status);
-
-        const data = await res.json();
-        const products = Array.isArray(data) ? data : (data.results || []);
+        const products = await fetchAllPages('/api/products/');
         
         // Cache products with their prices and suppliers
         productsCache = products;
@@ -383,27 +379,7 @@ async function loadProducts() {
 async function loadOrders() {
     // Fetch all orders from the API by following paginated 'next' links.
     try {
-        let url = '/api/orders/';
-        let all = [];
-
-        while (url) {
-            const res = await fetch(url);
-            if (!res.ok) {
-                console.error('Failed to fetch orders', res.status);
-                return;
-            }
-
-            const data = await res.json();
-            if (Array.isArray(data)) {
-                all = data;
-                url = null;
-            } else {
-                all = all.concat(data.results || []);
-                url = data.next || null;
-            }
-        }
-
-        ordersCache = all;
+        ordersCache = await fetchAllPages('/api/orders/');
         window.ordersCache = ordersCache;
         filteredOrders = null;
         window.filteredOrders = null;
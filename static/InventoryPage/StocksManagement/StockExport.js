@@ -1,3 +1,59 @@
+// Parse the CSV written by the export endpoints (quoted fields, CRLF line ends, UTF-8 BOM)
+function parseCsv(text) {
+  const rows = [];
+  let row = [];
+  let field = '';
+  let quoted = false;
+
+  text = text.replace(/^\ufeff/, '');
+  for (let i = 0; i < text.length; i++) {
+    const char = text[i];
+    if (quoted) {
+      if (char === '"' && text[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ',') {
+      row.push(field);
+      field = '';
+    } else if (char === '\n') {
+      row.push(field);
+      rows.push(row);
+      row = [];
+      field = '';
+    } else if (char !== '\r') {
+      field += char;
+    }
+  }
+  if (field || row.length) {
+    row.push(field);
+    rows.push(row);
+  }
+  return rows;
+}
+
+// Stock rows from /api/exports/stocks/csv/, as objects keyed by the CSV headers
+async function fetchStockExportRows(status) {
+  const params = new URLSearchParams();
+  if (status) {
+    params.set('status', status);
+  }
+
+  const response = await fetch(`/api/exports/stocks/csv/?${params}`);
+  if (!response.ok) {
+    throw new Error(`Failed to export stocks: ${response.status}`);
+  }
+
+  const [header, ...rows] = parseCsv(await response.text());
+  return rows.map(cells => Object.fromEntries(header.map((name, index) => [name, cells[index]])));
+}
+
 // Export Stock List to PDF
 async function exportStockListToPDF() {
   const { jsPDF } = window.jspdf;
@@ -16,41 +72,31 @@ async function exportStockListToPDF() {
   const statusValue = statusFilter ? statusFilter.options[statusFilter.selectedIndex].text : 'All';
   const currentStatusFilter = statusFilter ? statusFilter.value : 'all';
 
-  // Fetch ALL stocks data from API
+  // Fetch the stocks from the server-side export, filtered by status on the server
   let allStocks = [];
   try {
-    const response = await fetch('/api/product-stocks/');
-    allStocks = await response.json();
+    allStocks = await fetchStockExportRows(currentStatusFilter === 'all' ? null : statusValue);
   } catch (error) {
     console.error('Error fetching stocks:', error);
     alert('Failed to fetch stock data. Please try again.');
     return;
   }
 
-  // Apply the same filters as the table
+  // Apply the same search as the table
   const filteredStocks = allStocks.filter(stock => {
-    // Search filter
-    const matchesSearch = !searchTerm || 
-      stock.stock_id.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      stock.product_id.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      stock.product_name.toLowerCase().includes(searchTerm.toLowerCase());
-    
-    // Status filter - normalize both values to compare
-    const normalizedStockStatus = stock.status.toLowerCase().replace(/\s+/g, '-');
-    const normalizedFilterStatus = currentStatusFilter.toLowerCase();
-    const matchesStatus = currentStatusFilter === 'all' || 
-      normalizedStockStatus === normalizedFilterStatus;
-    
-    return matchesSearch && matchesStatus;
+    return !searchTerm ||
+      stock['Stock ID'].toLowerCase().includes(searchTerm.toLowerCase()) ||
+      stock['Product ID'].toLowerCase().includes(searchTerm.toLowerCase()) ||
+      stock['Product Name'].toLowerCase().includes(searchTerm.toLowerCase());
   });
 
   // Convert filtered stocks to table rows
   const tableRows = filteredStocks.map(stock => [
-    stock.stock_id,
-    stock.product_id,
-    stock.product_name,
-    stock.total_on_hand,
-    stock.status
+    stock['Stock ID'],
+    stock['Product ID'],
+    stock['Product Name'],
+    stock['Total On Hand'],
+    stock['Status']
   ]);
 
   // Add title
@@ -1,51 +1,64 @@
 document.addEventListener("DOMContentLoaded", function(){
   console.log("Stocks Management Script loaded");
 
-  // Pagination variables
-  let allStocks = [];
-  let currentPage = 1;
+  // Pagination variables (one page is fetched at a time)
+  let pageStocks = [];
+  let pager = null;
   const recordsPerPage = 8;
 
   // Filter/Search variables
   let currentSearchTerm = '';
   let currentStatusFilter = 'all';
+  let searchTimer = null;
+
+  // Filter values of the status dropdown -> status stored by the API
+  const STATUS_FILTERS = {
+    'normal': 'Normal',
+    'low-stock': 'Low Stock',
+    'near-expiry': 'Near Expiry',
+    'out-of-stock': 'Out of Stock',
+    'expired': 'Expired',
+  };
 
   // Check for expand_stock URL parameter (from alerts)
   const urlParams = new URLSearchParams(window.location.search);
   const expandStockId = urlParams.get('expand_stock');
   let hasExpandedFromUrl = false; // Flag to prevent multiple expansions
 
+  // Load the first page matching the search and status filter; further pages are fetched on demand
   async function loadStocks() {
     console.log("Reloading Stocks...");
+    const params = new URLSearchParams();
+    if (currentSearchTerm.trim()) params.set('search', currentSearchTerm.trim());
+    if (STATUS_FILTERS[currentStatusFilter]) params.set('status', STATUS_FILTERS[currentStatusFilter]);
+
+    pager = createCursorPager(`/api/product-stocks/?${params}`, recordsPerPage);
+    await showPage(() => pager.first());
+
+    // If expand_stock parameter exists and we haven't expanded yet, search and expand that stock
+    if (expandStockId && !hasExpandedFromUrl) {
+      hasExpandedFromUrl = true;
+      handleExpandStockFromUrl(expandStockId);
+    }
+  }
+
+  async function showPage(fetchPage) {
     try{
-      const response = await fetch('/api/product-stocks/');
-      const data = await response.json();
-      
-      // Store all stocks
-      allStocks = data;
-      
-      // Display current page
+      pageStocks = await fetchPage();
       displayStocks();
-      
-      // If expand_stock parameter exists and we haven't expanded yet, search and expand that stock
-      if (expandStockId && !hasExpandedFromUrl) {
-        hasExpandedFromUrl = true;
-        handleExpandStockFromUrl(expandStockId);
-      }
     } catch (error){
       console.error("Network Error: ", error)
     }
   }
   
   // Handle expanding a stock from URL parameter - uses search to filter and then expands
-  function handleExpandStockFromUrl(stockId) {
+  async function handleExpandStockFromUrl(stockId) {
     // Put stock ID in search bar to filter
     const searchInput = document.getElementById('stockslist_searchInput');
     if (searchInput) {
       searchInput.value = stockId;
       currentSearchTerm = stockId;
-      currentPage = 1;
-      displayStocks();
+      await loadStocks();
     }
     
     // Wait for DOM to update, then expand the stock
@@ -74,31 +87,11 @@ document.addEventListener("DOMContentLoaded", function(){
     const tbody = document.getElementById("stocks-table-body");
     tbody.innerHTML = ``;
 
-    // Apply search and filter
-    let filteredStocks = allStocks.filter(stock => {
-      // Search filter
-      const matchesSearch = 
-        stock.stock_id.toLowerCase().includes(currentSearchTerm.toLowerCase()) ||
-        stock.product_id.toLowerCase().includes(currentSearchTerm.toLowerCase()) ||
-        stock.product_name.toLowerCase().includes(currentSearchTerm.toLowerCase());
-      
-      // Status filter - normalize both values to compare
-      const normalizedStockStatus = stock.status.toLowerCase().replace(/\s+/g, '-');
-      const normalizedFilterStatus = currentStatusFilter.toLowerCase();
-      const matchesStatus = currentStatusFilter === 'all' || 
-        normalizedStockStatus === normalizedFilterStatus;
-      
-      return matchesSearch && matchesStatus;
-    });
-
-    // Calculate pagination based on filtered results
-    const totalPages = Math.ceil(filteredStocks.length / recordsPerPage);
-    const startIndex = (currentPage - 1) * recordsPerPage;
-    const endIndex = startIndex + recordsPerPage;
-    const paginatedStocks = filteredStocks.slice(startIndex, endIndex);
+    // The API already applied the search and status filter
+    const paginatedStocks = pageStocks;
 
     // If no stocks match filter, show message
-    if (filteredStocks.length === 0) {
+    if (paginatedStocks.length === 0) {
       const row = document.createElement("tr");
       row.innerHTML = `<td colspan="6" style="text-align: center; padding: 40px; color: var(--muted);">No stocks found.</td>`;
       tbody.appendChild(row);
@@ -179,32 +172,29 @@ document.addEventListener("DOMContentLoaded", function(){
     }
 
     // Update pagination buttons
-    updatePaginationButtons(currentPage, totalPages);
+    updatePaginationButtons();
   }
 
-  function updatePaginationButtons(current, total) {
+  function updatePaginationButtons() {
   const prevBtn = document.getElementById('stockslist_prevBtn');
   const nextBtn = document.getElementById('stockslist_nextBtn');
 
     if (prevBtn && nextBtn) {
-      prevBtn.disabled = current === 1;
-      nextBtn.disabled = current === total || total === 0;
+      prevBtn.disabled = !(pager && pager.hasPrevious());
+      nextBtn.disabled = !(pager && pager.hasNext());
     }
   }
 
   // Pagination event listeners
   document.getElementById('stockslist_prevBtn')?.addEventListener('click', function() {
-    if (currentPage > 1) {
-      currentPage--;
-      displayStocks();
+    if (pager && pager.hasPrevious()) {
+      showPage(() => pager.previous());
     }
   });
 
   document.getElementById('stockslist_nextBtn')?.addEventListener('click', function() {
-    const totalPages = Math.ceil(allStocks.length / recordsPerPage);
-    if (currentPage < totalPages) {
-      currentPage++;
-      displayStocks();
+    if (pager && pager.hasNext()) {
+      showPage(() => pager.next());
     }
   });
 
@@ -215,8 +205,9 @@ document.addEventListener("DOMContentLoaded", function(){
   if (searchInput) {
     searchInput.addEventListener('input', function() {
       currentSearchTerm = this.value;
-      currentPage = 1; // Reset to first page
-      displayStocks();
+      // Wait for typing to pause before asking the server
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(loadStocks, 300);
     });
   }
 
@@ -225,8 +216,7 @@ document.addEventListener("DOMContentLoaded", function(){
   if (statusFilter) {
     statusFilter.addEventListener('change', function() {
       currentStatusFilter = this.value;
-      currentPage = 1; // Reset to first page
-      displayStocks();
+      loadStocks();
     });
   }
 
@@ -318,8 +308,8 @@ async function loadBatches(stockId){
   console.log("Loading Batches for: ", stockId);
 
   try {
-    const response = await fetch (`/api/product-batches/?stock_id=${stockId}`);
-    const data = await response.json();
+    // Active batches of one stock fit in a single page
+    const data = await createCursorPager(`/api/product-batches/?stock_id=${stockId}`, 500).first();
 
     const batchContainer = document.getElementById(`stockslist_batches-${stockId}`);
     const tbody = batchContainer.querySelector("#batches-table-body");  
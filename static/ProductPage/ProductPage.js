@@ -148,10 +148,7 @@ document.addEventListener("DOMContentLoaded", function () {
 
   async function fetchAllProducts() {
     try {
-      const res = await fetch('/api/products/');
-      if (!res.ok) throw new Error(`Failed to fetch products: ${res.status}`);
-      const data = await res.json();
-      productsCache = Array.isArray(data) ? data : (data.results || []);
+      productsCache = await fetchAllPages('/api/products/');
       currentPage = 1;
       renderCurrentView();
     } catch (err) {
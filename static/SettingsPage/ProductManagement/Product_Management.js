@@ -43,20 +43,11 @@ document.addEventListener('DOMContentLoaded', function () {
   // Fetch and render products (UPDATED)
   async function loadProductsList() {
     try {
-      const [activeRes, archivedRes] = await Promise.all([
-        fetch('/api/products/'),
-        fetch('/api/products/?show_archived=true')
+      [allActiveProducts, allArchivedProducts] = await Promise.all([
+        fetchAllPages('/api/products/'),
+        fetchAllPages('/api/products/?show_archived=true')
       ]);
 
-      if (!activeRes.ok) throw new Error('Failed to fetch active products');
-      if (!archivedRes.ok) throw new Error('Failed to fetch archived products');
-
-      const activeData = await activeRes.json();
-      const archivedData = await archivedRes.json();
-
-      allActiveProducts = Array.isArray(activeData) ? activeData : (activeData.results || []);
-      allArchivedProducts = Array.isArray(archivedData) ? archivedData : (archivedData.results || []);
-
       // Reset to page 1
       activeCurrentPage = 1;
       archivedCurrentPage = 1;
@@ -255,8 +255,7 @@ document.addEventListener("DOMContentLoaded", function() {
   // Populate Supplier Product Multi-Select Dropdown
   async function populateProductDropdown() {
     try {
-      const response = await fetch('/api/products/');
-      const products = await response.json();
+      const products = await fetchAllPages('/api/products/');
       productsCache = products;
       
       // Populate Add Supplier multi-select
@@ -22,13 +22,12 @@ async function exportTransactionsToPDF() {
   const searchTerm = searchInput ? searchInput.value : '';
   const typeValue = typeFilter ? typeFilter.options[typeFilter.selectedIndex].text : 'All';
 
-  // Use the global filteredTransactions array
+  // The screen only holds the page it shows: fetch every transaction matching its filters
   let transactionsToExport = [];
-  if (typeof filteredTransactions !== 'undefined' && filteredTransactions) {
-    transactionsToExport = filteredTransactions;
-  } else if (typeof allTransactions !== 'undefined' && allTransactions) {
-    transactionsToExport = allTransactions;
-  } else {
+  try {
+    transactionsToExport = await fetchAllPages(transactionListUrl());
+  } catch (error) {
+    console.error('Error fetching transactions for export:', error);
     alert('No transaction data available. Please refresh the page and try again.');
     return;
   }
@@ -1,45 +1,60 @@
-let allTransactions = [];
-let filteredTransactions = [];
-let currentPage = 1;
+let pageTransactions = [];
+let pager = null;
+let searchTimer = null;
 const pageSize = 8;
 
+// Filter values of the type dropdown -> transaction_type stored by the API
+const TYPE_FILTERS = {in: 'IN', out: 'OUT', adjust: 'ADJ'};
+
 document.addEventListener('DOMContentLoaded', async function(){
   await loadTransactions();
   setupEventListeners();
 });
 
+// Transactions endpoint filtered by the search box and type filter (also used by TransactionExport.js)
+function transactionListUrl(){
+  const searchInput = document.getElementById('transactions_searchInput');
+  const typeFilter = document.getElementById('transactions_typeFilter');
+
+  const params = new URLSearchParams();
+  const searchTerm = searchInput ? searchInput.value.trim() : '';
+  if (searchTerm) params.set('search', searchTerm);
+  const transactionType = TYPE_FILTERS[typeFilter ? typeFilter.value : 'all'];
+  if (transactionType) params.set('transaction_type', transactionType);
+  return `/api/transactions/?${params}`;
+}
+
+// Load the first matching page; further pages are fetched on demand
 async function loadTransactions(){
+  pager = createCursorPager(transactionListUrl(), pageSize);
+  await showPage(() => pager.first());
+}
+
+async function showPage(fetchPage){
   try{
-    const response = await fetch('/api/transactions/');
-    
-    if (!response.ok){
-      const errorData = await response.json();
-      alert('Error: ' + JSON.stringify(errorData));
-      return;
-    }
-
-    const data = await response.json();
-    allTransactions = data;
-    filteredTransactions = [...allTransactions];
-    currentPage = 1;
+    pageTransactions = await fetchPage();
     renderTransactions();
     
   } catch (error){
     console.error('Error fetching Transactions:', error);
+    alert('Error: ' + error.message);
   }
 }
 
 function setupEventListeners() {
-  // Search input
+  // Search input (waits for typing to pause before asking the server)
   const searchInput = document.getElementById('transactions_searchInput');
   if (searchInput) {
-    searchInput.addEventListener('input', handleSearchAndFilter);
+    searchInput.addEventListener('input', () => {
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(loadTransactions, 300);
+    });
   }
 
   // Type filter
   const typeFilter = document.getElementById('transactions_typeFilter');
   if (typeFilter) {
-    typeFilter.addEventListener('change', handleSearchAndFilter);
+    typeFilter.addEventListener('change', loadTransactions);
   }
 
   // Pagination buttons
@@ -48,72 +63,28 @@ function setupEventListeners() {
   
   if (prevBtn) {
     prevBtn.addEventListener('click', () => {
-      if (currentPage > 1) {
-        currentPage--;
-        renderTransactions();
+      if (pager && pager.hasPrevious()) {
+        showPage(() => pager.previous());
       }
     });
   }
 
   if (nextBtn) {
     nextBtn.addEventListener('click', () => {
-      const totalPages = Math.ceil(filteredTransactions.length / pageSize);
-      if (currentPage < totalPages) {
-        currentPage++;
-        renderTransactions();
+      if (pager && pager.hasNext()) {
+        showPage(() => pager.next());
       }
     });
   }
 }
 
-function handleSearchAndFilter() {
-  const searchInput = document.getElementById('transactions_searchInput');
-  const typeFilter = document.getElementById('transactions_typeFilter');
-  
-  const searchTerm = searchInput ? searchInput.value.toLowerCase() : '';
-  const typeValue = typeFilter ? typeFilter.value : 'all';
-
-  filteredTransactions = allTransactions.filter(transaction => {
-    // Search filter
-    const matchesSearch = 
-      !searchTerm ||
-      (transaction.transaction_id && transaction.transaction_id.toLowerCase().includes(searchTerm)) ||
-      (transaction.product_id && transaction.product_id.toLowerCase().includes(searchTerm)) ||
-      (transaction.product_name && transaction.product_name.toLowerCase().includes(searchTerm)) ||
-      (transaction.batch_id && transaction.batch_id.toLowerCase().includes(searchTerm));
-
-    // Type filter - match all variations of transaction types
-    let matchesType = typeValue === 'all';
-    if (!matchesType && transaction.transaction_type) {
-      const transactionType = transaction.transaction_type.toLowerCase();
-      if (typeValue === 'in') {
-        matchesType = transactionType === 'in' || transactionType === 'stock in';
-      } else if (typeValue === 'out') {
-        matchesType = transactionType === 'out' || transactionType === 'stock out';
-      } else if (typeValue === 'adjust') {
-        matchesType = transactionType === 'adj' || 
-                      transactionType === 'adjust' || 
-                      transactionType === 'adjustment' || 
-                      transactionType === 'stock adjustment';
-      }
-    }
-
-    return matchesSearch && matchesType;
-  });
-
-  currentPage = 1;
-  renderTransactions();
-}
-
 function renderTransactions() {
   const tbody = document.getElementById('transactions_tableBody');
   if (!tbody) return;
 
   tbody.innerHTML = '';
 
-  const startIndex = (currentPage - 1) * pageSize;
-  const endIndex = startIndex + pageSize;
-  const paginatedTransactions = filteredTransactions.slice(startIndex, endIndex);
+  const paginatedTransactions = pageTransactions;
 
   // Render actual transactions
   paginatedTransactions.forEach(transaction => {
@@ -161,16 +132,17 @@ function renderTransactions() {
 function updatePaginationButtons() {
   const prevBtn = document.getElementById('transactions_prevBtn');
   const nextBtn = document.getElementById('transactions_nextBtn');
-  const totalPages = Math.ceil(filteredTransactions.length / pageSize);
+  const hasPrevious = Boolean(pager && pager.hasPrevious());
+  const hasNext = Boolean(pager && pager.hasNext());
 
   if (prevBtn) {
-    prevBtn.disabled = currentPage === 1;
-    prevBtn.style.opacity = currentPage === 1 ? '0.5' : '1';
+    prevBtn.disabled = !hasPrevious;
+    prevBtn.style.opacity = hasPrevious ? '1' : '0.5';
   }
 
   if (nextBtn) {
-    nextBtn.disabled = currentPage >= totalPages || filteredTransactions.length === 0;
-    nextBtn.style.opacity = (currentPage >= totalPages || filteredTransactions.length === 0) ? '0.5' : '1';
+    nextBtn.disabled = !hasNext;
+    nextBtn.style.opacity = hasNext ? '1' : '0.5';
   }
 }
 
@@ -29,8 +29,11 @@
         setupEventListeners();
         fetchAlerts();
         
-        // Refresh alerts every 5 minutes
-        setInterval(fetchAlerts, 5 * 60 * 1000);
+        // Alert changes are pushed; poll every 5 minutes whenever the stream is not connected
+        subscribeToAlerts();
+        setInterval(() => {
+          if (!(window.LiveEvents && window.LiveEvents.connected())) fetchAlerts();
+        }, 5 * 60 * 1000);
       }
     }, 100);
 
@@ -38,6 +41,25 @@
     setTimeout(() => clearInterval(checkSidebar), 10000);
   }
 
+  /**
+   * Update the badge and summary from pushed alert summaries
+   * @returns {boolean} false when live updates are unavailable
+   */
+  function subscribeToAlerts() {
+    if (!window.LiveEvents) return false;
+
+    const subscribed = window.LiveEvents.on('alerts', (summary) => {
+      alertsData.summary = summary;
+      updateBadge();
+      updateSummary();
+      if (panelOpen) fetchAlerts();
+    });
+    if (subscribed) {
+      window.LiveEvents.on('reset', fetchAlerts);
+    }
+    return subscribed;
+  }
+
   /**
    * Setup event listeners for notification elements
    */
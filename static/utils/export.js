@@ -71,6 +71,24 @@ function downloadCSV(csvContent, filename) {
     URL.revokeObjectURL(url);
 }
 
+/**
+ * Download a server-side export (streamed by /api/exports/<dataset>/<format>/)
+ * The browser saves the response directly, so large exports never sit in page memory.
+ * @param {string} url - Export endpoint, optionally with date_from/date_to/product/status params
+ * @param {string} label - Name shown in the status message
+ */
+function downloadServerExport(url, label) {
+    const link = document.createElement('a');
+    link.setAttribute('href', url);
+    link.style.visibility = 'hidden';
+    
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    
+    showExportStatus(`Exporting ${label}... the download will start shortly.`, 'success');
+}
+
 /**
  * Get current date string for filename
  * @returns {string} Date string in YYYY-MM-DD format
@@ -131,11 +149,7 @@ async function exportProducts() {
     showExportStatus('Exporting products...', 'loading');
     
     try {
-        const response = await fetch('/api/products/');
-        if (!response.ok) throw new Error('Failed to fetch products');
-        
-        const data = await response.json();
-        const products = Array.isArray(data) ? data : (data.results || []);
+        const products = await fetchAllPages('/api/products/');
         
         const columns = [
             { key: 'product_id', header: 'Product ID' },
@@ -240,42 +254,8 @@ async function exportCategories() {
 /**
  * Export Inventory/Stock to CSV
  */
-async function exportInventory() {
-    if (isExporting) return;
-    isExporting = true;
-    
-    showExportStatus('Exporting inventory...', 'loading');
-    
-    try {
-        const response = await fetch('/api/inventory/stocks/');
-        if (!response.ok) throw new Error('Failed to fetch inventory');
-        
-        const data = await response.json();
-        const stocks = Array.isArray(data) ? data : (data.results || []);
-        
-        const columns = [
-            { key: 'stock_id', header: 'Stock ID' },
-            { key: 'product_id', header: 'Product ID' },
-            { key: 'product_name', header: 'Product Name' },
-            { key: 'brand_name', header: 'Brand Name' },
-            { key: 'batch_number', header: 'Batch Number' },
-            { key: 'quantity', header: 'Quantity' },
-            { key: 'unit_of_measurement', header: 'Unit' },
-            { key: 'expiry_date', header: 'Expiry Date' },
-            { key: 'status', header: 'Status' },
-            { key: 'date_received', header: 'Date Received' }
-        ];
-        
-        const csv = arrayToCSV(stocks, columns);
-        downloadCSV(csv, `inventory_${getDateString()}.csv`);
-        
-        showExportStatus(`Successfully exported ${stocks.length} stock records!`, 'success');
-    } catch (error) {
-        console.error('Export error:', error);
-        showExportStatus('Failed to export inventory. Please try again.', 'error');
-    } finally {
-        isExporting = false;
-    }
+function exportInventory() {
+    downloadServerExport('/api/exports/stocks/csv/', 'inventory');
 }
 
 /**
@@ -288,11 +268,7 @@ async function exportOrders() {
     showExportStatus('Exporting orders...', 'loading');
     
     try {
-        const response = await fetch('/api/orders/');
-        if (!response.ok) throw new Error('Failed to fetch orders');
-        
-        const data = await response.json();
-        const orders = Array.isArray(data) ? data : (data.results || []);
+        const orders = await fetchAllPages('/api/orders/');
         
         const columns = [
             { key: 'order_id', header: 'Order ID' },
@@ -318,39 +294,8 @@ async function exportOrders() {
 /**
  * Export Transactions to CSV
  */
-async function exportTransactions() {
-    if (isExporting) return;
-    isExporting = true;
-    
-    showExportStatus('Exporting transactions...', 'loading');
-    
-    try {
-        const response = await fetch('/api/transactions/');
-        if (!response.ok) throw new Error('Failed to fetch transactions');
-        
-        const data = await response.json();
-        const transactions = Array.isArray(data) ? data : (data.results || []);
-        
-        const columns = [
-            { key: 'transaction_id', header: 'Transaction ID' },
-            { key: 'transaction_type', header: 'Type' },
-            { key: 'product_name', header: 'Product' },
-            { key: 'quantity', header: 'Quantity' },
-            { key: 'performed_by', header: 'Performed By' },
-            { key: 'transaction_date', header: 'Date' },
-            { key: 'remarks', header: 'Remarks' }
-        ];
-        
-        const csv = arrayToCSV(transactions, columns);
-        downloadCSV(csv, `transactions_${getDateString()}.csv`);
-        
-        showExportStatus(`Successfully exported ${transactions.length} transactions!`, 'success');
-    } catch (error) {
-        console.error('Export error:', error);
-        showExportStatus('Failed to export transactions. Please try again.', 'error');
-    } finally {
-        isExporting = false;
-    }
+function exportTransactions() {
+    downloadServerExport('/api/exports/transactions/csv/', 'transactions');
 }
 
 /**
@@ -365,11 +310,11 @@ async function exportAllData() {
     try {
         // Fetch all data in parallel
         const [productsRes, suppliersRes, categoriesRes, stocksRes, ordersRes] = await Promise.all([
-            fetch('/api/products/').then(r => r.json()).catch(() => []),
+            fetchAllPages('/api/products/').catch(() => []),
             fetch('/api/suppliers/').then(r => r.json()).catch(() => []),
             fetch('/api/categories/').then(r => r.json()).catch(() => []),
             fetch('/api/inventory/stocks/').then(r => r.json()).catch(() => []),
-            fetch('/api/orders/').then(r => r.json()).catch(() => [])
+            fetchAllPages('/api/orders/').catch(() => [])
         ]);
         
         const backup = {
@@ -0,0 +1,69 @@
+/**
+ * Live Updates
+ * One shared server-sent event stream (/api/events/) per page, opened only
+ * when the server advertises it (<meta name="live-events" content="on">,
+ * added by serve_static_html when settings.LIVE_EVENTS is on).
+ * Usage: LiveEvents.on('alerts', summary => { ... })
+ * Event types: stock, alerts, order, dashboard, and reset (updates were
+ * missed: reload the data).
+ */
+
+(function() {
+  'use strict';
+
+  const handlers = {};
+  let source = null;
+
+  function available() {
+    const meta = document.querySelector('meta[name="live-events"]');
+    return typeof EventSource !== 'undefined' && Boolean(meta) && meta.content === 'on';
+  }
+
+  /**
+   * Open the stream on first use; EventSource reconnects by itself
+   */
+  function connect() {
+    if (source || !available()) return;
+
+    source = new EventSource('/api/events/');
+    Object.keys(handlers).forEach(listen);
+  }
+
+  function listen(type) {
+    source.addEventListener(type, (event) => {
+      let data = {};
+      try {
+        data = JSON.parse(event.data);
+      } catch (e) {
+        console.error('Invalid live event:', e);
+        return;
+      }
+      (handlers[type] || []).forEach(handler => handler(data));
+    });
+  }
+
+  /**
+   * Register handler for an event type
+   * @returns {boolean} false when the stream is not served or the browser has no EventSource (keep polling)
+   */
+  function on(type, handler) {
+    if (!available()) return false;
+
+    if (!handlers[type]) {
+      handlers[type] = [];
+      if (source) listen(type);
+    }
+    handlers[type].push(handler);
+    connect();
+    return true;
+  }
+
+  /**
+   * Whether the stream is open right now (false while it reconnects)
+   */
+  function connected() {
+    return Boolean(source) && source.readyState === EventSource.OPEN;
+  }
+
+  window.LiveEvents = { on, connected };
+})();
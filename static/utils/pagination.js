@@ -0,0 +1,65 @@
+// Paginated API Utility Functions
+
+/**
+ * Fetch every page of a list endpoint and return all of its rows
+ * List endpoints answer {next, previous, results}; the `next` links are
+ * followed until the last page. Meant for exports: screens that list a
+ * growing table page on demand with createCursorPager instead.
+ * @param {string} url - List endpoint, with or without query parameters (e.g. '/api/products/?show_archived=true')
+ * @param {number} pageSize - Rows per request (the API caps it at 500)
+ * @returns {Promise<Array>} All rows, in the endpoint's order
+ * @throws {Error} When one of the requests fails
+ */
+async function fetchAllPages(url, pageSize = 500) {
+  let next = `${url}${url.includes('?') ? '&' : '?'}page_size=${pageSize}`;
+  let rows = [];
+
+  while (next) {
+    const response = await fetch(next);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch ${url}: ${response.status}`);
+    }
+
+    const data = await response.json();
+    if (Array.isArray(data)) {
+      return rows.concat(data);
+    }
+    rows = rows.concat(data.results || []);
+    next = data.next || null;
+  }
+  return rows;
+}
+
+/**
+ * Page through a list endpoint one page per request
+ * Keeps the `next`/`previous` cursor links of the last response, so screens
+ * only fetch the page they show.
+ * @param {string} url - List endpoint, with or without query parameters (e.g. '/api/transactions/?search=PRD')
+ * @param {number} pageSize - Rows per page
+ * @returns {{first: function, next: function, previous: function, hasNext: function, hasPrevious: function}}
+ *   first/next/previous resolve to the rows of that page
+ * @throws {Error} When a request fails
+ */
+function createCursorPager(url, pageSize) {
+  const firstUrl = `${url}${url.includes('?') ? '&' : '?'}page_size=${pageSize}`;
+  let links = {next: null, previous: null};
+
+  async function load(pageUrl) {
+    const response = await fetch(pageUrl);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch ${url}: ${response.status}`);
+    }
+
+    const data = await response.json();
+    links = {next: data.next || null, previous: data.previous || null};
+    return data.results || [];
+  }
+
+  return {
+    first: () => load(firstUrl),
+    next: () => load(links.next),
+    previous: () => load(links.previous),
+    hasNext: () => Boolean(links.next),
+    hasPrevious: () => Boolean(links.previous),
+  };
+}
@@ -0,0 +1,157 @@
+"""
+Benchmark the dashboard read burst: WSGI workers vs the ASGI async read path
+
+An open dashboard fires its four widget requests, the alerts and product
+lookups at the same time. Each simulated client here repeats that burst over
+a keep-alive connection for a fixed time; the script reports requests/s and
+latency percentiles for every target, one target after the other.
+
+Start both deployments on the same database and the same number of
+processes, e.g.:
+
+    gunicorn config.wsgi:application -w 4 -b 127.0.0.1:8001
+    uvicorn config.asgi:application --workers 4 --port 8002
+
+then run (the user must exist; a session is created for it directly):
+
+    python testing/benchmark_read_path.py --username admin \\
+        --target wsgi=http://127.0.0.1:8001 --target asgi=http://127.0.0.1:8002
+
+Each target is warmed up first with sequential bursts on fresh connections,
+so its processes build their widget caches and the day's alert table outside
+the measurement. After that the dashboard widgets come from the cache, and
+the database work of a burst is mostly the session lookup, the alerts and
+the product lookups.
+"""
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+from importlib import import_module
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+
+from inventory_system.models import Product
+
+DASHBOARD_PATHS = [
+    '/api/dashboard/stats/',
+    '/api/dashboard/categories/',
+    '/api/dashboard/top-suppliers/?top=3',
+    '/api/dashboard/stock-status/',
+    '/api/alerts/',
+]
+
+
+def session_cookie(username):
+    """Log username in by writing a session directly (no OTP round trip)"""
+    user = get_user_model().objects.get(username=username)
+    store = import_module(settings.SESSION_ENGINE).SessionStore()
+    store[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    store[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.save()
+    return f'{settings.SESSION_COOKIE_NAME}={store.session_key}'
+
+
+def burst_paths(lookups):
+    """One dashboard burst: widgets, alerts and `lookups` product lookups"""
+    product_ids = list(
+        Product.objects.exclude(status='Archived').order_by('product_id').values_list('product_id', flat=True)[:lookups]
+    )
+    return DASHBOARD_PATHS + [f'/api/products/{product_id}/' for product_id in product_ids]
+
+
+def client(base_url, cookie, paths, deadline, results, lock):
+    """Repeat the burst over one keep-alive connection until deadline"""
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    latencies, errors = [], 0
+    while time.monotonic() < deadline:
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers={'Cookie': cookie})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    with lock:
+        results['latencies'] += latencies
+        results['errors'] += errors
+
+
+def warm_up(base_url, cookie, paths, rounds):
+    url = urlsplit(base_url)
+    for _ in range(rounds):
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        for path in paths:
+            connection.request('GET', path, headers={'Cookie': cookie})
+            connection.getresponse().read()
+        connection.close()
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def run(name, base_url, cookie, paths, clients, seconds):
+    warm_up(base_url, cookie, paths, clients)
+    results = {'latencies': [], 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    threads = [
+        threading.Thread(target=client, args=(base_url, cookie, paths, deadline, results, lock))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(results['latencies'])
+    print(
+        f"{name:<8} {len(latencies) / elapsed:>9.1f} {results['errors']:>7} "
+        f"{percentile(latencies, 0.5):>9.1f} {percentile(latencies, 0.95):>9.1f} {percentile(latencies, 0.99):>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target', action='append', required=True, metavar='NAME=URL',
+                        help='Server to benchmark, e.g. asgi=http://127.0.0.1:8002 (repeatable)')
+    parser.add_argument('--username', required=True, help='Existing user the requests are made as')
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent clients (default 32)')
+    parser.add_argument('--seconds', type=float, default=15, help='Duration per target (default 15)')
+    parser.add_argument('--lookups', type=int, default=3, help='Product lookups per burst (default 3)')
+    args = parser.parse_args()
+
+    cookie = session_cookie(args.username)
+    paths = burst_paths(args.lookups)
+    print(f'{args.clients} clients, {args.seconds:g}s per target, burst of {len(paths)} requests')
+    print(f"{'target':<8} {'req/s':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for target in args.target:
+        name, _, base_url = target.partition('=')
+        run(name, base_url, cookie, paths, args.clients, args.seconds)
+
+
+if __name__ == '__main__':
+    main()